@@ -3,24 +3,24 @@
 API simple para disparar el proceso de análisis de candidatos
 """
 
+import asyncio
 import base64
+import functools
 import json
 import os
-import re
-import threading
 import uuid
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, Literal
 
+import anyio.to_thread
 from fastapi import FastAPI, HTTPException, Response
 from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
-from supabase import create_client
 
 from cv_crew import create_cv_analysis_crew
 from matching_engine import run_deterministic_matching
-from single_meet_crew import create_single_meet_evaluation_crew
+from single_meet_crew import create_single_meet_evaluation_crew, evaluation_cache_version, resolve_extraction_mode
 from tools.elevenlabs_tools import (
     create_elevenlabs_agent,
     generate_elevenlabs_prompt_from_jd,
@@ -29,19 +29,30 @@ from tools.elevenlabs_tools import (
 from tools.supabase_tools import (
     create_candidate,
     get_client_email,
-    get_meet_evaluation_data,
+    load_meet_evaluation_context,
     log_matching_inputs_debug,
     save_meet_evaluation,
 )
-from tools.vector_tools import get_supabase_client, search_similar_chunks
+from tools.vector_tools import count_knowledge_chunks, get_supabase_client, search_similar_chunks
 from utils.audit_log import (
+    audit_writer_stats,
     record_cv_candidate_audit_event,
     record_elevenlabs_agent_audit_event,
     record_evaluation_audit_event,
     record_matching_audit_event,
 )
+from utils.background_effects import BackgroundEffects
+from utils.evaluation_cache import (
+    evaluation_input_hash,
+    get_cached_evaluation,
+    is_evaluation_cache_enabled,
+    save_cached_evaluation,
+)
 from utils.helpers import clean_uuid
+from utils.json_extract import extract_json_object, iter_json_objects
 from utils.logger import evaluation_logger
+from utils.matching_runs import MatchingQueueFullError, MatchingRunExecutor, create_matching_run_store
+from utils.supabase_client import get_client
 from utils.tech_stack import extract_tech_stack_from_jd
 
 # ====== Helpers ======
@@ -185,12 +196,39 @@ app = FastAPI(
     version="1.0.0",
 )
 
-# Storage para runs (en producción usar Redis o DB)
-matching_runs: dict[str, dict] = {}
+# Estado de runs de matching (memory o tabla Supabase, ver MATCHING_RUN_STORE) y pool acotado de ejecución
+matching_runs = create_matching_run_store()
+matching_executor = MatchingRunExecutor.from_env(matching_runs)
+# Side effects de /evaluate-meet (email de match, audit, caché) fuera de la respuesta; best-effort, sin persistencia
+evaluation_effects = BackgroundEffects.from_env()
+
+
+@app.on_event("startup")
+async def _size_threadpool():
+    """
+    Los handlers async no hacen I/O síncrona en el event loop: Supabase, crews, OCR y
+    ElevenLabs van por run_in_threadpool. API_THREADPOOL_SIZE fija cuántos hilos comparten
+    (por defecto el de anyio, 40).
+    """
+    try:
+        size = int(os.getenv("API_THREADPOOL_SIZE", "0"))
+    except ValueError:
+        size = 0
+    if size > 0:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = size
+
+
+@app.on_event("shutdown")
+def _drain_evaluation_effects():
+    evaluation_effects.shutdown(wait_for_pending=True)
 
 
 class SingleMeetRequest(BaseModel):
     meet_id: str
+    # "llm" | "direct"; None = SINGLE_MEET_EXTRACTION_MODE (ver single_meet_crew.resolve_extraction_mode)
+    extraction_mode: Literal["llm", "direct"] | None = None
+    # Ignora la caché de evaluaciones (EVALUATION_CACHE_ENABLED) y vuelve a ejecutar el crew
+    force: bool = False
 
 
 class AnalysisResponse(BaseModel):
@@ -226,6 +264,7 @@ class CVAnalysisResponse(BaseModel):
 class MatchingRequest(BaseModel):
     user_id: str = None
     client_id: str = None
+    full_rebuild: bool = False
 
 
 class MatchingResponse(BaseModel):
@@ -251,6 +290,9 @@ class EvaluationJobsProcessRequest(BaseModel):
     worker_id: str | None = None
     lock_timeout_minutes: int = 15
     source: str | None = None
+    # None = EVALUATION_JOBS_CONCURRENCY / EVALUATION_JOBS_TIMEOUT_SECONDS
+    concurrency: int | None = None
+    job_timeout_seconds: float | None = None
 
 
 class EvaluationJobRetryResponse(BaseModel):
@@ -311,17 +353,10 @@ async def read_cv(request: CVRequest):
         parsed_json_objects = []
         try:
             import json as _json
-            import re
 
-            # Buscar posibles objetos JSON completos en el texto, incluyendo JSON anidado.
-            decoder = _json.JSONDecoder()
+            # Objetos JSON de primer nivel del texto, en orden (un solo recorrido)
             parsed = parsed_json_objects
-            for match in re.finditer(r"\{", result_text):
-                try:
-                    obj, _end = decoder.raw_decode(result_text[match.start() :])
-                    parsed.append(obj)
-                except Exception:
-                    continue
+            parsed.extend(m.value for m in iter_json_objects(result_text))
             # Heurística: quedarnos con el último que tenga 'success' o 'error_type'
             for obj in reversed(parsed):
                 if isinstance(obj, dict) and ("success" in obj or "error_type" in obj or "action" in obj):
@@ -352,20 +387,24 @@ async def read_cv(request: CVRequest):
                     create_candidate_callable = getattr(create_candidate, "func", create_candidate)
                     tech_stack_value = candidate_payload.get("tech_stack") or []
                     observations_value = candidate_payload.get("observations")
-                    candidate_create_raw = create_candidate_callable(
-                        name=candidate_payload.get("name"),
-                        email=candidate_payload.get("email"),
-                        phone=candidate_payload.get("phone"),
-                        cv_url=candidate_payload.get("cv_url"),
-                        tech_stack=_json.dumps(tech_stack_value, ensure_ascii=False)
-                        if isinstance(tech_stack_value, list)
-                        else str(tech_stack_value or ""),
-                        linkedin=candidate_payload.get("linkedin"),
-                        observations=_json.dumps(observations_value, ensure_ascii=False)
-                        if isinstance(observations_value, dict)
-                        else observations_value,
-                        user_id=request.user_id,
-                        client_id=request.client_id,
+                    # create_candidate hace I/O contra Supabase: fuera del event loop
+                    candidate_create_raw = await run_in_threadpool(
+                        functools.partial(
+                            create_candidate_callable,
+                            name=candidate_payload.get("name"),
+                            email=candidate_payload.get("email"),
+                            phone=candidate_payload.get("phone"),
+                            cv_url=candidate_payload.get("cv_url"),
+                            tech_stack=_json.dumps(tech_stack_value, ensure_ascii=False)
+                            if isinstance(tech_stack_value, list)
+                            else str(tech_stack_value or ""),
+                            linkedin=candidate_payload.get("linkedin"),
+                            observations=_json.dumps(observations_value, ensure_ascii=False)
+                            if isinstance(observations_value, dict)
+                            else observations_value,
+                            user_id=request.user_id,
+                            client_id=request.client_id,
+                        )
                     )
                     candidate_result = _json.loads(candidate_create_raw)
                     result_text = f"{result_text}\n\nCREATE_CANDIDATE_RESULT:\n{candidate_create_raw}"
@@ -462,9 +501,11 @@ async def read_cv(request: CVRequest):
         raise HTTPException(status_code=500, detail=f"Error en el análisis del CV: {str(e)}")
 
 
-def do_matching_long_task(run_id: str, user_id: str | None, client_id: str | None):
+def do_matching_long_task(run_id: str, user_id: str | None, client_id: str | None, full_rebuild: bool = False):
     """
     Ejecuta el proceso de matching en background
+
+    `full_rebuild` ignora el snapshot de matching incremental y recalcula todos los pares.
     """
     try:
         matching_runs[run_id] = {
@@ -528,7 +569,10 @@ def do_matching_long_task(run_id: str, user_id: str | None, client_id: str | Non
             "runId": run_id,
         }
 
-        matches_list = run_deterministic_matching(user_id=user_id, client_id=client_id)
+        matching_stats: dict[str, Any] = {}
+        matches_list = run_deterministic_matching(
+            user_id=user_id, client_id=client_id, stats=matching_stats, full_rebuild=full_rebuild
+        )
         evaluation_logger.log_task_progress(
             "Matching API", f"Matches determinísticos: {len(matches_list)} candidato(s) con al menos una búsqueda"
         )
@@ -555,6 +599,7 @@ def do_matching_long_task(run_id: str, user_id: str | None, client_id: str | Non
             "execution_time": execution_time,
             "matches": matches_list,
             "total_matches": total_matches,
+            "stats": matching_stats,
         }
 
         matching_runs[run_id] = {
@@ -574,6 +619,8 @@ def do_matching_long_task(run_id: str, user_id: str | None, client_id: str | Non
                 "client_id": client_id,
                 "execution_time": execution_time,
                 "total_matches": total_matches,
+                "supabase_round_trips": matching_stats.get("supabase_round_trips"),
+                "snapshot": matching_stats.get("snapshot"),
             },
         )
 
@@ -601,7 +648,8 @@ async def match_candidates(request: MatchingRequest = None):
     Retorna inmediatamente con un runId para consultar el estado
 
     Args:
-        request: Objeto con user_id y client_id opcionales para filtrar candidatos
+        request: Objeto con user_id y client_id opcionales para filtrar candidatos,
+            y full_rebuild para ignorar el snapshot de matching incremental
 
     Returns:
         JSON con runId para consultar el estado del proceso
@@ -609,30 +657,52 @@ async def match_candidates(request: MatchingRequest = None):
     try:
         user_id = request.user_id if request else None
         client_id = request.client_id if request else None
+        full_rebuild = bool(request.full_rebuild) if request else False
 
         # Generar runId único
         run_id = str(uuid.uuid4())
 
-        # Inicializar estado
-        matching_runs[run_id] = {"status": "queued", "progress": 0.0, "message": "Proceso en cola...", "runId": run_id}
+        # Encolar en el pool acotado; si ya hay un run activo con los mismos filtros (y el mismo
+        # full_rebuild: un rebuild no se resuelve con un run incremental en curso) se reutiliza.
+        # submit escribe el run en matching_runs (tabla Supabase con MATCHING_RUN_STORE=supabase): threadpool
+        run_id, coalesced = await run_in_threadpool(
+            matching_executor.submit,
+            (user_id, client_id, full_rebuild),
+            run_id,
+            do_matching_long_task,
+            run_id,
+            user_id,
+            client_id,
+            full_rebuild=full_rebuild,
+        )
 
-        # Ejecutar en background usando threading
-        thread = threading.Thread(target=do_matching_long_task, args=(run_id, user_id, client_id), daemon=True)
-        thread.start()
+        if coalesced:
+            run_data = await run_in_threadpool(matching_runs.get, run_id, {})
+            run_status = run_data.get("status", "queued")
+            message = (
+                "Ya hay un matching en curso con estos filtros, consulta el estado con GET /match-candidates/{runId}"
+            )
+        else:
+            run_status = "queued"
+            message = "Matching iniciado, consulta el estado con GET /match-candidates/{runId}"
 
         # Retornar inmediatamente con runId
         return Response(
             content=json.dumps(
                 {
                     "runId": run_id,
-                    "status": "queued",
-                    "message": "Matching iniciado, consulta el estado con GET /match-candidates/{runId}",
+                    "status": run_status,
+                    "message": message,
+                    "coalesced": coalesced,
                 }
             ),
             status_code=202,
             media_type="application/json",
         )
 
+    except MatchingQueueFullError as e:
+        evaluation_logger.log_error("Matching API", str(e))
+        raise HTTPException(status_code=429, detail=str(e))
     except Exception as e:
         failed_run_id = locals().get("run_id", "unknown")
         failed_user_id = locals().get("user_id", None)
@@ -664,11 +734,11 @@ async def get_matching_status(run_id: str):
     Returns:
         Estado del proceso: queued, running, done, o error
     """
-    if run_id not in matching_runs:
+    # Una sola lectura del store, en el threadpool (con MATCHING_RUN_STORE=supabase es un round trip)
+    run_data = await run_in_threadpool(matching_runs.get, run_id)
+    if run_data is None:
         raise HTTPException(status_code=404, detail="runId not found")
 
-    run_data = matching_runs[run_id]
-
     # Formatear respuesta según el estado (formato compatible con RunStatus del frontend)
     if run_data["status"] == "done":
         return {"status": "done", "result": run_data.get("result")}
@@ -692,15 +762,37 @@ async def get_status():
         "status": "active",
         "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
         "service": "Candidate Evaluation API",
+        "audit_log": audit_writer_stats(),
     }
 
 
+EVALUATION_JOBS_MAX_LIMIT = 10
+
+
+def _evaluation_jobs_env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _evaluation_job_lock_renew_interval(lock_timeout_minutes: int) -> float:
+    """Renueva el lock tres veces por ventana para que un job largo no vuelva a ser reclamable."""
+    return max(lock_timeout_minutes, 1) * 60 / 3
+
+
 def _get_evaluation_jobs_supabase_client():
     url = os.getenv("SUPABASE_URL")
     key = os.getenv("SUPABASE_KEY")
     if not url or not key:
         raise HTTPException(status_code=500, detail="SUPABASE_URL y SUPABASE_KEY son requeridos")
-    return create_client(url, key)
+    return get_client(url, key)
+
+
+def _evaluation_cache_supabase():
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    return get_client(url, key) if url and key else None
 
 
 def _job_result_payload(response: AnalysisResponse) -> dict[str, Any]:
@@ -756,7 +848,56 @@ def _mark_evaluation_job_failed(supabase, job: dict[str, Any], error: Exception)
     }
 
 
-async def _process_claimed_evaluation_job(supabase, job: dict[str, Any]) -> dict[str, Any]:
+def _claim_evaluation_jobs(supabase, worker_id: str, limit: int, lock_timeout_minutes: int) -> list[dict[str, Any]]:
+    response = supabase.rpc(
+        "claim_evaluation_jobs",
+        {
+            "p_worker_id": worker_id,
+            "p_limit": limit,
+            "p_lock_timeout_minutes": lock_timeout_minutes,
+        },
+    ).execute()
+    return response.data or []
+
+
+def _retry_evaluation_job(supabase, job_id: str) -> dict[str, Any] | None:
+    job = supabase.rpc("retry_evaluation_job", {"p_job_id": job_id}).execute().data
+    if isinstance(job, list):
+        job = job[0] if job else None
+    return job
+
+
+def _renew_evaluation_job_lock(supabase, job: dict[str, Any], worker_id: str) -> None:
+    (
+        supabase.table("evaluation_jobs")
+        .update({"locked_at": datetime.now().isoformat()})
+        .eq("id", job["id"])
+        .eq("locked_by", worker_id)
+        .eq("status", "running")
+        .execute()
+    )
+
+
+async def _keep_evaluation_job_locked(supabase, job: dict[str, Any], worker_id: str, interval: float) -> None:
+    """Mantiene vigente `locked_at` mientras el job corre; se cancela al terminar."""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await run_in_threadpool(_renew_evaluation_job_lock, supabase, job, worker_id)
+        except Exception as e:
+            evaluation_logger.log_error(
+                "Evaluation Jobs Worker", f"No se pudo renovar el lock del job {job.get('id')}: {e}"
+            )
+
+
+async def _process_claimed_evaluation_job(
+    supabase,
+    job: dict[str, Any],
+    worker_id: str | None = None,
+    timeout_seconds: float | None = None,
+    lock_renew_interval: float | None = None,
+) -> dict[str, Any]:
+    renew_task = None
     try:
         meet_id = job.get("meet_id")
         if not meet_id:
@@ -766,8 +907,20 @@ async def _process_claimed_evaluation_job(supabase, job: dict[str, Any]) -> dict
             "Evaluation Jobs Worker",
             f"Procesando job {job.get('id')} para meet {meet_id}",
         )
-        response = await evaluate_single_meet(SingleMeetRequest(meet_id=meet_id))
-        _mark_evaluation_job_completed(supabase, job, response)
+        if worker_id and lock_renew_interval:
+            renew_task = asyncio.create_task(_keep_evaluation_job_locked(supabase, job, worker_id, lock_renew_interval))
+        try:
+            response = await asyncio.wait_for(
+                evaluate_single_meet(SingleMeetRequest(meet_id=meet_id)), timeout=timeout_seconds
+            )
+        except TimeoutError:
+            # Se deja de renovar el lock y el job queda failed con backoff. El crew sigue en su hilo
+            # hasta terminar, pero su resultado se descarta (save_meet_evaluation actualiza por meet_id).
+            raise TimeoutError(f"evaluation_job excedió el timeout de {timeout_seconds:g}s") from None
+        finally:
+            if renew_task is not None:
+                renew_task.cancel()
+        await run_in_threadpool(_mark_evaluation_job_completed, supabase, job, response)
         evaluation_logger.log_task_complete(
             "Evaluation Jobs Worker",
             f"Job {job.get('id')} completado para meet {meet_id}",
@@ -783,7 +936,7 @@ async def _process_claimed_evaluation_job(supabase, job: dict[str, Any]) -> dict
             "Evaluation Jobs Worker",
             f"Job {job.get('id')} falló: {error}",
         )
-        return _mark_evaluation_job_failed(supabase, job, error)
+        return await run_in_threadpool(_mark_evaluation_job_failed, supabase, job, error)
 
 
 @app.post("/evaluation-jobs/process")
@@ -793,28 +946,37 @@ async def process_evaluation_jobs(request: EvaluationJobsProcessRequest | None =
     Puede ser invocado por el backoffice como kick, por Railway Cron o manualmente.
     """
     request = request or EvaluationJobsProcessRequest()
-    limit = max(1, min(request.limit or 1, 10))
+    limit = max(1, min(request.limit or 1, EVALUATION_JOBS_MAX_LIMIT))
+    concurrency = request.concurrency or _evaluation_jobs_env_int("EVALUATION_JOBS_CONCURRENCY", 3)
+    concurrency = max(1, min(concurrency, limit))
+    timeout_seconds = request.job_timeout_seconds or _evaluation_jobs_env_int("EVALUATION_JOBS_TIMEOUT_SECONDS", 1800)
     worker_id = request.worker_id or f"candidate-evaluation-api-{uuid.uuid4()}"
     supabase = _get_evaluation_jobs_supabase_client()
 
-    claimed_response = supabase.rpc(
-        "claim_evaluation_jobs",
-        {
-            "p_worker_id": worker_id,
-            "p_limit": limit,
-            "p_lock_timeout_minutes": request.lock_timeout_minutes,
-        },
-    ).execute()
-    jobs = claimed_response.data or []
+    jobs = await run_in_threadpool(_claim_evaluation_jobs, supabase, worker_id, limit, request.lock_timeout_minutes)
+
+    # Cada job es un crew.kickoff de varios minutos en el threadpool: se procesan hasta
+    # `concurrency` a la vez, con timeout propio y renovación del lock mientras corren.
+    semaphore = asyncio.Semaphore(concurrency)
+    renew_interval = _evaluation_job_lock_renew_interval(request.lock_timeout_minutes)
+
+    async def _run(job: dict[str, Any]) -> dict[str, Any]:
+        async with semaphore:
+            return await _process_claimed_evaluation_job(
+                supabase,
+                job,
+                worker_id=worker_id,
+                timeout_seconds=timeout_seconds,
+                lock_renew_interval=renew_interval,
+            )
 
-    processed = []
-    for job in jobs:
-        processed.append(await _process_claimed_evaluation_job(supabase, job))
+    processed = list(await asyncio.gather(*(_run(job) for job in jobs)))
 
     return {
         "status": "ok",
         "worker_id": worker_id,
         "claimed": len(jobs),
+        "concurrency": concurrency,
         "processed": processed,
         "source": request.source,
     }
@@ -826,15 +988,27 @@ async def retry_evaluation_job(job_id: str):
     Reintenta manualmente un job failed/cancelled usando la funcion SQL retry_evaluation_job.
     """
     supabase = _get_evaluation_jobs_supabase_client()
-    response = supabase.rpc("retry_evaluation_job", {"p_job_id": job_id}).execute()
-    job = response.data
-    if isinstance(job, list):
-        job = job[0] if job else None
+    job = await run_in_threadpool(_retry_evaluation_job, supabase, job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found or not retryable")
     return EvaluationJobRetryResponse(status="ok", message="Job queued for retry", job=job)
 
 
+def _send_match_email(payload: dict[str, Any]) -> None:
+    """Envía el email de match (corre en evaluation_effects; si lanza, se reintenta)."""
+    _email_api_url = os.getenv("EMAIL_API_URL")
+
+    # COMENTADO PARA PROBAR CON DATOS MOCKEADOS
+    # response = requests.post(
+    #     _email_api_url,
+    #     json=payload,
+    #     headers={'Content-Type': 'application/json'},
+    #     timeout=30
+    # )
+    # response.raise_for_status()
+    evaluation_logger.log_task_complete("Envío Email Match", f"Email enviado exitosamente a {payload['to_email']}")
+
+
 @app.post("/evaluate-meet", response_model=AnalysisResponse)
 async def evaluate_single_meet(request: SingleMeetRequest):
     """
@@ -850,9 +1024,54 @@ async def evaluate_single_meet(request: SingleMeetRequest):
 
         start_time = datetime.now()
 
+        # Contexto del meet (meet, conversación, candidato, JD, cliente, emotion_analysis) cargado
+        # una sola vez: lo recibe el crew pre-cargado y lo reutilizan enriquecimiento, emociones y email.
+        meet_context = await run_in_threadpool(load_meet_evaluation_context, meet_id)
+        meet_data = meet_context if isinstance(meet_context, dict) and not meet_context.get("error") else {}
+
         # Crear y ejecutar crew de evaluación individual
         # COMENTADO PARA PROBAR CON DATOS MOCKEADOS
-        crew = create_single_meet_evaluation_crew(meet_id)
+        extraction_mode = resolve_extraction_mode(request.extraction_mode, meet_context)
+        evaluation_logger.log_task_progress("API", f"Modo de extracción del meet {meet_id}: {extraction_mode}")
+
+        # Caché por contenido: mismas entradas (transcript, JD, stack, versión de prompt/modelo) => mismo resultado
+        cache_supabase = _evaluation_cache_supabase() if is_evaluation_cache_enabled() else None
+        cache_key = (
+            evaluation_input_hash(meet_context, evaluation_cache_version(extraction_mode)) if cache_supabase else None
+        )
+        if cache_key and not request.force:
+            cached = await run_in_threadpool(get_cached_evaluation, cache_supabase, meet_id, cache_key)
+            if cached:
+                end_time = datetime.now()
+                execution_time = end_time - start_time
+                evaluation_logger.log_task_complete("API", f"Evaluación de meet {meet_id} obtenida de la caché")
+                evaluation_effects.submit(
+                    "audit candidate_evaluation",
+                    record_evaluation_audit_event,
+                    meet_id=meet_id,
+                    action="candidate_evaluation",
+                    status="success",
+                    metadata={
+                        "endpoint": "POST /evaluate-meet",
+                        "evaluation_id": cached["evaluation_id"],
+                        "execution_time": str(execution_time),
+                        "extraction_mode": extraction_mode,
+                        "cached": True,
+                    },
+                )
+                return AnalysisResponse(
+                    status="success",
+                    message=f"Evaluación del meet {meet_id} obtenida de caché (sin cambios en los datos de entrada)",
+                    timestamp=end_time.strftime("%Y-%m-%d %H:%M:%S"),
+                    execution_time=str(execution_time),
+                    result=cached["result"],
+                    evaluation_id=cached["evaluation_id"],
+                )
+
+        # Arma el crew compactando la conversación (tiktoken + tokenizado): threadpool
+        crew = await run_in_threadpool(
+            create_single_meet_evaluation_crew, meet_id, meet_context=meet_context, extraction_mode=extraction_mode
+        )
 
         print("=" * 80)
         print("🚀 INICIANDO EJECUCIÓN DEL CREW (Single Meet Evaluation)")
@@ -891,29 +1110,14 @@ async def evaluate_single_meet(request: SingleMeetRequest):
             else:
                 result_str = str(result)
 
-            # Intentar parsear como JSON (puede venir en formato ```json ... ```)
-            try:
-                # Buscar JSON dentro de markdown code blocks
-                json_match = re.search(r"```json\s*(\{.*\})\s*```", result_str, re.DOTALL)
-                full_result = json.loads(json_match.group(1)) if json_match else json.loads(result_str)
-            except (json.JSONDecodeError, AttributeError):
-                # Si no es JSON válido, intentar extraer cualquier objeto JSON del texto
-                try:
-                    json_match = re.search(r"\{.*\}", result_str, re.DOTALL)
-                    if json_match:
-                        full_result = json.loads(json_match.group(0))
-                    else:
-                        evaluation_logger.log_error(
-                            "API",
-                            "No se pudo parsear el resultado como JSON (sin bloque JSON detectable)",
-                        )
-                        full_result = {}
-                except Exception as parse_err:
-                    evaluation_logger.log_error(
-                        "API",
-                        f"No se pudo parsear el resultado como JSON: {parse_err}",
-                    )
-                    full_result = {}
+            # Un solo recorrido del texto: bloque ```json si lo hay, si no el objeto JSON más grande
+            full_result = extract_json_object(result_str if isinstance(result_str, str) else str(result_str or ""))
+            if full_result is None:
+                evaluation_logger.log_error(
+                    "API",
+                    "No se pudo parsear el resultado como JSON (sin bloque JSON detectable)",
+                )
+                full_result = {}
 
         # ===== Fallback crítico: asegurar meet_id, candidate.id y jd_interview.id =====
         if not isinstance(full_result, dict):
@@ -931,21 +1135,8 @@ async def evaluate_single_meet(request: SingleMeetRequest):
 
         if needs_candidate or needs_jd:
             try:
-                # Reutilizar la función get_meet_evaluation_data para obtener datos mínimos
-                func_to_call = None
-                if hasattr(get_meet_evaluation_data, "__wrapped__"):
-                    func_to_call = get_meet_evaluation_data.__wrapped__
-                elif hasattr(get_meet_evaluation_data, "func"):
-                    func_to_call = get_meet_evaluation_data.func
-                elif hasattr(get_meet_evaluation_data, "_func"):
-                    func_to_call = get_meet_evaluation_data._func
-                elif callable(get_meet_evaluation_data) and not hasattr(get_meet_evaluation_data, "name"):
-                    func_to_call = get_meet_evaluation_data
-
-                if func_to_call:
-                    meet_data_json = func_to_call(meet_id)
-                    meet_data = json.loads(meet_data_json) if isinstance(meet_data_json, str) else meet_data_json
-
+                # Reutilizar el contexto ya cargado del meet para obtener datos mínimos
+                if meet_data:
                     conversation_data = meet_data.get("conversation") or {}
                     jd_data = meet_data.get("jd_interview") or {}
                     candidate_from_conv = conversation_data.get("candidate") or {}
@@ -975,7 +1166,7 @@ async def evaluate_single_meet(request: SingleMeetRequest):
 
                     evaluation_logger.log_task_progress(
                         "API",
-                        "full_result completado con meet_id/candidate.id/jd_interview.id desde get_meet_evaluation_data",
+                        "full_result completado con meet_id/candidate.id/jd_interview.id desde el contexto del meet",
                     )
             except Exception as enrich_err:
                 # Si falla el enriquecimiento, lo registramos pero no rompemos la API
@@ -1008,7 +1199,7 @@ async def evaluate_single_meet(request: SingleMeetRequest):
                 result_data["seniority_analysis"] = match_eval.get("seniority_analysis")
 
         # ===== Verificar si el agente procesó emotion_analysis =====
-        # El agente ahora recibe emotion_analysis a través de get_meet_evaluation_data
+        # El agente recibe emotion_analysis en el contexto pre-cargado del meet
         # y debe procesarlo en su análisis. Solo verificamos si lo hizo y agregamos datos raw si falta.
         try:
             if isinstance(full_result, dict):
@@ -1017,41 +1208,25 @@ async def evaluate_single_meet(request: SingleMeetRequest):
 
                 # Si el agente no procesó los datos de emociones, intentar obtenerlos y agregarlos como fallback
                 if not emotion_summary or not emotion_summary.get("prosody_summary_text"):
-                    url = os.getenv("SUPABASE_URL")
-                    key = os.getenv("SUPABASE_KEY")
-                    if url and key:
-                        supabase = create_client(url, key)
-
-                        # Tomar la conversación más reciente asociada al meet
-                        conv_resp = (
-                            supabase.table("conversations")
-                            .select("emotion_analysis")
-                            .eq("meet_id", meet_id)
-                            .order("created_at", desc=True)
-                            .limit(1)
-                            .execute()
-                        )
-
-                        if conv_resp.data and len(conv_resp.data) > 0:
-                            emotion_analysis = conv_resp.data[0].get("emotion_analysis")
-                            if emotion_analysis:
-                                # Solo agregar datos raw si el agente no los procesó
-                                if not emotion_summary:
-                                    conversation_analysis["emotion_sentiment_summary"] = {
-                                        "raw_emotion_analysis": emotion_analysis,
-                                        "prosody_summary_text": None,
-                                        "burst_summary_text": None,
-                                    }
-                                    full_result["conversation_analysis"] = conversation_analysis
-                                    evaluation_logger.log_task_progress(
-                                        "API",
-                                        "Datos raw de emotion_analysis agregados (el agente no los procesó)",
-                                    )
-                                elif not emotion_summary.get("raw_emotion_analysis"):
-                                    # Agregar solo raw_emotion_analysis si falta
-                                    emotion_summary["raw_emotion_analysis"] = emotion_analysis
-                                    conversation_analysis["emotion_sentiment_summary"] = emotion_summary
-                                    full_result["conversation_analysis"] = conversation_analysis
+                    emotion_analysis = (meet_data.get("conversation") or {}).get("emotion_analysis")
+                    if emotion_analysis:
+                        # Solo agregar datos raw si el agente no los procesó
+                        if not emotion_summary:
+                            conversation_analysis["emotion_sentiment_summary"] = {
+                                "raw_emotion_analysis": emotion_analysis,
+                                "prosody_summary_text": None,
+                                "burst_summary_text": None,
+                            }
+                            full_result["conversation_analysis"] = conversation_analysis
+                            evaluation_logger.log_task_progress(
+                                "API",
+                                "Datos raw de emotion_analysis agregados (el agente no los procesó)",
+                            )
+                        elif not emotion_summary.get("raw_emotion_analysis"):
+                            # Agregar solo raw_emotion_analysis si falta
+                            emotion_summary["raw_emotion_analysis"] = emotion_analysis
+                            conversation_analysis["emotion_sentiment_summary"] = emotion_summary
+                            full_result["conversation_analysis"] = conversation_analysis
 
                 # Exponer resumen en result_data si existe
                 if emotion_summary:
@@ -1085,7 +1260,7 @@ async def evaluate_single_meet(request: SingleMeetRequest):
                     func_to_call = save_meet_evaluation
 
                 if func_to_call:
-                    save_result = func_to_call(full_result_json)
+                    save_result = await run_in_threadpool(func_to_call, full_result_json)
                     save_result_data = json.loads(save_result) if isinstance(save_result, str) else save_result
 
                     if save_result_data.get("success"):
@@ -1113,45 +1288,30 @@ async def evaluate_single_meet(request: SingleMeetRequest):
 
                 evaluation_logger.log_error("API", f"Traceback: {traceback.format_exc()}")
 
-        # Si es un posible match, enviar email del cliente del JD interview
-        email_sent = False
+        # A partir de acá la evaluación ya está persistida: los side effects van a evaluation_effects
+        if cache_key and evaluation_id:
+            evaluation_effects.submit(
+                "evaluation_cache",
+                save_cached_evaluation,
+                cache_supabase,
+                meet_id,
+                cache_key,
+                evaluation_id,
+                result_data,
+            )
+
+        # Si es un posible match, encolar el email al cliente del JD interview
+        email_queued = False
         if result_data.get("is_potential_match") is True:
             try:
-                # Obtener datos del meet para conseguir jd_interviews_id
-                url = os.getenv("SUPABASE_URL")
-                key = os.getenv("SUPABASE_KEY")
-                supabase = create_client(url, key)
-
-                # Obtener el meet con jd_interview y client
-                meet_response = (
-                    supabase.table("meets")
-                    .select(
-                        """
-                    jd_interviews_id,
-                    jd_interviews(
-                        interview_name,
-                        client_id,
-                        clients(
-                            email,
-                            name,
-                            responsible,
-                            phone
-                        )
-                    )
-                    """
-                    )
-                    .eq("id", meet_id)
-                    .execute()
-                )
-
-                if meet_response.data and len(meet_response.data) > 0:
-                    meet = meet_response.data[0]
-                    jd_interviews_id = meet.get("jd_interviews_id")
-                    jd_interview = meet.get("jd_interviews")
+                # Meet, JD interview y cliente salen del contexto ya cargado (sin nuevas consultas)
+                if meet_data:
+                    jd_interviews_id = (meet_data.get("meet") or {}).get("jd_interviews_id")
+                    jd_interview = meet_data.get("jd_interview")
 
                     if jd_interview:
                         interview_name = jd_interview.get("interview_name", "N/A")
-                        client = jd_interview.get("clients")
+                        client = meet_data.get("client")
 
                         if client and client.get("email"):
                             client_email = client.get("email")
@@ -1170,17 +1330,10 @@ async def evaluate_single_meet(request: SingleMeetRequest):
                             prosody_summary_text = emotion_summary.get("prosody_summary_text")
                             burst_summary_text = emotion_summary.get("burst_summary_text")
 
-                            # Obtener la conversación completa del meet
-                            conversation_response = (
-                                supabase.table("conversations")
-                                .select("conversation_data")
-                                .eq("meet_id", meet_id)
-                                .execute()
-                            )
-
+                            # Conversación completa del meet (del contexto ya cargado)
                             conversation_text = "No disponible"
-                            if conversation_response.data and len(conversation_response.data) > 0:
-                                conv_data = conversation_response.data[0].get("conversation_data", {})
+                            conv_data = (meet_data.get("conversation") or {}).get("conversation_data")
+                            if conv_data:
                                 if isinstance(conv_data, dict):
                                     # Formatear conversación como texto
                                     messages = conv_data.get("messages", [])
@@ -1241,26 +1394,15 @@ async def evaluate_single_meet(request: SingleMeetRequest):
                                 jd_interviews_id=jd_interviews_id,
                             )
 
-                            # Enviar email (requests comentado: datos mockeados)
-                            _email_api_url = os.getenv("EMAIL_API_URL")
-
                             _payload = {
                                 "to_email": client_email,
                                 "subject": subject,
                                 "body": body,
                             }
-
-                            # COMENTADO PARA PROBAR CON DATOS MOCKEADOS
-                            # response = requests.post(
-                            #     _email_api_url,
-                            #     json=_payload,
-                            #     headers={'Content-Type': 'application/json'},
-                            #     timeout=30
-                            # )
-                            # response.raise_for_status()
-                            email_sent = True
-                            evaluation_logger.log_task_complete(
-                                "Envío Email Match", f"Email enviado exitosamente a {client_email}"
+                            evaluation_effects.submit(f"match_email meet {meet_id}", _send_match_email, _payload)
+                            email_queued = True
+                            evaluation_logger.log_task_progress(
+                                "Envío Email Match", f"Email de match encolado para {client_email}"
                             )
                         else:
                             evaluation_logger.log_error(
@@ -1270,10 +1412,12 @@ async def evaluate_single_meet(request: SingleMeetRequest):
                         evaluation_logger.log_error("Envío Email Match", "No se encontró jd_interview para el meet")
 
             except Exception as email_error:
-                evaluation_logger.log_error("Envío Email Match", f"Error enviando email de match: {str(email_error)}")
+                evaluation_logger.log_error("Envío Email Match", f"Error preparando email de match: {str(email_error)}")
                 # No fallar la respuesta por error en el email
 
-        record_evaluation_audit_event(
+        evaluation_effects.submit(
+            "audit candidate_evaluation",
+            record_evaluation_audit_event,
             meet_id=meet_id,
             action="candidate_evaluation",
             status="success",
@@ -1281,25 +1425,30 @@ async def evaluate_single_meet(request: SingleMeetRequest):
                 "endpoint": "POST /evaluate-meet",
                 "evaluation_id": evaluation_id,
                 "execution_time": str(execution_time),
+                "extraction_mode": extraction_mode,
+                "cached": False,
                 "final_recommendation": result_data.get("final_recommendation"),
                 "is_potential_match": result_data.get("is_potential_match"),
                 "compatibility_score": result_data.get("compatibility_score"),
-                "email_sent": email_sent,
+                "email_queued": email_queued,
             },
         )
 
         return AnalysisResponse(
             status="success",
             message=f"Evaluación del meet {meet_id} completada exitosamente"
-            + (" - Email enviado" if email_sent else ""),
+            + (" - Email de match encolado" if email_queued else ""),
             timestamp=end_time.strftime("%Y-%m-%d %H:%M:%S"),
             execution_time=str(execution_time),
             result=result_data,
+            evaluation_id=evaluation_id,
         )
 
     except Exception as e:
         failed_meet_id = getattr(request, "meet_id", "unknown")
-        record_evaluation_audit_event(
+        evaluation_effects.submit(
+            "audit candidate_evaluation",
+            record_evaluation_audit_event,
             meet_id=failed_meet_id,
             action="candidate_evaluation",
             status="failed",
@@ -1366,7 +1515,7 @@ def _update_elevenlabs_agent_impl(request: UpdateAgentRequest) -> dict:
             evaluation_logger.log_error("API", error_msg)
             raise HTTPException(status_code=500, detail=error_msg)
 
-        supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+        supabase = get_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
         jd_response = supabase.table("jd_interviews").select("*").eq("id", jd_interview_id).limit(1).execute()
         if not jd_response.data or len(jd_response.data) == 0:
@@ -1571,7 +1720,7 @@ def _create_elevenlabs_agent_impl(request: CreateAgentRequest) -> CreateAgentRes
             raise HTTPException(status_code=500, detail=f"Variables de entorno faltantes: {missing_vars}")
 
         # Conectar a Supabase
-        supabase = create_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
+        supabase = get_client(os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY"))
 
         # 1. Obtener datos del jd_interview
         print(f"📊 Obteniendo datos del jd_interview: {jd_interview_id}")
@@ -1792,6 +1941,9 @@ async def create_elevenlabs_agent_endpoint(request: CreateAgentRequest):
     return await run_in_threadpool(_create_elevenlabs_agent_impl, request)
 
 
+CHATBOT_MATCH_THRESHOLD = 0.3
+
+
 def _chatbot_impl(request: ChatbotRequest) -> ChatbotResponse:
     """Lógica síncrona (Supabase / búsqueda vectorial / OpenAI); run_in_threadpool desde el handler async."""
     try:
@@ -1805,12 +1957,10 @@ def _chatbot_impl(request: ChatbotRequest) -> ChatbotResponse:
         if not os.getenv("OPENAI_API_KEY"):
             raise HTTPException(status_code=500, detail="OPENAI_API_KEY no configurada")
 
-        # 1. Verificar si hay chunks en la base de datos
+        # 1. Verificar si hay chunks en la base de datos (conteo cacheado, no por request)
         total_chunks = 0
         try:
-            supabase = get_supabase_client()
-            count_result = supabase.table("knowledge_chunks").select("id", count="exact").limit(1).execute()
-            total_chunks = count_result.count if hasattr(count_result, "count") else 0
+            total_chunks = count_knowledge_chunks(get_supabase_client)
             evaluation_logger.log_task_progress("Chatbot", f"Total de chunks en BD: {total_chunks}")
         except Exception as e:
             evaluation_logger.log_error("Chatbot", f"Error contando chunks: {str(e)}")
@@ -1819,25 +1969,22 @@ def _chatbot_impl(request: ChatbotRequest) -> ChatbotResponse:
         similar_chunks = []
         if total_chunks > 0:
             try:
-                # Intentar con diferentes thresholds, empezando por el más permisivo
-                thresholds = [0.3, 0.4, 0.5]  # Probar con thresholds más bajos
-                for threshold in thresholds:
-                    similar_chunks = search_similar_chunks(
-                        query_text=message, match_threshold=threshold, match_count=10, entity_type_filter=None
+                # Una sola búsqueda con el threshold más permisivo: todo chunk que supera un
+                # threshold mayor también supera éste, así que reintentar con otros no agrega nada
+                similar_chunks = search_similar_chunks(
+                    query_text=message,
+                    match_threshold=CHATBOT_MATCH_THRESHOLD,
+                    match_count=10,
+                    entity_type_filter=None,
+                )
+                if len(similar_chunks) > 0:
+                    evaluation_logger.log_task_progress(
+                        "Chatbot",
+                        f"Encontrados {len(similar_chunks)} chunks con threshold {CHATBOT_MATCH_THRESHOLD}",
                     )
-                    if len(similar_chunks) > 0:
-                        evaluation_logger.log_task_progress(
-                            "Chatbot", f"Encontrados {len(similar_chunks)} chunks con threshold {threshold}"
-                        )
-                        break
-                    else:
-                        evaluation_logger.log_task_progress(
-                            "Chatbot", f"No se encontraron chunks con threshold {threshold}, intentando siguiente..."
-                        )
-
-                if len(similar_chunks) == 0:
+                else:
                     evaluation_logger.log_task_progress(
-                        "Chatbot", "No se encontraron chunks con ningún threshold, pero hay datos en BD"
+                        "Chatbot", "No se encontraron chunks relevantes, pero hay datos en BD"
                     )
             except Exception as e:
                 evaluation_logger.log_error("Chatbot", f"Error en búsqueda vectorial: {str(e)}")
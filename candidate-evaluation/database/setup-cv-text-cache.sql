@@ -0,0 +1,45 @@
+-- =====================================================
+-- Script de Configuracion de Cache de Texto de CVs para candidate-evaluation
+-- =====================================================
+-- Ejecutar este script completo en el SQL Editor de Supabase
+-- Solo necesario con CV_TEXT_CACHE_SUPABASE=true
+-- =====================================================
+
+-- =====================================================
+-- Paso 1: Crear tabla cv_text_cache
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS cv_text_cache (
+  cache_key TEXT PRIMARY KEY,
+  text_content TEXT NOT NULL,
+  metadata JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Comentarios para documentacion
+COMMENT ON TABLE cv_text_cache IS 'Texto extraido de cada CV en S3, reutilizado mientras el objeto no cambie';
+COMMENT ON COLUMN cv_text_cache.cache_key IS 'v<CV_TEXT_EXTRACTOR_VERSION>:<bucket>/<key>@<ETag>';
+COMMENT ON COLUMN cv_text_cache.metadata IS 'file_type y extraction (metodo, calidad, intentos) devueltos por download_cv_from_s3';
+
+-- =====================================================
+-- Paso 2: Verificacion
+-- =====================================================
+
+SELECT
+  table_name,
+  column_name,
+  data_type
+FROM information_schema.columns
+WHERE table_name = 'cv_text_cache'
+ORDER BY ordinal_position;
+
+-- =====================================================
+-- FIN DEL SCRIPT
+-- =====================================================
+-- Proximos pasos:
+-- 1. Verificar que la tabla se creo correctamente
+-- 2. Configurar CV_TEXT_CACHE_SUPABASE=true en el servicio
+-- 3. Para forzar una nueva extraccion: borrar la fila (o subir CV_TEXT_EXTRACTOR_VERSION
+--    en utils/cv_text_cache.py si cambio la extraccion)
+-- =====================================================
@@ -0,0 +1,37 @@
+-- =====================================================
+-- NOTIFY para el worker residente de evaluation_jobs
+-- =====================================================
+-- Ejecutar en el SQL Editor de Supabase después de
+-- hr-backoffice/database/evaluation-jobs.sql.
+--
+-- El worker (RAILWAY_RUN_MODE=worker) hace LISTEN en el canal fijo
+-- `evaluation_jobs` (utils/evaluation_worker.DEFAULT_NOTIFY_CHANNEL) y reclama en cuanto
+-- se encola o reprograma un job, sin esperar al siguiente poll.
+-- Sin este trigger el worker sigue funcionando sólo con polling.
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION notify_evaluation_jobs()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  IF NEW.status = 'pending' THEN
+    PERFORM pg_notify('evaluation_jobs', NEW.id::text);
+  END IF;
+  RETURN NEW;
+END;
+$$;
+
+COMMENT ON FUNCTION notify_evaluation_jobs IS 'Avisa al worker de evaluation_jobs (LISTEN evaluation_jobs) cuando hay un job pending.';
+
+DROP TRIGGER IF EXISTS trigger_notify_evaluation_jobs ON evaluation_jobs;
+
+CREATE TRIGGER trigger_notify_evaluation_jobs
+  AFTER INSERT OR UPDATE OF status, next_run_at ON evaluation_jobs
+  FOR EACH ROW
+  EXECUTE FUNCTION notify_evaluation_jobs();
+
+-- Prueba manual (en una sesión con LISTEN evaluation_jobs):
+/*
+NOTIFY evaluation_jobs, 'manual';
+*/
@@ -0,0 +1,54 @@
+-- =====================================================
+-- Script de Configuracion de Runs de Matching para candidate-evaluation
+-- =====================================================
+-- Ejecutar este script completo en el SQL Editor de Supabase
+-- Solo necesario con MATCHING_RUN_STORE=supabase
+-- =====================================================
+
+-- =====================================================
+-- Paso 1: Crear tabla matching_runs
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS matching_runs (
+  run_id TEXT PRIMARY KEY,
+  status VARCHAR(20) NOT NULL,
+  state JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  expires_at TIMESTAMP WITH TIME ZONE,
+  CONSTRAINT matching_runs_status_check
+    CHECK (status IN ('queued', 'running', 'done', 'error'))
+);
+
+-- Comentarios para documentacion
+COMMENT ON TABLE matching_runs IS 'Estado de los runs de POST /match-candidates, compartido entre workers y reinicios';
+COMMENT ON COLUMN matching_runs.state IS 'Mismo payload que devuelve GET /match-candidates/{runId} (progress, message, result, error)';
+COMMENT ON COLUMN matching_runs.expires_at IS 'Vencimiento: runs terminados (done/error) segun MATCHING_RUN_TTL_SECONDS; runs activos MATCHING_RUN_STALE_SECONDS despues de su ultima actualizacion (p. ej. cortados por un reinicio)';
+
+-- =====================================================
+-- Paso 2: Crear indices
+-- =====================================================
+
+CREATE INDEX IF NOT EXISTS idx_matching_runs_expires_at
+ON matching_runs(expires_at);
+
+-- =====================================================
+-- Paso 3: Verificacion
+-- =====================================================
+
+SELECT
+  table_name,
+  column_name,
+  data_type
+FROM information_schema.columns
+WHERE table_name = 'matching_runs'
+ORDER BY ordinal_position;
+
+-- =====================================================
+-- FIN DEL SCRIPT
+-- =====================================================
+-- Proximos pasos:
+-- 1. Verificar que la tabla e indices se crearon correctamente
+-- 2. Configurar MATCHING_RUN_STORE=supabase en el servicio
+-- 3. Opcional: MATCHING_RUN_TTL_SECONDS, MATCHING_RUN_STALE_SECONDS, MATCHING_MAX_WORKERS, MATCHING_MAX_PENDING
+-- =====================================================
@@ -0,0 +1,43 @@
+-- =====================================================
+-- Script de Configuracion de Snapshots de Matching para candidate-evaluation
+-- =====================================================
+-- Ejecutar este script completo en el SQL Editor de Supabase
+-- =====================================================
+
+-- =====================================================
+-- Paso 1: Crear tabla matching_snapshots
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS matching_snapshots (
+  scope_key TEXT PRIMARY KEY,
+  snapshot JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Comentarios para documentacion
+COMMENT ON TABLE matching_snapshots IS 'Ultimo resultado del matching deterministico por alcance (user_id/client_id), para re-puntuar solo filas modificadas';
+COMMENT ON COLUMN matching_snapshots.scope_key IS 'Alcance de la corrida: user=<user_id>|client=<client_id> (vacio = sin filtro)';
+COMMENT ON COLUMN matching_snapshots.snapshot IS 'version, fingerprints de jd_interviews y candidates (updated_at + hash de contenido) y pares candidato/JD con tokens comunes';
+
+-- =====================================================
+-- Paso 2: Verificacion
+-- =====================================================
+
+SELECT
+  table_name,
+  column_name,
+  data_type
+FROM information_schema.columns
+WHERE table_name = 'matching_snapshots'
+ORDER BY ordinal_position;
+
+-- =====================================================
+-- FIN DEL SCRIPT
+-- =====================================================
+-- Proximos pasos:
+-- 1. Verificar que la tabla se creo correctamente
+-- 2. Configurar MATCHING_SNAPSHOT_ENABLED=true en el servicio
+-- 3. Para forzar un recalculo completo: POST /match-candidates con {"full_rebuild": true}
+--    (o borrar la fila del alcance correspondiente)
+-- =====================================================
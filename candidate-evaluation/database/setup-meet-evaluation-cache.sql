@@ -0,0 +1,47 @@
+-- =====================================================
+-- Script de Configuracion de Cache de Evaluaciones para candidate-evaluation
+-- =====================================================
+-- Ejecutar este script completo en el SQL Editor de Supabase
+-- Solo necesario con EVALUATION_CACHE_ENABLED=true
+-- =====================================================
+
+-- =====================================================
+-- Paso 1: Crear tabla meet_evaluation_cache
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS meet_evaluation_cache (
+  meet_id TEXT PRIMARY KEY,
+  input_hash TEXT NOT NULL,
+  evaluation_id TEXT,
+  result JSONB NOT NULL DEFAULT '{}'::jsonb,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+-- Comentarios para documentacion
+COMMENT ON TABLE meet_evaluation_cache IS 'Ultimo resultado de POST /evaluate-meet por meet, reutilizado mientras no cambien sus entradas';
+COMMENT ON COLUMN meet_evaluation_cache.input_hash IS 'sha256 de transcript, emotion_analysis, job_description, tech_stack del candidato y version (prompt, modelo, modo de extraccion, compactacion)';
+COMMENT ON COLUMN meet_evaluation_cache.evaluation_id IS 'Fila de meet_evaluations guardada por esa evaluacion';
+COMMENT ON COLUMN meet_evaluation_cache.result IS 'Mismo payload que devuelve POST /evaluate-meet en result';
+
+-- =====================================================
+-- Paso 2: Verificacion
+-- =====================================================
+
+SELECT
+  table_name,
+  column_name,
+  data_type
+FROM information_schema.columns
+WHERE table_name = 'meet_evaluation_cache'
+ORDER BY ordinal_position;
+
+-- =====================================================
+-- FIN DEL SCRIPT
+-- =====================================================
+-- Proximos pasos:
+-- 1. Verificar que la tabla se creo correctamente
+-- 2. Configurar EVALUATION_CACHE_ENABLED=true en el servicio
+-- 3. Para re-evaluar ignorando la cache: POST /evaluate-meet con {"meet_id": "...", "force": true}
+--    (o borrar la fila del meet)
+-- =====================================================
@@ -54,6 +54,27 @@ ON knowledge_chunks(entity_id);
 CREATE INDEX IF NOT EXISTS idx_knowledge_chunks_metadata 
 ON knowledge_chunks USING GIN(metadata);
 
+-- Un chunk por entidad: requerido por el upsert masivo de PostgREST
+-- (on_conflict=entity_type,entity_id) que usan los index_all_* de tools/vector_tools.py.
+-- En instalaciones existentes, primero se eliminan duplicados conservando el más reciente.
+DELETE FROM knowledge_chunks kc
+USING knowledge_chunks newer
+WHERE kc.entity_type = newer.entity_type
+  AND kc.entity_id = newer.entity_id
+  AND (COALESCE(kc.updated_at, kc.created_at, 'epoch'), kc.id)
+    < (COALESCE(newer.updated_at, newer.created_at, 'epoch'), newer.id);
+
+DO $$
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM pg_constraint WHERE conname = 'knowledge_chunks_entity_key'
+  ) THEN
+    ALTER TABLE knowledge_chunks
+      ADD CONSTRAINT knowledge_chunks_entity_key UNIQUE (entity_type, entity_id);
+  END IF;
+END;
+$$;
+
 -- Índice vectorial para búsqueda por similitud (CRÍTICO)
 -- ivfflat es el algoritmo de índice vectorial más rápido para pgvector
 -- lists = 100 es un buen valor para ~10k-100k chunks
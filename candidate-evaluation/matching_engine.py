@@ -6,12 +6,18 @@ Sin LLM: resultados reproducibles.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import os
 import re
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import datetime
 from typing import Any
 
-from supabase import create_client
+from utils.logger import evaluation_logger
+from utils.supabase_client import get_client
+
 
 def _normalize_token(raw: str) -> str:
     if not raw:
@@ -147,52 +153,183 @@ def _score_from_overlap(common: set[str], cand: set[str]) -> int:
     return min(100, max(30, base))
 
 
-def _fetch_candidates(supabase: Any, user_id: str | None, client_id: str | None) -> list[dict[str, Any]]:
-    if user_id and client_id:
-        recruiter_response = (
+# Tamaño de lote para filtros `in_` (URL de PostgREST) y de página para respuestas (max-rows por defecto: 1000)
+IN_FILTER_CHUNK_SIZE = 100
+POSTGREST_PAGE_SIZE = 1000
+CANDIDATES_PAGE_SIZE = 500
+
+# Columnas de `candidates` que necesita el matching (`updated_at` entra en el fingerprint del
+# snapshot incremental). `observations` (JSON grande, no se usa para puntuar) se completa al
+# final sólo para los candidatos con match: ver `_attach_observations`.
+MATCHING_CANDIDATE_COLUMNS = "id, name, email, phone, cv_url, tech_stack, updated_at"
+# Con snapshot, la pasada sobre todos los candidatos sólo trae lo que entra en el fingerprint y el
+# score; los datos de contacto se completan después para los candidatos con match.
+MATCHING_FINGERPRINT_COLUMNS = "id, updated_at, tech_stack"
+MATCHING_PAYLOAD_FIELDS = ("name", "email", "phone", "cv_url", "observations")
+
+
+def _execute(query: Any, stats: dict[str, Any] | None) -> Any:
+    """Ejecuta una query de Supabase contando el round trip en `stats["supabase_round_trips"]`."""
+    if stats is not None:
+        stats["supabase_round_trips"] = stats.get("supabase_round_trips", 0) + 1
+    return query.execute()
+
+
+def _iter_recruiter_candidate_ids(
+    supabase: Any,
+    user_id: str,
+    client_id: str,
+    stats: dict[str, Any] | None = None,
+    page_size: int = POSTGREST_PAGE_SIZE,
+) -> Iterator[str]:
+    """candidate_id asignados al recruiter/cliente, paginados con `range` y sin duplicados."""
+    seen: set[str] = set()
+    offset = 0
+    while True:
+        response = _execute(
             supabase.table("candidate_recruiters")
             .select("candidate_id")
             .eq("user_id", user_id)
             .eq("client_id", client_id)
-            .execute()
+            .order("candidate_id")
+            .range(offset, offset + page_size - 1),
+            stats,
         )
-        candidate_ids = [row.get("candidate_id") for row in (recruiter_response.data or []) if row.get("candidate_id")]
-        if not candidate_ids:
-            return []
-        cand_resp = supabase.table("candidates").select("*").in_("id", candidate_ids).execute()
-        return list(cand_resp.data or [])
-    response = supabase.table("candidates").select("*").limit(1000).execute()
+        rows = response.data or []
+        for row in rows:
+            cid = row.get("candidate_id")
+            if cid and str(cid) not in seen:
+                seen.add(str(cid))
+                yield str(cid)
+        if len(rows) < page_size:
+            return
+        offset += page_size
+
+
+def _iter_candidates(
+    supabase: Any,
+    user_id: str | None,
+    client_id: str | None,
+    stats: dict[str, Any] | None = None,
+    page_size: int = CANDIDATES_PAGE_SIZE,
+    chunk_size: int = IN_FILTER_CHUNK_SIZE,
+    columns: str = MATCHING_CANDIDATE_COLUMNS,
+) -> Iterator[dict[str, Any]]:
+    """
+    Genera las filas de `candidates` a puntuar (sólo `columns`), página por página.
+
+    - Con `user_id` y `client_id`: IDs desde `candidate_recruiters`, luego `candidates` por lotes `in_`.
+    - Sin ambos: todos los candidatos, paginados por keyset sobre `id` (sin el tope de 1000 filas).
+    """
+    if user_id and client_id:
+        chunk: list[str] = []
+        for cid in _iter_recruiter_candidate_ids(supabase, user_id, client_id, stats):
+            chunk.append(cid)
+            if len(chunk) >= chunk_size:
+                yield from _fetch_candidates_by_ids(supabase, chunk, stats, columns)
+                chunk = []
+        if chunk:
+            yield from _fetch_candidates_by_ids(supabase, chunk, stats, columns)
+        return
+
+    last_id: Any = None
+    while True:
+        q = supabase.table("candidates").select(columns)
+        if last_id is not None:
+            q = q.gt("id", last_id)
+        rows = _execute(q.order("id").limit(page_size), stats).data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        last_id = rows[-1].get("id")
+
+
+def _fetch_candidates_by_ids(
+    supabase: Any,
+    candidate_ids: list[str],
+    stats: dict[str, Any] | None = None,
+    columns: str = MATCHING_CANDIDATE_COLUMNS,
+) -> list[dict[str, Any]]:
+    response = _execute(
+        supabase.table("candidates").select(columns).in_("id", candidate_ids).order("id"),
+        stats,
+    )
     return list(response.data or [])
 
 
-def _fetch_jd_interviews(supabase: Any, client_id: str | None) -> list[dict[str, Any]]:
+def _attach_observations(
+    supabase: Any,
+    matches: list[dict[str, Any]],
+    stats: dict[str, Any] | None = None,
+    chunk_size: int = IN_FILTER_CHUNK_SIZE,
+    fields: tuple[str, ...] = ("observations",),
+) -> None:
+    """Completa `fields` (por defecto `observations`) sólo para los candidatos que quedaron en `matches`."""
+    by_id = {str(m["candidate"].get("id")): m["candidate"] for m in matches if m["candidate"].get("id")}
+    ids = list(by_id)
+    for i in range(0, len(ids), chunk_size):
+        response = _execute(
+            supabase.table("candidates").select(", ".join(("id", *fields))).in_("id", ids[i : i + chunk_size]),
+            stats,
+        )
+        for row in response.data or []:
+            candidate = by_id.get(str(row.get("id")))
+            if candidate is not None:
+                for field_name in fields:
+                    candidate[field_name] = row.get(field_name)
+
+
+def _fetch_jd_interviews(
+    supabase: Any,
+    client_id: str | None,
+    stats: dict[str, Any] | None = None,
+) -> list[dict[str, Any]]:
     q = supabase.table("jd_interviews").select("*").eq("status", "active")
     if client_id:
         q = q.eq("client_id", client_id)
-    response = q.execute()
+    response = _execute(q, stats)
     return list(response.data or [])
 
 
-def _fetch_existing_meets_map(supabase: Any) -> dict[str, list[str]]:
-    jd_interviews_response = supabase.table("jd_interviews").select("id").eq("status", "active").execute()
-    result: dict[str, list[str]] = {}
-    for jd_row in jd_interviews_response.data or []:
-        jd_interview_id = jd_row.get("id")
-        if not jd_interview_id:
-            continue
-        meets_response = (
-            supabase.table("meets")
-            .select("candidate_id")
-            .eq("jd_interviews_id", jd_interview_id)
-            .execute()
-        )
-        ids: set[str] = set()
-        for meet in meets_response.data or []:
-            cid = meet.get("candidate_id")
-            if cid:
-                ids.add(str(cid))
-        result[str(jd_interview_id)] = list(ids)
-    return result
+def _fetch_existing_meets_map(
+    supabase: Any,
+    jd_ids: list[str],
+    stats: dict[str, Any] | None = None,
+    chunk_size: int = IN_FILTER_CHUNK_SIZE,
+    page_size: int = POSTGREST_PAGE_SIZE,
+) -> dict[str, frozenset[str]]:
+    """
+    jd_interview_id -> frozenset de candidate_id con meet existente.
+
+    Una query `in_("jd_interviews_id", ...)` por lote de JDs, paginada con `range` para no
+    truncar en el límite de filas de PostgREST (antes: una query por JD activa).
+    """
+    unique_ids = list(dict.fromkeys(str(jd_id) for jd_id in jd_ids if jd_id))
+    pairs: dict[str, set[str]] = {jd_id: set() for jd_id in unique_ids}
+
+    for i in range(0, len(unique_ids), chunk_size):
+        chunk = unique_ids[i : i + chunk_size]
+        offset = 0
+        while True:
+            meets_response = _execute(
+                supabase.table("meets")
+                .select("id, jd_interviews_id, candidate_id")
+                .in_("jd_interviews_id", chunk)
+                .order("id")
+                .range(offset, offset + page_size - 1),
+                stats,
+            )
+            rows = meets_response.data or []
+            for meet in rows:
+                jd_id = meet.get("jd_interviews_id")
+                cid = meet.get("candidate_id")
+                if jd_id and cid:
+                    pairs.setdefault(str(jd_id), set()).add(str(cid))
+            if len(rows) < page_size:
+                break
+            offset += page_size
+
+    return {jd_id: frozenset(ids) for jd_id, ids in pairs.items()}
 
 
 def _candidate_payload(row: dict[str, Any]) -> dict[str, Any]:
@@ -227,28 +364,49 @@ def _jd_payload(row: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def run_deterministic_matching(
-    user_id: str | None = None,
-    client_id: str | None = None,
-) -> list[dict[str, Any]]:
-    """
-    Devuelve la lista `matches` en el formato esperado por el backoffice / API:
-    [{ "candidate": {...}, "matching_interviews": [ { jd_interviews, compatibility_score, match_analysis, observations_match } ] }, ...]
-    """
-    url = os.getenv("SUPABASE_URL")
-    key = os.getenv("SUPABASE_KEY")
-    if not url or not key:
-        raise RuntimeError("SUPABASE_URL o SUPABASE_KEY no configurados")
+MATCHING_MODE_INDEXED = "indexed"
+MATCHING_MODE_NAIVE = "naive"
+_MATCHING_MODES = (MATCHING_MODE_INDEXED, MATCHING_MODE_NAIVE)
+
 
-    supabase = create_client(url, key)
-    candidates_rows = _fetch_candidates(supabase, user_id, client_id)
-    jd_rows = _fetch_jd_interviews(supabase, client_id)
-    existing = _fetch_existing_meets_map(supabase)
+def _resolve_matching_mode(mode: str | None) -> str:
+    """`mode` explícito > env `MATCHING_ENGINE_MODE` > índice invertido."""
+    resolved = (mode or os.getenv("MATCHING_ENGINE_MODE") or MATCHING_MODE_INDEXED).strip().lower()
+    if resolved not in _MATCHING_MODES:
+        raise ValueError(f"Modo de matching no soportado: {resolved} (usar uno de {', '.join(_MATCHING_MODES)})")
+    return resolved
 
-    # candidato_id -> lista de entradas matching_interviews
-    from collections import defaultdict
 
-    interviews_by_candidate: dict[str, list[dict[str, Any]]] = defaultdict(list)
+def _match_entry(jd_row: dict[str, Any], common: set[str], cand_tokens: set[str]) -> dict[str, Any] | None:
+    score = _score_from_overlap(common, cand_tokens)
+    if score <= 0:
+        return None
+
+    labels = ", ".join(sorted(common)) if common else "coincidencia por texto/JD"
+    analysis = f"Match determinístico: tecnologías alineadas ({labels}). "
+    return {
+        "jd_interviews": _jd_payload(jd_row),
+        "compatibility_score": score,
+        "match_analysis": analysis,
+        "observations_match": None,
+    }
+
+
+def _candidate_group(crow: dict[str, Any], items: list[dict[str, Any]]) -> dict[str, Any]:
+    items.sort(key=lambda x: -int(x.get("compatibility_score") or 0))
+    return {
+        "candidate": _candidate_payload(crow),
+        "matching_interviews": items,
+    }
+
+
+def _match_naive(
+    candidates_rows: Iterable[dict[str, Any]],
+    jd_rows: list[dict[str, Any]],
+    existing: dict[str, frozenset[str]],
+) -> list[dict[str, Any]]:
+    """Producto cartesiano candidatos × JDs (referencia; re-tokeniza cada JD por candidato)."""
+    matches: list[dict[str, Any]] = []
 
     for crow in candidates_rows:
         cid = str(crow.get("id") or "")
@@ -258,11 +416,12 @@ def run_deterministic_matching(
         if not cand_tokens:
             continue
 
+        items: list[dict[str, Any]] = []
         for jd_row in jd_rows:
             jd_id = str(jd_row.get("id") or "")
             if not jd_id:
                 continue
-            if cid in existing.get(jd_id, []):
+            if cid in existing.get(jd_id, ()):
                 continue
 
             jd_text = jd_row.get("job_description") or ""
@@ -270,36 +429,348 @@ def run_deterministic_matching(
             common = cand_tokens & jd_req
             common = _substring_fallback(common, cand_tokens, jd_text)
 
-            score = _score_from_overlap(common, cand_tokens)
-            if score <= 0:
+            entry = _match_entry(jd_row, common, cand_tokens)
+            if entry is not None:
+                items.append(entry)
+
+        if items:
+            matches.append(_candidate_group(crow, items))
+
+    return matches
+
+
+class _JdIndex:
+    """
+    Índice invertido sobre las JDs activas: cada JD se tokeniza una sola vez y se arma
+    token canónico -> posiciones de JD. Las búsquedas por substring (fallback) se memoizan
+    por token, ya que el vocabulario de tech_stack de candidatos se repite mucho.
+    """
+
+    def __init__(self, jd_rows: list[dict[str, Any]], positions: set[int] | None = None):
+        """`positions`: si se indica, sólo se indexan esas posiciones de `jd_rows` (resto ignorado)."""
+        self.rows = jd_rows
+        self.ids: list[str] = []
+        self.blobs: list[str] = []
+        self.postings: dict[str, list[int]] = defaultdict(list)
+        self._substring_hits: dict[str, tuple[int, ...]] = {}
+
+        for pos, jd_row in enumerate(jd_rows):
+            jd_id = str(jd_row.get("id") or "")
+            if positions is not None and pos not in positions:
+                jd_id = ""
+            jd_text = jd_row.get("job_description") or ""
+            self.ids.append(jd_id)
+            self.blobs.append(jd_text.lower() if jd_id else "")
+            if not jd_id:
+                continue
+            for token in _jd_requirement_tokens(jd_row.get("tech_stack"), jd_text):
+                self.postings[token].append(pos)
+
+    def substring_hits(self, token: str) -> tuple[int, ...]:
+        """Posiciones de JDs cuyo texto contiene `token` (mismo criterio que `_substring_fallback`)."""
+        hits = self._substring_hits.get(token)
+        if hits is None:
+            hits = tuple(pos for pos, blob in enumerate(self.blobs) if blob and token in blob)
+            self._substring_hits[token] = hits
+        return hits
+
+    def candidate_commons(self, cand_tokens: set[str]) -> dict[int, set[str]]:
+        """
+        Posición de JD -> tokens comunes con el candidato (intersección, o fallback por substring
+        si no la hay). Sólo incluye JDs con al menos un token, es decir, con score > 0.
+        """
+        # equivale a cand_tokens & jd_req por cada JD
+        common_by_pos: dict[int, set[str]] = {}
+        for token in cand_tokens:
+            for pos in self.postings.get(token, ()):
+                common_by_pos.setdefault(pos, set()).add(token)
+
+        # JDs sin intersección: tokens del candidato (>= 3 chars) presentes en el texto
+        token_hits = set(common_by_pos)
+        for token in cand_tokens:
+            if len(token) < 3:
                 continue
+            for pos in self.substring_hits(token):
+                if pos not in token_hits:
+                    common_by_pos.setdefault(pos, set()).add(token)
 
-            labels = ", ".join(sorted(common)) if common else "coincidencia por texto/JD"
-            analysis = (
-                f"Match determinístico: tecnologías alineadas ({labels}). "
-            )
+        return common_by_pos
+
+
+def _match_indexed(
+    candidates_rows: Iterable[dict[str, Any]],
+    jd_rows: list[dict[str, Any]],
+    existing: dict[str, frozenset[str]],
+) -> list[dict[str, Any]]:
+    """
+    Igual resultado que `_match_naive`, pero sólo puntúa pares (candidato, JD) que comparten
+    algún token canónico, más una pasada barata de substring para las JDs sin intersección.
+    """
+    index = _JdIndex(jd_rows)
+    matches: list[dict[str, Any]] = []
 
-            interviews_by_candidate[cid].append(
+    for crow in candidates_rows:
+        cid = str(crow.get("id") or "")
+        if not cid:
+            continue
+        cand_tokens = _candidate_canonicals(crow.get("tech_stack"))
+        if not cand_tokens:
+            continue
+
+        items = _entries_for(cid, jd_rows, index.candidate_commons(cand_tokens), cand_tokens, existing)
+        if items:
+            matches.append(_candidate_group(crow, items))
+
+    return matches
+
+
+def _entries_for(
+    cid: str,
+    jd_rows: list[dict[str, Any]],
+    common_by_pos: dict[int, set[str]],
+    cand_tokens: set[str],
+    existing: dict[str, frozenset[str]],
+) -> list[dict[str, Any]]:
+    items: list[dict[str, Any]] = []
+    # Mantener el orden de jd_rows para que el sort estable por score coincida
+    for pos in sorted(common_by_pos):
+        jd_row = jd_rows[pos]
+        if cid in existing.get(str(jd_row.get("id") or ""), ()):
+            continue
+        entry = _match_entry(jd_row, common_by_pos[pos], cand_tokens)
+        if entry is not None:
+            items.append(entry)
+    return items
+
+
+# ====== Matching incremental (snapshot persistido) ======
+
+MATCHING_SNAPSHOT_TABLE = "matching_snapshots"
+# Incrementar si cambia la lógica de tokens/score: invalida todos los snapshots guardados
+MATCHING_SNAPSHOT_VERSION = 1
+
+_ENABLED_VALUES = {"1", "true", "yes", "on"}
+
+
+def is_matching_snapshot_enabled() -> bool:
+    """Return whether incremental matching should read/write `matching_snapshots`."""
+    return os.getenv("MATCHING_SNAPSHOT_ENABLED", "").strip().lower() in _ENABLED_VALUES
+
+
+def _content_hash(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _candidate_fingerprint(row: dict[str, Any]) -> str:
+    return _content_hash(row.get("updated_at"), row.get("tech_stack"))
+
+
+def _jd_fingerprint(row: dict[str, Any]) -> str:
+    return _content_hash(row.get("updated_at"), row.get("tech_stack"), row.get("job_description"))
+
+
+def _snapshot_scope_key(user_id: str | None, client_id: str | None) -> str:
+    # Mismos filtros efectivos que _iter_candidates / _fetch_jd_interviews
+    recruiter = user_id if (user_id and client_id) else ""
+    return f"user={recruiter}|client={client_id or ''}"
+
+
+def _load_snapshot(supabase: Any, scope_key: str, stats: dict[str, Any] | None = None) -> dict[str, Any] | None:
+    try:
+        response = _execute(
+            supabase.table(MATCHING_SNAPSHOT_TABLE).select("snapshot").eq("scope_key", scope_key).limit(1),
+            stats,
+        )
+    except Exception as e:
+        evaluation_logger.log_error("Matching Engine", f"No se pudo leer snapshot de matching: {e}")
+        return None
+    rows = response.data or []
+    snapshot = rows[0].get("snapshot") if rows else None
+    if not isinstance(snapshot, dict) or snapshot.get("version") != MATCHING_SNAPSHOT_VERSION:
+        return None
+    return snapshot
+
+
+def _save_snapshot(
+    supabase: Any,
+    scope_key: str,
+    snapshot: dict[str, Any],
+    stats: dict[str, Any] | None = None,
+) -> bool:
+    try:
+        _execute(
+            supabase.table(MATCHING_SNAPSHOT_TABLE).upsert(
                 {
-                    "jd_interviews": _jd_payload(jd_row),
-                    "compatibility_score": score,
-                    "match_analysis": analysis,
-                    "observations_match": None,
-                }
-            )
+                    "scope_key": scope_key,
+                    "snapshot": snapshot,
+                    "updated_at": datetime.now().isoformat(),
+                },
+                on_conflict="scope_key",
+            ),
+            stats,
+        )
+        return True
+    except Exception as e:
+        evaluation_logger.log_error("Matching Engine", f"No se pudo guardar snapshot de matching: {e}")
+        return False
+
+
+def _match_incremental(
+    candidates_rows: Iterable[dict[str, Any]],
+    jd_rows: list[dict[str, Any]],
+    existing: dict[str, frozenset[str]],
+    snapshot: dict[str, Any] | None,
+    stats: dict[str, Any],
+) -> tuple[list[dict[str, Any]], dict[str, Any]]:
+    """
+    Igual salida que `_match_indexed`, reutilizando los pares (candidato, JD) del snapshot previo.
 
+    Sólo se re-puntúan los candidatos cuyo fingerprint (updated_at + hash de tech_stack) cambió,
+    contra todas las JDs, y los candidatos sin cambios contra las JDs cuyo fingerprint
+    (updated_at + hash de tech_stack/job_description) cambió. Los meets existentes se aplican
+    siempre sobre datos frescos. Devuelve también el snapshot nuevo para persistir.
+    """
+    prev_jds: dict[str, str] = (snapshot or {}).get("jd_interviews") or {}
+    prev_candidates: dict[str, Any] = (snapshot or {}).get("candidates") or {}
+
+    jd_fingerprints: dict[str, str] = {}
+    clean_pos_by_id: dict[str, int] = {}
+    dirty_positions: set[int] = set()
+    for pos, jd_row in enumerate(jd_rows):
+        jd_id = str(jd_row.get("id") or "")
+        if not jd_id:
+            continue
+        fp = _jd_fingerprint(jd_row)
+        jd_fingerprints[jd_id] = fp
+        if prev_jds.get(jd_id) == fp:
+            clean_pos_by_id[jd_id] = pos
+        else:
+            dirty_positions.add(pos)
+
+    dirty_index = _JdIndex(jd_rows, positions=dirty_positions)
+    full_index: _JdIndex | None = None
     matches: list[dict[str, Any]] = []
+    new_candidates: dict[str, Any] = {}
+    dirty_candidates = 0
+
     for crow in candidates_rows:
         cid = str(crow.get("id") or "")
-        if cid not in interviews_by_candidate:
+        if not cid:
+            continue
+        fp = _candidate_fingerprint(crow)
+        cand_tokens = _candidate_canonicals(crow.get("tech_stack"))
+        if not cand_tokens:
+            new_candidates[cid] = {"fp": fp, "pairs": {}}
             continue
-        items = interviews_by_candidate[cid]
-        items.sort(key=lambda x: -int(x.get("compatibility_score") or 0))
-        matches.append(
-            {
-                "candidate": _candidate_payload(crow),
-                "matching_interviews": items,
+
+        prev = prev_candidates.get(cid)
+        if isinstance(prev, dict) and prev.get("fp") == fp:
+            common_by_pos = {
+                clean_pos_by_id[jd_id]: set(tokens)
+                for jd_id, tokens in (prev.get("pairs") or {}).items()
+                if jd_id in clean_pos_by_id
             }
-        )
+            if dirty_positions:
+                common_by_pos.update(dirty_index.candidate_commons(cand_tokens))
+        else:
+            dirty_candidates += 1
+            if full_index is None:
+                full_index = _JdIndex(jd_rows)
+            common_by_pos = full_index.candidate_commons(cand_tokens)
+
+        new_candidates[cid] = {
+            "fp": fp,
+            "pairs": {str(jd_rows[pos].get("id")): sorted(common) for pos, common in common_by_pos.items()},
+        }
+        items = _entries_for(cid, jd_rows, common_by_pos, cand_tokens, existing)
+        if items:
+            matches.append(_candidate_group(crow, items))
+
+    stats["dirty_candidates"] = dirty_candidates
+    stats["dirty_jd_interviews"] = len(dirty_positions)
+    new_snapshot = {
+        "version": MATCHING_SNAPSHOT_VERSION,
+        "jd_interviews": jd_fingerprints,
+        "candidates": new_candidates,
+    }
+    return matches, new_snapshot
+
 
+def run_deterministic_matching(
+    user_id: str | None = None,
+    client_id: str | None = None,
+    mode: str | None = None,
+    stats: dict[str, Any] | None = None,
+    full_rebuild: bool = False,
+) -> list[dict[str, Any]]:
+    """
+    Devuelve la lista `matches` en el formato esperado por el backoffice / API:
+    [{ "candidate": {...}, "matching_interviews": [ { jd_interviews, compatibility_score, match_analysis, observations_match } ] }, ...]
+
+    `mode`: "indexed" (default, índice invertido token -> JD) o "naive" (producto cartesiano).
+    Ambos producen exactamente la misma salida; también configurable con `MATCHING_ENGINE_MODE`.
+
+    `stats`: dict opcional que se completa con contadores de la corrida (p. ej. `supabase_round_trips`).
+
+    Con `MATCHING_SNAPSHOT_ENABLED` (modo "indexed") se reutiliza el snapshot de la corrida anterior
+    del mismo alcance (user_id/client_id) y sólo se re-puntúan filas modificadas. La pasada sobre
+    los candidatos trae sólo `MATCHING_FINGERPRINT_COLUMNS`, los datos de contacto se leen sólo
+    para los candidatos con match y el snapshot sólo se guarda si cambió.
+    `full_rebuild=True` ignora el snapshot guardado y lo reconstruye desde cero.
+    """
+    matching_mode = _resolve_matching_mode(mode)
+
+    url = os.getenv("SUPABASE_URL")
+    key = os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        raise RuntimeError("SUPABASE_URL o SUPABASE_KEY no configurados")
+
+    if stats is None:
+        stats = {}
+    stats["supabase_round_trips"] = 0
+
+    supabase = get_client(url, key)
+    jd_rows = _fetch_jd_interviews(supabase, client_id, stats)
+    # Sólo importan los meets de las JDs que se van a puntuar
+    existing = _fetch_existing_meets_map(supabase, [row.get("id") for row in jd_rows], stats)
+    # Los candidatos se consumen en streaming, página por página
+    stats["candidates"] = 0
+    use_snapshot = matching_mode == MATCHING_MODE_INDEXED and is_matching_snapshot_enabled()
+    columns = MATCHING_FINGERPRINT_COLUMNS if use_snapshot else MATCHING_CANDIDATE_COLUMNS
+    candidates_rows = _count_rows(
+        _iter_candidates(supabase, user_id, client_id, stats, columns=columns), stats, "candidates"
+    )
+    payload_fields: tuple[str, ...] = ("observations",)
+
+    if matching_mode == MATCHING_MODE_NAIVE:
+        stats["snapshot"] = "disabled"
+        matches = _match_naive(candidates_rows, jd_rows, existing)
+    elif use_snapshot:
+        payload_fields = MATCHING_PAYLOAD_FIELDS
+        scope_key = _snapshot_scope_key(user_id, client_id)
+        snapshot = None if full_rebuild else _load_snapshot(supabase, scope_key, stats)
+        if full_rebuild:
+            stats["snapshot"] = "rebuild"
+        else:
+            stats["snapshot"] = "hit" if snapshot is not None else "miss"
+        matches, new_snapshot = _match_incremental(candidates_rows, jd_rows, existing, snapshot, stats)
+        # Corrida sin cambios: no se reescribe el JSONB (puede pesar varios MB)
+        stats["snapshot_saved"] = False
+        if new_snapshot != snapshot:
+            stats["snapshot_saved"] = _save_snapshot(supabase, scope_key, new_snapshot, stats)
+    else:
+        stats["snapshot"] = "disabled"
+        matches = _match_indexed(candidates_rows, jd_rows, existing)
+
+    _attach_observations(supabase, matches, stats, fields=payload_fields)
+
+    stats["mode"] = matching_mode
+    stats["jd_interviews"] = len(jd_rows)
     return matches
+
+
+def _count_rows(rows: Iterable[dict[str, Any]], stats: dict[str, Any], key: str) -> Iterator[dict[str, Any]]:
+    for row in rows:
+        stats[key] += 1
+        yield row
@@ -2,12 +2,15 @@
 """Railway entrypoint for API and cron services.
 
 The default mode starts the FastAPI web server. A second Railway service can set
-RAILWAY_RUN_MODE=worker-cron to process queued evaluation jobs and exit.
+RAILWAY_RUN_MODE=worker-cron to process queued evaluation jobs and exit, or
+RAILWAY_RUN_MODE=worker to keep a resident process claiming jobs in a loop.
 """
 
 import asyncio
 import json
 import os
+import signal
+import socket
 import sys
 
 
@@ -23,25 +26,76 @@ async def run_worker_cron() -> None:
     from api import EvaluationJobsProcessRequest, process_evaluation_jobs
 
     limit = int(os.getenv("EVALUATION_JOBS_CRON_LIMIT", "3"))
+    concurrency = int(os.getenv("EVALUATION_JOBS_CONCURRENCY", str(limit)))
     worker_id = os.getenv("EVALUATION_JOBS_WORKER_ID", "railway-cron")
     result = await process_evaluation_jobs(
         EvaluationJobsProcessRequest(
             limit=limit,
             worker_id=worker_id,
             source="railway-cron",
+            concurrency=concurrency,
         )
     )
     print(json.dumps(result, ensure_ascii=False, default=str))
 
 
+async def run_worker() -> None:
+    from api import EvaluationJobsProcessRequest, process_evaluation_jobs
+    from utils.evaluation_worker import EvaluationJobsWorker, start_notify_listener
+
+    limit = int(os.getenv("EVALUATION_JOBS_WORKER_LIMIT", "3"))
+    concurrency = int(os.getenv("EVALUATION_JOBS_CONCURRENCY", str(limit)))
+    worker_id = os.getenv("EVALUATION_JOBS_WORKER_ID") or f"railway-worker-{socket.gethostname()}"
+
+    async def process_batch() -> dict:
+        result = await process_evaluation_jobs(
+            EvaluationJobsProcessRequest(
+                limit=limit,
+                worker_id=worker_id,
+                source="railway-worker",
+                concurrency=concurrency,
+            )
+        )
+        if result.get("claimed"):
+            print(json.dumps(result, ensure_ascii=False, default=str), flush=True)
+        return result
+
+    worker = EvaluationJobsWorker(
+        process_batch,
+        min_idle_seconds=float(os.getenv("EVALUATION_JOBS_POLL_MIN_SECONDS", "2")),
+        max_idle_seconds=float(os.getenv("EVALUATION_JOBS_POLL_MAX_SECONDS", "60")),
+    )
+
+    # SIGTERM/SIGINT: no reclamar más jobs y terminar cuando el batch en curso se marque.
+    # SIGUSR1: despertar el loop sin esperar el backoff (stand-in local de NOTIFY).
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, worker.request_stop)
+    loop.add_signal_handler(signal.SIGINT, worker.request_stop)
+    loop.add_signal_handler(signal.SIGUSR1, worker.wake)
+
+    # Canal fijo `evaluation_jobs`: es el que usa el trigger de database/setup-evaluation-jobs-notify.sql
+    listener = start_notify_listener(os.getenv("EVALUATION_JOBS_NOTIFY_DSN"), worker.wake_threadsafe)
+    print(f"Evaluation worker {worker_id} started (limit={limit}, concurrency={concurrency})", flush=True)
+    try:
+        stats = await worker.run()
+    finally:
+        if listener is not None:
+            listener.stop()
+    print(json.dumps({"status": "stopped", "worker_id": worker_id, **stats}), flush=True)
+
+
 def main() -> None:
     mode = os.getenv("RAILWAY_RUN_MODE", "api").strip().lower()
     if mode == "worker-cron":
         asyncio.run(run_worker_cron())
         return
 
+    if mode == "worker":
+        asyncio.run(run_worker())
+        return
+
     if mode != "api":
-        print(f"Unknown RAILWAY_RUN_MODE={mode!r}. Expected 'api' or 'worker-cron'.", file=sys.stderr)
+        print(f"Unknown RAILWAY_RUN_MODE={mode!r}. Expected 'api', 'worker' or 'worker-cron'.", file=sys.stderr)
         sys.exit(1)
 
     run_api()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark de extracción de JSON en salidas de crews (utils/json_extract.py)
+Ejecutar: python scripts/benchmark_json_extract.py [--repeat 50]
+
+Genera salidas sintéticas de 20–50 KB parecidas a las reales (texto del agente, un bloque
+```json con la evaluación y objetos anidados) y compara:
+- legacy_read_cv: `raw_decode(text[pos:])` en cada `{` (lo que hacía POST /read-cv)
+- legacy_evaluate_meet: regex greedy ```json / `\\{.*\\}` + json.loads (POST /evaluate-meet)
+- find_json_objects / extract_json_object: un solo recorrido
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+# Agregar el directorio raíz al path
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+
+from utils.json_extract import extract_json_object, find_json_objects
+
+
+def _evaluation_payload(n_questions: int) -> dict:
+    return {
+        "meet_id": "550e8400-e29b-41d4-a716-446655440000",
+        "candidate": {"id": "c1", "name": "Candidata", "tech_stack": ["Python", "AWS", "React"]},
+        "jd_interview": {"id": "jd1", "interview_name": "Backend Sr"},
+        "conversation_analysis": {
+            "soft_skills": {k: "Análisis detallado " * 20 for k in ("communication", "leadership", "teamwork")},
+            "technical_assessment": {
+                "technical_questions": [
+                    {"question": f"Pregunta {i} {{detalle}}", "answer": "Respuesta " * 30, "answered": True}
+                    for i in range(n_questions)
+                ],
+                "alerts": [],
+            },
+        },
+        "match_evaluation": {"is_potential_match": True, "compatibility_score": 82, "justification": "Ok " * 50},
+    }
+
+
+def build_output(target_kb: int) -> str:
+    n_questions = 1
+    while True:
+        payload = _evaluation_payload(n_questions)
+        body = json.dumps(payload, ensure_ascii=False, indent=2)
+        if len(body) >= target_kb * 1024:
+            break
+        n_questions += 5
+    prelude = 'Thought: revisé la conversación {"tool": "get_meet_evaluation_data", "ok": true}\n' * 3
+    return f"{prelude}Final Answer:\n```json\n{body}\n```\n"
+
+
+def legacy_read_cv(text: str) -> list:
+    decoder = json.JSONDecoder()
+    parsed = []
+    for match in re.finditer(r"\{", text):
+        try:
+            obj, _end = decoder.raw_decode(text[match.start() :])
+            parsed.append(obj)
+        except Exception:
+            continue
+    return parsed
+
+
+def legacy_evaluate_meet(text: str) -> dict:
+    try:
+        json_match = re.search(r"```json\s*(\{.*\})\s*```", text, re.DOTALL)
+        return json.loads(json_match.group(1)) if json_match else json.loads(text)
+    except (json.JSONDecodeError, AttributeError):
+        json_match = re.search(r"\{.*\}", text, re.DOTALL)
+        return json.loads(json_match.group(0)) if json_match else {}
+
+
+def _timeit(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'tamaño':>8} {'legacy_read_cv':>16} {'find_json_objects':>18} {'legacy_eval':>12} {'extract':>10}  (ms)")
+    for kb in (20, 35, 50):
+        text = build_output(kb)
+        assert extract_json_object(text) == legacy_evaluate_meet(text)
+        row = [
+            _timeit(legacy_read_cv, text, args.repeat),
+            _timeit(find_json_objects, text, args.repeat),
+            _timeit(legacy_evaluate_meet, text, args.repeat),
+            _timeit(extract_json_object, text, args.repeat),
+        ]
+        print(f"{len(text) / 1024:>6.1f}KB {row[0]:>16.2f} {row[1]:>18.2f} {row[2]:>12.2f} {row[3]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
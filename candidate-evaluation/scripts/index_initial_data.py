@@ -2,10 +2,14 @@
 """
 Script para indexar datos iniciales en la knowledge base
 Ejecutar: python scripts/index_initial_data.py
+
+Los embeddings se generan en lote (ver EMBEDDING_BATCH_MAX_ITEMS, EMBEDDING_BATCH_MAX_TOKENS
+y EMBEDDING_MAX_CONCURRENCY en tools/vector_tools.py).
 """
 
 import os
 import sys
+import time
 
 from dotenv import load_dotenv
 
@@ -35,31 +39,39 @@ def index_initial_data():
         _ = get_supabase_client()
         print("✅ Conexión a Supabase establecida")
 
+        started_at = time.monotonic()
+        cache_stats = {
+            name: {} for name in ("candidates", "jd_interviews", "meets", "meet_evaluations", "candidate_jd_status")
+        }
+
         # Indexar candidatos
         print("\n📋 Indexando candidatos...")
-        candidates_count = index_all_candidates()
+        candidates_count = index_all_candidates(stats=cache_stats["candidates"])
         print(f"✅ {candidates_count} candidatos indexados")
 
         # Indexar JD Interviews
         print("\n📋 Indexando JD Interviews...")
-        jd_count = index_all_jd_interviews()
+        jd_count = index_all_jd_interviews(stats=cache_stats["jd_interviews"])
         print(f"✅ {jd_count} JD Interviews indexadas")
 
         # Indexar meets
         print("\n📋 Indexando meets...")
-        meets_count = index_all_meets()
+        meets_count = index_all_meets(stats=cache_stats["meets"])
         print(f"✅ {meets_count} meets indexados")
 
         # Indexar evaluaciones de meets
         print("\n📋 Indexando evaluaciones de meets...")
-        meet_evals_count = index_all_meet_evaluations()
+        meet_evals_count = index_all_meet_evaluations(stats=cache_stats["meet_evaluations"])
         print(f"✅ {meet_evals_count} meet_evaluations indexadas")
 
         # Indexar candidate_jd_status
         print("\n📋 Indexando candidate_jd_status...")
-        candidate_jd_count = index_all_candidate_jd_status()
+        candidate_jd_count = index_all_candidate_jd_status(stats=cache_stats["candidate_jd_status"])
         print(f"✅ {candidate_jd_count} candidate_jd_status indexados")
 
+        elapsed = time.monotonic() - started_at
+        total = candidates_count + jd_count + meets_count + meet_evals_count + candidate_jd_count
+
         # Resumen
         print("\n" + "=" * 60)
         print("RESUMEN")
@@ -69,9 +81,13 @@ def index_initial_data():
         print(f"✅ Meets indexados: {meets_count}")
         print(f"✅ Evaluaciones de meets indexadas: {meet_evals_count}")
         print(f"✅ Candidate JD Status indexados: {candidate_jd_count}")
-        print(
-            f"✅ Total de chunks creados: {candidates_count + jd_count + meets_count + meet_evals_count + candidate_jd_count}"
-        )
+        print(f"✅ Total de chunks creados: {total}")
+        print(f"⏱️  Tiempo total: {elapsed:.1f}s ({total / elapsed if elapsed else 0:.1f} chunks/s)")
+        unchanged = sum(st.get("unchanged", 0) for st in cache_stats.values())
+        hits = sum(st.get("embedding_cache_hits", 0) for st in cache_stats.values())
+        misses = sum(st.get("embedding_cache_misses", 0) for st in cache_stats.values())
+        print(f"♻️  Chunks sin cambios (omitidos): {unchanged}")
+        print(f"♻️  Cache de embeddings: {hits} hits / {misses} misses")
         print("\n🎉 Indexación inicial completada exitosamente!")
 
         return {
@@ -80,7 +96,9 @@ def index_initial_data():
             "meets": meets_count,
             "meet_evaluations": meet_evals_count,
             "candidate_jd_status": candidate_jd_count,
-            "total": candidates_count + jd_count + meets_count + meet_evals_count + candidate_jd_count,
+            "total": total,
+            "elapsed_seconds": round(elapsed, 2),
+            "cache": cache_stats,
         }
 
     except Exception as e:
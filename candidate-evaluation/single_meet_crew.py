@@ -3,63 +3,122 @@
 Crew para evaluar un solo meet
 """
 
+import os
+
 from crewai import Crew, Process
 
 from agents import (
     create_single_meet_evaluator_agent,  # , create_meeting_minutes_agent  # COMENTADO: meeting_minutes_knowledge
 )
+from agents import llm as evaluator_llm
 from tasks import (
     create_single_meet_evaluation_task,
     # create_single_meeting_minutes_task,  # COMENTADO: meeting_minutes_knowledge
     create_single_meet_extraction_task,
 )
-from tools.supabase_tools import get_meet_evaluation_data
+from tools.conversation_compactor import compact_meet_context, compaction_enabled, default_token_budget
+from tools.supabase_tools import load_meet_evaluation_context
+from utils.logger import evaluation_logger
+
+
+def _load_meet_context(meet_id: str) -> dict | None:
+    """Carga el contexto del meet con load_meet_evaluation_context; None si la carga falla."""
+    try:
+        return load_meet_evaluation_context(meet_id)
+    except Exception as e:
+        evaluation_logger.log_error("Single Meet Crew", f"No se pudo cargar el contexto del meet {meet_id}: {e}")
+        return None
+
+
+def _compact_for_llm(meet_id: str, meet_context: dict | None) -> dict | None:
+    """Compacta conversation_data de la copia que va al LLM y loguea tokens antes/después."""
+    try:
+        compacted, report = compact_meet_context(meet_context)
+    except Exception as e:
+        evaluation_logger.log_error("Compactación de conversación", f"Meet {meet_id}: {e}")
+        return meet_context
+    if report:
+        evaluation_logger.log_task_progress(
+            "Compactación de conversación",
+            f"Meet {meet_id}: {report['tokens_before']:,} -> {report['tokens_after']:,} tokens | "
+            f"turnos {report['turns_before']} -> {report['turns_after']} "
+            f"(descartados {report['dropped_turns']}, unidos {report['merged_turns']}, "
+            f"omitidos {report['truncated_turns']})",
+        )
+    return compacted
+
+
+EXTRACTION_MODE_LLM = "llm"
+EXTRACTION_MODE_DIRECT = "direct"
+EXTRACTION_MODES = (EXTRACTION_MODE_LLM, EXTRACTION_MODE_DIRECT)
+
 
+# Incrementar al cambiar los prompts del flujo de un meet (tasks.py / agents.py): invalida la caché de evaluaciones
+SINGLE_MEET_PROMPT_VERSION = 1
 
-def create_single_meet_evaluation_crew(meet_id: str):
+
+def evaluation_cache_version(extraction_mode: str) -> str:
+    """Componente de versión de la clave de utils.evaluation_cache: prompt, modelo y ajustes del crew."""
+    model = getattr(evaluator_llm, "model_name", None) or getattr(evaluator_llm, "model", "")
+    compaction = f"{default_token_budget()}" if compaction_enabled() else "off"
+    return f"prompt=v{SINGLE_MEET_PROMPT_VERSION}|model={model}|mode={extraction_mode}|compaction={compaction}"
+
+
+def resolve_extraction_mode(extraction_mode: str | None = None, meet_context: dict | None = None) -> str:
+    """
+    Modo efectivo de extracción del crew.
+
+    - "llm": tarea de extracción (una vuelta extra al LLM que devuelve el JSON del meet).
+    - "direct": el contexto cargado se inyecta directo en la tarea de evaluación.
+
+    Sin modo explícito se usa SINGLE_MEET_EXTRACTION_MODE (default "llm"). "direct" cae a
+    "llm" si no hay contexto válido, para que el agente lo obtenga con el tool.
+    """
+    mode = (extraction_mode or os.getenv("SINGLE_MEET_EXTRACTION_MODE") or EXTRACTION_MODE_LLM).strip().lower()
+    if mode not in EXTRACTION_MODES:
+        mode = EXTRACTION_MODE_LLM
+    if mode == EXTRACTION_MODE_DIRECT and (not isinstance(meet_context, dict) or meet_context.get("error")):
+        return EXTRACTION_MODE_LLM
+    return mode
+
+
+def create_single_meet_evaluation_crew(
+    meet_id: str, meet_context: dict | None = None, extraction_mode: str | None = None
+):
     """
     Crea el crew para evaluar un solo meet
 
     Args:
         meet_id: ID del meet a evaluar
+        meet_context: datos ya cargados con load_meet_evaluation_context; si no se pasan,
+            se cargan aquí una vez.
+        extraction_mode: "llm" (extracción + evaluación) o "direct" (sólo evaluación con los
+            datos inyectados); ver resolve_extraction_mode.
     """
-    try:
-        # Intentar diferentes formas de acceder a la función original del Tool
-        func_to_call = None
-        if hasattr(get_meet_evaluation_data, "__wrapped__"):
-            func_to_call = get_meet_evaluation_data.__wrapped__
-        elif hasattr(get_meet_evaluation_data, "func"):
-            func_to_call = get_meet_evaluation_data.func
-        elif hasattr(get_meet_evaluation_data, "_func"):
-            func_to_call = get_meet_evaluation_data._func
-        elif callable(get_meet_evaluation_data) and not hasattr(get_meet_evaluation_data, "name"):
-            # Si es directamente callable y no tiene atributos de Tool
-            func_to_call = get_meet_evaluation_data
-
-        if func_to_call:
-            _ = func_to_call(meet_id)
-        else:
-            print("No se pudo acceder a la función subyacente del Tool")
-    except Exception as e:
-        print(f"Error al probar get_meet_evaluation_data: {str(e)}")
-        import traceback
-
-        print(traceback.format_exc())
+    if meet_context is None:
+        meet_context = _load_meet_context(meet_id)
+    mode = resolve_extraction_mode(extraction_mode, meet_context)
+    if compaction_enabled():
+        meet_context = _compact_for_llm(meet_id, meet_context)
 
     # Crear agentes
     evaluator = create_single_meet_evaluator_agent()
     # minutes_agent = create_meeting_minutes_agent()  # COMENTADO: meeting_minutes_knowledge
 
     # Crear tareas
-    extraction_task = create_single_meet_extraction_task(evaluator, meet_id)
-    evaluation_task = create_single_meet_evaluation_task(evaluator, extraction_task)
+    if mode == EXTRACTION_MODE_DIRECT:
+        tasks = [create_single_meet_evaluation_task(evaluator, meet_data=meet_context)]
+    else:
+        extraction_task = create_single_meet_extraction_task(evaluator, meet_id, meet_data=meet_context)
+        evaluation_task = create_single_meet_evaluation_task(evaluator, extraction_task)
+        tasks = [extraction_task, evaluation_task]
     # minutes_task = create_single_meeting_minutes_task(minutes_agent, extraction_task, evaluation_task)  # COMENTADO: meeting_minutes_knowledge
 
-    # Crear crew: primero extrae, luego evalúa
+    # Crear crew: primero extrae (modo "llm"), luego evalúa
     # COMENTADO: meeting_minutes_knowledge - ya no se genera/guarda la minuta
     crew = Crew(
         agents=[evaluator],  # , minutes_agent],  # COMENTADO: meeting_minutes_knowledge
-        tasks=[extraction_task, evaluation_task],  # , minutes_task],  # COMENTADO: meeting_minutes_knowledge
+        tasks=tasks,  # , minutes_task],  # COMENTADO: meeting_minutes_knowledge
         process=Process.sequential,
         verbose=True,
     )
@@ -1,3 +1,5 @@
+import json
+
 from crewai import Task
 
 
@@ -896,8 +898,34 @@ def create_matching_task(agent, user_id: str = None, client_id: str = None):
     )
 
 
-def create_single_meet_extraction_task(agent, meet_id: str):
-    """Tarea de extracción de datos de un meet específico"""
+def create_single_meet_extraction_task(agent, meet_id: str, meet_data: dict | None = None):
+    """
+    Tarea de extracción de datos de un meet específico.
+
+    Si `meet_data` viene pre-cargado (load_meet_evaluation_context), se entrega en la
+    descripción y el agente no vuelve a llamar a get_meet_evaluation_data.
+    """
+    if meet_data and not meet_data.get("error"):
+        meet_data_json = json.dumps(meet_data, indent=2, ensure_ascii=False, default=str)
+        return Task(
+            description=f"""
+        ⏱️ Antes de comenzar, imprime: START SINGLE_MEET_EXTRACTION [YYYY-MM-DD HH:MM:SS]. Al finalizar, imprime: END SINGLE_MEET_EXTRACTION [YYYY-MM-DD HH:MM:SS].
+
+        Los datos del meet con ID: {meet_id} YA fueron obtenidos de la base de datos
+        (meet, conversación con emotion_analysis, candidato, JD interview y cliente):
+
+        ```json
+        {meet_data_json}
+        ```
+
+        **IMPORTANTE:** NO llames a get_meet_evaluation_data; esos datos son la fuente completa.
+        Devuelve exactamente ese JSON, sin modificar ni inventar valores.
+        """,
+            expected_output="JSON completo con meet, conversation, candidate, jd_interview y client",
+            max_iter=1,
+            agent=agent,
+        )
+
     return Task(
         description=f"""
         ⏱️ Antes de comenzar, imprime: START SINGLE_MEET_EXTRACTION [YYYY-MM-DD HH:MM:SS]. Al finalizar, imprime: END SINGLE_MEET_EXTRACTION [YYYY-MM-DD HH:MM:SS].
@@ -1120,10 +1148,15 @@ def create_elevenlabs_prompt_generation_task(agent, interview_name: str, job_des
     )
 
 
-def create_single_meet_evaluation_task(agent, extraction_task):
-    """Tarea de evaluación completa de un solo meet"""
-    return Task(
-        description="""
+def create_single_meet_evaluation_task(agent, extraction_task=None, meet_data: dict | None = None):
+    """
+    Tarea de evaluación completa de un solo meet.
+
+    Con `extraction_task` los datos llegan como contexto de esa tarea (modo "llm"). Con
+    `meet_data` (modo "direct") el JSON de load_meet_evaluation_context se incrusta en la
+    descripción y no hace falta la tarea de extracción.
+    """
+    description = """
         ⏱️ Antes de comenzar, imprime: START SINGLE_MEET_EVALUATION [YYYY-MM-DD HH:MM:SS]. Al finalizar, imprime: END SINGLE_MEET_EVALUATION [YYYY-MM-DD HH:MM:SS].
 
         🔍 Realizar una evaluación exhaustiva y detallada de UNA SOLA entrevista (meet) para determinar 
@@ -1398,8 +1431,21 @@ def create_single_meet_evaluation_task(agent, extraction_task):
         - Si no hay evidencia, indicarlo claramente en lugar de inventar
         - Todo el análisis en ESPAÑOL LATINO
         - Proporcionar justificaciones claras para la determinación de match basadas SOLO en datos reales
-        """,
+        """
+    if meet_data is not None:
+        meet_data_json = json.dumps(meet_data, indent=2, ensure_ascii=False, default=str)
+        description += f"""
+        📥 **DATOS DEL MEET** (meet, conversation con emotion_analysis, candidate, jd_interview y client),
+        ya obtenidos de la base de datos. Son la fuente completa; no hay otra tarea de extracción:
+
+        ```json
+        {meet_data_json}
+        ```
+        """
+    task_kwargs = {"context": [extraction_task]} if extraction_task is not None else {}
+    return Task(
+        description=description,
         expected_output="JSON completo con análisis exhaustivo y determinación de match potencial",
         agent=agent,
-        context=[extraction_task],
+        **task_kwargs,
     )
@@ -1 +1,66 @@
 # Fixtures compartidos; añadir aquí mocks de Supabase/OpenAI cuando haga falta.
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _inline_evaluation_effects(monkeypatch):
+    """Side effects de /evaluate-meet en línea: los tests ven email/audit al volver la respuesta."""
+    monkeypatch.setenv("EVALUATION_EFFECTS_ENABLED", "false")
+
+
+@pytest.fixture(autouse=True)
+def _no_textract_backoff(monkeypatch):
+    """Sin esperas reales entre reintentos de Textract por throttling."""
+    monkeypatch.setenv("TEXTRACT_RETRY_BASE_SECONDS", "0")
+
+
+@pytest.fixture(autouse=True)
+def _fresh_textract_clients(monkeypatch):
+    """Caché de clientes de Textract vacía: cada test ve el boto3.client que parchea."""
+    from tools import cv_tools
+
+    monkeypatch.setattr(cv_tools, "_textract_clients", {})
+
+
+@pytest.fixture(autouse=True)
+def _inline_audit_log(monkeypatch):
+    """Audit en línea: los tests que usan un cliente fake ven el insert al volver la llamada."""
+    monkeypatch.setenv("AUDIT_LOG_ASYNC", "false")
+
+
+@pytest.fixture(autouse=True)
+def _isolated_cv_text_cache(monkeypatch, tmp_path):
+    """Cache de texto de CVs en un SQLite por test: nada se comparte entre tests ni con el tmp real."""
+    monkeypatch.setenv("CV_TEXT_CACHE_PATH", str(tmp_path / "cv_text_cache.sqlite3"))
+    monkeypatch.delenv("CV_TEXT_CACHE_SUPABASE", raising=False)
+
+
+def _text_pdf(pages: list[str]) -> bytes:
+    """PDF mínimo con una línea de texto Helvetica por página (capa de texto real)."""
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for text in pages:
+        stream = f"BT /F1 10 Tf 20 750 Td ({text}) Tj ET"
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {len(objects)} 0 R "
+            "/Resources << /Font << /F1 3 0 R >> >> >>"
+        )
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    out, offsets = "%PDF-1.4\n", []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out.encode("latin-1")))
+        out += f"{i} 0 obj\n{obj}\nendobj\n"
+    xref = len(out.encode("latin-1"))
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{o:010d} 00000 n \n" for o in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+    return out.encode("latin-1")
+
+
+@pytest.fixture
+def text_pdf():
+    """Constructor de PDFs sintéticos con capa de texto: `text_pdf(["pág 1", "pág 2"])`."""
+    return _text_pdf
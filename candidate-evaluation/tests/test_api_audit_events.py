@@ -124,7 +124,7 @@ def test_evaluate_meet_emits_one_success_audit_event(monkeypatch):
         captured_events.append(kwargs)
         return True
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda mid, **_k: _FakeMeetCrew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save)
     monkeypatch.setattr(api_module, "run_in_threadpool", _run_pool)
     monkeypatch.setattr(api_module, "record_evaluation_audit_event", _capture_audit)
@@ -206,7 +206,7 @@ def test_create_elevenlabs_agent_emits_one_success_audit_event(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda _url, _key: _Supabase())
+    monkeypatch.setattr(api_module, "get_client", lambda _url, _key: _Supabase())
     monkeypatch.setattr(api_module, "get_client_email", _ClientEmailTool())
     monkeypatch.setattr(
         api_module,
@@ -7,6 +7,17 @@ pytest.importorskip("boto3")
 
 import api as api_module  # noqa: E402
 from api import app  # noqa: E402
+from tools import vector_tools  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _fresh_chatbot_caches():
+    """El conteo de chunks y los embeddings de consultas se cachean entre requests."""
+    vector_tools._chunks_count_cache.clear()
+    vector_tools._query_embedding_cache.clear()
+    yield
+    vector_tools._chunks_count_cache.clear()
+    vector_tools._query_embedding_cache.clear()
 
 
 def test_chatbot_returns_answer_with_mocked_openai_and_rag(monkeypatch):
@@ -215,8 +226,8 @@ def test_chatbot_generic_exception_returns_500(monkeypatch):
     assert "rag fail" in detail or "Error en chatbot" in detail
 
 
-def test_chatbot_tries_vector_thresholds_until_chunks_found(monkeypatch):
-    """Bucle de thresholds 0.3 → 0.4 → 0.5 hasta obtener chunks (1447–1457)."""
+def test_chatbot_runs_single_vector_search_with_lowest_threshold(monkeypatch):
+    """Una sola búsqueda con el threshold más permisivo (antes 0.3 → 0.4 → 0.5)."""
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test-chatbot")
 
     class _CountExec:
@@ -245,11 +256,9 @@ def test_chatbot_tries_vector_thresholds_until_chunks_found(monkeypatch):
 
     def _search(**kwargs):
         thresholds_seen.append(float(kwargs.get("match_threshold", 0)))
-        if kwargs.get("match_threshold", 0) < 0.5:
-            return []
         return [
             {
-                "content": "Fragmento con threshold alto.",
+                "content": "Fragmento relevante.",
                 "entity_type": "candidate",
                 "entity_id": "c1",
                 "metadata": {"name": "Ana"},
@@ -286,7 +295,7 @@ def test_chatbot_tries_vector_thresholds_until_chunks_found(monkeypatch):
     client = TestClient(app)
     r = client.post("/chatbot", json={"message": "¿Algo?", "conversation_history": []})
     assert r.status_code == 200
-    assert thresholds_seen == [0.3, 0.4, 0.5]
+    assert thresholds_seen == [0.3]
     data = r.json()
     assert len(data.get("sources") or []) >= 1
 
@@ -376,7 +385,7 @@ def test_chatbot_includes_conversation_history_in_openai_messages(monkeypatch):
 
 
 def test_chatbot_chunks_exist_but_similar_search_empty_at_all_thresholds(monkeypatch):
-    """Hay chunks en BD pero `search_similar_chunks` devuelve vacío en 0.3/0.4/0.5 (1461–1462)."""
+    """Hay chunks en BD pero `search_similar_chunks` devuelve vacío."""
     monkeypatch.setenv("OPENAI_API_KEY", "sk-test-chatbot")
 
     class _CountExec:
@@ -432,3 +441,58 @@ def test_chatbot_chunks_exist_but_similar_search_empty_at_all_thresholds(monkeyp
     assert r.status_code == 200
     data = r.json()
     assert data.get("sources") == []
+
+
+def test_chatbot_counts_chunks_once_and_reuses_query_embedding(monkeypatch):
+    """El conteo de chunks y el embedding de la consulta no se recalculan por mensaje."""
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-chatbot")
+    count_queries = []
+
+    class _KcQuery:
+        def select(self, *_args, **_kwargs):
+            return self
+
+        def limit(self, _n):
+            return self
+
+        def execute(self):
+            count_queries.append(1)
+            return type("R", (), {"count": 7})()
+
+    class _Sb:
+        def table(self, name):
+            assert name == "knowledge_chunks"
+            return _KcQuery()
+
+        def rpc(self, name, params):
+            assert name == "search_similar_chunks"
+            assert params["match_threshold"] == 0.3
+            data = [{"content": "Ana sabe Python.", "entity_type": "candidate", "entity_id": "c1", "metadata": {}}]
+            return type("Rpc", (), {"execute": lambda self: type("R", (), {"data": data})()})()
+
+    embeddings = []
+    monkeypatch.setattr(api_module, "get_supabase_client", lambda: _Sb())
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
+    monkeypatch.setattr(vector_tools, "generate_embedding", lambda text, model: embeddings.append(text) or [0.1])
+
+    class _Completions:
+        def create(self, **_kwargs):
+            msg = type("M", (), {"content": "ok"})()
+            return type("Resp", (), {"choices": [type("C", (), {"message": msg})()], "model": "gpt-4o-mini"})()
+
+    class _FakeOpenAI:
+        def __init__(self, **_kwargs):
+            self.chat = type("Chat", (), {"completions": _Completions()})()
+
+    import openai
+
+    monkeypatch.setattr(openai, "OpenAI", _FakeOpenAI)
+
+    client = TestClient(app)
+    for _ in range(3):
+        r = client.post("/chatbot", json={"message": "¿Quién sabe Python?", "conversation_history": []})
+        assert r.status_code == 200
+        assert r.json()["sources"]
+
+    assert len(count_queries) == 1
+    assert embeddings == ["¿Quién sabe Python?"]
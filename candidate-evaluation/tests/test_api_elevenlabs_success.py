@@ -76,7 +76,7 @@ def test_create_elevenlabs_agent_success(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(
         api_module,
@@ -150,7 +150,7 @@ def test_create_elevenlabs_agent_success_when_result_is_object_with_agent_id(mon
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(api_module, "create_elevenlabs_agent", lambda **kwargs: _ElbObj())
 
@@ -216,7 +216,7 @@ def test_create_elevenlabs_agent_success_when_index_jd_interview_raises(monkeypa
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(
         api_module,
@@ -287,7 +287,7 @@ def test_update_elevenlabs_agent_success(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(
         api_module,
@@ -337,7 +337,7 @@ def test_update_elevenlabs_agent_returns_404_when_jd_not_found(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     _patch_run_pool(monkeypatch)
 
     client = TestClient(app)
@@ -380,7 +380,7 @@ def test_create_elevenlabs_agent_returns_500_when_elevenlabs_returns_none(monkey
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(api_module, "create_elevenlabs_agent", lambda **kwargs: None)
     _patch_run_pool(monkeypatch)
@@ -423,7 +423,7 @@ def test_create_elevenlabs_agent_returns_500_when_agent_id_missing(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(api_module, "create_elevenlabs_agent", lambda **kwargs: {"name": "solo nombre"})
     _patch_run_pool(monkeypatch)
@@ -477,7 +477,7 @@ def test_create_elevenlabs_agent_returns_500_when_update_returns_no_rows(monkeyp
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(
         api_module,
@@ -528,7 +528,7 @@ def test_update_elevenlabs_agent_returns_500_on_unexpected_exception(monkeypatch
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(
         api_module,
@@ -567,7 +567,7 @@ def test_create_elevenlabs_agent_returns_404_when_jd_not_found(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     _patch_run_pool(monkeypatch)
 
     r = TestClient(app).post("/create-elevenlabs-agent", json={"jd_interview_id": jd_id})
@@ -607,7 +607,7 @@ def test_create_elevenlabs_agent_returns_400_when_job_description_empty(monkeypa
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     _patch_run_pool(monkeypatch)
 
     r = TestClient(app).post("/create-elevenlabs-agent", json={"jd_interview_id": jd_id})
@@ -647,7 +647,7 @@ def test_create_elevenlabs_agent_returns_400_when_client_id_missing(monkeypatch)
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     _patch_run_pool(monkeypatch)
 
     r = TestClient(app).post("/create-elevenlabs-agent", json={"jd_interview_id": jd_id})
@@ -692,7 +692,7 @@ def test_create_elevenlabs_agent_returns_400_when_get_client_email_error(monkeyp
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _ErrEmail())
     _patch_run_pool(monkeypatch)
 
@@ -745,7 +745,7 @@ def test_update_elevenlabs_agent_returns_400_when_job_description_empty(monkeypa
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     _patch_run_pool(monkeypatch)
 
     r = TestClient(app).patch("/update-elevenlabs-agent", json={"jd_interview_id": jd_id})
@@ -798,7 +798,7 @@ def test_update_elevenlabs_agent_returns_400_when_no_agent_id(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     _patch_run_pool(monkeypatch)
 
     r = TestClient(app).patch("/update-elevenlabs-agent", json={"jd_interview_id": jd_id})
@@ -838,7 +838,7 @@ def test_update_elevenlabs_agent_returns_400_when_no_client_id(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     _patch_run_pool(monkeypatch)
 
     r = TestClient(app).patch("/update-elevenlabs-agent", json={"jd_interview_id": jd_id})
@@ -892,7 +892,7 @@ def test_update_elevenlabs_agent_success_when_index_jd_interview_raises(monkeypa
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(
         api_module,
@@ -948,7 +948,7 @@ def test_create_elevenlabs_agent_returns_500_when_get_client_email_unresolvable(
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", object())
     _patch_run_pool(monkeypatch)
 
@@ -1006,7 +1006,7 @@ def test_create_elevenlabs_agent_success_when_result_is_object_with_id_only(monk
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(api_module, "create_elevenlabs_agent", lambda **kwargs: _ElbObj())
 
@@ -1053,7 +1053,7 @@ def test_update_elevenlabs_agent_returns_500_when_get_client_email_unresolvable(
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", object())
     _patch_run_pool(monkeypatch)
 
@@ -1123,7 +1123,7 @@ def test_update_elevenlabs_agent_success_get_client_email_wrapped(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
     monkeypatch.setattr(api_module, "get_client_email", _EmailTool())
     monkeypatch.setattr(
         api_module,
@@ -1158,7 +1158,7 @@ def test_update_elevenlabs_agent_success_get_client_email_dunder_func(monkeypatc
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
     monkeypatch.setattr(api_module, "get_client_email", _EmailTool())
     monkeypatch.setattr(
         api_module,
@@ -1191,7 +1191,7 @@ def test_update_elevenlabs_agent_returns_400_when_get_client_email_payload_has_e
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
     monkeypatch.setattr(api_module, "get_client_email", _ErrEmail())
     _patch_run_pool(monkeypatch)
 
@@ -1213,7 +1213,7 @@ def test_update_elevenlabs_agent_returns_400_when_sender_email_empty(monkeypatch
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
     monkeypatch.setattr(api_module, "get_client_email", _EmptyEmail())
     _patch_run_pool(monkeypatch)
 
@@ -1230,7 +1230,7 @@ def test_update_elevenlabs_agent_returns_500_when_generated_prompt_empty(monkeyp
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(api_module, "generate_elevenlabs_prompt_from_jd", lambda **kwargs: {"prompt": "   "})
     _patch_run_pool(monkeypatch)
@@ -1248,7 +1248,7 @@ def test_update_elevenlabs_agent_returns_500_when_update_agent_prompt_falsy(monk
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _patch_supabase_jd_only(jd_row)())
     monkeypatch.setattr(api_module, "get_client_email", _fake_client_email_tool())
     monkeypatch.setattr(
         api_module,
@@ -1318,7 +1318,7 @@ def test_create_elevenlabs_agent_success_get_client_email_wrapped(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _EmailTool())
     monkeypatch.setattr(
         api_module,
@@ -1392,7 +1392,7 @@ def test_create_elevenlabs_agent_success_get_client_email_dunder_func(monkeypatc
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _EmailTool())
     monkeypatch.setattr(
         api_module,
@@ -1451,7 +1451,7 @@ def test_create_elevenlabs_agent_returns_400_when_sender_email_empty(monkeypatch
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(api_module, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(api_module, "get_client_email", _EmptyEmail())
     _patch_run_pool(monkeypatch)
 
@@ -1461,7 +1461,7 @@ def test_create_elevenlabs_agent_returns_400_when_sender_email_empty(monkeypatch
 
 
 def test_create_elevenlabs_agent_returns_500_on_unexpected_exception(monkeypatch):
-    """1395–1401: excepción genérica (p. ej. create_client falla)."""
+    """1395–1401: excepción genérica (p. ej. get_client falla)."""
     jd_id = "550e8400-e29b-41d4-a716-446655440440"
 
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
@@ -1469,7 +1469,7 @@ def test_create_elevenlabs_agent_returns_500_on_unexpected_exception(monkeypatch
     monkeypatch.setenv("ELEVENLABS_API_KEY", "el-key")
     monkeypatch.setattr(
         api_module,
-        "create_client",
+        "get_client",
         lambda u, k: (_ for _ in ()).throw(RuntimeError("supabase caído")),
     )
     _patch_run_pool(monkeypatch)
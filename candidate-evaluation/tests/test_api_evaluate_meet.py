@@ -1,7 +1,7 @@
 """POST /evaluate-meet con crew, guardado y enriquecimiento mockeados."""
 
 import json
-from types import SimpleNamespace
+import threading
 
 import pytest
 from fastapi.testclient import TestClient
@@ -12,6 +12,12 @@ import api as api_module  # noqa: E402
 from api import app  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def _no_meet_context(monkeypatch):
+    """Por defecto el contexto del meet no está disponible (sin Supabase real)."""
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _mid: {"error": "sin Supabase en tests"})
+
+
 def _fake_save_meet_evaluation(_json_str: str) -> str:
     return json.dumps({"success": True, "evaluation_id": "eval-test-1", "action": "created"})
 
@@ -47,7 +53,7 @@ class _FakeMeetCrew:
 
 
 def test_evaluate_meet_success(monkeypatch):
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda mid, **_k: _FakeMeetCrew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
 
     async def _run_pool(fn, *args, **kwargs):
@@ -69,8 +75,8 @@ def test_evaluate_meet_success(monkeypatch):
     assert data["result"]["is_potential_match"] is False
 
 
-def test_evaluate_meet_enriches_from_get_meet_evaluation_data(monkeypatch):
-    """Si el crew no devuelve candidate/jd ids, se rellenan con get_meet_evaluation_data."""
+def test_evaluate_meet_enriches_from_meet_context(monkeypatch):
+    """Si el crew no devuelve candidate/jd ids, se rellenan con el contexto ya cargado del meet."""
 
     class _CrewSparse:
         def kickoff(self):
@@ -98,30 +104,25 @@ def test_evaluate_meet_enriches_from_get_meet_evaluation_data(monkeypatch):
         captured.append(json.loads(json_str))
         return json.dumps({"success": True, "evaluation_id": "e1", "action": "created"})
 
-    def _fake_get_meet(mid: str) -> str:
-        return json.dumps(
-            {
-                "conversation": {
-                    "candidate": {
-                        "id": "550e8400-e29b-41d4-a716-446655440011",
-                        "name": "Enriched",
-                        "email": "e@test.example",
-                    }
-                },
-                "jd_interview": {
-                    "id": "550e8400-e29b-41d4-a716-446655440012",
-                    "interview_name": "JD Name",
-                    "job_description": "Desc",
-                },
-            }
-        )
-
-    class _MeetEvalTool:
-        func = staticmethod(_fake_get_meet)
+    def _fake_load_context(mid: str) -> dict:
+        return {
+            "conversation": {
+                "candidate": {
+                    "id": "550e8400-e29b-41d4-a716-446655440011",
+                    "name": "Enriched",
+                    "email": "e@test.example",
+                }
+            },
+            "jd_interview": {
+                "id": "550e8400-e29b-41d4-a716-446655440012",
+                "interview_name": "JD Name",
+                "job_description": "Desc",
+            },
+        }
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda mid: _CrewSparse())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda mid, **_k: _CrewSparse())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save)
-    monkeypatch.setattr(api_module, "get_meet_evaluation_data", _MeetEvalTool())
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", _fake_load_context)
 
     async def _run_pool(fn, *args, **kwargs):
         if args:
@@ -150,7 +151,7 @@ def _async_run_pool(monkeypatch):
 
 
 def test_evaluate_meet_match_triggers_email_branch(monkeypatch):
-    """is_potential_match True: consulta meets + conversations y marca email (sin POST real)."""
+    """is_potential_match True: arma el email desde el contexto del meet (sin POST real)."""
     mid = "550e8400-e29b-41d4-a716-446655440020"
     jd_id = "550e8400-e29b-41d4-a716-446655440021"
 
@@ -185,74 +186,26 @@ def test_evaluate_meet_match_triggers_email_branch(monkeypatch):
                 },
             }
 
-    class _ConvExec:
-        def execute(self):
-            return type(
-                "R", (), {"data": [{"conversation_data": {"messages": [{"role": "user", "content": "Hola"}]}}]}
-            )()
-
-    class _ConvEq:
-        def eq(self, col, val):
-            assert col == "meet_id" and val == mid
-            return _ConvExec()
-
-    class _ConvTable:
-        def select(self, _cols):
-            return _ConvEq()
-
-    class _MeetExec:
-        def execute(self):
-            return type(
-                "R",
-                (),
-                {
-                    "data": [
-                        {
-                            "jd_interviews_id": jd_id,
-                            "jd_interviews": {
-                                "interview_name": "Python Dev",
-                                "client_id": "cl-1",
-                                "clients": {
-                                    "email": "hiring@client.example",
-                                    "name": "Cliente QA",
-                                    "responsible": "Rec",
-                                    "phone": "999",
-                                },
-                            },
-                        }
-                    ]
-                },
-            )()
-
-    class _MeetEq:
-        def eq(self, col, val):
-            assert col == "id" and val == mid
-            return _MeetExec()
-
-    class _MeetSelect:
-        def select(self, _q):
-            return _MeetEq()
-
-    class _Sb:
-        def table(self, name):
-            if name == "meets":
-                return _MeetSelect()
-            if name == "conversations":
-                return _ConvTable()
-            raise AssertionError(name)
-
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewMatch())
+    monkeypatch.setattr(
+        api_module,
+        "load_meet_evaluation_context",
+        lambda _m: _meet_context(
+            mid,
+            jd_id,
+            interview_name="Python Dev",
+            client=_client("hiring@client.example"),
+            conversation_data={"messages": [{"role": "user", "content": "Hola"}]},
+        ),
+    )
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewMatch())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
     assert r.status_code == 200
     data = r.json()
     assert data["status"] == "success"
-    assert "Email enviado" in data["message"]
+    assert "Email de match encolado" in data["message"]
     assert data["result"]["is_potential_match"] is True
 
 
@@ -289,82 +242,26 @@ def test_evaluate_meet_match_email_formats_assistant_ai_and_other_roles(monkeypa
                 },
             }
 
-    class _ConvExec:
-        def execute(self):
-            return type(
-                "R",
-                (),
-                {
-                    "data": [
-                        {
-                            "conversation_data": {
-                                "messages": [
-                                    {"role": "user", "content": "Hola"},
-                                    {"role": "assistant", "content": "Soy asistente"},
-                                    {"role": "ai", "content": "Soy ai"},
-                                    {"role": "system", "content": "Meta"},
-                                ]
-                            }
-                        }
-                    ]
-                },
-            )()
-
-    class _ConvEq:
-        def eq(self, col, val):
-            assert col == "meet_id" and val == mid
-            return _ConvExec()
-
-    class _ConvTable:
-        def select(self, _cols):
-            return _ConvEq()
-
-    class _MeetExec:
-        def execute(self):
-            return type(
-                "R",
-                (),
-                {
-                    "data": [
-                        {
-                            "jd_interviews_id": jd_id,
-                            "jd_interviews": {
-                                "interview_name": "Python Dev",
-                                "client_id": "cl-1",
-                                "clients": {
-                                    "email": "hiring@client.example",
-                                    "name": "Cliente QA",
-                                    "responsible": "Rec",
-                                    "phone": "999",
-                                },
-                            },
-                        }
-                    ]
-                },
-            )()
-
-    class _MeetEq:
-        def eq(self, col, val):
-            assert col == "id" and val == mid
-            return _MeetExec()
-
-    class _MeetSelect:
-        def select(self, _q):
-            return _MeetEq()
-
-    class _Sb:
-        def table(self, name):
-            if name == "meets":
-                return _MeetSelect()
-            if name == "conversations":
-                return _ConvTable()
-            raise AssertionError(name)
-
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewMatch())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewMatch())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(
+        api_module,
+        "load_meet_evaluation_context",
+        lambda _m: _meet_context(
+            mid,
+            jd_id,
+            interview_name="Python Dev",
+            client=_client("hiring@client.example"),
+            conversation_data={
+                "messages": [
+                    {"role": "user", "content": "Hola"},
+                    {"role": "assistant", "content": "Soy asistente"},
+                    {"role": "ai", "content": "Soy ai"},
+                    {"role": "system", "content": "Meta"},
+                ]
+            },
+        ),
+    )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
@@ -405,65 +302,19 @@ def test_evaluate_meet_match_email_uses_conversation_data_string(monkeypatch):
                 },
             }
 
-    class _ConvExec:
-        def execute(self):
-            return type("R", (), {"data": [{"conversation_data": "Transcripción plana del meet"}]})()
-
-    class _ConvEq:
-        def eq(self, col, val):
-            assert col == "meet_id" and val == mid
-            return _ConvExec()
-
-    class _ConvTable:
-        def select(self, _cols):
-            return _ConvEq()
-
-    class _MeetExec:
-        def execute(self):
-            return type(
-                "R",
-                (),
-                {
-                    "data": [
-                        {
-                            "jd_interviews_id": jd_id,
-                            "jd_interviews": {
-                                "interview_name": "Go Dev",
-                                "client_id": "cl-2",
-                                "clients": {
-                                    "email": "hr@client.example",
-                                    "name": "C",
-                                    "responsible": "R",
-                                    "phone": "1",
-                                },
-                            },
-                        }
-                    ]
-                },
-            )()
-
-    class _MeetEq:
-        def eq(self, col, val):
-            assert col == "id" and val == mid
-            return _MeetExec()
-
-    class _MeetSelect:
-        def select(self, _q):
-            return _MeetEq()
-
-    class _Sb:
-        def table(self, name):
-            if name == "meets":
-                return _MeetSelect()
-            if name == "conversations":
-                return _ConvTable()
-            raise AssertionError(name)
-
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewMatch())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewMatch())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(
+        api_module,
+        "load_meet_evaluation_context",
+        lambda _m: _meet_context(
+            mid,
+            jd_id,
+            interview_name="Go Dev",
+            client=_client("hr@client.example"),
+            conversation_data="Transcripción plana del meet",
+        ),
+    )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
@@ -472,7 +323,7 @@ def test_evaluate_meet_match_email_uses_conversation_data_string(monkeypatch):
 
 
 def test_evaluate_meet_fetches_emotion_when_prosody_missing(monkeypatch):
-    """Sin prosodia: primero conversations (emotion_analysis); luego flujo de email con segundo create_client."""
+    """Sin prosodia: emotion_analysis sale del contexto del meet y el email usa el mismo contexto."""
     mid = "550e8400-e29b-41d4-a716-446655440030"
     jd_id = "550e8400-e29b-41d4-a716-446655440031"
     emo_raw = {"scores": {"calm": 0.8}}
@@ -498,96 +349,15 @@ def test_evaluate_meet_fetches_emotion_when_prosody_missing(monkeypatch):
         captured_save.append(json.loads(js))
         return json.dumps({"success": True, "evaluation_id": "e2", "action": "created"})
 
-    class _EmoExec:
-        def execute(self):
-            return type("R", (), {"data": [{"emotion_analysis": emo_raw}]})()
-
-    class _EmoLimit:
-        def limit(self, _n):
-            return _EmoExec()
-
-    class _EmoOrd:
-        def order(self, _col, desc=False):
-            return _EmoLimit()
-
-    class _EmoEq:
-        def eq(self, col, val):
-            assert col == "meet_id" and val == mid
-            return _EmoOrd()
-
-    class _EmoSel:
-        def select(self, _cols):
-            return _EmoEq()
-
-    class _SbEmotion:
-        def table(self, name):
-            assert name == "conversations"
-            return _EmoSel()
-
-    class _ConvExec:
-        def execute(self):
-            return type("R", (), {"data": [{"conversation_data": {}}]})()
-
-    class _ConvEq:
-        def eq(self, col, val):
-            assert col == "meet_id"
-            return _ConvExec()
-
-    class _ConvTable:
-        def select(self, _cols):
-            return _ConvEq()
-
-    class _MeetExec:
-        def execute(self):
-            return type(
-                "R",
-                (),
-                {
-                    "data": [
-                        {
-                            "jd_interviews_id": jd_id,
-                            "jd_interviews": {
-                                "interview_name": "Role",
-                                "client_id": "c",
-                                "clients": {
-                                    "email": "x@y.com",
-                                    "name": "N",
-                                    "responsible": "R",
-                                    "phone": "1",
-                                },
-                            },
-                        }
-                    ]
-                },
-            )()
-
-    class _MeetEq:
-        def eq(self, col, val):
-            return _MeetExec()
-
-    class _MeetSel:
-        def select(self, _q):
-            return _MeetEq()
-
-    class _SbEmail:
-        def table(self, name):
-            if name == "meets":
-                return _MeetSel()
-            if name == "conversations":
-                return _ConvTable()
-            raise AssertionError(name)
-
-    _n = [0]
-
-    def _factory(u, k):
-        _n[0] += 1
-        return _SbEmotion() if _n[0] == 1 else _SbEmail()
-
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewNoProsody())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewNoProsody())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _capture_save)
-    monkeypatch.setattr(api_module, "create_client", _factory)
+    monkeypatch.setattr(
+        api_module,
+        "load_meet_evaluation_context",
+        lambda _m: _meet_context(
+            mid, jd_id, interview_name="Role", client=_client("x@y.com"), conversation_data={}, emotion_analysis=emo_raw
+        ),
+    )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
@@ -599,7 +369,7 @@ def test_evaluate_meet_fetches_emotion_when_prosody_missing(monkeypatch):
 
 
 def test_evaluate_meet_no_prosody_without_supabase_skips_emotion_fetch(monkeypatch):
-    """Sin URL de Supabase no se intenta el fetch de emotion_analysis; is_potential_match false evita email."""
+    """Sin contexto del meet no se agrega emotion_analysis; is_potential_match false evita email."""
     monkeypatch.delenv("SUPABASE_URL", raising=False)
     monkeypatch.delenv("SUPABASE_KEY", raising=False)
 
@@ -620,7 +390,7 @@ def test_evaluate_meet_no_prosody_without_supabase_skips_emotion_fetch(monkeypat
                 "conversation_analysis": {"technical_assessment": {}},
             }
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _CrewBare())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _CrewBare())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
     _async_run_pool(monkeypatch)
 
@@ -655,63 +425,32 @@ def _crew_match_base(mid: str, jd_id: str):
     }
 
 
-def _supabase_meet_plus_conv(
-    mid: str, jd_id: str, *, client_email: str | None = "h@client.example", messages: list | None = None
-):
-    class _ConvExec:
-        def execute(self):
-            msgs = [] if messages is None else messages
-            return type("R", (), {"data": [{"conversation_data": {"messages": msgs}}]})()
-
-    class _ConvEq:
-        def eq(self, col, val):
-            assert col == "meet_id" and val == mid
-            return _ConvExec()
-
-    class _ConvTable:
-        def select(self, _cols):
-            return _ConvEq()
-
-    class _MeetExec:
-        def execute(self):
-            clients = (
-                {"name": "Sin email"}
-                if client_email is None
-                else {
-                    "email": client_email,
-                    "name": "Co",
-                    "responsible": "R",
-                    "phone": "1",
-                }
-            )
-            row = {
-                "jd_interviews_id": jd_id,
-                "jd_interviews": {
-                    "interview_name": "Role",
-                    "client_id": "cl-x",
-                    "clients": clients,
-                },
-            }
-            return type("R", (), {"data": [row]})()
-
-    class _MeetEq:
-        def eq(self, col, val):
-            assert col == "id" and val == mid
-            return _MeetExec()
+def _client(email: str | None = "h@client.example") -> dict:
+    return {"email": email, "name": "Co", "responsible": "R", "phone": "1"}
 
-    class _MeetSelect:
-        def select(self, _q):
-            return _MeetEq()
 
-    class _Sb:
-        def table(self, name):
-            if name == "meets":
-                return _MeetSelect()
-            if name == "conversations":
-                return _ConvTable()
-            raise AssertionError(name)
-
-    return _Sb
+def _meet_context(
+    mid: str,
+    jd_id: str,
+    *,
+    interview_name: str = "Role",
+    client: dict | None = None,
+    conversation_data=None,
+    emotion_analysis=None,
+) -> dict:
+    """Contexto con la forma de load_meet_evaluation_context."""
+    client = _client() if client is None else client
+    return {
+        "meet": {"id": mid, "jd_interviews_id": jd_id},
+        "conversation": {
+            "meet_id": mid,
+            "conversation_data": {"messages": []} if conversation_data is None else conversation_data,
+            "emotion_analysis": emotion_analysis,
+            "candidate": {"id": "550e8400-e29b-41d4-a716-4466554400a0", "name": "M"},
+        },
+        "jd_interview": {"id": jd_id, "interview_name": interview_name, "client_id": "cl-x"},
+        "client": client,
+    }
 
 
 def test_evaluate_meet_match_without_nested_jd_does_not_send_email(monkeypatch):
@@ -722,34 +461,16 @@ def test_evaluate_meet_match_without_nested_jd_does_not_send_email(monkeypatch):
         def kickoff(self):
             return _crew_match_base(mid, jd_id)
 
-    class _MeetExecNull:
-        def execute(self):
-            return type("R", (), {"data": [{"jd_interviews_id": jd_id, "jd_interviews": None}]})()
-
-    class _MeetEqNull:
-        def eq(self, col, val):
-            assert col == "id" and val == mid
-            return _MeetExecNull()
-
-    class _MeetSelNull:
-        def select(self, _q):
-            return _MeetEqNull()
-
-    class _SbMeetsOnly:
-        def table(self, name):
-            assert name == "meets"
-            return _MeetSelNull()
-
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _SbMeetsOnly())
+    monkeypatch.setattr(
+        api_module, "load_meet_evaluation_context", lambda _m: {**_meet_context(mid, jd_id), "jd_interview": None}
+    )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
     assert r.status_code == 200
-    assert "Email enviado" not in r.json()["message"]
+    assert "Email de match encolado" not in r.json()["message"]
 
 
 def test_evaluate_meet_match_without_client_email_does_not_send_email(monkeypatch):
@@ -760,18 +481,16 @@ def test_evaluate_meet_match_without_client_email_does_not_send_email(monkeypatc
         def kickoff(self):
             return _crew_match_base(mid, jd_id)
 
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
     monkeypatch.setattr(
-        api_module, "create_client", lambda u, k: _supabase_meet_plus_conv(mid, jd_id, client_email=None)()
+        api_module, "load_meet_evaluation_context", lambda _m: _meet_context(mid, jd_id, client={"name": "Sin email"})
     )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
     assert r.status_code == 200
-    assert "Email enviado" not in r.json()["message"]
+    assert "Email de match encolado" not in r.json()["message"]
 
 
 def test_evaluate_meet_match_render_email_template_error_still_200(monkeypatch):
@@ -785,17 +504,15 @@ def test_evaluate_meet_match_render_email_template_error_still_200(monkeypatch):
     def _boom(**_kwargs):
         raise RuntimeError("template error for test")
 
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _supabase_meet_plus_conv(mid, jd_id)())
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _m: _meet_context(mid, jd_id))
     monkeypatch.setattr(api_module, "render_email_template", _boom)
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
     assert r.status_code == 200
-    assert "Email enviado" not in r.json()["message"]
+    assert "Email de match encolado" not in r.json()["message"]
 
 
 def test_evaluate_meet_match_empty_messages_still_sends_email(monkeypatch):
@@ -806,20 +523,22 @@ def test_evaluate_meet_match_empty_messages_still_sends_email(monkeypatch):
         def kickoff(self):
             return _crew_match_base(mid, jd_id)
 
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _supabase_meet_plus_conv(mid, jd_id, messages=[])())
+    monkeypatch.setattr(
+        api_module,
+        "load_meet_evaluation_context",
+        lambda _m: _meet_context(mid, jd_id, conversation_data={"messages": []}),
+    )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
     assert r.status_code == 200
-    assert "Email enviado" in r.json()["message"]
+    assert "Email de match encolado" in r.json()["message"]
 
 
 def test_evaluate_meet_match_no_meet_rows_skips_email(monkeypatch):
-    """Consulta a meets sin filas: no hay destinatario ni conversación para el email."""
+    """Meet inexistente en el contexto: no hay destinatario ni conversación para el email."""
     mid = "550e8400-e29b-41d4-a716-446655440110"
     jd_id = "550e8400-e29b-41d4-a716-446655440111"
 
@@ -827,34 +546,16 @@ def test_evaluate_meet_match_no_meet_rows_skips_email(monkeypatch):
         def kickoff(self):
             return _crew_match_base(mid, jd_id)
 
-    class _MeetExecEmpty:
-        def execute(self):
-            return type("R", (), {"data": []})()
-
-    class _MeetEq:
-        def eq(self, col, val):
-            assert col == "id" and val == mid
-            return _MeetExecEmpty()
-
-    class _MeetSel:
-        def select(self, _q):
-            return _MeetEq()
-
-    class _SbMeetsEmpty:
-        def table(self, name):
-            assert name == "meets"
-            return _MeetSel()
-
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _SbMeetsEmpty())
+    monkeypatch.setattr(
+        api_module, "load_meet_evaluation_context", lambda _m: {"error": f"No se encontró el meet con ID: {mid}"}
+    )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
     assert r.status_code == 200
-    assert "Email enviado" not in r.json()["message"]
+    assert "Email de match encolado" not in r.json()["message"]
 
 
 def test_evaluate_meet_crew_returns_markdown_json_in_raw(monkeypatch):
@@ -869,7 +570,7 @@ def test_evaluate_meet_crew_returns_markdown_json_in_raw(monkeypatch):
 
             return _R()
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewMd())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewMd())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
 
     async def _run_pool(fn, *args, **kwargs):
@@ -898,7 +599,7 @@ def test_evaluate_meet_crew_returns_dict_in_content_attribute(monkeypatch):
 
             return _R()
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewContent())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewContent())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
 
     async def _run_pool(fn, *args, **kwargs):
@@ -927,7 +628,7 @@ def test_evaluate_meet_crew_returns_dict_in_raw_attribute(monkeypatch):
 
             return _R()
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewRawDict())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewRawDict())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
 
     async def _run_pool(fn, *args, **kwargs):
@@ -957,7 +658,7 @@ def test_evaluate_meet_crew_returns_json_string_in_content_only(monkeypatch):
 
             return _R()
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewContentStr())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewContentStr())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
 
     async def _run_pool(fn, *args, **kwargs):
@@ -976,13 +677,13 @@ def test_evaluate_meet_crew_returns_json_string_in_content_only(monkeypatch):
 
 
 def test_evaluate_meet_crew_string_invalid_json_inner_parse_error(monkeypatch):
-    """Rama except interna al parsear `{...}` que no es JSON válido (664–681)."""
+    """`{...}` que no es JSON válido: sin objeto extraíble, el resultado queda vacío y la API responde."""
 
     class _CrewBad:
         def kickoff(self):
             return '{"a": }'
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewBad())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewBad())
 
     def _fake_save(_json_str: str) -> str:
         return json.dumps({"success": True, "evaluation_id": "e1", "action": "created"})
@@ -1008,7 +709,7 @@ def test_evaluate_meet_crew_weird_object_uses_str_result(monkeypatch):
         def kickoff(self):
             return _Weird()
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _CrewWeird())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _CrewWeird())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
     _async_run_pool(monkeypatch)
 
@@ -1025,7 +726,7 @@ def test_evaluate_meet_save_meet_evaluation_returns_failure(monkeypatch):
         return json.dumps({"success": False, "error": "persist failed"})
 
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save)
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _FakeMeetCrew())
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post(
@@ -1040,7 +741,7 @@ def test_evaluate_meet_save_meet_evaluation_raises_logs_and_continues(monkeypatc
         raise RuntimeError("save boom")
 
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save)
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _FakeMeetCrew())
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post(
@@ -1052,7 +753,7 @@ def test_evaluate_meet_save_meet_evaluation_raises_logs_and_continues(monkeypatc
 
 def test_evaluate_meet_save_meet_evaluation_tool_unresolvable(monkeypatch):
     monkeypatch.setattr(api_module, "save_meet_evaluation", None)
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _FakeMeetCrew())
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post(
@@ -1063,7 +764,7 @@ def test_evaluate_meet_save_meet_evaluation_tool_unresolvable(monkeypatch):
 
 
 def test_evaluate_meet_merges_raw_emotion_when_summary_has_burst_but_no_raw(monkeypatch):
-    """Supabase conversations: añade raw_emotion_analysis si falta (816–820)."""
+    """Añade raw_emotion_analysis del contexto del meet si falta."""
     mid = "550e8400-e29b-41d4-a716-446655440555"
 
     class _Crew:
@@ -1085,36 +786,13 @@ def test_evaluate_meet_merges_raw_emotion_when_summary_has_burst_but_no_raw(monk
                 },
             }
 
-    class _ConvExec:
-        def execute(self):
-            return type("R", (), {"data": [{"emotion_analysis": {"scores": [0.1]}}]})()
-
-    class _Ord:
-        def order(self, *_a, **_k):
-            return _Lim()
-
-    class _Lim:
-        def limit(self, _n):
-            return _ConvExec()
-
-    class _Eq:
-        def eq(self, *_a, **_k):
-            return _Ord()
-
-    class _ConvTable:
-        def select(self, _c):
-            return _Eq()
-
-    class _Sb:
-        def table(self, name):
-            assert name == "conversations"
-            return _ConvTable()
-
-    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
-    monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(
+        api_module,
+        "load_meet_evaluation_context",
+        lambda _m: _meet_context(mid, "j1", emotion_analysis={"scores": [0.1]}),
+    )
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
@@ -1123,7 +801,7 @@ def test_evaluate_meet_merges_raw_emotion_when_summary_has_burst_but_no_raw(monk
 
 
 def test_evaluate_meet_emotion_block_swallows_supabase_failure(monkeypatch):
-    """Si falla create_client en el fallback de emotion_analysis, la API sigue OK (except 828–829)."""
+    """El fallback de emotion_analysis no vuelve a consultar Supabase (get_client nunca se usa)."""
     mid = "550e8400-e29b-41d4-a716-446655440666"
 
     class _Crew:
@@ -1148,11 +826,11 @@ def test_evaluate_meet_emotion_block_swallows_supabase_failure(monkeypatch):
 
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
     monkeypatch.setattr(
         api_module,
-        "create_client",
+        "get_client",
         lambda u, k: (_ for _ in ()).throw(RuntimeError("emotion supabase path")),
     )
     _async_run_pool(monkeypatch)
@@ -1175,7 +853,7 @@ def test_evaluate_meet_save_meet_evaluation_uses_wrapped_callable(monkeypatch):
         __wrapped__ = _underlying
 
     monkeypatch.setattr(api_module, "save_meet_evaluation", _FakeSaveTool())
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _FakeMeetCrew())
     _async_run_pool(monkeypatch)
 
     r = TestClient(app).post(
@@ -1190,7 +868,7 @@ def test_evaluate_meet_returns_500_when_crew_factory_raises(monkeypatch):
     monkeypatch.setattr(
         api_module,
         "create_single_meet_evaluation_crew",
-        lambda _mid: (_ for _ in ()).throw(RuntimeError("no crew")),
+        lambda _mid, **_k: (_ for _ in ()).throw(RuntimeError("no crew")),
     )
     _async_run_pool(monkeypatch)
     r = TestClient(app).post(
@@ -1208,7 +886,7 @@ def test_evaluate_meet_kickoff_plain_string_no_json_detectable(monkeypatch):
         def kickoff(self):
             return "solo texto sin llaves json"
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
     _async_run_pool(monkeypatch)
     r = TestClient(app).post(
@@ -1226,7 +904,7 @@ def test_evaluate_meet_kickoff_string_brace_extract_fails_json_loads(monkeypatch
         def kickoff(self):
             return "{invalid}"
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
     _async_run_pool(monkeypatch)
     r = TestClient(app).post(
@@ -1244,7 +922,7 @@ def test_evaluate_meet_json_array_string_normalized_to_empty_dict(monkeypatch):
         def kickoff(self):
             return '[{"meet_id": "550e8400-e29b-41d4-a716-446655440888"}]'
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _Crew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _Crew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
     _async_run_pool(monkeypatch)
     r = TestClient(app).post(
@@ -1255,124 +933,6 @@ def test_evaluate_meet_json_array_string_normalized_to_empty_dict(monkeypatch):
     assert r.json()["status"] == "success"
 
 
-def test_evaluate_meet_enrich_uses_get_meet_evaluation_data_wrapped(monkeypatch):
-    """Rama `get_meet_evaluation_data.__wrapped__` (701–702)."""
-    mid = "550e8400-e29b-41d4-a716-446655440770"
-    captured: list[dict] = []
-
-    class _CrewSparse:
-        def kickoff(self):
-            return {
-                "meet_id": mid,
-                "candidate": {},
-                "jd_interview": {},
-                "match_evaluation": {
-                    "final_recommendation": "No",
-                    "justification": "t",
-                    "is_potential_match": False,
-                    "compatibility_score": 0,
-                },
-                "conversation_analysis": {
-                    "emotion_sentiment_summary": {
-                        "prosody_summary_text": "ok",
-                        "burst_summary_text": "ok",
-                    },
-                },
-            }
-
-    def _wrapped(*args, **kwargs) -> str:
-        mid_param = args[-1]
-        assert mid_param == mid
-        return json.dumps(
-            {
-                "conversation": {
-                    "candidate": {
-                        "id": "550e8400-e29b-41d4-a716-446655440771",
-                        "name": "Wrapped",
-                        "email": "w@test.example",
-                    }
-                },
-                "jd_interview": {
-                    "id": "550e8400-e29b-41d4-a716-446655440772",
-                    "interview_name": "JD-W",
-                    "job_description": "d",
-                },
-            }
-        )
-
-    class _MeetTool:
-        __wrapped__ = _wrapped
-
-    def _fake_save(json_str: str) -> str:
-        captured.append(json.loads(json_str))
-        return json.dumps({"success": True, "evaluation_id": "e-wrap", "action": "created"})
-
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _CrewSparse())
-    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save)
-    monkeypatch.setattr(api_module, "get_meet_evaluation_data", _MeetTool())
-    _async_run_pool(monkeypatch)
-    r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
-    assert r.status_code == 200
-    assert captured[0]["candidate"]["id"] == "550e8400-e29b-41d4-a716-446655440771"
-
-
-def test_evaluate_meet_enrich_uses_plain_callable_get_meet_evaluation_data(monkeypatch):
-    """Rama `callable(...) and not hasattr(..., 'name')` (707–708)."""
-    mid = "550e8400-e29b-41d4-a716-446655440773"
-    captured: list[dict] = []
-
-    class _CrewSparse:
-        def kickoff(self):
-            return {
-                "meet_id": mid,
-                "candidate": {},
-                "jd_interview": {},
-                "match_evaluation": {
-                    "final_recommendation": "No",
-                    "justification": "t",
-                    "is_potential_match": False,
-                    "compatibility_score": 0,
-                },
-                "conversation_analysis": {
-                    "emotion_sentiment_summary": {
-                        "prosody_summary_text": "ok",
-                        "burst_summary_text": "ok",
-                    },
-                },
-            }
-
-    def _plain(mid_param: str) -> str:
-        assert mid_param == mid
-        return json.dumps(
-            {
-                "conversation": {
-                    "candidate": {
-                        "id": "550e8400-e29b-41d4-a716-446655440774",
-                        "name": "Plain",
-                        "email": "p@test.example",
-                    }
-                },
-                "jd_interview": {
-                    "id": "550e8400-e29b-41d4-a716-446655440775",
-                    "interview_name": "JD-P",
-                    "job_description": "d",
-                },
-            }
-        )
-
-    def _fake_save(json_str: str) -> str:
-        captured.append(json.loads(json_str))
-        return json.dumps({"success": True, "evaluation_id": "e-plain", "action": "created"})
-
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _CrewSparse())
-    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save)
-    monkeypatch.setattr(api_module, "get_meet_evaluation_data", _plain)
-    _async_run_pool(monkeypatch)
-    r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
-    assert r.status_code == 200
-    assert captured[0]["candidate"]["id"] == "550e8400-e29b-41d4-a716-446655440774"
-
-
 def test_evaluate_meet_save_meet_evaluation_uses_dot_func(monkeypatch):
     """Rama `save_meet_evaluation.func` (844–845)."""
     captured: list[str] = []
@@ -1386,7 +946,7 @@ def test_evaluate_meet_save_meet_evaluation_uses_dot_func(monkeypatch):
         func = _impl
 
     monkeypatch.setattr(api_module, "save_meet_evaluation", _SaveTool())
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _FakeMeetCrew())
     _async_run_pool(monkeypatch)
     r = TestClient(app).post(
         "/evaluate-meet",
@@ -1409,7 +969,7 @@ def test_evaluate_meet_save_meet_evaluation_uses_dot_underscore_func(monkeypatch
         _func = _impl
 
     monkeypatch.setattr(api_module, "save_meet_evaluation", _SaveTool())
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid: _FakeMeetCrew())
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _mid, **_k: _FakeMeetCrew())
     _async_run_pool(monkeypatch)
     r = TestClient(app).post(
         "/evaluate-meet",
@@ -1419,10 +979,9 @@ def test_evaluate_meet_save_meet_evaluation_uses_dot_underscore_func(monkeypatch
     assert captured
 
 
-def test_evaluate_meet_enrich_uses_get_meet_evaluation_data_dunder_func(monkeypatch):
-    """Rama `get_meet_evaluation_data._func` (705–706)."""
-    mid = "550e8400-e29b-41d4-a716-446655440779"
-    captured: list[dict] = []
+def test_evaluate_meet_without_meet_context_still_returns_200(monkeypatch):
+    """Si el contexto del meet no se pudo cargar, no se enriquece pero la respuesta no falla."""
+    mid = "550e8400-e29b-41d4-a716-446655440782"
 
     class _CrewSparse:
         def kickoff(self):
@@ -1444,75 +1003,193 @@ def test_evaluate_meet_enrich_uses_get_meet_evaluation_data_dunder_func(monkeypa
                 },
             }
 
-    def _func(meet_param: str) -> str:
-        assert meet_param == mid
-        return json.dumps(
-            {
-                "conversation": {
-                    "candidate": {
-                        "id": "550e8400-e29b-41d4-a716-446655440780",
-                        "name": "ViaFunc",
-                        "email": "vf@test.example",
-                    }
-                },
-                "jd_interview": {
-                    "id": "550e8400-e29b-41d4-a716-446655440781",
-                    "interview_name": "JD",
-                    "job_description": "d",
-                },
-            }
-        )
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m, **_k: _CrewSparse())
+    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _mid: {"error": "enrich fail"})
+    _async_run_pool(monkeypatch)
+    r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
+    assert r.status_code == 200
+    assert r.json()["status"] == "success"
 
-    # Solo `_func` (sin `.func`) para cubrir la rama 705–706; SimpleNamespace evita atributos de Tool.
-    _meet_tool = SimpleNamespace(_func=_func)
 
-    def _fake_save(json_str: str) -> str:
-        captured.append(json.loads(json_str))
-        return json.dumps({"success": True, "evaluation_id": "e-dunder", "action": "created"})
+def test_evaluate_meet_loads_meet_context_once_and_shares_it(monkeypatch):
+    """Una sola carga del contexto: el crew lo recibe y el email lo reutiliza sin consultar Supabase."""
+    mid = "550e8400-e29b-41d4-a716-4466554400f0"
+    jd_id = "550e8400-e29b-41d4-a716-4466554400f1"
+    loads = []
+    crew_contexts = []
+    context = _meet_context(mid, jd_id, conversation_data={"messages": [{"role": "user", "content": "Hola"}]})
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _CrewSparse())
-    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save)
-    monkeypatch.setattr(api_module, "get_meet_evaluation_data", _meet_tool)
+    class _Crew:
+        def kickoff(self):
+            return _crew_match_base(mid, jd_id)
+
+    def _factory(meet_id, meet_context=None, **_k):
+        crew_contexts.append(meet_context)
+        return _Crew()
+
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda m: loads.append(m) or context)
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", _factory)
+    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
+    monkeypatch.setattr(api_module, "get_client", lambda *_a: pytest.fail("no debería consultar Supabase"))
     _async_run_pool(monkeypatch)
+
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
+
     assert r.status_code == 200
-    assert captured, "save_meet_evaluation debería recibir payload enriquecido"
-    assert captured[0]["candidate"]["id"] == "550e8400-e29b-41d4-a716-446655440780"
+    assert "Email de match encolado" in r.json()["message"]
+    assert loads == [mid]
+    assert crew_contexts == [context]
+
+
+@pytest.mark.parametrize(
+    ("has_context", "expected_mode"),
+    [(True, "direct"), (False, "llm")],
+)
+def test_evaluate_meet_direct_extraction_mode_is_forwarded_and_audited(monkeypatch, has_context, expected_mode):
+    """extraction_mode=direct llega al crew y queda en el audit; sin contexto válido cae a llm."""
+    mid = "550e8400-e29b-41d4-a716-4466554400f2"
+    jd_id = "550e8400-e29b-41d4-a716-4466554400f3"
+    modes = []
+    audits = []
+    context = _meet_context(mid, jd_id) if has_context else {"error": "sin datos"}
 
+    class _Crew:
+        def kickoff(self):
+            return _crew_match_base(mid, jd_id)
 
-def test_evaluate_meet_enrich_exception_still_returns_200(monkeypatch):
-    """745–747: fallo al enriquecer no tumba la respuesta."""
-    mid = "550e8400-e29b-41d4-a716-446655440782"
+    def _factory(meet_id, meet_context=None, extraction_mode=None):
+        modes.append(extraction_mode)
+        return _Crew()
 
-    class _CrewSparse:
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _m: context)
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", _factory)
+    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
+    monkeypatch.setattr(api_module, "record_evaluation_audit_event", lambda **kw: audits.append(kw) or True)
+    _async_run_pool(monkeypatch)
+
+    r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid, "extraction_mode": "direct"})
+
+    assert r.status_code == 200
+    assert modes == [expected_mode]
+    assert audits[0]["metadata"]["extraction_mode"] == expected_mode
+
+
+def test_evaluate_meet_rejects_unknown_extraction_mode():
+    r = TestClient(app).post("/evaluate-meet", json={"meet_id": "m1", "extraction_mode": "magic"})
+    assert r.status_code == 422
+
+
+def _patch_evaluation_cache(monkeypatch, cached=None):
+    """Activa la caché con lecturas/escrituras falsas; devuelve las listas de lookups y saves."""
+    lookups = []
+    saves = []
+    monkeypatch.setattr(api_module, "is_evaluation_cache_enabled", lambda: True)
+    monkeypatch.setattr(api_module, "_evaluation_cache_supabase", lambda: object())
+    monkeypatch.setattr(api_module, "get_cached_evaluation", lambda _sb, mid, key: lookups.append((mid, key)) or cached)
+    monkeypatch.setattr(
+        api_module, "save_cached_evaluation", lambda _sb, mid, key, eid, result: saves.append((mid, key, eid, result))
+    )
+    return lookups, saves
+
+
+def test_evaluate_meet_returns_cached_result_without_running_crew(monkeypatch):
+    mid = "550e8400-e29b-41d4-a716-4466554400f4"
+    audits = []
+    cached = {"evaluation_id": "eval-cached", "result": {"compatibility_score": 77}}
+    lookups, saves = _patch_evaluation_cache(monkeypatch, cached=cached)
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _m: _meet_context(mid, "jd-1"))
+    monkeypatch.setattr(
+        api_module, "create_single_meet_evaluation_crew", lambda *_a, **_k: pytest.fail("no debería ejecutar el crew")
+    )
+    monkeypatch.setattr(api_module, "record_evaluation_audit_event", lambda **kw: audits.append(kw) or True)
+    _async_run_pool(monkeypatch)
+
+    r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
+
+    assert r.status_code == 200
+    body = r.json()
+    assert body["result"] == {"compatibility_score": 77}
+    assert body["evaluation_id"] == "eval-cached"
+    assert "caché" in body["message"]
+    assert len(lookups) == 1
+    assert saves == []
+    assert audits[0]["metadata"]["cached"] is True
+
+
+def test_evaluate_meet_force_skips_cache_lookup_and_refreshes_entry(monkeypatch):
+    mid = "550e8400-e29b-41d4-a716-4466554400f5"
+    jd_id = "550e8400-e29b-41d4-a716-4466554400f6"
+    lookups, saves = _patch_evaluation_cache(monkeypatch, cached={"evaluation_id": "old", "result": {}})
+
+    class _Crew:
         def kickoff(self):
-            return {
-                "meet_id": mid,
-                "candidate": {},
-                "jd_interview": {},
-                "match_evaluation": {
-                    "final_recommendation": "No",
-                    "justification": "t",
-                    "is_potential_match": False,
-                    "compatibility_score": 0,
-                },
-                "conversation_analysis": {
-                    "emotion_sentiment_summary": {
-                        "prosody_summary_text": "ok",
-                        "burst_summary_text": "ok",
-                    },
-                },
-            }
+            return _crew_match_base(mid, jd_id)
 
-    def _boom(_mid):
-        raise RuntimeError("enrich fail")
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _m: _meet_context(mid, jd_id))
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda *_a, **_k: _Crew())
+    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
+    _async_run_pool(monkeypatch)
 
-    _meet_tool = SimpleNamespace(_func=_boom)
+    r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid, "force": True})
 
-    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda _m: _CrewSparse())
+    assert r.status_code == 200
+    assert lookups == []
+    assert len(saves) == 1
+    saved_mid, saved_key, saved_eid, saved_result = saves[0]
+    assert saved_mid == mid
+    assert saved_key
+    assert saved_eid == r.json()["evaluation_id"]
+    assert saved_result == r.json()["result"]
+
+
+def test_evaluate_meet_skips_cache_without_meet_context(monkeypatch):
+    lookups, saves = _patch_evaluation_cache(monkeypatch, cached={"evaluation_id": "x", "result": {}})
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda *_a, **_k: _FakeMeetCrew())
     monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
-    monkeypatch.setattr(api_module, "get_meet_evaluation_data", _meet_tool)
     _async_run_pool(monkeypatch)
+
+    r = TestClient(app).post("/evaluate-meet", json={"meet_id": "550e8400-e29b-41d4-a716-4466554400f7"})
+
+    assert r.status_code == 200
+    assert lookups == []
+    assert saves == []
+
+
+def test_evaluate_meet_returns_before_background_side_effects_finish(monkeypatch):
+    """Con los side effects en segundo plano, la respuesta no espera al email ni al audit (corren en el pool)."""
+    monkeypatch.setenv("EVALUATION_EFFECTS_ENABLED", "true")
+    mid = "550e8400-e29b-41d4-a716-4466554400f8"
+    jd_id = "550e8400-e29b-41d4-a716-4466554400f9"
+    release = threading.Event()
+    sent = []
+    audits = []
+
+    class _Crew:
+        def kickoff(self):
+            return _crew_match_base(mid, jd_id)
+
+    def _blocked_send(payload):
+        release.wait(5)
+        sent.append(payload["to_email"])
+
+    effects = api_module.BackgroundEffects(sleep=lambda _s: None)
+    monkeypatch.setattr(api_module, "evaluation_effects", effects)
+    monkeypatch.setattr(api_module, "_send_match_email", _blocked_send)
+    monkeypatch.setattr(api_module, "record_evaluation_audit_event", lambda **kw: audits.append(kw) or True)
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _m: _meet_context(mid, jd_id))
+    monkeypatch.setattr(api_module, "create_single_meet_evaluation_crew", lambda *_a, **_k: _Crew())
+    monkeypatch.setattr(api_module, "save_meet_evaluation", _fake_save_meet_evaluation)
+    _async_run_pool(monkeypatch)
+
     r = TestClient(app).post("/evaluate-meet", json={"meet_id": mid})
+
     assert r.status_code == 200
-    assert r.json()["status"] == "success"
+    assert r.json()["evaluation_id"] == "eval-test-1"
+    assert "Email de match encolado" in r.json()["message"]
+    assert sent == []
+    release.set()
+    assert effects.drain(timeout=5)
+    assert sent == [_client()["email"]]
+    assert audits[0]["metadata"]["email_queued"] is True
+    effects.shutdown()
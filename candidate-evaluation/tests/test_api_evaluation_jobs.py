@@ -1,5 +1,9 @@
 """Evaluation jobs worker API."""
 
+import asyncio
+import time
+from datetime import datetime
+
 import pytest
 from fastapi.testclient import TestClient
 
@@ -20,10 +24,13 @@ class _Exec:
 class _UpdateEq:
     def __init__(self, updates):
         self.updates = updates
+        self.filters = {}
 
     def eq(self, column, value):
-        self.column = column
-        self.value = value
+        self.filters[column] = value
+        return self
+
+    def execute(self):
         return _Exec([])
 
 
@@ -77,7 +84,7 @@ def test_process_evaluation_jobs_marks_claimed_job_completed(monkeypatch):
 
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_client", lambda _url, _key: fake_supabase)
+    monkeypatch.setattr(api_module, "get_client", lambda _url, _key: fake_supabase)
     monkeypatch.setattr(api_module, "evaluate_single_meet", _fake_evaluate)
 
     response = TestClient(app).post("/evaluation-jobs/process", json={"limit": 1, "worker_id": "worker-test"})
@@ -105,7 +112,7 @@ def test_process_evaluation_jobs_marks_failed_job_retryable(monkeypatch):
 
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_client", lambda _url, _key: fake_supabase)
+    monkeypatch.setattr(api_module, "get_client", lambda _url, _key: fake_supabase)
     monkeypatch.setattr(api_module, "evaluate_single_meet", _fake_evaluate)
 
     response = TestClient(app).post("/evaluation-jobs/process", json={"limit": 1})
@@ -125,10 +132,107 @@ def test_retry_evaluation_job_queues_retry(monkeypatch):
 
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(api_module, "create_client", lambda _url, _key: fake_supabase)
+    monkeypatch.setattr(api_module, "get_client", lambda _url, _key: fake_supabase)
 
     response = TestClient(app).post("/evaluation-jobs/job-3/retry")
 
     assert response.status_code == 200
     assert response.json()["job"] == retry_job
     assert fake_supabase.rpc_calls[0] == ("retry_evaluation_job", {"p_job_id": "job-3"})
+
+
+def _jobs(n):
+    return [
+        {"id": f"job-{i}", "meet_id": f"550e8400-e29b-41d4-a716-44665544000{i}", "attempts": 0, "max_attempts": 5}
+        for i in range(n)
+    ]
+
+
+def _success(meet_id):
+    return AnalysisResponse(
+        status="success",
+        message=f"evaluated {meet_id}",
+        timestamp="2026-04-29T00:00:00",
+        execution_time="0:00:01",
+        result={},
+        evaluation_id=f"eval-{meet_id[-1]}",
+    )
+
+
+def _patch_supabase(monkeypatch, fake_supabase):
+    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
+    monkeypatch.setenv("SUPABASE_KEY", "secret")
+    monkeypatch.setattr(api_module, "get_client", lambda _url, _key: fake_supabase)
+
+
+def test_process_evaluation_jobs_runs_claimed_jobs_concurrently(monkeypatch):
+    fake_supabase = _SupabaseJobs(_jobs(4))
+    running = {"now": 0, "max": 0}
+
+    async def _fake_evaluate(request):
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.05)
+        running["now"] -= 1
+        return _success(request.meet_id)
+
+    _patch_supabase(monkeypatch, fake_supabase)
+    monkeypatch.setattr(api_module, "evaluate_single_meet", _fake_evaluate)
+
+    response = TestClient(app).post("/evaluation-jobs/process", json={"limit": 4, "concurrency": 2})
+
+    body = response.json()
+    assert body["concurrency"] == 2
+    assert running["max"] == 2
+    assert [p["job_id"] for p in body["processed"]] == ["job-0", "job-1", "job-2", "job-3"]
+    assert all(p["status"] == "completed" for p in body["processed"])
+
+
+def test_process_evaluation_jobs_timeout_releases_job_and_drops_late_result(monkeypatch):
+    fake_supabase = _SupabaseJobs(_jobs(1))
+    late = {"finished": False}
+
+    async def _slow_evaluate(request):
+        await asyncio.sleep(5)
+        late["finished"] = True
+        return _success(request.meet_id)
+
+    _patch_supabase(monkeypatch, fake_supabase)
+    monkeypatch.setattr(api_module, "evaluate_single_meet", _slow_evaluate)
+    monkeypatch.setattr(api_module, "_evaluation_job_lock_renew_interval", lambda _minutes: 0.02)
+
+    response = TestClient(app).post(
+        "/evaluation-jobs/process", json={"limit": 1, "job_timeout_seconds": 0.1, "worker_id": "w"}
+    )
+
+    processed = response.json()["processed"][0]
+    assert processed["status"] == "failed"
+    assert "timeout" in processed["error"]
+    assert processed["will_retry"] is True
+    assert processed["next_run_at"] > datetime.now().isoformat()
+    failed = fake_supabase.updates[-1]
+    assert (failed["status"], failed["locked_at"], failed["locked_by"]) == ("failed", None, None)
+    # El lock se renovó mientras corría y no después del timeout; el resultado tardío no se guarda
+    time.sleep(0.1)
+    assert fake_supabase.updates[-1] is failed
+    assert all(u.get("status") != "completed" for u in fake_supabase.updates)
+    assert late["finished"] is False
+
+
+def test_process_evaluation_jobs_renews_lock_while_job_runs(monkeypatch):
+    fake_supabase = _SupabaseJobs(_jobs(1))
+
+    async def _fake_evaluate(request):
+        await asyncio.sleep(0.2)
+        return _success(request.meet_id)
+
+    _patch_supabase(monkeypatch, fake_supabase)
+    monkeypatch.setattr(api_module, "evaluate_single_meet", _fake_evaluate)
+    monkeypatch.setattr(api_module, "_evaluation_job_lock_renew_interval", lambda _minutes: 0.03)
+
+    response = TestClient(app).post("/evaluation-jobs/process", json={"limit": 1, "worker_id": "worker-renew"})
+
+    assert response.json()["processed"][0]["status"] == "completed"
+    renewals = [u for u in fake_supabase.updates if set(u) == {"locked_at"}]
+    assert len(renewals) >= 2
+    assert fake_supabase.updates[-1]["status"] == "completed"
@@ -0,0 +1,267 @@
+"""Los handlers async no bloquean el event loop: toda I/O lenta va al threadpool o a colas."""
+
+import asyncio
+import gc
+import json
+import time
+
+import pytest
+
+pytest.importorskip("boto3")
+
+import api as api_module  # noqa: E402
+import single_meet_crew  # noqa: E402
+from tools import token_estimator  # noqa: E402
+from utils import audit_log  # noqa: E402
+
+# Cada I/O fake tarda SLOW_IO; si corriera en el loop, el heartbeat vería un hueco de ese orden
+SLOW_IO = 0.3
+MAX_LOOP_STALL = 0.1
+
+
+def _slow(value=None):
+    time.sleep(SLOW_IO)
+    return value
+
+
+async def _max_loop_stall(coro, tick: float = 0.005):
+    """Corre `coro` junto a un heartbeat y devuelve (resultado, mayor retraso del loop en segundos)."""
+    state = {"done": False, "stall": 0.0}
+
+    async def _heartbeat():
+        last = time.perf_counter()
+        while not state["done"]:
+            await asyncio.sleep(tick)
+            now = time.perf_counter()
+            state["stall"] = max(state["stall"], now - last - tick)
+            last = now
+
+    heartbeat = asyncio.create_task(_heartbeat())
+    await asyncio.sleep(0)  # que el heartbeat arranque antes de la primera I/O del handler
+    # Sin GC durante la medición: una pasada gen2 con crewai cargado para el loop ~0.3s y no es I/O
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        result = await coro
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+        state["done"] = True
+        await heartbeat
+    return result, state["stall"]
+
+
+class _SlowExec:
+    def __init__(self, data=None):
+        self.data = data
+
+    def eq(self, *_a):
+        return self
+
+    def execute(self):
+        return _slow(self)
+
+
+class _SlowSupabaseJobs:
+    def __init__(self, jobs=None, retry_job=None):
+        self.jobs = jobs or []
+        self.retry_job = retry_job
+
+    def rpc(self, name, _params):
+        return _SlowExec(self.jobs if name == "claim_evaluation_jobs" else self.retry_job)
+
+    def table(self, _name):
+        return self
+
+    def update(self, _payload):
+        return _SlowExec([])
+
+
+@pytest.fixture
+def slow_audit_writer(monkeypatch, tmp_path):
+    """Audit habilitado con el writer en segundo plano e insert lento."""
+    writer = audit_log.AuditEventWriter(insert_batch=_slow, spool_path=str(tmp_path / "spool.jsonl"))
+    monkeypatch.setenv("AUDIT_LOG_ENABLED", "true")
+    monkeypatch.setenv("AUDIT_LOG_ASYNC", "true")
+    monkeypatch.setattr(audit_log, "_writer", writer)
+    yield writer
+    writer.stop()
+
+
+def _patch_jobs_supabase(monkeypatch, fake):
+    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
+    monkeypatch.setenv("SUPABASE_KEY", "secret")
+    monkeypatch.setattr(api_module, "get_client", lambda _url, _key: fake)
+
+
+def test_process_evaluation_jobs_does_not_block_loop(monkeypatch):
+    job = {"id": "job-1", "meet_id": "550e8400-e29b-41d4-a716-446655440000", "attempts": 0}
+    _patch_jobs_supabase(monkeypatch, _SlowSupabaseJobs(jobs=[job]))
+
+    async def _fake_evaluate(request):
+        return api_module.AnalysisResponse(
+            status="success", message="ok", timestamp="t", execution_time="0", result={}, evaluation_id="e1"
+        )
+
+    monkeypatch.setattr(api_module, "evaluate_single_meet", _fake_evaluate)
+
+    result, stall = asyncio.run(_max_loop_stall(api_module.process_evaluation_jobs(None)))
+
+    assert result["processed"][0]["status"] == "completed"
+    assert stall < MAX_LOOP_STALL
+
+
+def test_retry_evaluation_job_does_not_block_loop(monkeypatch):
+    _patch_jobs_supabase(monkeypatch, _SlowSupabaseJobs(retry_job=[{"id": "job-1", "status": "pending"}]))
+
+    result, stall = asyncio.run(_max_loop_stall(api_module.retry_evaluation_job("job-1")))
+
+    assert result.job == {"id": "job-1", "status": "pending"}
+    assert stall < MAX_LOOP_STALL
+
+
+def test_read_cv_does_not_block_loop(monkeypatch, slow_audit_writer):
+    class _Crew:
+        def kickoff(self):
+            return _slow('{"candidate_payload": {"name": "Ana", "email": "ana@test.example", "tech_stack": []}}')
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test-ak")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test-sk")
+    monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
+    monkeypatch.setattr(api_module, "create_cv_analysis_crew", lambda *a, **k: _Crew())
+    monkeypatch.setattr(api_module, "create_candidate", lambda **_k: _slow('{"success": true, "action": "created"}'))
+
+    result, stall = asyncio.run(_max_loop_stall(api_module.read_cv(api_module.CVRequest(filename="cv.pdf"))))
+
+    assert result.candidate_status == "created"
+    assert stall < MAX_LOOP_STALL
+    assert slow_audit_writer.flush(timeout=5)
+    assert slow_audit_writer.snapshot()["written"] == 1
+
+
+def test_evaluate_meet_does_not_block_loop(monkeypatch, slow_audit_writer):
+    real_encoding_for_model = token_estimator.tiktoken.encoding_for_model
+
+    def _slow_encoding(model):
+        # Primera carga de la codificación: tiktoken puede descargar el archivo BPE
+        return _slow(real_encoding_for_model(model))
+
+    meet_context = {
+        "meet": {"id": "m1"},
+        "candidate": {"id": "c1", "name": "Ana"},
+        "jd_interview": {"id": "j1"},
+        "conversation": {
+            "conversation_data": [
+                {"role": "agent" if i % 2 else "user", "message": f"Turno {i} sobre Python y AWS"} for i in range(40)
+            ]
+        },
+    }
+
+    # Crew real (compacta la conversación con tiktoken); sólo el kickoff contra el LLM es falso
+    monkeypatch.setenv("EVALUATION_EFFECTS_ENABLED", "true")
+    monkeypatch.setenv("CONVERSATION_COMPACTION_ENABLED", "true")
+    # El primer armado construye en Rust las tablas BPE de tiktoken con el GIL tomado (una vez por
+    # proceso, ningún threadpool lo evita): se hace antes de medir
+    single_meet_crew.create_single_meet_evaluation_crew("m0", meet_context=meet_context)
+    monkeypatch.setattr(token_estimator.tiktoken, "encoding_for_model", _slow_encoding)
+    token_estimator._encoding_or_none.cache_clear()
+    monkeypatch.setattr(
+        single_meet_crew.Crew,
+        "kickoff",
+        lambda self: _slow({"meet_id": "m1", "candidate": {"id": "c1"}, "jd_interview": {"id": "j1"}}),
+    )
+    monkeypatch.setattr(api_module, "load_meet_evaluation_context", lambda _mid: _slow(meet_context))
+    monkeypatch.setattr(
+        api_module,
+        "save_meet_evaluation",
+        lambda _json: _slow(json.dumps({"success": True, "evaluation_id": "eval-1", "action": "created"})),
+    )
+
+    request = api_module.SingleMeetRequest(meet_id="550e8400-e29b-41d4-a716-446655440000")
+    result, stall = asyncio.run(_max_loop_stall(api_module.evaluate_single_meet(request)))
+
+    token_estimator._encoding_or_none.cache_clear()
+    assert result.evaluation_id == "eval-1"
+    assert stall < MAX_LOOP_STALL
+    assert api_module.evaluation_effects.drain(timeout=5)
+
+
+def test_match_candidates_does_not_block_loop(monkeypatch, slow_audit_writer):
+    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
+    monkeypatch.setenv("SUPABASE_KEY", "secret")
+    monkeypatch.setattr(api_module, "log_matching_inputs_debug", lambda **_k: None)
+    monkeypatch.setattr(api_module, "run_deterministic_matching", lambda **_k: _slow([]))
+
+    request = api_module.MatchingRequest(user_id="u-loop", client_id="c-loop")
+    response, stall = asyncio.run(_max_loop_stall(api_module.match_candidates(request)))
+
+    assert response.status_code == 202
+    assert stall < MAX_LOOP_STALL
+    run_id = json.loads(response.body)["runId"]
+    deadline = time.monotonic() + 5
+    while api_module.matching_runs.get(run_id, {}).get("status") not in ("done", "error"):
+        assert time.monotonic() < deadline
+        time.sleep(0.02)
+
+
+class _SlowRunStore(dict):
+    """Store de runs con latencia de red (como SupabaseRunStore con MATCHING_RUN_STORE=supabase)."""
+
+    def __getitem__(self, key):
+        return _slow(super().__getitem__(key))
+
+    def __setitem__(self, key, value):
+        _slow()
+        super().__setitem__(key, value)
+
+    def __contains__(self, key):
+        return _slow(super().__contains__(key))
+
+    def get(self, key, default=None):
+        return _slow(super().get(key, default))
+
+
+@pytest.fixture
+def slow_run_store(monkeypatch):
+    store = _SlowRunStore()
+    executor = api_module.MatchingRunExecutor(store, max_workers=1, max_pending=5)
+    monkeypatch.setattr(api_module, "matching_runs", store)
+    monkeypatch.setattr(api_module, "matching_executor", executor)
+    yield store
+    executor.shutdown()
+
+
+def test_match_candidates_with_remote_run_store_does_not_block_loop(monkeypatch, slow_run_store):
+    monkeypatch.setattr(api_module, "do_matching_long_task", lambda *_a, **_k: None)
+
+    request = api_module.MatchingRequest(user_id="u-store", client_id="c-store")
+    response, stall = asyncio.run(_max_loop_stall(api_module.match_candidates(request)))
+
+    assert response.status_code == 202
+    assert stall < MAX_LOOP_STALL
+    assert json.loads(response.body)["runId"] in dict(slow_run_store)
+
+
+def test_match_candidates_coalesced_with_remote_run_store_does_not_block_loop(monkeypatch, slow_run_store):
+    slow_run_store.update({"r-activo": {"status": "running", "runId": "r-activo"}})
+    monkeypatch.setattr(api_module.matching_executor, "submit", lambda *_a, **_k: _slow(("r-activo", True)))
+
+    request = api_module.MatchingRequest(user_id="u-store", client_id="c-store")
+    response, stall = asyncio.run(_max_loop_stall(api_module.match_candidates(request)))
+
+    body = json.loads(response.body)
+    assert (body["runId"], body["status"], body["coalesced"]) == ("r-activo", "running", True)
+    assert stall < MAX_LOOP_STALL
+
+
+def test_get_matching_status_with_remote_run_store_does_not_block_loop(slow_run_store):
+    slow_run_store.update({"r-listo": {"status": "done", "result": {"matches": []}}})
+
+    result, stall = asyncio.run(_max_loop_stall(api_module.get_matching_status("r-listo")))
+
+    assert result == {"status": "done", "result": {"matches": []}}
+    assert stall < MAX_LOOP_STALL
+
+    with pytest.raises(api_module.HTTPException) as exc:
+        asyncio.run(api_module.get_matching_status("r-desconocido"))
+    assert exc.value.status_code == 404
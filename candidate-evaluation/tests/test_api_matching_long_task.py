@@ -117,3 +117,20 @@ def test_do_matching_long_task_logs_matching_inputs_called(monkeypatch):
         assert called == [{"user_id": "u1", "client_id": "c1"}]
     finally:
         matching_runs.pop(rid, None)
+
+
+def test_do_matching_long_task_exposes_engine_stats(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
+    monkeypatch.setenv("SUPABASE_KEY", "secret")
+
+    def _fake_matching(**kw):
+        kw["stats"]["supabase_round_trips"] = 4
+        return []
+
+    monkeypatch.setattr(api_module, "run_deterministic_matching", _fake_matching)
+    rid = "run-stats-t16"
+    try:
+        api_module.do_matching_long_task(rid, None, None)
+        assert matching_runs[rid]["result"]["stats"] == {"supabase_round_trips": 4}
+    finally:
+        matching_runs.pop(rid, None)
@@ -1,5 +1,6 @@
 """Rutas GET /match-candidates/{run_id} (requiere importar api)."""
 
+import threading
 import uuid
 
 import pytest
@@ -60,7 +61,7 @@ def test_match_candidates_status_queued():
 
 
 def test_match_candidates_post_returns_202(monkeypatch):
-    def _noop_task(run_id, user_id, client_id):
+    def _noop_task(run_id, user_id, client_id, full_rebuild=False):
         return None
 
     monkeypatch.setattr(api_module, "do_matching_long_task", _noop_task)
@@ -77,23 +78,58 @@ def test_match_candidates_post_returns_202(monkeypatch):
         matching_runs.pop(rid, None)
 
 
-def test_match_candidates_post_raises_500_when_thread_start_fails(monkeypatch):
+def test_match_candidates_post_raises_500_when_submit_fails(monkeypatch):
     fixed = uuid.UUID("00000000-0000-0000-0000-000000000099")
 
-    class _BadThread:
-        def __init__(self, *_a, **_k):
-            pass
-
-        def start(self):
-            raise RuntimeError("thread boom")
+    def _bad_submit(*_a, **_k):
+        raise RuntimeError("pool boom")
 
     monkeypatch.setattr(api_module.uuid, "uuid4", lambda: fixed)
-    monkeypatch.setattr(api_module.threading, "Thread", lambda *a, **k: _BadThread())
+    monkeypatch.setattr(api_module.matching_executor, "submit", _bad_submit)
     try:
         client = TestClient(app)
         r = client.post("/match-candidates", json={})
         assert r.status_code == 500
         detail = r.json().get("detail", "")
-        assert "thread boom" in detail or "Error iniciando matching" in detail
+        assert "pool boom" in detail or "Error iniciando matching" in detail
     finally:
         matching_runs.pop(str(fixed), None)
+
+
+def test_match_candidates_post_coalesces_identical_active_run(monkeypatch):
+    release = threading.Event()
+
+    def _blocking_task(run_id, user_id, client_id, full_rebuild=False):
+        release.wait(5)
+
+    monkeypatch.setattr(api_module, "do_matching_long_task", _blocking_task)
+    client = TestClient(app)
+    first = client.post("/match-candidates", json={"user_id": "u-coal", "client_id": "c-coal"}).json()
+    second = client.post("/match-candidates", json={"user_id": "u-coal", "client_id": "c-coal"}).json()
+    other = client.post("/match-candidates", json={"user_id": "u-coal", "client_id": "c-otro"}).json()
+    rebuild = client.post(
+        "/match-candidates", json={"user_id": "u-coal", "client_id": "c-coal", "full_rebuild": True}
+    ).json()
+    release.set()
+    try:
+        assert first["coalesced"] is False
+        assert second["runId"] == first["runId"]
+        assert second["coalesced"] is True
+        assert other["runId"] != first["runId"]
+        # Un full_rebuild no se resuelve con el run incremental en curso
+        assert rebuild["coalesced"] is False
+        assert rebuild["runId"] != first["runId"]
+    finally:
+        for run in (first, other, rebuild):
+            matching_runs.pop(run["runId"], None)
+
+
+def test_match_candidates_post_returns_429_when_queue_full(monkeypatch):
+    def _full(*_a, **_k):
+        raise api_module.MatchingQueueFullError("Cola de matching llena (20/20 runs en curso)")
+
+    monkeypatch.setattr(api_module.matching_executor, "submit", _full)
+    client = TestClient(app)
+    r = client.post("/match-candidates", json={})
+    assert r.status_code == 429
+    assert "Cola de matching llena" in r.json()["detail"]
@@ -1,7 +1,6 @@
 """POST /read-cv con crew y threadpool mockeados."""
 
 import json
-import re
 
 import pytest
 from fastapi.testclient import TestClient
@@ -311,7 +310,7 @@ def test_read_cv_skips_invalid_json_block_then_uses_valid(monkeypatch):
 
 
 def test_read_cv_swallows_exception_in_candidate_json_parse_block(monkeypatch):
-    """Si `re.findall` lanza, el `except` externo ignora (263–265)."""
+    """Si el extractor de JSON lanza, el `except` externo lo ignora."""
     monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test-ak")
     monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test-sk")
     monkeypatch.setenv("OPENAI_API_KEY", "test-openai")
@@ -323,9 +322,9 @@ def test_read_cv_swallows_exception_in_candidate_json_parse_block(monkeypatch):
     monkeypatch.setattr(api_module, "run_in_threadpool", _run_pool)
 
     def _boom(*_a, **_k):
-        raise RuntimeError("finditer boom")
+        raise RuntimeError("extractor boom")
 
-    monkeypatch.setattr(re, "finditer", _boom)
+    monkeypatch.setattr(api_module, "iter_json_objects", _boom)
     client = TestClient(app)
     r = client.post("/read-cv", json={"filename": "folder/cv.pdf"})
     assert r.status_code == 200
@@ -202,3 +202,95 @@ def test_record_cv_candidate_audit_event_maps_failed_events(monkeypatch):
     assert captured["resource_type"] == "cv"
     assert captured["resource_id"] == "folder/cv.pdf"
     assert captured["error_message"] == "boom"
+
+
+class _RecordingInsert:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def __call__(self, payloads):
+        if self.fail:
+            raise RuntimeError("supabase down")
+        self.batches.append(list(payloads))
+
+
+def _writer(insert, tmp_path, **kwargs):
+    kwargs.setdefault("flush_interval_seconds", 0.05)
+    return audit_log.AuditEventWriter(insert_batch=insert, spool_path=str(tmp_path / "spool.jsonl"), **kwargs)
+
+
+def test_record_audit_event_enqueues_for_background_writer(monkeypatch, tmp_path):
+    insert = _RecordingInsert()
+    writer = _writer(insert, tmp_path)
+    monkeypatch.setenv("AUDIT_LOG_ENABLED", "true")
+    monkeypatch.setenv("AUDIT_LOG_ASYNC", "true")
+    monkeypatch.setattr(audit_log, "_writer", writer)
+
+    recorded = audit_log.record_audit_event(
+        action="candidate_evaluation_completed", status="success", metadata={"api_key": "secret"}
+    )
+
+    assert recorded is True
+    assert writer.flush(timeout=2)
+    writer.stop()
+    assert insert.batches[0][0]["metadata"]["api_key"] == "***"
+    assert audit_log.audit_writer_stats()["written"] == 1
+
+
+def test_writer_batches_by_size(tmp_path):
+    insert = _RecordingInsert()
+    writer = _writer(insert, tmp_path, batch_size=3, flush_interval_seconds=5)
+
+    for i in range(6):
+        assert writer.enqueue({"action": f"a{i}"}) is True
+
+    assert writer.flush(timeout=2)
+    writer.stop()
+    assert [len(batch) for batch in insert.batches] == [3, 3]
+    assert writer.snapshot()["written"] == 6
+
+
+def test_writer_flushes_partial_batch_after_interval(tmp_path):
+    insert = _RecordingInsert()
+    writer = _writer(insert, tmp_path, batch_size=50)
+
+    writer.enqueue({"action": "solo"})
+
+    assert writer.flush(timeout=2)
+    writer.stop()
+    assert insert.batches == [[{"action": "solo"}]]
+
+
+def test_writer_spools_failed_batch_and_replays_after_recovery(tmp_path):
+    insert = _RecordingInsert(fail=True)
+    writer = _writer(insert, tmp_path)
+
+    writer.enqueue({"action": "perdido"})
+    assert writer.flush(timeout=2)
+    spool = tmp_path / "spool.jsonl"
+    assert spool.read_text(encoding="utf-8").strip() == '{"action": "perdido"}'
+    assert writer.snapshot()["spooled"] == 1
+    assert writer.snapshot()["flush_errors"] == 1
+
+    insert.fail = False
+    writer.enqueue({"action": "nuevo"})
+    assert writer.flush(timeout=2)
+    writer.stop()
+
+    assert insert.batches == [[{"action": "nuevo"}], [{"action": "perdido"}]]
+    assert not spool.exists()
+    assert writer.snapshot()["replayed"] == 1
+
+
+def test_writer_drops_events_when_queue_is_full(tmp_path):
+    writer = _writer(_RecordingInsert(), tmp_path, max_queue=2)
+    writer._ensure_started = lambda: None  # sin hilo: la cola no se vacía
+
+    assert writer.enqueue({"action": "a"}) is True
+    assert writer.enqueue({"action": "b"}) is True
+    assert writer.enqueue({"action": "c"}) is False
+
+    stats = writer.snapshot()
+    assert stats["queue_depth"] == 2
+    assert stats["dropped"] == 1
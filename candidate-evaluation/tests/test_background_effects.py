@@ -0,0 +1,88 @@
+"""Tests del pipeline de side effects post-evaluación (utils.background_effects)."""
+
+import threading
+
+from utils import background_effects
+from utils.background_effects import BackgroundEffects
+
+
+def _effects(monkeypatch, **kwargs):
+    monkeypatch.setenv("EVALUATION_EFFECTS_ENABLED", "true")
+    sleeps = []
+    effects = BackgroundEffects(sleep=sleeps.append, **kwargs)
+    return effects, sleeps
+
+
+def test_side_effect_runs_in_background_and_drain_waits(monkeypatch):
+    effects, _ = _effects(monkeypatch)
+    release = threading.Event()
+    done = []
+
+    def _slow(value):
+        release.wait(2)
+        done.append(value)
+
+    future = effects.submit("slow", _slow, "ok")
+
+    assert not future.done()
+    assert effects.drain(timeout=0.01) is False
+    release.set()
+    assert effects.drain(timeout=2) is True
+    assert done == ["ok"]
+    assert effects.stats["succeeded"] == 1
+    effects.shutdown()
+
+
+def test_failing_side_effect_is_retried_with_exponential_backoff(monkeypatch):
+    effects, sleeps = _effects(monkeypatch, max_attempts=3, retry_base_seconds=0.5)
+    attempts = []
+
+    def _flaky():
+        attempts.append(1)
+        if len(attempts) < 3:
+            raise ConnectionError("email api caída")
+        return "sent"
+
+    assert effects.submit("email", _flaky).result(timeout=2) == "sent"
+    assert len(attempts) == 3
+    assert sleeps == [0.5, 1.0]
+    assert effects.stats == {"submitted": 1, "succeeded": 1, "retried": 2, "failed": 0}
+    effects.shutdown()
+
+
+def test_side_effect_is_dropped_and_logged_after_max_attempts(monkeypatch):
+    errors = []
+    monkeypatch.setattr(background_effects.evaluation_logger, "log_error", lambda _t, msg: errors.append(msg))
+    effects, sleeps = _effects(monkeypatch, max_attempts=2, retry_base_seconds=1)
+
+    def _broken():
+        raise RuntimeError("supabase caído")
+
+    assert effects.submit("audit", _broken).result(timeout=2) is None
+    assert effects.stats["failed"] == 1
+    assert sleeps == [1]
+    assert "audit" in errors[0] and "supabase caído" in errors[0]
+    effects.shutdown()
+
+
+def test_disabled_effects_run_inline(monkeypatch):
+    monkeypatch.setenv("EVALUATION_EFFECTS_ENABLED", "false")
+    effects = BackgroundEffects(sleep=lambda _s: None)
+    caller = threading.current_thread()
+    threads = []
+
+    future = effects.submit("inline", lambda: threads.append(threading.current_thread()))
+
+    assert future.done()
+    assert threads == [caller]
+    assert effects._pool is None
+
+
+def test_from_env_reads_pool_and_retry_settings(monkeypatch):
+    monkeypatch.setenv("EVALUATION_EFFECTS_MAX_WORKERS", "4")
+    monkeypatch.setenv("EVALUATION_EFFECTS_MAX_ATTEMPTS", "5")
+    monkeypatch.setenv("EVALUATION_EFFECTS_RETRY_BASE_SECONDS", "0.25")
+
+    effects = BackgroundEffects.from_env()
+
+    assert (effects.max_workers, effects.max_attempts, effects.retry_base_seconds) == (4, 5, 0.25)
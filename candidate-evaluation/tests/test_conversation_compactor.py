@@ -0,0 +1,141 @@
+"""Tests de la compactación determinística de conversation_data (tools.conversation_compactor)."""
+
+from tools import conversation_compactor
+from tools.conversation_compactor import compact_conversation_data, compact_meet_context
+
+
+def _words(text: str) -> int:
+    return len(text.split())
+
+
+def _elevenlabs_transcript():
+    return [
+        {"role": "agent", "message": "Hola, bienvenido.", "tool_calls": [], "time_in_call_secs": 0},
+        {"role": "agent", "message": None, "tool_calls": [{"tool_name": "lookup"}], "tool_results": [{"ok": 1}]},
+        {"role": "agent", "message": "¿Cuál es tu experiencia con Python?", "time_in_call_secs": 3},
+        {"role": "user", "message": "  ", "time_in_call_secs": 5},
+        {"role": "user", "message": "Cinco años.", "time_in_call_secs": 6},
+        {"role": "user", "message": "Sobre todo con Django.", "time_in_call_secs": 9},
+        {"role": "tool", "message": "resultado interno"},
+    ]
+
+
+def test_compaction_drops_noise_and_merges_same_speaker_turns():
+    compacted, report = compact_conversation_data(_elevenlabs_transcript(), token_budget=0, count=_words)
+
+    assert compacted == [
+        {"role": "agent", "content": "Hola, bienvenido.\n¿Cuál es tu experiencia con Python?"},
+        {"role": "user", "content": "Cinco años.\nSobre todo con Django."},
+    ]
+    assert report["turns_before"] == 7
+    assert report["turns_after"] == 2
+    assert report["dropped_turns"] == 3
+    assert report["merged_turns"] == 2
+    assert report["truncated_turns"] == 0
+    assert report["tokens_after"] < report["tokens_before"]
+
+
+def test_compaction_keeps_messages_dict_shape():
+    data = {"messages": [{"role": "user", "content": "Hola"}, {"role": "user", "content": "otra vez"}], "meta": 1}
+
+    compacted, _report = compact_conversation_data(data, token_budget=0, count=_words)
+
+    assert compacted == {"messages": [{"role": "user", "content": "Hola\notra vez"}], "meta": 1}
+
+
+def test_compaction_keeps_other_conversation_keys():
+    data = {
+        "transcript": [{"role": "agent", "message": "Hola"}, {"role": "user", "message": "Buenas"}],
+        "analysis": {"transcript_summary": "Entrevista breve"},
+        "status": "done",
+    }
+
+    compacted, _report = compact_conversation_data(data, token_budget=0, count=_words)
+
+    assert compacted["analysis"] == {"transcript_summary": "Entrevista breve"}
+    assert compacted["status"] == "done"
+    assert compacted["transcript"] == [{"role": "agent", "content": "Hola"}, {"role": "user", "content": "Buenas"}]
+    assert data["transcript"][0] == {"role": "agent", "message": "Hola"}
+
+
+def test_compaction_leaves_unknown_formats_untouched():
+    compacted, report = compact_conversation_data("texto plano", token_budget=0, count=_words)
+
+    assert compacted == "texto plano"
+    assert report["tokens_before"] == report["tokens_after"]
+
+
+def test_token_budget_keeps_head_and_tail_turns():
+    turns = [{"role": "user" if i % 2 else "agent", "content": f"turno {i} " + "palabra " * 8} for i in range(20)]
+
+    compacted, report = compact_conversation_data(turns, token_budget=60, count=_words)
+
+    assert compacted[0]["content"].startswith("turno 0 ")
+    assert compacted[-1]["content"].startswith("turno 19 ")
+    marker = [t for t in compacted if t["role"] == "system"]
+    assert len(marker) == 1
+    assert f"{report['truncated_turns']} turnos omitidos" in marker[0]["content"]
+    assert report["truncated_turns"] == 20 - (len(compacted) - 1)
+    assert report["tokens_after"] < report["tokens_before"]
+
+
+def test_token_budget_cuts_oversized_opening_turn_and_keeps_candidate_turn():
+    turns = [
+        {"role": "agent", "content": "Presentación " + "x" * 4000},
+        {"role": "user", "content": "Tengo cinco años de experiencia con Python y Django."},
+        {"role": "agent", "content": "Gracias."},
+    ]
+
+    compacted, report = compact_conversation_data(turns, token_budget=200, count=len)
+
+    assert compacted[0]["role"] == "agent"
+    assert compacted[0]["content"].startswith("Presentación xxx")
+    assert compacted[0]["content"].endswith(conversation_compactor.CUT_SUFFIX)
+    candidate = [t for t in compacted if t["role"] == "user"]
+    assert len(candidate) == 1
+    assert candidate[0]["content"].startswith("Tengo cinco años")
+    assert report["truncated_turns"] == 1
+    assert report["tokens_after"] < report["tokens_before"]
+
+
+def test_token_budget_always_keeps_a_candidate_turn():
+    # Cada turno ~13 "tokens": con 30 sólo entrarían el primero y el último, ambos del agente
+    turns = [
+        {"role": "user" if i % 2 else "agent", "content": f"turno {i} " + ("respuesta " if i % 2 else "pregunta ") * 8}
+        for i in range(7)
+    ]
+
+    compacted, report = compact_conversation_data(turns, token_budget=30, count=_words)
+
+    assert compacted[0]["content"].startswith("turno 0 ")
+    assert [t["content"].split()[1] for t in compacted if t["role"] == "user"] == ["1"]
+    markers = [t for t in compacted if t["role"] == "system"]
+    assert sum(int(m["content"].split()[1]) for m in markers) == report["truncated_turns"] == 5
+
+
+def test_token_budget_not_applied_when_conversation_fits():
+    turns = [{"role": "agent", "content": "Hola"}, {"role": "user", "content": "Hola"}]
+
+    compacted, report = compact_conversation_data(turns, token_budget=1000, count=_words)
+
+    assert compacted == turns
+    assert report["truncated_turns"] == 0
+
+
+def test_compact_meet_context_returns_copy(monkeypatch):
+    monkeypatch.setattr(conversation_compactor, "count_tokens", lambda text, _model: _words(text))
+    transcript = _elevenlabs_transcript()
+    context = {"meet": {"id": "m1"}, "conversation": {"id": "c1", "conversation_data": transcript}}
+
+    compacted, report = compact_meet_context(context, token_budget=0)
+
+    assert context["conversation"]["conversation_data"] is transcript
+    assert compacted["conversation"]["id"] == "c1"
+    assert len(compacted["conversation"]["conversation_data"]) == 2
+    assert report["turns_after"] == 2
+
+
+def test_compact_meet_context_skips_errors_and_missing_conversation():
+    assert compact_meet_context({"error": "x"}) == ({"error": "x"}, None)
+    assert compact_meet_context({"meet": {}, "conversation": None}) == ({"meet": {}, "conversation": None}, None)
+    assert compact_meet_context(None) == (None, None)
@@ -1,6 +1,5 @@
 """Smoke de composición de crews (sin ejecutar kickoff)."""
 
-import json
 from unittest.mock import patch
 
 import pytest
@@ -172,12 +171,9 @@ def test_create_single_meet_evaluation_crew_composes(monkeypatch):
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     import single_meet_crew
 
-    class _FakeMeetTool:
-        @staticmethod
-        def func(mid):
-            return json.dumps({"conversation": {}, "jd_interview": {}})
-
-    monkeypatch.setattr(single_meet_crew, "get_meet_evaluation_data", _FakeMeetTool())
+    monkeypatch.setattr(
+        single_meet_crew, "load_meet_evaluation_context", lambda _mid: {"conversation": {}, "jd_interview": {}}
+    )
 
     mid = "550e8400-e29b-41d4-a716-446655440000"
     crew = single_meet_crew.create_single_meet_evaluation_crew(mid)
@@ -185,103 +181,123 @@ def test_create_single_meet_evaluation_crew_composes(monkeypatch):
     assert len(crew.tasks) == 2
 
 
-def _meet_id_smoke():
-    return "550e8400-e29b-41d4-a716-446655440000"
-
-
-def test_single_meet_crew_resolves_via_wrapped(monkeypatch):
+def test_single_meet_crew_uses_prefetched_context_without_tool_call(monkeypatch):
     pytest.importorskip("crewai")
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     import single_meet_crew
 
-    calls = []
+    def _no_fetch(_mid):
+        raise AssertionError("no debería volver a cargar el meet")
 
-    def _inner(*args, **_kwargs):
-        for a in args:
-            if isinstance(a, str) and a.count("-") >= 4:
-                calls.append(a)
-                break
-        return json.dumps({})
+    monkeypatch.setattr(single_meet_crew, "load_meet_evaluation_context", _no_fetch)
+    context = {"meet": {"id": _meet_id_smoke()}, "conversation": {"conversation_data": "Hola"}, "client": None}
 
-    class _W:
-        __wrapped__ = _inner
+    crew = single_meet_crew.create_single_meet_evaluation_crew(_meet_id_smoke(), meet_context=context)
 
-    monkeypatch.setattr(single_meet_crew, "get_meet_evaluation_data", _W())
-    single_meet_crew.create_single_meet_evaluation_crew(_meet_id_smoke())
-    assert calls == [_meet_id_smoke()]
+    extraction = crew.tasks[0].description
+    assert '"conversation_data": "Hola"' in extraction
+    assert "NO llames a get_meet_evaluation_data" in extraction
 
 
-def test_single_meet_crew_resolves_via_underscore_func(monkeypatch):
+def test_single_meet_crew_direct_mode_skips_extraction_task(monkeypatch):
     pytest.importorskip("crewai")
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     import single_meet_crew
 
-    calls = []
+    context = {"meet": {"id": _meet_id_smoke()}, "conversation": {"conversation_data": "Hola"}, "client": None}
 
-    def _inner(*args, **_kwargs):
-        for a in args:
-            if isinstance(a, str) and a.count("-") >= 4:
-                calls.append(a)
-                break
-        return json.dumps({})
+    crew = single_meet_crew.create_single_meet_evaluation_crew(
+        _meet_id_smoke(), meet_context=context, extraction_mode="direct"
+    )
 
-    class _F:
-        _func = _inner
+    assert len(crew.tasks) == 1
+    evaluation = crew.tasks[0]
+    assert '"conversation_data": "Hola"' in evaluation.description
+    assert "START SINGLE_MEET_EVALUATION" in evaluation.description
 
-    monkeypatch.setattr(single_meet_crew, "get_meet_evaluation_data", _F())
-    single_meet_crew.create_single_meet_evaluation_crew(_meet_id_smoke())
-    assert calls == [_meet_id_smoke()]
 
+def test_single_meet_crew_compacts_conversation_for_llm_only(monkeypatch):
+    pytest.importorskip("crewai")
+    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
+    monkeypatch.setenv("SUPABASE_KEY", "secret")
+    monkeypatch.delenv("CONVERSATION_COMPACTION_ENABLED", raising=False)
+    import single_meet_crew
+
+    transcript = [
+        {"role": "agent", "message": "Hola", "tool_calls": [], "time_in_call_secs": 0},
+        {"role": "agent", "message": None, "tool_calls": [{"tool_name": "lookup"}]},
+        {"role": "user", "message": "Buenas", "time_in_call_secs": 2},
+    ]
+    context = {"meet": {"id": _meet_id_smoke()}, "conversation": {"conversation_data": transcript}}
 
-def test_single_meet_crew_resolves_plain_callable(monkeypatch):
+    crew = single_meet_crew.create_single_meet_evaluation_crew(
+        _meet_id_smoke(), meet_context=context, extraction_mode="direct"
+    )
+
+    description = crew.tasks[0].description
+    assert "time_in_call_secs" not in description
+    assert '"content": "Buenas"' in description
+    assert context["conversation"]["conversation_data"] is transcript
+
+
+def test_resolve_extraction_mode_env_default_and_fallback(monkeypatch):
     pytest.importorskip("crewai")
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     import single_meet_crew
 
-    calls = []
+    context = {"meet": {"id": "m"}}
+    monkeypatch.delenv("SINGLE_MEET_EXTRACTION_MODE", raising=False)
+    assert single_meet_crew.resolve_extraction_mode(None, context) == "llm"
+    monkeypatch.setenv("SINGLE_MEET_EXTRACTION_MODE", "Direct")
+    assert single_meet_crew.resolve_extraction_mode(None, context) == "direct"
+    assert single_meet_crew.resolve_extraction_mode("llm", context) == "llm"
+    assert single_meet_crew.resolve_extraction_mode("direct", {"error": "x"}) == "llm"
+    assert single_meet_crew.resolve_extraction_mode("direct", None) == "llm"
+    monkeypatch.setenv("SINGLE_MEET_EXTRACTION_MODE", "otro")
+    assert single_meet_crew.resolve_extraction_mode(None, context) == "llm"
 
-    def _bare(mid):
-        calls.append(mid)
-        return json.dumps({})
 
-    monkeypatch.setattr(single_meet_crew, "get_meet_evaluation_data", _bare)
-    single_meet_crew.create_single_meet_evaluation_crew(_meet_id_smoke())
-    assert calls == [_meet_id_smoke()]
+def _meet_id_smoke():
+    return "550e8400-e29b-41d4-a716-446655440000"
 
 
-def test_single_meet_crew_probe_no_callable(monkeypatch, capsys):
+def test_single_meet_crew_loads_context_when_not_prefetched(monkeypatch):
     pytest.importorskip("crewai")
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     import single_meet_crew
 
-    class _No:
-        name = "meet_tool"
+    calls = []
 
-    monkeypatch.setattr(single_meet_crew, "get_meet_evaluation_data", _No())
-    single_meet_crew.create_single_meet_evaluation_crew(_meet_id_smoke())
-    out = capsys.readouterr().out
-    assert "No se pudo acceder" in out
+    def _load(mid):
+        calls.append(mid)
+        return {"meet": {"id": mid}, "conversation": {"conversation_data": "Hola"}}
+
+    monkeypatch.setattr(single_meet_crew, "load_meet_evaluation_context", _load)
+    crew = single_meet_crew.create_single_meet_evaluation_crew(_meet_id_smoke())
+    assert calls == [_meet_id_smoke()]
+    assert '"conversation_data": "Hola"' in crew.tasks[0].description
 
 
-def test_single_meet_crew_probe_raises(monkeypatch, capsys):
+def test_single_meet_crew_load_failure_is_logged(monkeypatch):
     pytest.importorskip("crewai")
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     import single_meet_crew
 
+    errors = []
+
     def _boom(mid):
         raise RuntimeError("meet probe")
 
-    monkeypatch.setattr(single_meet_crew, "get_meet_evaluation_data", _boom)
+    monkeypatch.setattr(single_meet_crew, "load_meet_evaluation_context", _boom)
+    monkeypatch.setattr(single_meet_crew.evaluation_logger, "log_error", lambda _t, msg: errors.append(msg))
     crew = single_meet_crew.create_single_meet_evaluation_crew(_meet_id_smoke())
     assert len(crew.tasks) == 2
-    captured = capsys.readouterr()
-    text = captured.out + captured.err
-    assert "meet probe" in text or "Error al probar" in text
+    assert any("meet probe" in e for e in errors)
 
 
 def test_matching_crew_kickoff_patched_on_crew_class(monkeypatch):
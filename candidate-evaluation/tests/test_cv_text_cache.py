@@ -0,0 +1,121 @@
+"""Tests unitarios de utils.cv_text_cache (texto extraído de CVs por bucket/key/ETag)."""
+
+from types import SimpleNamespace
+
+from utils import cv_text_cache
+from utils.cv_text_cache import CVTextCache, cache_key
+
+
+def test_cache_key_requires_etag_and_includes_extractor_version():
+    assert cache_key("bucket", "cvs/a.pdf", None) is None
+    assert cache_key("bucket", "cvs/a.pdf", '""') is None
+
+    key = cache_key("bucket", "cvs/a.pdf", '"abc123"')
+    assert key == f"v{cv_text_cache.CV_TEXT_EXTRACTOR_VERSION}:bucket/cvs/a.pdf@abc123"
+    assert key != cache_key("bucket", "cvs/a.pdf", '"abc124"')
+
+
+def test_cache_roundtrip_persists_across_instances(tmp_path):
+    path = str(tmp_path / "nested" / "cv.sqlite3")
+    first = CVTextCache(path)
+    first.put("k1", "Texto del CV", {"file_type": "pdf", "extraction": {"method": "pypdf2"}})
+    first.close()
+
+    entry = CVTextCache(path).get("k1")
+
+    assert entry == {
+        "text_content": "Texto del CV",
+        "metadata": {"file_type": "pdf", "extraction": {"method": "pypdf2"}},
+    }
+    assert CVTextCache(path).get("k2") is None
+
+
+def test_cache_evicts_least_recently_used_entries_by_size(tmp_path):
+    cache = CVTextCache(str(tmp_path / "cv.sqlite3"), max_bytes=250)
+    for key in ("a", "b", "c"):
+        cache.put(key, key * 100, {})
+    assert cache.get("a") is None  # 3 x ~102 bytes > 250: se fue el más viejo
+
+    cache.get("b")  # b pasa a ser el más reciente
+    cache.put("d", "d" * 100, {})
+
+    assert cache.get("c") is None
+    assert cache.get("b") is not None and cache.get("d") is not None
+    assert cache.total_bytes() <= 250
+
+
+def test_entries_larger_than_the_cache_are_not_stored(tmp_path):
+    cache = CVTextCache(str(tmp_path / "cv.sqlite3"), max_bytes=10)
+
+    cache.put("big", "x" * 100, {})
+
+    assert cache.get("big") is None
+
+
+def test_disabled_cache_is_a_miss(monkeypatch, tmp_path):
+    monkeypatch.setenv("CV_TEXT_CACHE_PATH", str(tmp_path / "cv.sqlite3"))
+    monkeypatch.setenv("CV_TEXT_CACHE_ENABLED", "false")
+
+    cv_text_cache.save_cv_text("k", "texto", {})
+
+    assert cv_text_cache.get_cv_text_cache() is None
+    assert cv_text_cache.get_cached_cv_text("k") == (None, None)
+
+
+class _FakeRemoteTable:
+    def __init__(self, store):
+        self.store = store
+        self.filters = {}
+
+    def select(self, _columns):
+        return self
+
+    def eq(self, column, value):
+        self.filters[column] = value
+        return self
+
+    def limit(self, _n):
+        return self
+
+    def upsert(self, payload, on_conflict):
+        assert on_conflict == "cache_key"
+        self.store[payload["cache_key"]] = payload
+        return self
+
+    def execute(self):
+        row = self.store.get(self.filters.get("cache_key"))
+        return SimpleNamespace(data=[row] if row else [])
+
+
+def test_remote_cache_is_shared_and_copied_locally(monkeypatch, tmp_path):
+    store = {}
+    client = SimpleNamespace(table=lambda name: _FakeRemoteTable(store))
+    monkeypatch.setattr(cv_text_cache, "_remote_client", lambda: client)
+    monkeypatch.setenv("CV_TEXT_CACHE_SUPABASE", "true")
+    monkeypatch.setenv("CV_TEXT_CACHE_PATH", str(tmp_path / "instance-a.sqlite3"))
+
+    cv_text_cache.save_cv_text("k", "Texto compartido", {"file_type": "pdf"})
+    assert store["k"]["text_content"] == "Texto compartido"
+
+    # Otra instancia (otro archivo local) lo encuentra en Supabase y lo guarda localmente
+    monkeypatch.setenv("CV_TEXT_CACHE_PATH", str(tmp_path / "instance-b.sqlite3"))
+    entry, source = cv_text_cache.get_cached_cv_text("k")
+    assert source == "supabase"
+    assert entry["text_content"] == "Texto compartido"
+
+    store.clear()
+    entry, source = cv_text_cache.get_cached_cv_text("k")
+    assert source == "local"
+    assert entry["metadata"] == {"file_type": "pdf"}
+
+
+def test_get_cached_etag_returns_last_extracted_version(monkeypatch, tmp_path):
+    monkeypatch.setenv("CV_TEXT_CACHE_PATH", str(tmp_path / "cv.sqlite3"))
+    assert cv_text_cache.get_cached_etag("bucket", "cvs/a.pdf") is None
+
+    cv_text_cache.save_cv_text(cache_key("bucket", "cvs/a.pdf", '"old"'), "v1", {})
+    cv_text_cache.save_cv_text(cache_key("bucket", "cvs/a.pdf", '"new"'), "v2", {})
+    cv_text_cache.save_cv_text(cache_key("bucket", "cvs/b.pdf", '"other"'), "b", {})
+
+    assert cv_text_cache.get_cached_etag("bucket", "cvs/a.pdf") == '"new"'
+    assert cv_text_cache.get_cached_etag("other-bucket", "cvs/a.pdf") is None
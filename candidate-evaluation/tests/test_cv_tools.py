@@ -2,6 +2,7 @@
 
 import io
 import json
+import re
 
 import pytest
 
@@ -54,11 +55,34 @@ def test_get_s3_client_returns_boto_client(monkeypatch):
         assert service == "s3"
         return _FakeS3()
 
+    monkeypatch.setattr(cv_tools, "_s3_clients", {})
     monkeypatch.setattr(cv_tools.boto3, "client", _fake_client)
     client = cv_tools._get_s3_client()
     assert isinstance(client, _FakeS3)
 
 
+def test_get_s3_client_is_reused_per_credentials(monkeypatch):
+    from tools import cv_tools
+
+    created = []
+
+    def _fake_client(service, **kwargs):
+        created.append(kwargs["aws_access_key_id"])
+        return object()
+
+    monkeypatch.setattr(cv_tools, "_s3_clients", {})
+    monkeypatch.setattr(cv_tools.boto3, "client", _fake_client)
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "secretkey")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIAONE")
+
+    first = cv_tools._get_s3_client()
+    assert cv_tools._get_s3_client() is first
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "AKIATWO")
+    assert cv_tools._get_s3_client() is not first
+    assert created == ["AKIAONE", "AKIATWO"]
+
+
 def test_extract_text_from_docx_reads_paragraphs():
     from docx import Document
 
@@ -169,7 +193,7 @@ def test_extract_text_from_pdf_uses_pypdf2_when_plumber_empty(monkeypatch):
     monkeypatch.setattr(cv_tools.pdfplumber, "open", lambda _b: _EmptyPdf())
     monkeypatch.setattr(cv_tools, "PdfReader", lambda _b: _PyReader())
     monkeypatch.setattr(cv_tools, "pdfminer_extract_text", lambda _b: "")
-    monkeypatch.setattr(cv_tools, "_extract_text_from_pdf_with_textract", lambda _b: "")
+    monkeypatch.setattr(cv_tools, "_textract_pdf_pages", lambda _b: ("", []))
 
     assert cv_tools._extract_text_from_pdf(b"%PDF-1.4 x") == "Texto PyPDF2"
 
@@ -196,7 +220,7 @@ def test_extract_text_from_pdf_uses_pdfminer_when_plumber_and_pypdf_empty(monkey
     monkeypatch.setattr(cv_tools.pdfplumber, "open", lambda _b: _EmptyPdf())
     monkeypatch.setattr(cv_tools, "PdfReader", lambda _b: _PyReader())
     monkeypatch.setattr(cv_tools, "pdfminer_extract_text", lambda _b: "  salida pdfminer  ")
-    monkeypatch.setattr(cv_tools, "_extract_text_from_pdf_with_textract", lambda _b: "")
+    monkeypatch.setattr(cv_tools, "_textract_pdf_pages", lambda _b: ("", []))
 
     assert cv_tools._extract_text_from_pdf(b"%PDF-1.4 y") == "salida pdfminer"
 
@@ -225,7 +249,7 @@ def test_extract_text_from_pdf_raises_when_all_methods_fail(monkeypatch):
     monkeypatch.setattr(cv_tools, "pdfminer_extract_text", lambda _b: "")
     monkeypatch.setattr(
         cv_tools,
-        "_extract_text_from_pdf_with_textract",
+        "_textract_pdf_pages",
         lambda _b: (_ for _ in ()).throw(RuntimeError("textract off")),
     )
 
@@ -233,6 +257,128 @@ def test_extract_text_from_pdf_raises_when_all_methods_fail(monkeypatch):
         cv_tools._extract_text_from_pdf(b"%PDF-1.4 dead")
 
 
+def _no_call(name):
+    def _fail(*_a, **_k):
+        raise AssertionError(f"{name} no debería llamarse")
+
+    return _fail
+
+
+def test_extract_pdf_text_text_layer_uses_pypdf2_only(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    line = "Desarrolladora Python con experiencia en AWS, Django y PostgreSQL. " * 4
+    monkeypatch.setattr(cv_tools.pdfplumber, "open", _no_call("pdfplumber"))
+    monkeypatch.setattr(cv_tools, "_textract_pdf_pages", _no_call("textract"))
+
+    extraction = cv_tools.extract_pdf_text(text_pdf([line, line]))
+
+    assert extraction.method == "pypdf2"
+    assert extraction.probe.pages == 2
+    assert extraction.probe.has_text_layer is True
+    assert extraction.text.count("Desarrolladora Python") == 8
+    assert [a["method"] for a in extraction.attempts] == ["pypdf2"]
+
+
+def _blank_pdf() -> bytes:
+    from PyPDF2 import PdfWriter
+
+    writer = PdfWriter()
+    writer.add_blank_page(612, 792)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def test_extract_pdf_text_without_text_layer_tries_pypdf2_then_ocr(monkeypatch):
+    from tools import cv_tools
+
+    monkeypatch.setattr(cv_tools.pdfplumber, "open", _no_call("pdfplumber"))
+    monkeypatch.setattr(cv_tools, "pdfminer_extract_text", _no_call("pdfminer"))
+    monkeypatch.setattr(cv_tools, "_textract_pdf_pages", lambda _b: ("Texto OCR del escaneo", []))
+
+    extraction = cv_tools.extract_pdf_text(_blank_pdf())
+
+    assert extraction.method == "textract"
+    assert extraction.text == "Texto OCR del escaneo"
+    assert [a["method"] for a in extraction.attempts] == ["text_layer", "pypdf2", "textract"]
+
+
+def test_extract_pdf_text_without_text_layer_falls_back_when_textract_fails(monkeypatch):
+    from tools import cv_tools
+
+    monkeypatch.setattr(cv_tools.pdfplumber, "open", lambda _b: (_ for _ in ()).throw(RuntimeError("plumber roto")))
+    monkeypatch.setattr(cv_tools, "pdfminer_extract_text", lambda _b: "Ana Perez - Backend Python")
+    monkeypatch.setattr(
+        cv_tools,
+        "_textract_pdf_pages",
+        lambda _b: (_ for _ in ()).throw(RuntimeError("Acceso denegado a AWS Textract")),
+    )
+
+    extraction = cv_tools.extract_pdf_text(_blank_pdf())
+
+    assert extraction.method == "pdfminer"
+    assert extraction.text == "Ana Perez - Backend Python"
+    assert [a["method"] for a in extraction.attempts] == ["text_layer", "pypdf2", "textract", "pdfplumber", "pdfminer"]
+    assert "error" in extraction.attempts[2]
+
+
+def test_extract_pdf_text_escalates_when_text_is_garbage(monkeypatch):
+    from tools import cv_tools
+
+    class _Page:
+        def __init__(self, text):
+            self.text = text
+
+        def extract_text(self):
+            return self.text
+
+    class _Pdf:
+        pages = [_Page("Ingeniera de datos, Spark, Airflow y dbt. " * 6)]
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *a):
+            return False
+
+    class _Reader:
+        pages = [_Page("(cid:12)(cid:7)(cid:3) " * 40)]
+
+    monkeypatch.setattr(cv_tools, "PdfReader", lambda _b: _Reader())
+    monkeypatch.setattr(cv_tools.pdfplumber, "open", lambda _b: _Pdf())
+    monkeypatch.setattr(cv_tools, "_textract_pdf_pages", _no_call("textract"))
+
+    extraction = cv_tools.extract_pdf_text(b"%PDF-1.4 cid")
+
+    assert extraction.method == "pdfplumber"
+    assert extraction.attempts[0]["garbage_ratio"] > cv_tools.PDF_MAX_GARBAGE_RATIO
+    assert extraction.quality["garbage_ratio"] == 0
+
+
+def test_extract_pdf_text_short_usable_text_does_not_trigger_ocr(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    monkeypatch.setattr(cv_tools, "_textract_pdf_pages", _no_call("textract"))
+
+    extraction = cv_tools.extract_pdf_text(text_pdf(["Ana Perez - ana@test.example"]))
+
+    assert extraction.text == "Ana Perez - ana@test.example"
+    assert extraction.method == "pypdf2"
+    assert "textract" not in [a["method"] for a in extraction.attempts]
+    assert extraction.cache_skip_reason == "calidad de texto no adecuada"
+
+
+def test_extract_pdf_text_adequate_complete_text_is_cacheable(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    line = "Desarrolladora Python con experiencia en AWS, Django y PostgreSQL. " * 4
+    extraction = cv_tools.extract_pdf_text(text_pdf([line]))
+
+    assert extraction.cacheable is True
+    assert extraction.metadata()["cacheable"] is True
+
+
 def test_extract_text_from_pdf_with_textract_access_denied(monkeypatch):
     from tools import cv_tools
 
@@ -362,7 +508,7 @@ def test_extract_text_from_pdf_textract_failure_runs_pdfreader_diagnostic(monkey
     monkeypatch.setattr(cv_tools, "pdfminer_extract_text", lambda _b: "")
     monkeypatch.setattr(
         cv_tools,
-        "_extract_text_from_pdf_with_textract",
+        "_textract_pdf_pages",
         lambda _b: (_ for _ in ()).throw(RuntimeError("textract caído")),
     )
 
@@ -402,7 +548,7 @@ def test_extract_text_from_pdf_textract_failure_diagnostic_pdfreader_raises(monk
     monkeypatch.setattr(cv_tools, "pdfminer_extract_text", lambda _b: "")
     monkeypatch.setattr(
         cv_tools,
-        "_extract_text_from_pdf_with_textract",
+        "_textract_pdf_pages",
         lambda _b: (_ for _ in ()).throw(RuntimeError("textract off")),
     )
 
@@ -418,6 +564,157 @@ def test_extract_text_from_pdf_with_textract_file_too_large(monkeypatch):
         cv_tools._extract_text_from_pdf_with_textract(big)
 
 
+class _TextractStub:
+    """Textract local: cada llamada recibe un PDF de una página y devuelve su texto como LINE."""
+
+    def __init__(self, throttle_first=0, delay=0.05):
+        import threading
+
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.throttled = 0
+        self.active = 0
+        self.max_active = 0
+        self.throttle_first = throttle_first
+        self.delay = delay
+
+    def detect_document_text(self, Document):
+        import time
+
+        from PyPDF2 import PdfReader
+
+        with self.lock:
+            self.calls += 1
+            if self.throttled < self.throttle_first:
+                self.throttled += 1
+                raise RuntimeError("An error occurred (ProvisionedThroughputExceededException)")
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delay)
+            reader = PdfReader(io.BytesIO(Document["Bytes"]))
+            assert len(reader.pages) == 1
+            # Texto del operador Tj del content stream (más rápido que extract_text en páginas grandes)
+            text = re.search(rb"\((.*?)\) Tj", reader.pages[0].get_contents().get_data(), re.DOTALL).group(1)
+            return {"Blocks": [{"BlockType": "LINE", "Text": text.decode("latin-1")}]}
+        finally:
+            with self.lock:
+                self.active -= 1
+
+
+def _patch_textract(monkeypatch, stub):
+    from tools import cv_tools
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "k")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "s")
+    monkeypatch.setattr(cv_tools.boto3, "client", lambda _service, **_kw: stub)
+
+
+def test_textract_ocr_splits_pages_and_merges_in_order_with_bounded_concurrency(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    stub = _TextractStub()
+    _patch_textract(monkeypatch, stub)
+    monkeypatch.setenv("TEXTRACT_MAX_CONCURRENCY", "3")
+
+    out = cv_tools._extract_text_from_pdf_with_textract(text_pdf([f"Pagina escaneada {i}" for i in range(7)]))
+
+    assert out.split("\n\n") == [f"Pagina escaneada {i}" for i in range(7)]
+    assert stub.calls == 7
+    assert 1 < stub.max_active <= 3
+
+
+def test_textract_ocr_retries_throttling_with_backoff(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    stub = _TextractStub(throttle_first=3)
+    _patch_textract(monkeypatch, stub)
+
+    out = cv_tools._extract_text_from_pdf_with_textract(text_pdf(["Uno", "Dos"]))
+
+    assert out == "Uno\n\nDos"
+    assert stub.calls == 5
+
+
+def test_textract_client_is_reused_across_ocr_calls(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    stub = _TextractStub(delay=0)
+    created = []
+
+    def _fake_client(service, **kwargs):
+        created.append((service, kwargs["config"].max_pool_connections))
+        return stub
+
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "k")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "s")
+    monkeypatch.setenv("TEXTRACT_MAX_CONCURRENCY", "16")
+    monkeypatch.setattr(cv_tools.boto3, "client", _fake_client)
+
+    cv_tools._extract_text_from_pdf_with_textract(text_pdf(["Uno", "Dos", "Tres"]))
+    cv_tools._extract_text_from_pdf_with_textract(text_pdf(["Cuatro"]))
+
+    assert created == [("textract", 16)]
+    assert stub.calls == 4
+
+
+def test_textract_ocr_large_scanned_pdf_succeeds_when_each_page_fits(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    filler = "x" * (2 * 1024 * 1024)
+    pdf = text_pdf([f"Pagina {i} {filler}" for i in range(3)])
+    assert len(pdf) > cv_tools.TEXTRACT_SYNC_MAX_BYTES
+    stub = _TextractStub(delay=0)
+    _patch_textract(monkeypatch, stub)
+
+    out = cv_tools._extract_text_from_pdf_with_textract(pdf)
+
+    assert [page[:8] for page in out.split("\n\n")] == ["Pagina 0", "Pagina 1", "Pagina 2"]
+
+
+def test_textract_ocr_keeps_pages_that_succeeded(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    stub = _TextractStub(delay=0)
+    real_detect = stub.detect_document_text
+
+    def _detect(Document):
+        result = real_detect(Document)
+        if result["Blocks"][0]["Text"] == "B":
+            raise RuntimeError("InternalServerError")
+        return result
+
+    stub.detect_document_text = _detect
+    _patch_textract(monkeypatch, stub)
+
+    assert cv_tools._extract_text_from_pdf_with_textract(text_pdf(["A", "B", "C"])) == "A\n\nC"
+
+
+def test_textract_failed_page_is_recorded_and_not_cacheable(monkeypatch):
+    from tools import cv_tools
+
+    pages = [f"Pagina escaneada {i} " * 30 for i in range(3)]
+    monkeypatch.setattr(cv_tools, "_split_pdf_pages", lambda _b: [p.encode() for p in pages])
+    monkeypatch.setattr(cv_tools, "_probe_pdf", lambda _f: cv_tools.PdfProbe(pages=3, has_text_layer=False))
+
+    class _Textract:
+        def detect_document_text(self, Document):
+            text = Document["Bytes"].decode()
+            if text.startswith("Pagina escaneada 1"):
+                raise RuntimeError("InternalServerError")
+            return {"Blocks": [{"BlockType": "LINE", "Text": text}]}
+
+    _patch_textract(monkeypatch, _Textract())
+
+    extraction = cv_tools.extract_pdf_text(b"%PDF-1.4 escaneo")
+
+    assert extraction.method == "textract"
+    assert cv_tools._is_adequate(extraction.quality)
+    assert extraction.attempts[-1]["failed_pages"] == [1]
+    assert extraction.cacheable is False
+    assert "OCR" in extraction.cache_skip_reason
+
+
 def test_download_cv_from_s3_docx_success(monkeypatch):
     from docx import Document
 
@@ -429,13 +726,8 @@ def test_download_cv_from_s3_docx_success(monkeypatch):
     doc.save(buf)
     raw = buf.getvalue()
 
-    class _Body:
-        def read(self):
-            return raw
-
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
-    s3.get_object = lambda **kwargs: {"Body": _Body()}
+    s3.get_object = lambda **kwargs: {"Body": io.BytesIO(raw)}
 
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
@@ -448,20 +740,127 @@ def test_download_cv_from_s3_docx_success(monkeypatch):
 def test_download_cv_from_s3_pdf_success(monkeypatch):
     from tools import cv_tools
 
-    class _Body:
-        def read(self):
-            return b"%PDF-1.4"
-
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
-    s3.get_object = lambda **kwargs: {"Body": _Body()}
+    s3.get_object = lambda **kwargs: {"Body": io.BytesIO(b"%PDF-1.4")}
 
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
-    monkeypatch.setattr(cv_tools, "_extract_text_from_pdf", lambda _b: "PDF extraído")
+    monkeypatch.setattr(
+        cv_tools,
+        "extract_pdf_text",
+        lambda _b: cv_tools.PdfExtraction(
+            text="PDF extraído", method="pypdf2", probe=cv_tools.PdfProbe(pages=1), quality={"chars": 12}
+        ),
+    )
 
     out = json.loads(cv_tools.download_cv_from_s3.func("cv.pdf"))
     assert out["success"] is True
     assert out["text_content"] == "PDF extraído"
+    assert out["extraction"]["method"] == "pypdf2"
+    assert out["extraction"]["pages"] == 1
+
+
+def _not_modified():
+    from botocore.exceptions import ClientError
+
+    return ClientError(
+        {"Error": {"Code": "304", "Message": "Not Modified"}, "ResponseMetadata": {"HTTPStatusCode": 304}},
+        "GetObject",
+    )
+
+
+def test_download_cv_from_s3_repeat_read_is_conditional_get_on_cached_etag(monkeypatch):
+    from tools import cv_tools
+
+    state = {"etag": '"etag-1"'}
+    requests, calls = [], {"body": 0, "extract": 0}
+
+    def _get_object(**kwargs):
+        requests.append(kwargs.get("IfNoneMatch"))
+        if kwargs.get("IfNoneMatch") == state["etag"]:
+            raise _not_modified()
+        calls["body"] += 1
+        return {"Body": io.BytesIO(b"%PDF-1.4"), "ETag": state["etag"], "ContentLength": 8}
+
+    def _extract(_b):
+        calls["extract"] += 1
+        return cv_tools.PdfExtraction(
+            text="Texto del CV", method="pypdf2", probe=cv_tools.PdfProbe(pages=1), quality={"chars": 12}
+        )
+
+    s3 = _fake_s3_client()
+    s3.get_object = _get_object
+    monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
+    monkeypatch.setattr(cv_tools, "extract_pdf_text", _extract)
+
+    first = json.loads(cv_tools.download_cv_from_s3.func("cv.pdf"))
+    second = json.loads(cv_tools.download_cv_from_s3.func("cv.pdf"))
+
+    assert requests == [None, '"etag-1"']
+    assert calls == {"body": 1, "extract": 1}
+    assert first["cached"] is None
+    assert second["cached"] == "local"
+    assert second["text_content"] == "Texto del CV"
+    assert second["extraction"]["method"] == "pypdf2"
+
+    state["etag"] = '"etag-2"'
+    third = json.loads(cv_tools.download_cv_from_s3.func("cv.pdf"))
+    assert requests[-1] == '"etag-1"'
+    assert third["cached"] is None
+    assert calls == {"body": 2, "extract": 2}
+
+
+def test_download_cv_from_s3_does_not_cache_uncacheable_extraction(monkeypatch):
+    from tools import cv_tools
+
+    calls = {"extract": 0}
+
+    def _extract(_b):
+        calls["extract"] += 1
+        return cv_tools.PdfExtraction(
+            text="Texto parcial",
+            method="textract",
+            probe=cv_tools.PdfProbe(pages=3),
+            quality={"chars": 13},
+            cache_skip_reason="calidad de texto no adecuada",
+        )
+
+    s3 = _fake_s3_client()
+    s3.get_object = lambda **kwargs: {"Body": io.BytesIO(b"%PDF-1.4"), "ETag": '"etag-1"', "ContentLength": 8}
+    monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
+    monkeypatch.setattr(cv_tools, "extract_pdf_text", _extract)
+
+    first = json.loads(cv_tools.download_cv_from_s3.func("cv.pdf"))
+    second = json.loads(cv_tools.download_cv_from_s3.func("cv.pdf"))
+
+    assert first["extraction"]["cacheable"] is False
+    assert first["extraction"]["cache_skip_reason"] == "calidad de texto no adecuada"
+    assert second["cached"] is None
+    assert calls["extract"] == 2
+
+
+def test_download_cv_from_s3_parses_from_spooled_buffer(monkeypatch, text_pdf):
+    from tools import cv_tools
+
+    raw = text_pdf(["Ada Lovelace ada@example.com Python " * 8])
+    seen = []
+    real_extract = cv_tools.extract_pdf_text
+
+    def _extract(file_content):
+        seen.append(file_content)
+        return real_extract(file_content)
+
+    s3 = _fake_s3_client()
+    s3.get_object = lambda **kwargs: {"Body": io.BytesIO(raw), "ETag": '"e"'}
+    monkeypatch.setenv("CV_DOWNLOAD_SPOOL_BYTES", "64")  # fuerza el paso a archivo temporal
+    monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
+    monkeypatch.setattr(cv_tools, "extract_pdf_text", _extract)
+
+    out = json.loads(cv_tools.download_cv_from_s3.func("cv.pdf"))
+
+    assert out["success"] is True
+    assert "ada@example.com" in out["text_content"]
+    assert not isinstance(seen[0], bytes)
+    assert seen[0].closed
 
 
 def test_download_cv_from_s3_prefix_in_filename(monkeypatch):
@@ -473,13 +872,8 @@ def test_download_cv_from_s3_prefix_in_filename(monkeypatch):
     Document().save(buf)
     raw = buf.getvalue()
 
-    class _Body:
-        def read(self):
-            return raw
-
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
-    s3.get_object = lambda **kwargs: {"Body": _Body()}
+    s3.get_object = lambda **kwargs: {"Body": io.BytesIO(raw)}
 
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
@@ -493,10 +887,10 @@ def test_download_cv_from_s3_no_such_key_returns_json(monkeypatch):
 
     s3 = _fake_s3_client()
 
-    def _head(**_kwargs):
+    def _get(**_kwargs):
         raise s3.exceptions.NoSuchKey()
 
-    s3.head_object = _head
+    s3.get_object = _get
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
     out = json.loads(cv_tools.download_cv_from_s3.func("missing.docx"))
@@ -507,13 +901,8 @@ def test_download_cv_from_s3_no_such_key_returns_json(monkeypatch):
 def test_download_cv_from_s3_empty_file_returns_json(monkeypatch):
     from tools import cv_tools
 
-    class _Body:
-        def read(self):
-            return b""
-
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
-    s3.get_object = lambda **kwargs: {"Body": _Body()}
+    s3.get_object = lambda **kwargs: {"Body": io.BytesIO(b"")}
 
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
@@ -525,13 +914,8 @@ def test_download_cv_from_s3_empty_file_returns_json(monkeypatch):
 def test_download_cv_from_s3_unsupported_format_returns_json(monkeypatch):
     from tools import cv_tools
 
-    class _Body:
-        def read(self):
-            return b"data"
-
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
-    s3.get_object = lambda **kwargs: {"Body": _Body()}
+    s3.get_object = lambda **kwargs: {"Body": io.BytesIO(b"data")}
 
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
@@ -581,7 +965,6 @@ def test_download_cv_from_s3_no_such_bucket_on_get_object(monkeypatch):
     def _get(**_kwargs):
         raise s3.exceptions.NoSuchBucket()
 
-    s3.head_object = lambda **kwargs: {}
     s3.get_object = _get
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
@@ -593,12 +976,7 @@ def test_download_cv_from_s3_no_such_bucket_on_get_object(monkeypatch):
 def test_download_cv_from_s3_access_denied_message(monkeypatch):
     from tools import cv_tools
 
-    class _Body:
-        def read(self):
-            return b"x"
-
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
 
     def _get(**_kwargs):
         raise RuntimeError("AccessDenied: user not allowed")
@@ -615,7 +993,6 @@ def test_download_cv_from_s3_403_message(monkeypatch):
     from tools import cv_tools
 
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
     s3.get_object = lambda **kwargs: (_ for _ in ()).throw(RuntimeError("HTTP 403 Forbidden"))
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
@@ -628,7 +1005,6 @@ def test_download_cv_from_s3_invalid_access_key_message(monkeypatch):
     from tools import cv_tools
 
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
     s3.get_object = lambda **kwargs: (_ for _ in ()).throw(
         RuntimeError("InvalidAccessKeyId: bad key"),
     )
@@ -643,7 +1019,6 @@ def test_download_cv_from_s3_signature_mismatch_message(monkeypatch):
     from tools import cv_tools
 
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
     s3.get_object = lambda **kwargs: (_ for _ in ()).throw(
         RuntimeError("SignatureDoesNotMatch"),
     )
@@ -658,7 +1033,6 @@ def test_download_cv_from_s3_no_such_key_in_error_message(monkeypatch):
     from tools import cv_tools
 
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
     s3.get_object = lambda **kwargs: (_ for _ in ()).throw(
         RuntimeError("NoSuchKey: object gone during read"),
     )
@@ -674,7 +1048,6 @@ def test_download_cv_from_s3_generic_exception_message(monkeypatch):
     from tools import cv_tools
 
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: {}
     s3.get_object = lambda **kwargs: (_ for _ in ()).throw(RuntimeError("network glitch"))
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
@@ -683,16 +1056,61 @@ def test_download_cv_from_s3_generic_exception_message(monkeypatch):
     assert out["error"] == "network glitch"
 
 
-def test_download_cv_from_s3_head_object_wraps_exception(monkeypatch):
+class _TrackedBody(io.BytesIO):
+    def __init__(self, raw: bytes):
+        super().__init__(raw)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+def test_download_cv_from_s3_rejects_declared_size_without_reading(monkeypatch):
     from tools import cv_tools
 
+    body = _TrackedBody(b"x" * 2048)
     s3 = _fake_s3_client()
-    s3.head_object = lambda **kwargs: (_ for _ in ()).throw(RuntimeError("throttle"))
+    s3.get_object = lambda **kwargs: {"Body": body, "ContentLength": 2048}
+    monkeypatch.setenv("CV_MAX_DOWNLOAD_BYTES", "1024")
     monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
 
-    out = json.loads(cv_tools.download_cv_from_s3.func("a.docx"))
+    out = json.loads(cv_tools.download_cv_from_s3.func("big.pdf"))
+
+    assert out["success"] is False
+    assert out["error_type"] == "ValueError"
+    assert "CV_MAX_DOWNLOAD_BYTES" in out["error"]
+    assert body.bytes_read == 0
+    assert body.closed
+
+
+def test_download_cv_from_s3_stops_streaming_past_max_size(monkeypatch):
+    from tools import cv_tools
+
+    body = _TrackedBody(b"x" * (3 * cv_tools._DOWNLOAD_CHUNK_BYTES))
+    s3 = _fake_s3_client()
+    s3.get_object = lambda **kwargs: {"Body": body}  # sin ContentLength
+    monkeypatch.setenv("CV_MAX_DOWNLOAD_BYTES", str(cv_tools._DOWNLOAD_CHUNK_BYTES + 1))
+    monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
+
+    out = json.loads(cv_tools.download_cv_from_s3.func("big.docx"))
+
+    assert out["success"] is False
+    assert "CV_MAX_DOWNLOAD_BYTES" in out["error"]
+    assert body.bytes_read == 2 * cv_tools._DOWNLOAD_CHUNK_BYTES
+
+
+def test_download_cv_from_s3_unsupported_format_is_not_downloaded(monkeypatch):
+    from tools import cv_tools
+
+    s3 = _fake_s3_client()
+    s3.get_object = lambda **kwargs: pytest.fail("no debe descargar formatos no soportados")
+    monkeypatch.setattr(cv_tools, "_get_s3_client", lambda: s3)
+
+    out = json.loads(cv_tools.download_cv_from_s3.func("file.txt"))
     assert out["success"] is False
-    assert "Error verificando objeto en S3" in out["error"]
+    assert "Unsupported file format" in out["error"]
 
 
 def test_extract_candidate_data_suggested_profile_ux_ui():
@@ -0,0 +1,47 @@
+"""Tests unitarios de utils.embedding_cache (cache local de embeddings por modelo y hash)."""
+
+from utils import embedding_cache
+from utils.embedding_cache import EmbeddingCache, content_hash
+
+
+def test_content_hash_is_stable_and_content_sensitive():
+    assert content_hash("Candidato Ana") == content_hash("Candidato Ana")
+    assert content_hash("Candidato Ana") != content_hash("Candidato Ana.")
+
+
+def test_cache_roundtrip_is_keyed_by_model_and_hash(tmp_path):
+    cache = EmbeddingCache(str(tmp_path / "cache.sqlite3"))
+    cache.put("model-a", "h1", [0.1, 0.2])
+
+    assert cache.get("model-a", "h1") == [0.1, 0.2]
+    assert cache.get("model-b", "h1") is None
+    assert cache.get_many("model-a", ["h1", "h2", "h1"]) == {"h1": [0.1, 0.2]}
+
+
+def test_cache_persists_across_instances(tmp_path):
+    path = str(tmp_path / "nested" / "cache.sqlite3")
+    first = EmbeddingCache(path)
+    first.put_many("m", {f"h{i}": [float(i)] for i in range(600)})
+    first.close()
+
+    second = EmbeddingCache(path)
+    found = second.get_many("m", [f"h{i}" for i in range(600)])
+    assert len(found) == 600 and found["h599"] == [599.0]
+
+
+def test_get_embedding_cache_respects_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(tmp_path / "c.sqlite3"))
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "true")
+    cache = embedding_cache.get_embedding_cache()
+    assert cache is embedding_cache.get_embedding_cache()
+    assert cache.path == str(tmp_path / "c.sqlite3")
+
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+    assert embedding_cache.get_embedding_cache() is None
+
+
+def test_get_embedding_cache_returns_none_when_file_cannot_open(monkeypatch, tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("x")
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(blocker / "cache.sqlite3"))
+    assert embedding_cache.get_embedding_cache() is None
@@ -0,0 +1,120 @@
+"""Tests de la caché de evaluaciones por hash de contenido (utils.evaluation_cache)."""
+
+from utils import evaluation_cache
+from utils.evaluation_cache import evaluation_input_hash, get_cached_evaluation, save_cached_evaluation
+
+
+def _context(**overrides):
+    context = {
+        "meet": {"id": "m1"},
+        "jd_interview": {"id": "jd1", "interview_name": "Backend", "job_description": "Python + AWS"},
+        "conversation": {
+            "conversation_data": [{"role": "user", "content": "Hola"}],
+            "emotion_analysis": None,
+            "candidate": {"id": "c1", "tech_stack": ["python"]},
+        },
+        "client": {"email": "x@y.z"},
+    }
+    for key, value in overrides.items():
+        section, field = key.split("__")
+        context[section][field] = value
+    return context
+
+
+class _Query:
+    def __init__(self, table):
+        self.table = table
+        self.filters = {}
+
+    def select(self, *_a):
+        return self
+
+    def eq(self, field, value):
+        self.filters[field] = value
+        return self
+
+    def limit(self, _n):
+        return self
+
+    def upsert(self, row, on_conflict=None):
+        self.table.upserts.append((row, on_conflict))
+        return self
+
+    def execute(self):
+        if self.table.error:
+            raise self.table.error
+        rows = [r for r in self.table.rows if all(r.get(k) == v for k, v in self.filters.items())]
+        return type("R", (), {"data": rows})()
+
+
+class _Supabase:
+    def __init__(self, rows=None, error=None):
+        self.rows = rows or []
+        self.error = error
+        self.upserts = []
+        self.tables = []
+
+    def table(self, name):
+        self.tables.append(name)
+        return _Query(self)
+
+
+def test_input_hash_is_stable_and_ignores_unrelated_fields():
+    base = evaluation_input_hash(_context(), "v1")
+
+    assert base == evaluation_input_hash(_context(), "v1")
+    assert base == evaluation_input_hash(_context(client__email="otro@y.z"), "v1")
+
+
+def test_input_hash_changes_with_inputs_and_version():
+    base = evaluation_input_hash(_context(), "v1")
+
+    assert base != evaluation_input_hash(_context(), "v2")
+    assert base != evaluation_input_hash(_context(jd_interview__job_description="Go"), "v1")
+    assert base != evaluation_input_hash(_context(conversation__emotion_analysis={"prosody": {}}), "v1")
+    changed_stack = _context()
+    changed_stack["conversation"]["candidate"]["tech_stack"] = ["go"]
+    assert base != evaluation_input_hash(changed_stack, "v1")
+
+
+def test_input_hash_is_none_without_usable_context():
+    assert evaluation_input_hash({"error": "x"}, "v1") is None
+    assert evaluation_input_hash(None, "v1") is None
+    assert evaluation_input_hash(_context(conversation__conversation_data=None), "v1") is None
+
+
+def test_get_cached_evaluation_matches_meet_and_hash():
+    supabase = _Supabase(rows=[{"meet_id": "m1", "input_hash": "h1", "evaluation_id": "e1", "result": {"score": 1}}])
+
+    assert get_cached_evaluation(supabase, "m1", "h1") == {"evaluation_id": "e1", "result": {"score": 1}}
+    assert get_cached_evaluation(supabase, "m1", "h2") is None
+    assert supabase.tables == [evaluation_cache.EVALUATION_CACHE_TABLE] * 2
+
+
+def test_cache_errors_are_treated_as_miss(monkeypatch):
+    errors = []
+    monkeypatch.setattr(evaluation_cache.evaluation_logger, "log_error", lambda _t, msg: errors.append(msg))
+    supabase = _Supabase(error=RuntimeError("relation does not exist"))
+
+    assert get_cached_evaluation(supabase, "m1", "h1") is None
+    assert save_cached_evaluation(supabase, "m1", "h1", "e1", {}) is False
+    assert len(errors) == 2
+
+
+def test_save_cached_evaluation_upserts_one_row_per_meet():
+    supabase = _Supabase()
+
+    assert save_cached_evaluation(supabase, "m1", "h1", "e1", {"score": 1}) is True
+
+    row, on_conflict = supabase.upserts[0]
+    assert on_conflict == "meet_id"
+    assert row["input_hash"] == "h1"
+    assert row["evaluation_id"] == "e1"
+    assert row["result"] == {"score": 1}
+
+
+def test_cache_is_opt_in(monkeypatch):
+    monkeypatch.delenv("EVALUATION_CACHE_ENABLED", raising=False)
+    assert evaluation_cache.is_evaluation_cache_enabled() is False
+    monkeypatch.setenv("EVALUATION_CACHE_ENABLED", "on")
+    assert evaluation_cache.is_evaluation_cache_enabled() is True
@@ -0,0 +1,108 @@
+"""Tests del loop residente del worker de evaluation_jobs (utils.evaluation_worker)."""
+
+import asyncio
+
+from utils import evaluation_worker
+from utils.evaluation_worker import EvaluationJobsWorker
+
+
+def _batches(claimed_sequence, worker_ref, on_empty=None):
+    """process_batch falso: devuelve `claimed` de la secuencia y detiene el worker al agotarla."""
+    remaining = list(claimed_sequence)
+    calls = []
+
+    async def _process_batch():
+        calls.append(asyncio.get_running_loop().time())
+        if not remaining:
+            worker_ref[0].request_stop()
+            return {"claimed": 0}
+        return {"claimed": remaining.pop(0)}
+
+    return _process_batch, calls
+
+
+def test_worker_claims_back_to_back_while_queue_has_jobs():
+    ref = []
+    process_batch, calls = _batches([2, 1, 3], ref)
+    worker = EvaluationJobsWorker(process_batch, min_idle_seconds=5, max_idle_seconds=5)
+    ref.append(worker)
+
+    stats = asyncio.run(asyncio.wait_for(worker.run(), timeout=2))
+
+    assert stats["claimed"] == 6
+    assert stats["batches"] == 4
+    assert calls[-1] - calls[0] < 1
+
+
+def test_worker_backs_off_exponentially_when_queue_is_empty():
+    ref = []
+    process_batch, calls = _batches([0, 0, 0, 0], ref)
+    worker = EvaluationJobsWorker(process_batch, min_idle_seconds=0.02, max_idle_seconds=0.08)
+    ref.append(worker)
+
+    asyncio.run(asyncio.wait_for(worker.run(), timeout=2))
+
+    gaps = [b - a for a, b in zip(calls, calls[1:], strict=False)]
+    assert gaps[0] < gaps[1] < gaps[2]
+    assert gaps[3] < 0.08 * 1.5
+
+
+def test_wake_interrupts_idle_backoff():
+    ref = []
+    process_batch, calls = _batches([0], ref)
+    worker = EvaluationJobsWorker(process_batch, min_idle_seconds=30, max_idle_seconds=30)
+    ref.append(worker)
+
+    async def _main():
+        task = asyncio.create_task(worker.run())
+        await asyncio.sleep(0.05)
+        worker.wake_threadsafe()
+        return await asyncio.wait_for(task, timeout=2)
+
+    stats = asyncio.run(_main())
+
+    assert stats["wakeups"] == 1
+    assert len(calls) == 2
+
+
+def test_request_stop_lets_in_flight_batch_finish():
+    finished = []
+    worker = None
+
+    async def _process_batch():
+        worker.request_stop()
+        await asyncio.sleep(0.05)
+        finished.append(True)
+        return {"claimed": 1}
+
+    worker = EvaluationJobsWorker(_process_batch, min_idle_seconds=30)
+    stats = asyncio.run(asyncio.wait_for(worker.run(), timeout=2))
+
+    assert finished == [True]
+    assert stats == {"batches": 1, "claimed": 1, "errors": 0, "wakeups": 0}
+
+
+def test_batch_errors_are_logged_and_loop_continues(monkeypatch):
+    errors = []
+    monkeypatch.setattr(evaluation_worker.evaluation_logger, "log_error", lambda _t, msg: errors.append(msg))
+    attempts = []
+    worker = None
+
+    async def _process_batch():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise RuntimeError("supabase caído")
+        worker.request_stop()
+        return {"claimed": 0}
+
+    worker = EvaluationJobsWorker(_process_batch, min_idle_seconds=0.01)
+    stats = asyncio.run(asyncio.wait_for(worker.run(), timeout=2))
+
+    assert stats["errors"] == 1
+    assert len(attempts) == 2
+    assert "supabase caído" in errors[0]
+
+
+def test_notify_listener_is_optional():
+    assert evaluation_worker.start_notify_listener(None, lambda: None) is None
+    assert evaluation_worker.start_notify_listener("", lambda: None) is None
@@ -0,0 +1,55 @@
+"""Tests del extractor de objetos JSON en salidas de crews (utils.json_extract)."""
+
+import json
+
+from utils.json_extract import extract_json_object, find_json_objects
+
+
+def test_finds_top_level_objects_in_order_with_positions():
+    text = 'Resultado: {"a": 1, "inner": {"b": 2}} y luego {"c": [3, {"d": 4}]} fin'
+
+    matches = find_json_objects(text)
+
+    assert [m.value for m in matches] == [{"a": 1, "inner": {"b": 2}}, {"c": [3, {"d": 4}]}]
+    for m in matches:
+        assert json.loads(text[m.start : m.end]) == m.value
+        assert m.fenced is False
+
+
+def test_braces_inside_strings_do_not_break_objects():
+    text = 'x {"msg": "usa { y } en texto", "esc": "comilla \\" y }"} y'
+
+    (match,) = find_json_objects(text)
+
+    assert match.value == {"msg": "usa { y } en texto", "esc": 'comilla " y }'}
+
+
+def test_invalid_candidates_are_skipped_and_nested_valid_objects_found():
+    text = '{"bad": } {"success": true} { nota: {"ok": 1} } {sin cerrar'
+
+    values = [m.value for m in find_json_objects(text)]
+
+    assert values == [{"success": True}, {"ok": 1}]
+
+
+def test_fenced_block_is_preferred_over_larger_plain_object():
+    plain = {"borrador": "x" * 200}
+    fenced = {"match_evaluation": {"compatibility_score": 80}}
+    text = f"Notas {json.dumps(plain)}\n```json\n{json.dumps(fenced)}\n```\nfin"
+
+    matches = find_json_objects(text)
+
+    assert [m.fenced for m in matches] == [False, True]
+    assert extract_json_object(text) == fenced
+
+
+def test_extract_returns_largest_object_without_fence():
+    text = 'Paso previo {"tool": "ok"} resultado final {"meet_id": "m1", "match_evaluation": {"score": 1}}'
+
+    assert extract_json_object(text) == {"meet_id": "m1", "match_evaluation": {"score": 1}}
+
+
+def test_extract_returns_none_without_objects():
+    assert extract_json_object("") is None
+    assert extract_json_object("sin json [1, 2]") is None
+    assert extract_json_object('{"a": }') is None
@@ -1,7 +1,20 @@
 """Tests unitarios del motor determinístico de matching."""
 
+import json
+
+import pytest
+
 from matching_engine import (
+    MATCHING_CANDIDATE_COLUMNS,
+    _attach_observations,
+    _candidate_fingerprint,
+    _fetch_existing_meets_map,
+    _iter_candidates,
     _jd_requirement_tokens,
+    _match_incremental,
+    _match_indexed,
+    _match_naive,
+    _resolve_matching_mode,
     _score_from_overlap,
     to_canonical,
 )
@@ -27,3 +40,309 @@ def test_jd_tokens_from_stack_and_description():
 def test_score_from_overlap():
     assert _score_from_overlap({"react"}, {"react", "vue"}) >= 30
     assert _score_from_overlap(set(), {"react"}) == 0
+
+
+def _matching_fixture():
+    candidates = [
+        {"id": "c1", "name": "Ana", "tech_stack": '["React", "Node.js", "Docker"]'},
+        {"id": "c2", "name": "Beto", "tech_stack": ["Python", "Django", "Terraform"]},
+        {"id": "c3", "name": "Caro", "tech_stack": ["Figma", "Salesforce"]},
+        {"id": "c4", "name": "Dani", "tech_stack": []},
+        {"id": None, "name": "Sin id", "tech_stack": ["React"]},
+    ]
+    jds = [
+        {"id": "jd1", "interview_name": "Frontend", "tech_stack": "React, TypeScript", "job_description": "SPA"},
+        {"id": "jd2", "interview_name": "Backend", "tech_stack": None, "job_description": "Python + Django + AWS"},
+        {"id": "jd3", "interview_name": "CRM", "tech_stack": "", "job_description": "Admin de Salesforce/figma."},
+        {"id": "jd4", "interview_name": "Infra", "tech_stack": "Docker, Terraform", "job_description": "IaC"},
+        {"id": None, "interview_name": "Sin id", "tech_stack": "React", "job_description": "React"},
+    ]
+    existing = {"jd4": frozenset({"c2"})}
+    return candidates, jds, existing
+
+
+def test_indexed_matching_is_identical_to_naive():
+    candidates, jds, existing = _matching_fixture()
+    naive = _match_naive(candidates, jds, existing)
+    indexed = _match_indexed(candidates, jds, existing)
+    assert json.dumps(indexed) == json.dumps(naive)
+
+    by_candidate = {m["candidate"]["id"]: [i["jd_interviews"]["id"] for i in m["matching_interviews"]] for m in indexed}
+    assert set(by_candidate["c1"]) == {"jd1", "jd4"}
+    assert by_candidate["c2"] == ["jd2"]
+    # c3 sólo matchea por substring (fallback) en el texto del JD
+    assert by_candidate["c3"] == ["jd3"]
+    assert "c4" not in by_candidate
+
+
+def test_resolve_matching_mode(monkeypatch):
+    monkeypatch.delenv("MATCHING_ENGINE_MODE", raising=False)
+    assert _resolve_matching_mode(None) == "indexed"
+    monkeypatch.setenv("MATCHING_ENGINE_MODE", "NAIVE")
+    assert _resolve_matching_mode(None) == "naive"
+    assert _resolve_matching_mode("indexed") == "indexed"
+    with pytest.raises(ValueError):
+        _resolve_matching_mode("quantum")
+
+
+class _FakeQuery:
+    """Cadena PostgREST mínima sobre filas en memoria (select/eq/gt/in_/order/limit/range)."""
+
+    def __init__(self, name, rows, calls):
+        self._name = name
+        self._rows = rows
+        self._calls = calls
+        self._filters = []
+        self._order = None
+        self._slice = (0, None)
+
+    def select(self, columns, **_k):
+        self._columns = columns
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def gt(self, column, value):
+        self._filters.append(lambda r: r.get(column) > value)
+        return self
+
+    def in_(self, column, values):
+        values = list(values)
+        self._filters.append(lambda r: r.get(column) in values)
+        return self
+
+    def order(self, column, **_k):
+        self._order = column
+        return self
+
+    def limit(self, n):
+        self._slice = (0, n)
+        return self
+
+    def range(self, start, end):
+        self._slice = (start, end - start + 1)
+        return self
+
+    def upsert(self, payload, on_conflict):
+        self._columns = f"upsert:{on_conflict}"
+        # Como PostgREST: se guarda JSON, no el objeto Python
+        stored = json.loads(json.dumps(payload))
+        self._rows[:] = [r for r in self._rows if r.get(on_conflict) != stored[on_conflict]] + [stored]
+        return self
+
+    def execute(self):
+        self._calls.append((self._name, self._columns))
+        rows = [r for r in self._rows if all(f(r) for f in self._filters)]
+        if self._order:
+            rows.sort(key=lambda r: r[self._order])
+        start, n = self._slice
+        rows = rows[start:] if n is None else rows[start : start + n]
+        keep = None if self._columns == "*" else {c.strip() for c in self._columns.split(",")}
+
+        class _R:
+            data = [{k: v for k, v in r.items() if keep is None or k in keep} for r in rows]
+
+        return _R()
+
+
+class _FakeSupabase:
+    def __init__(self, **tables):
+        self.tables = tables
+        self.calls = []
+
+    def table(self, name):
+        return _FakeQuery(name, self.tables.get(name, []), self.calls)
+
+
+def test_fetch_existing_meets_map_bulk_chunks_and_pages():
+    rows = [{"id": f"m{i}", "jd_interviews_id": "jd1", "candidate_id": f"c{i}"} for i in range(5)]
+    rows += [{"id": "m9", "jd_interviews_id": "jd3", "candidate_id": "c1"}]
+    rows += [{"id": "m10", "jd_interviews_id": "jd3", "candidate_id": None}]
+    sb = _FakeSupabase(meets=rows)
+    stats = {}
+
+    out = _fetch_existing_meets_map(sb, ["jd1", "jd2", "jd3", "jd1", None], stats, chunk_size=2, page_size=3)
+
+    assert out == {
+        "jd1": frozenset({"c0", "c1", "c2", "c3", "c4"}),
+        "jd2": frozenset(),
+        "jd3": frozenset({"c1"}),
+    }
+    # lote [jd1, jd2]: páginas de 3 filas (3 + 2); lote [jd3]: una página
+    assert [c[0] for c in sb.calls] == ["meets"] * 3
+    assert stats["supabase_round_trips"] == 3
+
+
+def test_fetch_existing_meets_map_no_jds_no_round_trips():
+    sb = _FakeSupabase()
+    stats = {}
+    assert _fetch_existing_meets_map(sb, [], stats) == {}
+    assert sb.calls == []
+    assert stats == {}
+
+
+def test_incremental_matching_reuses_snapshot_and_matches_full_run():
+    candidates, jds, existing = _matching_fixture()
+    stats = {}
+    first, snapshot = _match_incremental(candidates, jds, existing, None, stats)
+    assert first == _match_indexed(candidates, jds, existing)
+    assert stats["dirty_candidates"] == 3
+    assert stats["dirty_jd_interviews"] == 4
+
+    # Sin cambios: nada se re-puntúa
+    stats = {}
+    again, same_snapshot = _match_incremental(candidates, jds, existing, snapshot, stats)
+    assert again == first
+    assert (stats["dirty_candidates"], stats["dirty_jd_interviews"]) == (0, 0)
+    assert same_snapshot == snapshot
+
+    # Cambia un candidato, se edita una JD, se agrega otra y se quita un candidato
+    candidates2 = [dict(c) for c in candidates if c["id"] != "c3"]
+    candidates2[1]["tech_stack"] = ["Python", "Docker"]
+    jds2 = [dict(j) for j in jds]
+    jds2[0]["job_description"] = "SPA con Figma"
+    jds2.append({"id": "jd5", "interview_name": "Data", "tech_stack": "Python", "job_description": "ETL"})
+    stats = {}
+    incremental, new_snapshot = _match_incremental(candidates2, jds2, existing, snapshot, stats)
+    assert incremental == _match_indexed(candidates2, jds2, existing)
+    assert stats["dirty_candidates"] == 1
+    assert stats["dirty_jd_interviews"] == 2
+    assert "c3" not in new_snapshot["candidates"]
+    assert set(new_snapshot["candidates"]["c2"]["pairs"]) == {"jd2", "jd4", "jd5"}
+
+
+def test_incremental_matching_applies_fresh_existing_meets():
+    candidates, jds, _existing = _matching_fixture()
+    _first, snapshot = _match_incremental(candidates, jds, {}, None, {})
+    existing = {"jd1": frozenset({"c1"})}
+    out, _snapshot = _match_incremental(candidates, jds, existing, snapshot, {})
+    by_candidate = {m["candidate"]["id"]: m["matching_interviews"] for m in out}
+    assert [i["jd_interviews"]["id"] for i in by_candidate["c1"]] == ["jd4"]
+
+
+def _candidate_rows(n):
+    return [
+        {"id": f"c{i:04d}", "name": f"Cand {i}", "tech_stack": ["React"], "observations": {"big": "x" * 50}}
+        for i in range(n)
+    ]
+
+
+def test_iter_candidates_keyset_pages_past_1000_rows():
+    sb = _FakeSupabase(candidates=_candidate_rows(1203))
+    stats = {}
+
+    rows = list(_iter_candidates(sb, None, None, stats, page_size=500))
+
+    assert len(rows) == 1203
+    assert len({r["id"] for r in rows}) == 1203
+    assert stats["supabase_round_trips"] == 3
+    assert all("observations" not in r for r in rows)
+    assert all(columns == MATCHING_CANDIDATE_COLUMNS for _name, columns in sb.calls)
+
+
+def test_iter_candidates_keeps_updated_at_for_fingerprint():
+    rows = _candidate_rows(2)
+    rows[0]["updated_at"] = "2026-01-01T00:00:00"
+    rows[1]["updated_at"] = "2026-02-01T00:00:00"
+    sb = _FakeSupabase(candidates=rows)
+
+    streamed = list(_iter_candidates(sb, None, None))
+
+    assert [r["updated_at"] for r in streamed] == ["2026-01-01T00:00:00", "2026-02-01T00:00:00"]
+    touched = dict(streamed[0], updated_at="2026-03-01T00:00:00")
+    assert _candidate_fingerprint(touched) != _candidate_fingerprint(streamed[0])
+
+
+def test_iter_candidates_recruiter_path_chunks_ids():
+    sb = _FakeSupabase(
+        candidate_recruiters=[
+            {"candidate_id": f"c{i:04d}", "user_id": "u1", "client_id": "cl1"} for i in range(0, 10, 2)
+        ]
+        + [{"candidate_id": "c0001", "user_id": "otro", "client_id": "cl1"}],
+        candidates=_candidate_rows(10),
+    )
+    stats = {}
+
+    rows = list(_iter_candidates(sb, "u1", "cl1", stats, chunk_size=2))
+
+    assert [r["id"] for r in rows] == ["c0000", "c0002", "c0004", "c0006", "c0008"]
+    # 1 página de candidate_recruiters + 3 lotes de candidates
+    assert stats["supabase_round_trips"] == 4
+
+
+def test_attach_observations_only_for_matched_candidates():
+    sb = _FakeSupabase(candidates=_candidate_rows(3))
+    matches = [{"candidate": {"id": "c0001", "observations": None}, "matching_interviews": []}]
+
+    _attach_observations(sb, matches)
+
+    assert matches[0]["candidate"]["observations"] == {"big": "x" * 50}
+    assert sb.calls == [("candidates", "id, observations")]
+
+
+def test_run_deterministic_matching_streams_candidates_end_to_end(monkeypatch):
+    import matching_engine
+
+    candidates = _candidate_rows(1203)
+    candidates[5]["tech_stack"] = ["Cobol"]
+    sb = _FakeSupabase(
+        candidates=candidates,
+        jd_interviews=[
+            {"id": "jd1", "status": "active", "tech_stack": "React", "job_description": "SPA"},
+            {"id": "jd2", "status": "closed", "tech_stack": "React", "job_description": "SPA"},
+        ],
+        meets=[{"id": "m1", "jd_interviews_id": "jd1", "candidate_id": "c0000"}],
+    )
+    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
+    monkeypatch.setenv("SUPABASE_KEY", "secret")
+    monkeypatch.delenv("MATCHING_SNAPSHOT_ENABLED", raising=False)
+    monkeypatch.setattr(matching_engine, "get_client", lambda *_a: sb)
+
+    stats = {}
+    indexed = matching_engine.run_deterministic_matching(stats=stats)
+    naive = matching_engine.run_deterministic_matching(mode="naive")
+
+    assert indexed == naive
+    assert len(indexed) == 1201
+    assert indexed[0]["candidate"]["id"] == "c0001"
+    assert indexed[0]["candidate"]["observations"] == {"big": "x" * 50}
+    assert stats["candidates"] == 1203
+    assert stats["snapshot"] == "disabled"
+
+
+def test_run_deterministic_matching_snapshot_reads_fingerprint_columns_and_skips_unchanged_save(monkeypatch):
+    import matching_engine
+
+    candidates = _candidate_rows(5)
+    for row in candidates:
+        row.update(email=f"{row['id']}@example.com", updated_at="2026-01-01T00:00:00")
+    candidates[2]["tech_stack"] = ["Cobol"]
+    sb = _FakeSupabase(
+        candidates=candidates,
+        jd_interviews=[{"id": "jd1", "status": "active", "tech_stack": "React", "job_description": "SPA"}],
+        meets=[],
+        matching_snapshots=[],
+    )
+    monkeypatch.setenv("SUPABASE_URL", "http://local.test")
+    monkeypatch.setenv("SUPABASE_KEY", "secret")
+    monkeypatch.setattr(matching_engine, "get_client", lambda *_a: sb)
+    monkeypatch.delenv("MATCHING_SNAPSHOT_ENABLED", raising=False)
+    full = matching_engine.run_deterministic_matching()
+
+    monkeypatch.setenv("MATCHING_SNAPSHOT_ENABLED", "true")
+    sb.calls.clear()
+    first_stats, second_stats = {}, {}
+    first = matching_engine.run_deterministic_matching(stats=first_stats)
+    second = matching_engine.run_deterministic_matching(stats=second_stats)
+
+    assert first == second == full
+    assert first[0]["candidate"]["email"] == "c0000@example.com"
+    assert first[0]["candidate"]["observations"] == {"big": "x" * 50}
+    candidate_reads = [columns for name, columns in sb.calls if name == "candidates"]
+    assert candidate_reads.count(matching_engine.MATCHING_FINGERPRINT_COLUMNS) == 2
+    assert MATCHING_CANDIDATE_COLUMNS not in candidate_reads
+    assert (first_stats["snapshot"], first_stats["snapshot_saved"]) == ("miss", True)
+    assert (second_stats["snapshot"], second_stats["snapshot_saved"]) == ("hit", False)
+    assert [c for c in sb.calls if c[1].startswith("upsert")] == [("matching_snapshots", "upsert:scope_key")]
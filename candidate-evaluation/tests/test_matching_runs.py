@@ -0,0 +1,188 @@
+"""Tests unitarios de utils.matching_runs (store con TTL y pool acotado con coalescing)."""
+
+import threading
+
+import pytest
+
+from utils.matching_runs import (
+    InMemoryRunStore,
+    MatchingQueueFullError,
+    MatchingRunExecutor,
+    SupabaseRunStore,
+    create_matching_run_store,
+)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_in_memory_store_evicts_only_finished_runs_after_ttl():
+    clock = _Clock()
+    store = InMemoryRunStore(ttl_seconds=60, clock=clock)
+    store["running"] = {"status": "running"}
+    store["done"] = {"status": "done", "result": {}}
+
+    clock.now += 59
+    assert set(store) == {"running", "done"}
+
+    clock.now += 2
+    assert "done" not in store
+    assert store["running"]["status"] == "running"
+    assert len(store) == 1
+
+
+def test_in_memory_store_requeue_clears_expiry():
+    clock = _Clock()
+    store = InMemoryRunStore(ttl_seconds=10, clock=clock)
+    store["r1"] = {"status": "error"}
+    store["r1"] = {"status": "running"}
+    clock.now += 100
+    assert store["r1"] == {"status": "running"}
+
+
+def test_create_matching_run_store_selects_backend(monkeypatch):
+    monkeypatch.delenv("MATCHING_RUN_STORE", raising=False)
+    assert isinstance(create_matching_run_store(), InMemoryRunStore)
+    monkeypatch.setenv("MATCHING_RUN_STORE", "supabase")
+    monkeypatch.setenv("MATCHING_RUN_TTL_SECONDS", "120")
+    store = create_matching_run_store()
+    assert isinstance(store, SupabaseRunStore)
+    assert store.ttl_seconds == 120
+
+
+def test_executor_coalesces_same_key_and_releases_when_done():
+    store = InMemoryRunStore()
+    executor = MatchingRunExecutor(store, max_workers=1, max_pending=5)
+    release = threading.Event()
+    ran = []
+
+    def _task(run_id):
+        release.wait(5)
+        ran.append(run_id)
+
+    try:
+        assert executor.submit(("u", "c"), "r1", _task, "r1") == ("r1", False)
+        assert store["r1"]["status"] == "queued"
+        assert executor.submit(("u", "c"), "r2", _task, "r2") == ("r1", True)
+        assert "r2" not in store
+        release.set()
+        executor.shutdown()
+        assert ran == ["r1"]
+        assert executor.pending == 0
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+def test_executor_rejects_beyond_max_pending():
+    store = InMemoryRunStore()
+    executor = MatchingRunExecutor(store, max_workers=1, max_pending=2)
+    release = threading.Event()
+    try:
+        executor.submit(("a", None), "r1", release.wait, 5)
+        executor.submit(("b", None), "r2", release.wait, 5)
+        with pytest.raises(MatchingQueueFullError):
+            executor.submit(("c", None), "r3", release.wait, 5)
+        assert executor.pending == 2
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+class _FakeRunsQuery:
+    def __init__(self, table):
+        self._table = table
+        self._op = "select"
+        self._filters = []
+        self._payload = None
+
+    def select(self, *_a, **_k):
+        return self
+
+    def upsert(self, row, on_conflict=None):
+        self._op, self._payload = "upsert", row
+        return self
+
+    def delete(self):
+        self._op = "delete"
+        return self
+
+    def eq(self, column, value):
+        self._filters.append(lambda r: r.get(column) == value)
+        return self
+
+    def lt(self, column, value):
+        self._filters.append(lambda r: r.get(column) is not None and r.get(column) < value)
+        return self
+
+    def or_(self, expr):
+        now = expr.rsplit("expires_at.gt.", 1)[1]
+        self._filters.append(lambda r: r.get("expires_at") is None or r.get("expires_at") > now)
+        return self
+
+    def limit(self, *_a):
+        return self
+
+    def execute(self):
+        rows = self._table
+
+        class _R:
+            data = []
+
+        if self._op == "upsert":
+            rows[:] = [r for r in rows if r["run_id"] != self._payload["run_id"]] + [self._payload]
+            return _R()
+        matched = [r for r in rows if all(f(r) for f in self._filters)]
+        if self._op == "delete":
+            rows[:] = [r for r in rows if r not in matched]
+        _R.data = matched
+        return _R()
+
+
+class _FakeRunsSupabase:
+    def __init__(self):
+        self.rows = []
+
+    def table(self, name):
+        assert name == "matching_runs"
+        return _FakeRunsQuery(self.rows)
+
+
+def test_supabase_store_roundtrip_and_ttl():
+    sb = _FakeRunsSupabase()
+    store = SupabaseRunStore(supabase=sb, ttl_seconds=3600)
+    store["r1"] = {"status": "running", "runId": "r1"}
+    assert store["r1"]["status"] == "running"
+    assert sb.rows[0]["expires_at"].endswith("Z")
+
+    store["r1"] = {"status": "done", "runId": "r1", "result": {"matches": []}}
+    assert store["r1"]["result"] == {"matches": []}
+    assert sb.rows[0]["expires_at"].endswith("Z")
+
+    sb.rows[0]["expires_at"] = "2000-01-01T00:00:00Z"
+    assert "r1" not in store
+    store["r2"] = {"status": "error", "runId": "r2"}
+    assert [r["run_id"] for r in sb.rows] == ["r2"]
+    assert list(store) == ["r2"]
+
+
+def test_supabase_store_expires_runs_that_stop_updating():
+    sb = _FakeRunsSupabase()
+    store = SupabaseRunStore(supabase=sb, ttl_seconds=3600, stale_seconds=60)
+    store["cortado"] = {"status": "running", "runId": "cortado"}
+    running_expiry = sb.rows[0]["expires_at"]
+    store["cortado"] = {"status": "running", "runId": "cortado", "progress": 0.5}
+    assert sb.rows[0]["expires_at"] >= running_expiry
+
+    # El proceso murió: el run dejó de actualizarse y venció
+    sb.rows[0]["expires_at"] = "2000-01-01T00:00:00Z"
+    assert "cortado" not in store
+
+    # El próximo run encolado purga la fila
+    store["nuevo"] = {"status": "queued", "runId": "nuevo"}
+    assert [r["run_id"] for r in sb.rows] == ["nuevo"]
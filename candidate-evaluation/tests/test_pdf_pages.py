@@ -0,0 +1,123 @@
+"""Extracción de texto por páginas en paralelo (tools.pdf_pages)."""
+
+import multiprocessing
+import time
+
+import pytest
+
+pytest.importorskip("pdfplumber")
+
+from tools import pdf_pages  # noqa: E402
+
+_real_extract_page = pdf_pages._extract_page
+
+
+def _slow_second_page(index: int) -> str:
+    if index == 1:
+        time.sleep(30)
+    return _real_extract_page(index)
+
+
+def _pages(n: int) -> list[str]:
+    return [f"Pagina {i} experiencia en Python y AWS" for i in range(n)]
+
+
+@pytest.mark.parametrize("engine", pdf_pages.PAGE_ENGINES)
+def test_parallel_extraction_keeps_page_order(text_pdf, engine):
+    pdf = text_pdf(_pages(6))
+
+    result = pdf_pages.extract_pages_parallel(pdf, engine, 6, workers=2, page_timeout=30)
+
+    assert [t.strip() for t in result.texts] == _pages(6)
+    assert result.timed_out == []
+    assert result.failed == {}
+    assert result.texts == pdf_pages.extract_pages_serial(pdf, engine).texts
+
+
+def test_page_timeout_skips_hung_page_and_terminates_pool(monkeypatch, text_pdf):
+    # fork: los workers heredan el _extract_page parcheado
+    monkeypatch.setattr(pdf_pages, "_mp_context", lambda: multiprocessing.get_context("fork"))
+    monkeypatch.setattr(pdf_pages, "_extract_page", _slow_second_page)
+
+    start = time.monotonic()
+    result = pdf_pages.extract_pages_parallel(text_pdf(_pages(4)), "pypdf2", 4, workers=2, page_timeout=1)
+
+    assert time.monotonic() - start < 10
+    assert result.timed_out == [1]
+    assert result.texts[1] == ""
+    assert [result.texts[i].strip() for i in (0, 2, 3)] == [_pages(4)[i] for i in (0, 2, 3)]
+
+
+def test_should_parallelize_respects_env(monkeypatch):
+    monkeypatch.setenv("PDF_PAGE_WORKERS", "4")
+    monkeypatch.setenv("PDF_PARALLEL_MIN_PAGES", "5")
+
+    assert pdf_pages.should_parallelize(5) is True
+    assert pdf_pages.should_parallelize(4) is False
+    assert pdf_pages.should_parallelize(None) is False
+
+    monkeypatch.setenv("PDF_PAGE_WORKERS", "1")
+    assert pdf_pages.should_parallelize(30) is False
+
+    monkeypatch.setenv("PDF_PAGE_WORKERS", "4")
+    monkeypatch.setenv("PDF_PARALLEL_EXTRACTION", "false")
+    assert pdf_pages.should_parallelize(30) is False
+
+
+def test_cv_tools_uses_parallel_pages_for_long_pdfs(monkeypatch):
+    from tools import cv_tools
+
+    class _EmptyPage:
+        def extract_text(self):
+            return ""
+
+    class _Reader:
+        pages = [_EmptyPage()] * 5
+
+    calls = []
+
+    def _fake_parallel(file_content, engine, pages):
+        calls.append((engine, pages))
+        return pdf_pages.PageTexts(texts=[f"texto {i} " * 40 for i in range(pages)])
+
+    monkeypatch.setattr(cv_tools, "PdfReader", lambda _b: _Reader())
+    monkeypatch.setattr(pdf_pages, "should_parallelize", lambda pages: pages >= 4)
+    monkeypatch.setattr(pdf_pages, "extract_pages_parallel", _fake_parallel)
+
+    extraction = cv_tools.extract_pdf_text(b"%PDF-1.4 largo")
+
+    assert calls == [("pdfplumber", 5)]
+    assert extraction.method == "pdfplumber"
+    assert extraction.text.startswith("texto 0")
+
+
+def test_cv_tools_marks_incomplete_parallel_text_as_not_cacheable(monkeypatch):
+    from tools import cv_tools
+
+    class _EmptyPage:
+        def extract_text(self):
+            return ""
+
+    class _Reader:
+        pages = [_EmptyPage()] * 5
+
+    def _partial_parallel(file_content, engine, pages):
+        texts = [f"texto {i} " * 40 for i in range(pages)]
+        texts[3] = ""
+        return pdf_pages.PageTexts(texts=texts, timed_out=[3])
+
+    monkeypatch.setattr(cv_tools, "PdfReader", lambda _b: _Reader())
+    monkeypatch.setattr(cv_tools, "pdfminer_extract_text", lambda _b: "")
+    monkeypatch.setattr(pdf_pages, "should_parallelize", lambda pages: pages >= 4)
+    monkeypatch.setattr(pdf_pages, "extract_pages_parallel", _partial_parallel)
+
+    extraction = cv_tools.extract_pdf_text(b"%PDF-1.4 largo")
+
+    assert extraction.method == "pdfplumber"
+    assert extraction.cacheable is False
+    assert extraction.metadata()["cacheable"] is False
+    assert "páginas sin texto" in extraction.cache_skip_reason
+    plumber = next(a for a in extraction.attempts if a["method"] == "pdfplumber")
+    assert (plumber["timed_out_pages"], plumber["failed_pages"]) == ([3], [])
+    # El texto incompleto no corta la cascada: se prueba pdfminer antes de quedarse con él
+    assert [a["method"] for a in extraction.attempts] == ["pypdf2", "pdfplumber", "pdfminer"]
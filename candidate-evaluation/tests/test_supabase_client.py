@@ -0,0 +1,66 @@
+"""Tests unitarios de utils.supabase_client (cliente Supabase compartido con pool HTTP)."""
+
+import pytest
+
+from utils import supabase_client
+
+
+@pytest.fixture(autouse=True)
+def _fresh_registry(monkeypatch):
+    built = []
+
+    def _fake_create(url, key, options=None):
+        client = {"url": url, "key": key, "options": options}
+        built.append(client)
+        return client
+
+    monkeypatch.setattr(supabase_client, "create_client", _fake_create)
+    supabase_client.reset_clients()
+    yield built
+    supabase_client.reset_clients()
+
+
+def test_get_client_reuses_one_client_per_url_and_key(_fresh_registry):
+    first = supabase_client.get_client("http://sb.test", "secret")
+    second = supabase_client.get_client("http://sb.test", "secret")
+    other = supabase_client.get_client("http://sb.test", "other-key")
+
+    assert first is second
+    assert other is not first
+    assert len(_fresh_registry) == 2
+
+
+def test_get_client_passes_pooled_httpx_client(monkeypatch, _fresh_registry):
+    monkeypatch.setenv("SUPABASE_HTTP_MAX_CONNECTIONS", "7")
+    client = supabase_client.get_client("http://sb.test", "secret")
+
+    http_client = client["options"].httpx_client
+    assert http_client is not None
+    assert http_client._transport._pool._max_connections == 7
+
+
+def test_get_client_defaults_to_env_and_requires_credentials(monkeypatch):
+    monkeypatch.setenv("SUPABASE_URL", "http://env.test")
+    monkeypatch.setenv("SUPABASE_KEY", "env-key")
+    assert supabase_client.get_client()["url"] == "http://env.test"
+
+    monkeypatch.delenv("SUPABASE_URL")
+    with pytest.raises(ValueError, match="SUPABASE_URL y SUPABASE_KEY"):
+        supabase_client.get_client(None, None)
+
+
+def test_override_client_applies_only_inside_block():
+    fake = object()
+    with supabase_client.override_client(fake):
+        assert supabase_client.get_client("http://sb.test", "secret") is fake
+    assert supabase_client.get_client("http://sb.test", "secret") is not fake
+
+
+def test_reset_clients_closes_http_pools():
+    client = supabase_client.get_client("http://sb.test", "secret")
+    http_client = client["options"].httpx_client
+
+    supabase_client.reset_clients()
+
+    assert http_client.is_closed
+    assert supabase_client.get_client("http://sb.test", "secret") is not client
@@ -242,7 +242,7 @@ def test_extract_supabase_conversations_maps_rows(monkeypatch):
             assert name == "conversations"
             return _Table(rows)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda url, key: _Client())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda url, key: _Client())
 
     out = json.loads(supabase_tools.extract_supabase_conversations.func(10))
     assert len(out) == 2
@@ -256,7 +256,7 @@ def test_extract_supabase_conversations_returns_error_json_on_exception(monkeypa
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setattr(
         supabase_tools,
-        "create_client",
+        "get_client",
         lambda u, k: (_ for _ in ()).throw(RuntimeError("conversations down")),
     )
     out = json.loads(supabase_tools.extract_supabase_conversations.func(5))
@@ -264,7 +264,7 @@ def test_extract_supabase_conversations_returns_error_json_on_exception(monkeypa
     assert "conversations down" in out.get("error", "").lower() or "extracting" in out.get("error", "").lower()
 
 
-def test_supabase_extractor_tool_inits_with_create_client(monkeypatch):
+def test_supabase_extractor_tool_inits_with_get_client(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     stub = object()
@@ -273,7 +273,7 @@ def test_supabase_extractor_tool_inits_with_create_client(monkeypatch):
         assert u == "http://local.test"
         return stub
 
-    monkeypatch.setattr(supabase_tools, "create_client", _cc)
+    monkeypatch.setattr(supabase_tools, "get_client", _cc)
     tool = supabase_tools.SupabaseExtractorTool()
     assert tool.supabase is stub
 
@@ -315,7 +315,7 @@ def test_get_meet_evaluation_data_meet_not_found(monkeypatch):
             assert name == "meets"
             return _MeetTableNF()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda url, key: _Client())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda url, key: _Client())
     out = json.loads(supabase_tools.get_meet_evaluation_data.func("00000000-0000-0000-0000-000000000099"))
     assert "error" in out
 
@@ -333,6 +333,7 @@ def test_get_meet_evaluation_data_success(monkeypatch):
             "job_description": "https://jd",
             "client_id": "cl1",
             "created_at": "cj",
+            "clients": {"id": "cl1", "name": "ACME", "email": "client@acme.com"},
         },
     }
     conv_row = {
@@ -349,15 +350,6 @@ def test_get_meet_evaluation_data_success(monkeypatch):
             "tech_stack": "go",
         },
     }
-    client_row = {"id": "cl1", "name": "ACME", "email": "client@acme.com"}
-
-    class _ClientEq:
-        def execute(self):
-            return type("R", (), {"data": [client_row]})()
-
-    class _ClientSelect:
-        def eq(self, *_a, **_k):
-            return _ClientEq()
 
     class _ConvLimit:
         def execute(self):
@@ -391,31 +383,26 @@ def test_get_meet_evaluation_data_success(monkeypatch):
         def select(self, _q):
             return _ConvSelect()
 
-    class _ClientsTable:
-        def select(self, _q):
-            return _ClientSelect()
-
     class _Client:
         def table(self, name):
             if name == "meets":
                 return _MeetTable()
             if name == "conversations":
                 return _ConvTable()
-            if name == "clients":
-                return _ClientsTable()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda url, key: _Client())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda url, key: _Client())
     monkeypatch.setenv("REPORT_TO_EMAIL", "")
     out = json.loads(supabase_tools.get_meet_evaluation_data.func("m1"))
     assert out["meet"]["id"] == "m1"
     assert out["conversation"]["candidate"]["name"] == "Bo"
     assert out["jd_interview"]["id"] == "jd1"
+    assert "clients" not in out["jd_interview"]
     assert out["client"]["email"] == "client@acme.com"
 
 
 def test_get_meet_evaluation_data_empty_client_sets_fallback_report_email(monkeypatch):
-    """797–801: sin filas en `clients` → fallback en `REPORT_TO_EMAIL`."""
+    """Sin cliente embebido en la JD → fallback en `REPORT_TO_EMAIL`."""
     meet_row = {
         "id": "m1",
         "jd_interviews_id": "jd1",
@@ -428,6 +415,7 @@ def test_get_meet_evaluation_data_empty_client_sets_fallback_report_email(monkey
             "job_description": "https://jd",
             "client_id": "cl1",
             "created_at": "cj",
+            "clients": None,
         },
     }
     conv_row = {
@@ -438,14 +426,6 @@ def test_get_meet_evaluation_data_empty_client_sets_fallback_report_email(monkey
         "candidates": None,
     }
 
-    class _ClientEq:
-        def execute(self):
-            return type("R", (), {"data": []})()
-
-    class _ClientSelect:
-        def eq(self, *_a, **_k):
-            return _ClientEq()
-
     class _ConvLimit:
         def execute(self):
             return type("R", (), {"data": [conv_row]})()
@@ -478,29 +458,23 @@ def test_get_meet_evaluation_data_empty_client_sets_fallback_report_email(monkey
         def select(self, _q):
             return _ConvSelect()
 
-    class _ClientsTable:
-        def select(self, _q):
-            return _ClientSelect()
-
     class _Client:
         def table(self, name):
             if name == "meets":
                 return _MeetTable()
             if name == "conversations":
                 return _ConvTable()
-            if name == "clients":
-                return _ClientsTable()
             raise AssertionError(name)
 
     monkeypatch.setenv("REPORT_TO_EMAIL", "")
-    monkeypatch.setattr(supabase_tools, "create_client", lambda url, key: _Client())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda url, key: _Client())
     out = json.loads(supabase_tools.get_meet_evaluation_data.func("m1"))
     assert out["conversation"] is not None
     assert os.environ.get("REPORT_TO_EMAIL") == "flocklab.id@gmail.com"
 
 
 def test_get_meet_evaluation_data_jd_interviews_none_returns_error(monkeypatch):
-    """792–845: `jd_interviews` ausente rompe la cadena → `except` externo."""
+    """`jd_interviews` ausente → error sin consultar la conversación."""
     meet_row = {
         "id": "m1",
         "jd_interviews_id": "jd1",
@@ -526,7 +500,7 @@ def test_get_meet_evaluation_data_jd_interviews_none_returns_error(monkeypatch):
             assert name == "meets"
             return _MeetTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda url, key: _Client())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda url, key: _Client())
     out = json.loads(supabase_tools.get_meet_evaluation_data.func("m1"))
     assert "error" in out
 
@@ -541,7 +515,7 @@ def test_save_meet_evaluation_missing_supabase_env(monkeypatch):
 def test_save_meet_evaluation_invalid_json(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: object())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: object())
     out = json.loads(supabase_tools.save_meet_evaluation.func("not-json"))
     assert out["success"] is False
 
@@ -549,7 +523,7 @@ def test_save_meet_evaluation_invalid_json(monkeypatch):
 def test_save_meet_evaluation_wrong_type(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: object())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: object())
     out = json.loads(supabase_tools.save_meet_evaluation.func(99))  # type: ignore[arg-type]
     assert out["success"] is False
     assert "string o dict" in out["error"].lower()
@@ -558,7 +532,7 @@ def test_save_meet_evaluation_wrong_type(monkeypatch):
 def test_save_meet_evaluation_missing_meet_id(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: object())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: object())
     payload = json.dumps({"candidate": {"id": "c"}, "jd_interview": {"id": "j"}})
     out = json.loads(supabase_tools.save_meet_evaluation.func(payload))
     assert out["success"] is False
@@ -593,7 +567,7 @@ def test_save_meet_evaluation_insert_success(monkeypatch):
             assert name == "meet_evaluations"
             return _MeetEvalTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -639,7 +613,7 @@ def test_save_meet_evaluation_update_success(monkeypatch):
             assert name == "meet_evaluations"
             return _MeetEvalTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -686,7 +660,7 @@ def test_save_meet_evaluation_update_returns_empty_data_fails(monkeypatch):
             assert name == "meet_evaluations"
             return _MeetEvalTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -728,7 +702,7 @@ def test_save_meet_evaluation_insert_returns_empty_data_fails(monkeypatch):
             assert name == "meet_evaluations"
             return _MeetEvalTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -744,7 +718,7 @@ def test_save_meet_evaluation_insert_returns_empty_data_fails(monkeypatch):
 def test_save_meet_evaluation_requires_candidate_id(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: object())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: object())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {},
@@ -760,7 +734,7 @@ def test_save_meet_evaluation_requires_candidate_id(monkeypatch):
 def test_save_meet_evaluation_requires_jd_interview_id(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: object())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: object())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -802,7 +776,7 @@ def test_save_meet_evaluation_full_result_dict_branch(monkeypatch):
             assert name == "meet_evaluations"
             return _MeetEvalTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -849,7 +823,7 @@ def test_save_meet_evaluation_technical_assessment_not_dict_normalized(monkeypat
             assert name == "meet_evaluations"
             return _MeetEvalTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -875,7 +849,7 @@ def test_save_meet_evaluation_outer_exception_on_meet_eval_select(monkeypatch):
             assert name == "meet_evaluations"
             return _MeetEvalTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     payload = {
         "meet_id": "550e8400-e29b-41d4-a716-446655440000",
         "candidate": {"id": "550e8400-e29b-41d4-a716-446655440001"},
@@ -920,7 +894,7 @@ def test_get_client_email_success(monkeypatch):
             assert name == "clients"
             return _ClientsTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_client_email.func("cl1"))
     assert out["email"] == "x@y.com"
     assert out["name"] == "Cliente"
@@ -950,7 +924,7 @@ def test_get_client_email_not_found(monkeypatch):
         def table(self, name):
             return _ClientsTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_client_email.func("missing"))
     assert "error" in out
 
@@ -960,7 +934,7 @@ def test_get_client_email_exception_returns_json_error(monkeypatch):
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setattr(
         supabase_tools,
-        "create_client",
+        "get_client",
         lambda u, k: (_ for _ in ()).throw(RuntimeError("supabase down")),
     )
     out = json.loads(supabase_tools.get_client_email.func("550e8400-e29b-41d4-a716-446655440001"))
@@ -992,7 +966,7 @@ def test_get_client_email_row_without_email(monkeypatch):
         def table(self, name):
             return _ClientsTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_client_email.func("cl1"))
     assert "error" in out
 
@@ -1029,7 +1003,7 @@ def test_get_jd_interviews_data_by_id_empty(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     raw = supabase_tools.get_jd_interviews_data.func("00000000-0000-0000-0000-000000000099")
     out = json.loads(raw)
     assert out == []
@@ -1069,7 +1043,7 @@ def test_get_jd_interviews_data_by_id_returns_row(monkeypatch):
         def table(self, name):
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_jd_interviews_data.func(jid))
     assert len(out) == 1
     assert out[0]["interview_name"] == "Dev"
@@ -1110,7 +1084,7 @@ def test_get_jd_interviews_data_truncates_long_job_description(monkeypatch):
         def table(self, name):
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_jd_interviews_data.func(jid))
     assert len(out) == 1
     assert len(row["job_description"]) > 5000
@@ -1151,7 +1125,7 @@ def test_get_jd_interviews_data_warns_when_json_over_100k_chars(monkeypatch, cap
         def table(self, name):
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     json.loads(supabase_tools.get_jd_interviews_data.func(jid))
     err = capsys.readouterr().out
     assert "ADVERTENCIA" in err or "grande" in err.lower() or "100000" in err or "chars" in err.lower()
@@ -1197,7 +1171,7 @@ def test_get_jd_interviews_data_active_listing_limit_50(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_jd_interviews_data.func(None))
     assert len(out) == 1
     assert out[0]["interview_name"] == "Active JD"
@@ -1228,7 +1202,7 @@ def test_get_jd_interviews_data_execute_raises_returns_error_json(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_jd_interviews_data.func("550e8400-e29b-41d4-a716-446655440001"))
     assert "error" in out
     assert "supabase down" in out.get("error", "") or "Error obteniendo" in out.get("error", "")
@@ -1272,7 +1246,7 @@ def test_create_candidate_inserts_and_skips_index_errors(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
 
     def _boom(_row):
         raise RuntimeError("index offline")
@@ -1322,7 +1296,7 @@ def test_create_candidate_insert_without_returned_id_reports_failure(monkeypatch
             assert name == "candidates"
             return _CandTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
 
     out = json.loads(
         supabase_tools.create_candidate.func(
@@ -1391,7 +1365,7 @@ def test_create_candidate_updates_existing_when_email_duplicate(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1418,9 +1392,7 @@ def test_create_candidate_updates_existing_when_email_duplicate(monkeypatch):
     assert update_payloads[0]["cv_url"] == "http://cv"
     assert update_payloads[0]["tech_stack"] == ["Python", "Go"]
     assert update_payloads[0]["observations"]["languages"] == [{"language": "English", "level": "advanced"}]
-    assert update_payloads[0]["observations"]["certifications_and_courses"] == [
-        {"name": "AWS", "issuer": "Amazon"}
-    ]
+    assert update_payloads[0]["observations"]["certifications_and_courses"] == [{"name": "AWS", "issuer": "Amazon"}]
     assert update_payloads[0]["observations"]["other"] == "Dato anterior"
 
 
@@ -1477,7 +1449,7 @@ def test_create_candidate_inserts_candidate_recruiters_when_ids_given(monkeypatc
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1533,7 +1505,7 @@ def test_create_candidate_tech_stack_json_list_and_scalar_json(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1595,7 +1567,7 @@ def test_create_candidate_observations_bad_json_and_bad_type(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1655,7 +1627,7 @@ def test_create_candidate_email_precheck_raises_still_inserts(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1693,7 +1665,7 @@ def test_create_candidate_invalid_email_inserts_without_precheck(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1761,7 +1733,7 @@ def test_create_candidate_recruiter_insert_empty_data_logs(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1829,7 +1801,7 @@ def test_create_candidate_recruiter_insert_raises_still_success(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -1846,14 +1818,14 @@ def test_create_candidate_recruiter_insert_raises_still_success(monkeypatch):
     assert out["success"] is True
 
 
-def test_create_candidate_create_client_raises_returns_error_json(monkeypatch):
+def test_create_candidate_get_client_raises_returns_error_json(monkeypatch):
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
 
     def _boom(_u, _k):
         raise RuntimeError("no supabase")
 
-    monkeypatch.setattr(supabase_tools, "create_client", _boom)
+    monkeypatch.setattr(supabase_tools, "get_client", _boom)
 
     out = json.loads(
         supabase_tools.create_candidate.func(
@@ -1893,7 +1865,7 @@ def test_save_interview_evaluation_jd_not_found(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -1932,7 +1904,7 @@ def test_save_interview_evaluation_client_id_null(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -1975,7 +1947,7 @@ def test_save_interview_evaluation_invalid_summary_json(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -2067,7 +2039,7 @@ def test_save_interview_evaluation_insert_success(monkeypatch):
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, cand, rank))
     assert out["success"] is True
     assert out.get("action") == "created"
@@ -2154,7 +2126,7 @@ def test_save_interview_evaluation_runtime_dict_args_rebuilds_summary(monkeypatc
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(jid, summary_obj, cand_obj, rank_list)  # type: ignore[arg-type]
     )
@@ -2211,7 +2183,7 @@ def test_save_interview_evaluation_json_loads_raises_generic_parse_error(monkeyp
         return _real_loads(s)
 
     monkeypatch.setattr(supabase_tools.json, "loads", _loads)
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -2304,7 +2276,7 @@ def test_save_interview_evaluation_candidates_json_array_count(monkeypatch):
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, cand, rank))
     assert out["success"] is True
 
@@ -2399,7 +2371,7 @@ def test_save_interview_evaluation_ranking_fortalezas_and_nivel_from_score(monke
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, cand, rank))
     assert out["success"] is True
 
@@ -2480,7 +2452,7 @@ def test_save_interview_evaluation_parse_else_branches_and_scalar_candidates(mon
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -2570,7 +2542,7 @@ def test_save_interview_evaluation_candidates_json_number_count_zero(monkeypatch
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, "5", "[]"))
     assert out["success"] is True
 
@@ -2655,7 +2627,7 @@ def test_save_interview_evaluation_summary_without_kpis_and_empty_candidates(mon
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, cand, rank))
     assert out["success"] is True
 
@@ -2736,7 +2708,7 @@ def test_save_interview_evaluation_summary_not_dict_rebuilds(monkeypatch):
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -2824,7 +2796,7 @@ def test_save_interview_evaluation_summary_json_list_uses_candidates_count(monke
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -2927,7 +2899,7 @@ def test_save_interview_evaluation_fortalezas_scalar_normalized(monkeypatch):
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, cand, rank))
     assert out["success"] is True
 
@@ -3026,7 +2998,7 @@ def test_save_interview_evaluation_ranking_score_tiers_excelente_to_debil(monkey
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, cand, rank))
     assert out["success"] is True
 
@@ -3115,7 +3087,7 @@ def test_save_interview_evaluation_update_existing_row(monkeypatch):
                 return _UpdTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, cand, rank))
     assert out["success"] is True
     assert out.get("action") == "updated"
@@ -3196,7 +3168,7 @@ def test_save_interview_evaluation_update_without_return_rows_fails(monkeypatch)
                 return _UpdTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, "{}", "[]"))
     assert out["success"] is False
     assert "no retornó datos" in out.get("error", "").lower()
@@ -3228,7 +3200,7 @@ def test_save_interview_evaluation_jd_query_raises(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.save_interview_evaluation.func(
             jid,
@@ -3307,7 +3279,7 @@ def test_save_interview_evaluation_insert_returns_no_rows(monkeypatch):
                 return _IevInsertTbl()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, "{}", "[]"))
     assert out["success"] is False
     assert "no retornó datos" in out.get("error", "").lower()
@@ -3333,7 +3305,7 @@ def test_save_meeting_minute_success(monkeypatch):
             assert name == "meeting_minutes_knowledge"
             return _MmTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
 
     import tools.vector_tools as vector_tools
 
@@ -3376,7 +3348,7 @@ def test_save_meeting_minute_tags_json_and_csv_and_scalar_json(monkeypatch):
         def table(self, name):
             return _MmTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
 
     import tools.vector_tools as vector_tools
 
@@ -3463,7 +3435,7 @@ def test_save_meeting_minute_errors_no_env_raw_empty_embedding(monkeypatch):
         def execute(self):
             return type("R", (), {"data": [{"id": "z"}]})()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
 
     import tools.vector_tools as vector_tools
 
@@ -3501,7 +3473,7 @@ def test_save_meeting_minute_insert_empty_and_index_error_still_ok(monkeypatch):
         def table(self, name):
             return _MmTableEmpty()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _SbEmpty())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _SbEmpty())
 
     import tools.vector_tools as vector_tools
 
@@ -3524,7 +3496,7 @@ def test_save_meeting_minute_insert_empty_and_index_error_still_ok(monkeypatch):
         def table(self, name):
             return _MmTableOk()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _SbOk())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _SbOk())
     monkeypatch.setattr(
         vector_tools,
         "update_knowledge_chunk",
@@ -3562,7 +3534,7 @@ def test_get_candidates_by_recruiter_empty_and_success(monkeypatch):
             assert name == "candidate_recruiters"
             return _RecSelect()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb0())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb0())
     out0 = json.loads(supabase_tools.get_candidates_by_recruiter.func(uid, clid))
     assert out0 == []
 
@@ -3586,7 +3558,7 @@ def test_get_candidates_by_recruiter_empty_and_success(monkeypatch):
         def table(self, name):
             return _RecSelectN()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _SbN())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _SbN())
     outn = json.loads(supabase_tools.get_candidates_by_recruiter.func(uid, clid))
     assert outn == []
 
@@ -3648,7 +3620,7 @@ def test_get_candidates_by_recruiter_empty_and_success(monkeypatch):
                 return _CandSelect()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _SbOk())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _SbOk())
     out_ok = json.loads(supabase_tools.get_candidates_by_recruiter.func(uid, clid, limit=5))
     assert len(out_ok) == 1
     assert out_ok[0]["id"] == cand_id
@@ -3675,7 +3647,7 @@ def test_get_candidates_by_recruiter_execute_raises(monkeypatch):
         def table(self, name):
             return _RecSelect()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(
         supabase_tools.get_candidates_by_recruiter.func(
             "550e8400-e29b-41d4-a716-446655440610",
@@ -3734,7 +3706,7 @@ def test_get_existing_meets_candidates_maps_jd_to_candidate_ids(monkeypatch):
                 return _MeetTable()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_existing_meets_candidates.func())
     assert jd1 in out
     assert set(out[jd1]) == {"c-one", "c-two"}
@@ -3747,7 +3719,7 @@ def test_get_existing_meets_candidates_returns_error_json_on_exception(monkeypat
     def _boom(_u, _k):
         raise RuntimeError("supabase down")
 
-    monkeypatch.setattr(supabase_tools, "create_client", _boom)
+    monkeypatch.setattr(supabase_tools, "get_client", _boom)
     out = json.loads(supabase_tools.get_existing_meets_candidates.func())
     assert "error" in out
     assert "supabase down" in out.get("error", "")
@@ -3774,7 +3746,7 @@ def test_get_conversations_by_jd_interview_not_found(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_conversations_by_jd_interview.func("00000000-0000-0000-0000-000000000099"))
     assert "error" in out
 
@@ -3830,7 +3802,7 @@ def test_get_conversations_by_jd_interview_no_meets_returns_message(monkeypatch)
                 return _MeetTable()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_conversations_by_jd_interview.func(jid))
     assert out.get("total_conversations") == 0
     assert "No se han presentado candidatos" in out.get("message", "")
@@ -3981,7 +3953,7 @@ def test_get_conversations_by_jd_interview_with_meets_and_conversations(monkeypa
                 return _ConvTable(convs_by_meet)
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_conversations_by_jd_interview.func(jid, limit=50))
 
     assert isinstance(out, list)
@@ -4092,7 +4064,7 @@ def test_get_conversations_by_jd_interview_two_meets_accumulates_rows(monkeypatc
                 return _ConvTable(convs_by_meet)
             raise AssertionError(f"unexpected {name}")
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_conversations_by_jd_interview.func(jid))
 
     assert len(out) == 2
@@ -4187,7 +4159,7 @@ def test_get_conversations_by_jd_interview_client_fetch_exception_logged(monkeyp
                 return _ConvTable()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_conversations_by_jd_interview.func(jid))
     assert isinstance(out, list)
     assert out[0].get("client") is None
@@ -4244,7 +4216,7 @@ def test_get_conversations_by_jd_interview_meets_data_none_raises_outer(monkeypa
                 return _MeetTable()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_conversations_by_jd_interview.func(jid))
     assert "error" in out
 
@@ -4284,7 +4256,7 @@ def test_get_candidates_data_respects_limit(monkeypatch):
             assert name == "candidates"
             return _CandTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_candidates_data.func({"limit": 2}))
     assert len(out) == 1
     assert out[0]["name"] == "A"
@@ -4326,7 +4298,7 @@ def test_get_all_jd_interviews_with_client_id_filter(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_all_jd_interviews.func(cid))
     assert len(out) == 1
     assert out[0]["id"] == "jd-1"
@@ -4353,7 +4325,7 @@ def test_get_all_jd_interviews_without_client_id(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_all_jd_interviews.func())
     assert out == []
 
@@ -4365,7 +4337,7 @@ def test_get_all_jd_interviews_returns_error_json_on_exception(monkeypatch):
     def _boom(_u, _k):
         raise RuntimeError("jd query fail")
 
-    monkeypatch.setattr(supabase_tools, "create_client", _boom)
+    monkeypatch.setattr(supabase_tools, "get_client", _boom)
     out = json.loads(supabase_tools.get_all_jd_interviews.func())
     assert "error" in out
     assert "jd query fail" in out.get("error", "")
@@ -4388,7 +4360,7 @@ def test_get_candidates_data_returns_error_on_execute_exception(monkeypatch):
             assert name == "candidates"
             return _CandTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_candidates_data.func(10))
     assert "error" in out
     assert "candidates table down" in out.get("error", "")
@@ -4416,7 +4388,7 @@ def test_get_candidates_data_limit_non_numeric_string_defaults_to_100(monkeypatc
         def table(self, name):
             return _CandTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_candidates_data.func("not-a-number"))
     assert out == []
 
@@ -4443,7 +4415,7 @@ def test_get_candidates_data_limit_dict_unparseable_defaults_to_100(monkeypatch)
         def table(self, name):
             return _CandTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_candidates_data.func({"default": "not-int", "value": None}))
     assert out == []
 
@@ -4470,7 +4442,7 @@ def test_get_candidates_data_limit_none_defaults_to_100(monkeypatch):
         def table(self, name):
             return _CandTable()
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     out = json.loads(supabase_tools.get_candidates_data.func(None))
     assert out == []
 
@@ -4511,7 +4483,7 @@ def test_create_candidate_observations_dict_passed_directly(monkeypatch):
 
     import tools.vector_tools as vector_tools
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     monkeypatch.setattr(vector_tools, "index_candidate", lambda _r: None)
 
     out = json.loads(
@@ -4577,20 +4549,20 @@ def test_save_interview_evaluation_db_select_raises_returns_error(monkeypatch):
                 return _IevTable()
             raise AssertionError(name)
 
-    monkeypatch.setattr(supabase_tools, "create_client", lambda u, k: _Sb())
+    monkeypatch.setattr(supabase_tools, "get_client", lambda u, k: _Sb())
     summary = json.dumps({"kpis": {"completed_interviews": 0, "avg_score": 0}, "notes": "n"})
     out = json.loads(supabase_tools.save_interview_evaluation.func(jid, summary, "{}", "[]"))
     assert out["success"] is False
     assert "base de datos" in out.get("error", "").lower() or "ie table" in out.get("error", "").lower()
 
 
-def test_save_interview_evaluation_outer_exception_from_create_client(monkeypatch):
+def test_save_interview_evaluation_outer_exception_from_get_client(monkeypatch):
     """1852–1859: fallo antes del flujo principal."""
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setattr(
         supabase_tools,
-        "create_client",
+        "get_client",
         lambda u, k: (_ for _ in ()).throw(RuntimeError("no client")),
     )
     out = json.loads(
@@ -4606,12 +4578,12 @@ def test_save_interview_evaluation_outer_exception_from_create_client(monkeypatc
 
 
 def test_save_meeting_minute_outer_exception(monkeypatch):
-    """1247–1252: excepción genérica (p. ej. create_client)."""
+    """1247–1252: excepción genérica (p. ej. get_client)."""
     monkeypatch.setenv("SUPABASE_URL", "http://local.test")
     monkeypatch.setenv("SUPABASE_KEY", "secret")
     monkeypatch.setattr(
         supabase_tools,
-        "create_client",
+        "get_client",
         lambda u, k: (_ for _ in ()).throw(RuntimeError("minute db")),
     )
     out = json.loads(
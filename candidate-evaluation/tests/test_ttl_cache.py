@@ -0,0 +1,46 @@
+"""Tests unitarios de utils.ttl_cache (LRU con vencimiento por entrada)."""
+
+from utils.ttl_cache import TTLCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_entries_expire_after_ttl():
+    clock = _Clock()
+    cache = TTLCache(maxsize=10, ttl_seconds=60, clock=clock)
+    cache.set("q", [0.1])
+
+    clock.now += 59
+    assert cache.get("q") == [0.1]
+    clock.now += 1
+    assert cache.get("q") is None
+    assert len(cache) == 0
+
+
+def test_per_entry_ttl_overrides_default():
+    clock = _Clock()
+    cache = TTLCache(ttl_seconds=60, clock=clock)
+    cache.set("short", 1, ttl_seconds=5)
+    clock.now += 6
+    assert cache.get("short", "default") == "default"
+
+
+def test_least_recently_used_is_evicted_and_stats_counted():
+    cache = TTLCache(maxsize=2, ttl_seconds=60, clock=_Clock())
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert (cache.hits, cache.misses) == (3, 1)
+
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == 0
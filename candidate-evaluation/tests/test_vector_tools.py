@@ -5,6 +5,32 @@ import json
 import pytest
 
 from tools import vector_tools
+from utils import embedding_cache
+
+_real_fetch_indexed_chunks = vector_tools._fetch_indexed_chunks
+
+
+@pytest.fixture(autouse=True)
+def _isolated_embedding_cache(monkeypatch, tmp_path):
+    """Cache de embeddings en tmp y sin chunks indexados previos (sin Supabase real)."""
+    monkeypatch.setenv("EMBEDDING_CACHE_PATH", str(tmp_path / "embeddings.sqlite3"))
+    monkeypatch.setattr(vector_tools, "_fetch_indexed_chunks", lambda *_a: {})
+    vector_tools._query_embedding_cache.clear()
+    vector_tools._chunks_count_cache.clear()
+
+
+def _patch_batch_indexing(monkeypatch, failing_ids=()):
+    """Embeddings en lote y upsert falsos para los `index_all_*`; devuelve los entity_id upserteados."""
+    upserted = []
+
+    def _upsert_many(chunks, batch_size=None):
+        written = [c["entity_id"] for c in chunks if c["entity_id"] not in failing_ids]
+        upserted.extend(written)
+        return len(written)
+
+    monkeypatch.setattr(vector_tools, "generate_embeddings", lambda texts, **_k: [[0.1] for _ in texts])
+    monkeypatch.setattr(vector_tools, "upsert_knowledge_chunks", _upsert_many)
+    return upserted
 
 
 def test_get_supabase_client_raises_without_env(monkeypatch):
@@ -53,6 +79,99 @@ def test_generate_embedding_propagates_openai_api_error(monkeypatch):
         vector_tools.generate_embedding("x")
 
 
+class _BatchEmbeddings:
+    """Fake de `openai_client.embeddings` que registra cada request y puede fallar por input."""
+
+    def __init__(self, fail_on=(), rate_limited=0):
+        self.requests = []
+        self.fail_on = set(fail_on)
+        self.rate_limited = rate_limited
+
+    def create(self, model, input):
+        self.requests.append(list(input))
+        if self.rate_limited:
+            self.rate_limited -= 1
+            raise type("RateLimitError", (Exception,), {"status_code": 429})("429 slow down")
+        if self.fail_on & set(input):
+            raise type("BadRequestError", (Exception,), {"status_code": 400})("input inválido")
+        items = [type("Item", (), {"index": i, "embedding": [float(len(t))]})() for i, t in enumerate(input)]
+        return type("Resp", (), {"data": list(reversed(items))})()
+
+
+def _patch_batch_openai(monkeypatch, embeddings):
+    monkeypatch.setattr(vector_tools, "OPENAI_AVAILABLE", True)
+    monkeypatch.setattr(vector_tools, "openai_client", type("C", (), {"embeddings": embeddings})())
+    monkeypatch.setattr(vector_tools.time, "sleep", lambda _s: None)
+
+
+def test_generate_embeddings_packs_inputs_per_request_and_keeps_order(monkeypatch):
+    fake = _BatchEmbeddings()
+    _patch_batch_openai(monkeypatch, fake)
+    texts = ["a" * n for n in range(1, 8)]
+
+    result = vector_tools.generate_embeddings(texts, max_batch_items=3, max_concurrency=2)
+
+    assert result == [[float(n)] for n in range(1, 8)]
+    assert sorted(len(r) for r in fake.requests) == [1, 3, 3]
+
+
+def test_generate_embeddings_respects_token_budget():
+    texts = ["x" * 30, "x" * 30, "x" * 30]  # ~11 tokens estimados cada uno
+    batches = list(vector_tools._iter_embedding_batches(texts, max_items=100, max_tokens=25))
+    assert batches == [[0, 1], [2]]
+
+
+def test_generate_embeddings_isolates_failing_item(monkeypatch):
+    fake = _BatchEmbeddings(fail_on={"malo"})
+    _patch_batch_openai(monkeypatch, fake)
+
+    result = vector_tools.generate_embeddings(["uno", "malo", "tres", "cuatro"], max_concurrency=1)
+
+    assert result == [[3.0], None, [4.0], [6.0]]
+
+
+def test_generate_embeddings_backs_off_on_rate_limit(monkeypatch):
+    fake = _BatchEmbeddings(rate_limited=2)
+    _patch_batch_openai(monkeypatch, fake)
+
+    assert vector_tools.generate_embeddings(["hola"]) == [[4.0]]
+    assert len(fake.requests) == 3
+
+
+def test_generate_embeddings_gives_up_after_max_retries(monkeypatch):
+    fake = _BatchEmbeddings(rate_limited=10)
+    _patch_batch_openai(monkeypatch, fake)
+
+    assert vector_tools.generate_embeddings(["a", "b"], max_retries=2) == [None, None]
+    assert len(fake.requests) == 3
+
+
+def test_index_all_meets_embeds_in_one_request(monkeypatch):
+    rows = [{"id": f"m{i}", "status": "done"} for i in range(5)]
+
+    class _Query:
+        def execute(self):
+            return type("R", (), {"data": rows})()
+
+    class _Sb:
+        def table(self, _name):
+            return type("T", (), {"select": lambda self, _s: _Query()})()
+
+    fake = _BatchEmbeddings()
+    _patch_batch_openai(monkeypatch, fake)
+    upserted = []
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
+    monkeypatch.setattr(
+        vector_tools,
+        "upsert_knowledge_chunks",
+        lambda chunks: upserted.extend(c["entity_id"] for c in chunks) or len(chunks),
+    )
+
+    assert vector_tools.index_all_meets() == 5
+    assert len(fake.requests) == 1
+    assert sorted(upserted) == [f"m{i}" for i in range(5)]
+
+
 def test_insert_knowledge_chunk_returns_string_id(monkeypatch):
     class _Exec:
         data = "chunk-abc"
@@ -329,7 +448,7 @@ def test_index_all_candidates_counts_successes(monkeypatch):
             return _CandTable()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_candidate", lambda c: "ok")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_candidates(limit=None) == 2
 
 
@@ -365,7 +484,7 @@ def test_index_all_jd_interviews_counts_successes(monkeypatch):
             return _JdTable()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_jd_interview", lambda j: "jid")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_jd_interviews() == 1
 
 
@@ -440,7 +559,7 @@ def test_index_all_meets_respects_limit(monkeypatch):
             return _MeetTable()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_meet", lambda m: "x")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_meets(limit=3) == 1
 
 
@@ -460,7 +579,7 @@ def test_index_all_meets_without_limit(monkeypatch):
             return _MeetTable()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_meet", lambda m: "y")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_meets(limit=None) == 1
 
 
@@ -490,7 +609,7 @@ def test_index_all_meet_evaluations_with_limit(monkeypatch):
             return _Table()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_meet_evaluation", lambda e: "z")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_meet_evaluations(limit=5) == 1
 
 
@@ -510,7 +629,7 @@ def test_index_all_meet_evaluations_without_limit(monkeypatch):
             return _Table()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_meet_evaluation", lambda e: "w")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_meet_evaluations(limit=None) == 1
 
 
@@ -562,7 +681,7 @@ def test_index_all_candidate_jd_status_with_limit(monkeypatch):
             return _Table()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_candidate_jd_status", lambda r: "ok")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_candidate_jd_status(limit=7) == 1
 
 
@@ -590,7 +709,7 @@ def test_index_all_candidate_jd_status_without_limit(monkeypatch):
             return _Table()
 
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_candidate_jd_status", lambda r: "idx")
+    _patch_batch_indexing(monkeypatch)
     assert vector_tools.index_all_candidate_jd_status(limit=None) == 1
 
 
@@ -615,18 +734,13 @@ def test_index_all_candidate_jd_status_continues_on_row_error(monkeypatch):
         def table(self, name):
             return _Table()
 
-    def _idx(r):
-        if r["id"] == "bad":
-            raise ValueError("index fail")
-        return "ok"
-
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_candidate_jd_status", _idx)
+    _patch_batch_indexing(monkeypatch, failing_ids={"bad"})
     assert vector_tools.index_all_candidate_jd_status(limit=10) == 1
 
 
-def test_get_supabase_client_calls_create_client_with_env(monkeypatch):
-    """38: `create_client(SUPABASE_URL, SUPABASE_KEY)` cuando hay env."""
+def test_get_supabase_client_calls_get_client_with_env(monkeypatch):
+    """38: `get_client(SUPABASE_URL, SUPABASE_KEY)` cuando hay env."""
     monkeypatch.setattr(vector_tools, "SUPABASE_URL", "http://sb.test")
     monkeypatch.setattr(vector_tools, "SUPABASE_KEY", "secret")
 
@@ -635,7 +749,7 @@ def test_get_supabase_client_calls_create_client_with_env(monkeypatch):
         assert key == "secret"
         return "supabase-client"
 
-    monkeypatch.setattr(vector_tools, "create_client", _fake_create)
+    monkeypatch.setattr(vector_tools, "get_client", _fake_create)
     assert vector_tools.get_supabase_client() == "supabase-client"
 
 
@@ -904,13 +1018,8 @@ def test_index_all_candidates_skips_failed_candidate(monkeypatch):
             assert name == "candidates"
             return _CandTable()
 
-    def _idx(c):
-        if c["id"] == "bad":
-            raise ValueError("index one fail")
-        return "ok"
-
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_candidate", _idx)
+    _patch_batch_indexing(monkeypatch, failing_ids={"bad"})
     assert vector_tools.index_all_candidates(limit=None) == 1
 
 
@@ -968,13 +1077,8 @@ def test_index_all_jd_interviews_skips_failed_row(monkeypatch):
             assert name == "jd_interviews"
             return _JdTable()
 
-    def _idx(j):
-        if j["id"] == "jbad":
-            raise ValueError("jd fail")
-        return "ok"
-
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_jd_interview", _idx)
+    _patch_batch_indexing(monkeypatch, failing_ids={"jbad"})
     assert vector_tools.index_all_jd_interviews() == 1
 
 
@@ -1031,13 +1135,8 @@ def test_index_all_meets_skips_row_error(monkeypatch):
         def table(self, name):
             return _MeetTable()
 
-    def _im(m):
-        if m["id"] == "m1":
-            raise ValueError("meet row fail")
-        return "ok"
-
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_meet", _im)
+    _patch_batch_indexing(monkeypatch, failing_ids={"m1"})
     assert vector_tools.index_all_meets() == 1
 
 
@@ -1080,13 +1179,8 @@ def test_index_all_meet_evaluations_skips_row_error(monkeypatch):
             assert name == "meet_evaluations"
             return _Table()
 
-    def _idx(e):
-        if e["id"] == "e1":
-            raise ValueError("mev fail")
-        return "z"
-
     monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
-    monkeypatch.setattr(vector_tools, "index_meet_evaluation", _idx)
+    _patch_batch_indexing(monkeypatch, failing_ids={"e1"})
     assert vector_tools.index_all_meet_evaluations() == 1
 
 
@@ -1136,3 +1230,258 @@ def test_index_all_candidate_jd_status_outer_exception(monkeypatch):
     monkeypatch.setattr(vector_tools, "get_supabase_client", _boom)
     with pytest.raises(RuntimeError, match="cjs query fail"):
         vector_tools.index_all_candidate_jd_status()
+
+
+def _candidate_expected_metadata(candidate):
+    content, metadata = vector_tools._candidate_chunk(candidate)
+    return content, vector_tools._with_content_hash(content, metadata)
+
+
+def test_index_candidate_skips_openai_and_rpc_when_chunk_unchanged(monkeypatch):
+    candidate = {"id": "c1", "name": "Ana", "email": "a@a.com", "tech_stack": ["python"]}
+    _, metadata = _candidate_expected_metadata(candidate)
+    monkeypatch.setattr(
+        vector_tools,
+        "_fetch_indexed_chunks",
+        lambda entity_type, ids: {"c1": {"id": "chunk-old", "entity_id": "c1", "metadata": metadata}},
+    )
+    monkeypatch.setattr(vector_tools, "generate_embedding", lambda *a, **k: pytest.fail("no debe embeber"))
+    monkeypatch.setattr(vector_tools, "update_knowledge_chunk", lambda **k: pytest.fail("no debe llamar al RPC"))
+
+    assert vector_tools.index_candidate(candidate) == "chunk-old"
+    assert metadata["content_hash"] == embedding_cache.content_hash(_candidate_expected_metadata(candidate)[0])
+
+
+def test_index_candidate_reuses_cached_embedding_when_only_metadata_changed(monkeypatch):
+    calls = {"embed": 0}
+    upserts = []
+
+    def _embed(text, model="text-embedding-3-small"):
+        calls["embed"] += 1
+        return [0.5, 0.25]
+
+    monkeypatch.setattr(vector_tools, "generate_embedding", _embed)
+    monkeypatch.setattr(vector_tools, "update_knowledge_chunk", lambda **k: upserts.append(k) or "chunk")
+
+    candidate = {"id": "c1", "name": "Ana", "email": "a@a.com"}
+    vector_tools.index_candidate(candidate)
+    vector_tools.index_candidate(candidate)
+
+    assert calls["embed"] == 1
+    assert [u["embedding"] for u in upserts] == [[0.5, 0.25], [0.5, 0.25]]
+    assert upserts[0]["metadata"]["embedding_model"] == "text-embedding-3-small"
+
+
+def test_index_all_candidates_reports_cache_hits_and_misses(monkeypatch, tmp_path):
+    rows = [{"id": cid, "name": cid.upper(), "email": f"{cid}@x", "tech_stack": None} for cid in ("a", "b", "c")]
+
+    class _Sb:
+        def table(self, _name):
+            query = type(
+                "Q", (), {"limit": lambda self, _n: self, "execute": lambda self: type("R", (), {"data": rows})()}
+            )
+            return type("T", (), {"select": lambda self, _s: query()})()
+
+    contents = {r["id"]: _candidate_expected_metadata(r) for r in rows}
+    # "a" ya indexado sin cambios; "b" con el embedding en cache local; "c" nuevo
+    monkeypatch.setattr(
+        vector_tools,
+        "_fetch_indexed_chunks",
+        lambda entity_type, ids: {"a": {"id": "chunk-a", "entity_id": "a", "metadata": contents["a"][1]}},
+    )
+    cache = embedding_cache.get_embedding_cache()
+    cache.put("text-embedding-3-small", contents["b"][1]["content_hash"], [9.0])
+
+    embedded = []
+
+    def _embeddings(texts, **_k):
+        embedded.extend(texts)
+        return [[1.0] for _ in texts]
+
+    upserted = {}
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
+    monkeypatch.setattr(vector_tools, "generate_embeddings", _embeddings)
+    monkeypatch.setattr(
+        vector_tools,
+        "upsert_knowledge_chunks",
+        lambda chunks: upserted.update({c["entity_id"]: c["embedding"] for c in chunks}) or len(chunks),
+    )
+
+    stats = {}
+    assert vector_tools.index_all_candidates(stats=stats) == 3
+    assert embedded == [contents["c"][0]]
+    assert upserted == {"b": [9.0], "c": [1.0]}
+    assert stats == {
+        "unchanged": 1,
+        "embedding_cache_hits": 1,
+        "embedding_cache_misses": 1,
+        "upserted": 2,
+        "failed": 0,
+    }
+    assert cache.get("text-embedding-3-small", contents["c"][1]["content_hash"]) == [1.0]
+
+
+def test_fetch_indexed_chunks_batches_in_filter(monkeypatch):
+    seen = []
+
+    class _Query:
+        def select(self, _cols):
+            return self
+
+        def eq(self, col, value):
+            assert (col, value) == ("entity_type", "meet")
+            return self
+
+        def in_(self, col, values):
+            seen.append(list(values))
+            self._values = values
+            return self
+
+        def execute(self):
+            return type("R", (), {"data": [{"id": f"k{v}", "entity_id": v, "metadata": {}} for v in self._values]})()
+
+    class _Sb:
+        def table(self, name):
+            assert name == "knowledge_chunks"
+            return _Query()
+
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
+    ids = [str(i) for i in range(250)] + [None, "0"]
+
+    found = _real_fetch_indexed_chunks("meet", ids)
+
+    assert [len(chunk) for chunk in seen] == [100, 100, 50]
+    assert len(found) == 250 and found["7"]["id"] == "k7"
+
+
+def test_fetch_indexed_chunks_treats_errors_as_not_indexed(monkeypatch):
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: (_ for _ in ()).throw(ValueError("sin env")))
+    assert _real_fetch_indexed_chunks("candidate", ["c1"]) == {}
+
+
+def _chunk(entity_id):
+    return {
+        "entity_id": entity_id,
+        "entity_type": "candidate",
+        "content": f"texto {entity_id}",
+        "embedding": [0.1],
+        "metadata": {"content_hash": entity_id},
+    }
+
+
+def test_upsert_knowledge_chunks_writes_batches_on_entity_key(monkeypatch):
+    requests = []
+
+    class _Upsert:
+        def __init__(self, rows, on_conflict, returning):
+            requests.append((len(rows), on_conflict, returning))
+
+        def execute(self):
+            return type("R", (), {"data": []})()
+
+    class _Table:
+        def upsert(self, rows, on_conflict="", returning="representation"):
+            return _Upsert(rows, on_conflict, returning)
+
+    class _Sb:
+        def table(self, name):
+            assert name == "knowledge_chunks"
+            return _Table()
+
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
+    monkeypatch.setattr(vector_tools, "update_knowledge_chunk", lambda **_k: pytest.fail("no debe ir fila a fila"))
+
+    written = vector_tools.upsert_knowledge_chunks([_chunk(str(i)) for i in range(450)], batch_size=200)
+
+    assert written == 450
+    assert sorted(requests) == [
+        (50, "entity_type,entity_id", "minimal"),
+        (200, "entity_type,entity_id", "minimal"),
+        (200, "entity_type,entity_id", "minimal"),
+    ]
+
+
+def test_upsert_knowledge_chunks_falls_back_per_row_when_batch_fails(monkeypatch):
+    class _Table:
+        def upsert(self, *_a, **_k):
+            raise RuntimeError("there is no unique or exclusion constraint matching the ON CONFLICT specification")
+
+    class _Sb:
+        def table(self, _name):
+            return _Table()
+
+    written_ids = []
+
+    def _update(entity_id, entity_type, content, embedding, metadata=None):
+        if entity_id == "bad":
+            raise ValueError("fila inválida")
+        written_ids.append(entity_id)
+        return f"chunk-{entity_id}"
+
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: _Sb())
+    monkeypatch.setattr(vector_tools, "update_knowledge_chunk", _update)
+
+    assert vector_tools.upsert_knowledge_chunks([_chunk("a"), _chunk("bad"), _chunk("c")]) == 2
+    assert written_ids == ["a", "c"]
+
+
+def test_upsert_knowledge_chunks_empty_is_noop(monkeypatch):
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: pytest.fail("no debe conectar"))
+    assert vector_tools.upsert_knowledge_chunks([]) == 0
+
+
+def test_get_query_embedding_reuses_cached_embedding(monkeypatch):
+    calls = []
+    monkeypatch.setattr(vector_tools, "generate_embedding", lambda text, model: calls.append(text) or [0.7])
+
+    assert vector_tools.get_query_embedding("¿Quién sabe Python?") == [0.7]
+    assert vector_tools.get_query_embedding("  ¿Quién sabe Python? ") == [0.7]
+    assert vector_tools.get_query_embedding("¿Quién sabe Go?") == [0.7]
+    assert calls == ["¿Quién sabe Python?", "¿Quién sabe Go?"]
+
+
+def _count_client(counts, queries):
+    class _Query:
+        def select(self, _cols, count=None):
+            assert count == "exact"
+            return self
+
+        def limit(self, _n):
+            return self
+
+        def execute(self):
+            queries.append(1)
+            return type("R", (), {"count": counts.pop(0)})()
+
+    return type("Sb", (), {"table": lambda self, name: _Query()})()
+
+
+def test_count_knowledge_chunks_caches_positive_counts():
+    queries = []
+    client = _count_client([5, 9], queries)
+
+    assert vector_tools.count_knowledge_chunks(lambda: client) == 5
+    assert vector_tools.count_knowledge_chunks(lambda: pytest.fail("debe usar el cache")) == 5
+    assert vector_tools.count_knowledge_chunks(lambda: client, refresh=True) == 9
+    assert len(queries) == 2
+
+
+def test_count_knowledge_chunks_does_not_cache_empty_base():
+    queries = []
+    client = _count_client([0, 3], queries)
+
+    assert vector_tools.count_knowledge_chunks(lambda: client) == 0
+    assert vector_tools.count_knowledge_chunks(lambda: client) == 3
+
+
+def test_upsert_knowledge_chunks_invalidates_cached_count(monkeypatch):
+    vector_tools._chunks_count_cache.set("total", 1)
+
+    class _Table:
+        def upsert(self, *_a, **_k):
+            return type("U", (), {"execute": lambda self: None})()
+
+    monkeypatch.setattr(vector_tools, "get_supabase_client", lambda: type("Sb", (), {"table": lambda s, n: _Table()})())
+    vector_tools.upsert_knowledge_chunks([_chunk("a")])
+
+    assert vector_tools._chunks_count_cache.get("total") is None
@@ -0,0 +1,232 @@
+"""
+Compactación determinística de conversation_data antes de evaluarla con el LLM.
+
+conversation_data es el bloque que más tokens aporta al prompt de /evaluate-meet
+(ver token_estimator.breakdown_context_tokens). La compactación:
+
+1. Normaliza cada turno a {"role", "content"} (acepta `content`, `message` o `text`),
+   descartando metadatos de ElevenLabs (tool_calls, tool_results, time_in_call_secs, ...).
+2. Elimina turnos vacíos (p. ej. turnos del agente que sólo contienen llamadas a tools) y
+   turnos de rol tool/system/function.
+3. Une turnos consecutivos del mismo rol.
+4. Opcionalmente, si se supera `token_budget`, conserva el inicio y el final de la entrevista
+   y reemplaza los turnos del medio por un marcador con la cantidad omitida. El turno que no
+   entra completo se recorta en lugar de descartarse, y siempre queda al menos un turno del
+   candidato (si lo hay).
+
+Sólo se compacta la copia que recibe el crew; el contexto original (email, guardado) no cambia.
+"""
+
+import json
+import os
+from collections.abc import Callable
+from typing import Any
+
+from tools.token_estimator import count_tokens
+
+NOISE_ROLES = {"tool", "system", "function"}
+TEXT_KEYS = ("content", "message", "text")
+TURN_LIST_KEYS = ("messages", "transcript")
+OMITTED_ROLE = "system"
+# Roles con los que ElevenLabs / el backoffice registran al candidato
+CANDIDATE_ROLES = ("user", "candidate")
+CUT_SUFFIX = " [... recortado por longitud ...]"
+# Si ni recortado entra en el presupuesto, el turno del candidato conserva al menos esto
+MIN_CANDIDATE_CHARS = 200
+
+
+def compaction_enabled() -> bool:
+    return os.getenv("CONVERSATION_COMPACTION_ENABLED", "true").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def default_token_budget() -> int:
+    """CONVERSATION_TOKEN_BUDGET; 0 (default) = sin truncar."""
+    try:
+        return max(0, int(os.getenv("CONVERSATION_TOKEN_BUDGET", "0")))
+    except ValueError:
+        return 0
+
+
+def _turn_text(turn: dict) -> str:
+    for key in TEXT_KEYS:
+        value = turn.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return ""
+
+
+def compact_turns(turns: list) -> tuple[list[dict], dict[str, int]]:
+    """Normaliza, descarta ruido y une turnos consecutivos del mismo rol."""
+    compacted: list[dict] = []
+    dropped = merged = 0
+    for turn in turns:
+        if not isinstance(turn, dict):
+            dropped += 1
+            continue
+        role = str(turn.get("role") or "unknown").strip().lower()
+        text = _turn_text(turn)
+        if role in NOISE_ROLES or not text:
+            dropped += 1
+            continue
+        if compacted and compacted[-1]["role"] == role:
+            compacted[-1]["content"] += "\n" + text
+            merged += 1
+            continue
+        compacted.append({"role": role, "content": text})
+    return compacted, {"dropped_turns": dropped, "merged_turns": merged}
+
+
+def _serialized_tokens(value: Any, count: Callable[[str], int]) -> int:
+    return count(json.dumps(value, ensure_ascii=False, default=str))
+
+
+def _cut_turn(turn: dict, token_budget: int, count: Callable[[str], int]) -> dict | None:
+    """Prefijo más largo del turno (con CUT_SUFFIX) que entra en `token_budget`; None si ninguno."""
+    content = turn["content"]
+    best = None
+    low, high = 1, len(content) - 1
+    while low <= high:
+        mid = (low + high) // 2
+        cut = {"role": turn["role"], "content": content[:mid].rstrip() + CUT_SUFFIX}
+        if _serialized_tokens(cut, count) <= token_budget:
+            best, low = cut, mid + 1
+        else:
+            high = mid - 1
+    return best
+
+
+def _keep_head_and_tail(
+    turns: list[dict], token_budget: int, count: Callable[[str], int]
+) -> tuple[dict[int, dict], int]:
+    """
+    Posición -> turno conservado, alternando desde el inicio y el final; el primer turno que no
+    entra completo se recorta al presupuesto restante. Devuelve también los tokens usados.
+    """
+    kept: dict[int, dict] = {}
+    used = 0
+    left, right = 0, len(turns) - 1
+    take_head = True
+    while left <= right:
+        pos = left if take_head else right
+        cost = _serialized_tokens(turns[pos], count)
+        if used + cost > token_budget:
+            cut = _cut_turn(turns[pos], token_budget - used, count)
+            if cut is not None:
+                kept[pos] = cut
+                used += _serialized_tokens(cut, count)
+            break
+        kept[pos] = turns[pos]
+        used += cost
+        if take_head:
+            left += 1
+        else:
+            right -= 1
+        take_head = not take_head
+    return kept, used
+
+
+def _omitted_marker(omitted: int) -> dict:
+    return {"role": OMITTED_ROLE, "content": f"[... {omitted} turnos omitidos por longitud ...]"}
+
+
+def _truncate_middle(turns: list[dict], token_budget: int, count: Callable[[str], int]) -> tuple[list[dict], int]:
+    """Conserva turnos alternando desde el inicio y el final hasta agotar el presupuesto."""
+    if _serialized_tokens(turns, count) <= token_budget:
+        return turns, 0
+
+    kept, used = _keep_head_and_tail(turns, token_budget, count)
+    candidate_positions = [pos for pos, turn in enumerate(turns) if turn["role"] in CANDIDATE_ROLES]
+    if candidate_positions and not any(pos in kept for pos in candidate_positions):
+        # Sin ningún turno del candidato no hay entrevista que evaluar: se le reserva la mitad
+        first = candidate_positions[0]
+        reserve = min(_serialized_tokens(turns[first], count), token_budget // 2)
+        kept, used = _keep_head_and_tail(turns, token_budget - reserve, count)
+        if first not in kept:
+            turn = turns[first]
+            if _serialized_tokens(turn, count) > token_budget - used:
+                turn = _cut_turn(turn, token_budget - used, count) or {
+                    "role": turn["role"],
+                    "content": turn["content"][:MIN_CANDIDATE_CHARS].rstrip() + CUT_SUFFIX,
+                }
+            kept[first] = turn
+
+    result: list[dict] = []
+    gap = 0
+    for pos in range(len(turns)):
+        if pos not in kept:
+            gap += 1
+            continue
+        if gap:
+            result.append(_omitted_marker(gap))
+            gap = 0
+        result.append(kept[pos])
+    if gap:
+        result.append(_omitted_marker(gap))
+    return result, len(turns) - len(kept)
+
+
+def compact_conversation_data(
+    conversation_data: Any,
+    token_budget: int | None = None,
+    model: str = "gpt-4o-mini",
+    count: Callable[[str], int] | None = None,
+) -> tuple[Any, dict[str, int]]:
+    """
+    Devuelve (conversation_data compactado, reporte). Conserva la forma de entrada: lista de
+    turnos, o dict con `messages`/`transcript` (sólo se reemplaza esa clave; el resto, p. ej.
+    análisis o resumen de ElevenLabs, se mantiene). Otros formatos (texto plano, dicts sin
+    turnos) se devuelven sin cambios.
+
+    El reporte incluye tokens_before/tokens_after, turns_before/turns_after, dropped_turns,
+    merged_turns y truncated_turns.
+    """
+    count = count or (lambda text: count_tokens(text, model))
+    token_budget = default_token_budget() if token_budget is None else token_budget
+
+    turns_key = None
+    turns = conversation_data
+    if isinstance(conversation_data, dict):
+        turns_key = next((k for k in TURN_LIST_KEYS if isinstance(conversation_data.get(k), list)), None)
+        turns = conversation_data.get(turns_key) if turns_key else None
+
+    tokens_before = _serialized_tokens(conversation_data, count) if conversation_data else 0
+    report = {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_before,
+        "turns_before": len(turns) if isinstance(turns, list) else 0,
+        "turns_after": len(turns) if isinstance(turns, list) else 0,
+        "dropped_turns": 0,
+        "merged_turns": 0,
+        "truncated_turns": 0,
+    }
+    if not isinstance(turns, list):
+        return conversation_data, report
+
+    compacted, stats = compact_turns(turns)
+    report.update(stats)
+    if token_budget > 0:
+        compacted, report["truncated_turns"] = _truncate_middle(compacted, token_budget, count)
+
+    result = {**conversation_data, turns_key: compacted} if turns_key else compacted
+    report["turns_after"] = len(compacted)
+    report["tokens_after"] = _serialized_tokens(result, count)
+    return result, report
+
+
+def compact_meet_context(
+    meet_context: dict | None, token_budget: int | None = None, model: str = "gpt-4o-mini"
+) -> tuple[dict | None, dict[str, int] | None]:
+    """
+    Copia de meet_context (load_meet_evaluation_context) con conversation.conversation_data
+    compactado. Devuelve (contexto, reporte); el reporte es None si no había qué compactar.
+    """
+    if not isinstance(meet_context, dict) or meet_context.get("error"):
+        return meet_context, None
+    conversation = meet_context.get("conversation")
+    if not isinstance(conversation, dict) or not conversation.get("conversation_data"):
+        return meet_context, None
+
+    compacted, report = compact_conversation_data(
+        conversation["conversation_data"], token_budget=token_budget, model=model
+    )
+    return {**meet_context, "conversation": {**conversation, "conversation_data": compacted}}, report
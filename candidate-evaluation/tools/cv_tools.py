@@ -1,23 +1,47 @@
 import io
 import json
 import os
+import random
 import re
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, BinaryIO
 
 import boto3
 import pdfplumber
+from botocore.config import Config
 from crewai.tools import tool
 from docx import Document
 from dotenv import load_dotenv
 from pdfminer.high_level import extract_text as pdfminer_extract_text
-from PyPDF2 import PdfReader
+from PyPDF2 import PdfReader, PdfWriter
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from tools import pdf_pages
+from utils import cv_text_cache
 from utils.logger import evaluation_logger
 
 load_dotenv()
 
 S3_PREFIX = "cvs/"
+CV_FILE_TYPES = ("pdf", "docx", "doc")
+# Tope de descarga de un CV y tamaño hasta el que el buffer queda en memoria (después, archivo temporal)
+DEFAULT_CV_MAX_DOWNLOAD_BYTES = 25 * 1024 * 1024
+DEFAULT_CV_DOWNLOAD_SPOOL_BYTES = 5 * 1024 * 1024
+_DOWNLOAD_CHUNK_BYTES = 256 * 1024
+
+# Contenido de un CV: bytes o el buffer de descarga (los parsers leen del buffer sin copiarlo)
+CVFile = bytes | BinaryIO
+
+# Un cliente S3 (y uno de Textract) por credenciales/región: reusa el pool de conexiones HTTP entre lecturas
+_s3_clients: dict[tuple[str, str, str], Any] = {}
+_s3_clients_lock = threading.Lock()
+_textract_clients: dict[tuple[str, str, str], Any] = {}
+_textract_clients_lock = threading.Lock()
 
 
 def get_s3_bucket_name() -> str:
@@ -35,9 +59,19 @@ def get_s3_region() -> str:
     return (os.getenv("S3_REGION") or os.getenv("AWS_REGION") or "us-east-1").strip() or "us-east-1"
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
 def _get_s3_client():
     """
-    Crea y retorna un cliente de S3 configurado con las credenciales correctas
+    Retorna el cliente de S3 del proceso para las credenciales actuales (se crea una sola vez).
+
+    Los clientes boto3 son thread-safe; S3_MAX_POOL_CONNECTIONS (10 por defecto) acota las
+    conexiones HTTP que comparten los hilos del API.
     """
     aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
     aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
@@ -49,24 +83,107 @@ def _get_s3_client():
     if not aws_secret_access_key:
         raise ValueError("AWS_SECRET_ACCESS_KEY not found in environment variables. Please set it in .env file")
 
-    # Verificar que las credenciales funcionen haciendo una llamada simple (sin logging)
-    try:
-        # Crear cliente con configuración explícita
-        s3_client = boto3.client(
-            "s3",
-            region_name=aws_region,
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-        )
+    client_key = (aws_access_key_id, aws_secret_access_key, aws_region)
+    with _s3_clients_lock:
+        s3_client = _s3_clients.get(client_key)
+        if s3_client is not None:
+            return s3_client
+        try:
+            # Crear cliente con configuración explícita
+            s3_client = boto3.client(
+                "s3",
+                region_name=aws_region,
+                aws_access_key_id=aws_access_key_id,
+                aws_secret_access_key=aws_secret_access_key,
+                config=Config(max_pool_connections=max(1, _env_int("S3_MAX_POOL_CONNECTIONS", 10))),
+            )
+        except Exception as e:
+            evaluation_logger.log_error("AWS S3", f"Error creando cliente S3: {str(e)}")
+            raise ValueError(f"Failed to create S3 client: {str(e)}")
+        _s3_clients[client_key] = s3_client
         return s3_client
-    except Exception as e:
-        evaluation_logger.log_error("AWS S3", f"Error creando cliente S3: {str(e)}")
-        raise ValueError(f"Failed to create S3 client: {str(e)}")
+
+
+# DetectDocumentText (síncrono) acepta hasta 5 MB y PDFs de una sola página
+TEXTRACT_SYNC_MAX_BYTES = 5 * 1024 * 1024
+_TEXTRACT_THROTTLING_ERRORS = (
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "LimitExceededException",
+)
+
+
+def _textract_setting(name: str, default: float, cast) -> Any:
+    try:
+        return max(cast(os.getenv(name, str(default))), 0)
+    except ValueError:
+        return default
+
+
+def _is_textract_throttling(error: Exception) -> bool:
+    code = (getattr(error, "response", None) or {}).get("Error", {}).get("Code", "")
+    return code in _TEXTRACT_THROTTLING_ERRORS or any(name in str(error) for name in _TEXTRACT_THROTTLING_ERRORS)
+
+
+def _get_textract_client():
+    """
+    Cliente de Textract del proceso para las credenciales actuales (se crea una sola vez).
+
+    Como el de S3, es thread-safe: las páginas en paralelo y los reintentos comparten su pool
+    de conexiones, con lugar para TEXTRACT_MAX_CONCURRENCY páginas a la vez (10 como mínimo).
+    """
+    client_key = (os.getenv("AWS_ACCESS_KEY_ID") or "", os.getenv("AWS_SECRET_ACCESS_KEY") or "", get_s3_region())
+    with _textract_clients_lock:
+        textract = _textract_clients.get(client_key)
+        if textract is None:
+            textract = boto3.client(
+                "textract",
+                region_name=client_key[2],
+                aws_access_key_id=client_key[0] or None,
+                aws_secret_access_key=client_key[1] or None,
+                config=Config(max_pool_connections=max(10, _textract_setting("TEXTRACT_MAX_CONCURRENCY", 4, int))),
+            )
+            _textract_clients[client_key] = textract
+        return textract
+
+
+def _split_pdf_pages(file_content: bytes) -> list[bytes] | None:
+    """Un PDF de una página por cada página del original; None si no es un PDF multipágina legible."""
+    try:
+        reader = PdfReader(io.BytesIO(file_content))
+        if len(reader.pages) <= 1:
+            return None
+        chunks = []
+        for page in reader.pages:
+            writer = PdfWriter()
+            writer.add_page(page)
+            buffer = io.BytesIO()
+            writer.write(buffer)
+            chunks.append(buffer.getvalue())
+        return chunks
+    except Exception:
+        return None
+
+
+def _textract_detect_lines(textract, document: bytes) -> list[str]:
+    """DetectDocumentText de un documento (una página) con backoff exponencial + jitter ante throttling."""
+    max_retries = _textract_setting("TEXTRACT_MAX_RETRIES", 4, int)
+    base_seconds = _textract_setting("TEXTRACT_RETRY_BASE_SECONDS", 0.5, float)
+    for attempt in range(max_retries + 1):
+        try:
+            response = textract.detect_document_text(Document={"Bytes": document})
+        except Exception as e:
+            if attempt >= max_retries or not _is_textract_throttling(e):
+                raise
+            time.sleep(base_seconds * (2**attempt) * random.uniform(1, 1.5))
+            continue
+        return [block["Text"] for block in response["Blocks"] if block["BlockType"] == "LINE"]
+    return []
 
 
 def _extract_text_from_pdf_with_textract(file_content: bytes) -> str:
     """
-    Extrae texto de PDF usando AWS Textract OCR (para PDFs escaneados/imágenes)
+    Extrae texto de PDF usando AWS Textract OCR (ver `_textract_pdf_pages`)
 
     Args:
         file_content: Contenido del archivo PDF en bytes
@@ -74,42 +191,60 @@ def _extract_text_from_pdf_with_textract(file_content: bytes) -> str:
     Returns:
         Texto extraído del PDF usando OCR
     """
-    try:
-        aws_access_key_id = os.getenv("AWS_ACCESS_KEY_ID")
-        aws_secret_access_key = os.getenv("AWS_SECRET_ACCESS_KEY")
-        aws_region = get_s3_region()
-
-        textract = boto3.client(
-            "textract",
-            region_name=aws_region,
-            aws_access_key_id=aws_access_key_id,
-            aws_secret_access_key=aws_secret_access_key,
-        )
+    return _textract_pdf_pages(file_content)[0]
 
-        # Verificar tamaño del archivo (máximo 5MB para sincrónico)
-        file_size_mb = len(file_content) / (1024 * 1024)
 
-        if file_size_mb > 5:
+def _textract_pdf_pages(file_content: bytes) -> tuple[str, list[int]]:
+    """
+    Extrae texto de PDF usando AWS Textract OCR (para PDFs escaneados/imágenes)
+
+    DetectDocumentText solo acepta PDFs de una página: los multipágina se separan en un PDF
+    por página y se procesan en paralelo (TEXTRACT_MAX_CONCURRENCY, 4 por defecto). El
+    límite de 5 MB aplica por página. El throttling se reintenta con backoff exponencial
+    (TEXTRACT_MAX_RETRIES, TEXTRACT_RETRY_BASE_SECONDS) y el texto se une en orden de página.
+
+    Args:
+        file_content: Contenido del archivo PDF en bytes
+
+    Returns:
+        Texto extraído del PDF usando OCR e índices (desde 0) de las páginas que fallaron
+    """
+    try:
+        documents = _split_pdf_pages(file_content) or [file_content]
+
+        oversized = max(len(document) for document in documents)
+        if oversized > TEXTRACT_SYNC_MAX_BYTES:
             raise Exception(
-                f"El archivo es muy grande ({file_size_mb:.2f} MB). "
-                "Textract síncrono solo soporta hasta 5MB. "
+                f"El archivo es muy grande ({oversized / (1024 * 1024):.2f} MB por página). "
+                "Textract síncrono solo soporta hasta 5MB por página. "
                 "Considera comprimir el PDF o usar procesamiento asíncrono."
             )
 
-        # Usar DetectDocumentText para extracción simple de texto
-        response = textract.detect_document_text(Document={"Bytes": file_content})
-
-        # Extraer el texto de la respuesta
-        text = ""
-        line_count = 0
-
-        for block in response["Blocks"]:
-            if block["BlockType"] == "LINE":
-                text += block["Text"] + "\n"
-                line_count += 1
+        textract = _get_textract_client()
 
+        failed_pages: list[int] = []
+        if len(documents) == 1:
+            page_lines = [_textract_detect_lines(textract, documents[0])]
+        else:
+            # Los clientes boto3 son thread-safe; se procesan las páginas con paralelismo acotado
+            concurrency = max(1, min(_textract_setting("TEXTRACT_MAX_CONCURRENCY", 4, int), len(documents)))
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="textract-page") as pool:
+                futures = [pool.submit(_textract_detect_lines, textract, document) for document in documents]
+            page_lines, errors = [], []
+            for index, future in enumerate(futures):
+                try:
+                    page_lines.append(future.result())
+                except Exception as page_error:
+                    errors.append(page_error)
+                    failed_pages.append(index)
+                    page_lines.append([])
+                    evaluation_logger.log_error("Textract OCR", f"Página {index + 1} falló: {page_error}")
+            if len(errors) == len(documents):
+                raise errors[0]
+
+        text = "\n\n".join("\n".join(lines) for lines in page_lines if lines)
         if text.strip():
-            return text.strip()
+            return text.strip(), failed_pages
         else:
             raise Exception("Textract no encontró texto en el documento")
 
@@ -125,138 +260,326 @@ def _extract_text_from_pdf_with_textract(file_content: bytes) -> str:
             )
         elif "InvalidParameterException" in error_msg:
             raise Exception(f"Parámetro inválido en Textract: {error_msg}")
-        elif "ProvisionedThroughputExceededException" in error_msg:
+        elif _is_textract_throttling(e):
             raise Exception("Límite de Textract excedido. Espera unos segundos y reintenta.")
         else:
             raise Exception(f"Error en Textract OCR: {error_msg}")
 
 
-def _extract_text_from_pdf(file_content: bytes) -> str:
-    """
-    Extrae texto de un archivo PDF usando múltiples métodos de extracción
+@dataclass
+class PdfProbe:
+    """Lo que se sabe de un PDF tras parsearlo una vez con PyPDF2 (None = no se pudo determinar)."""
 
-    Args:
-        file_content: Contenido del archivo PDF en bytes
+    pages: int | None = None
+    encrypted: bool | None = None
+    has_text_layer: bool | None = None
+    reader: Any = field(default=None, repr=False)
+    error: str | None = None
 
-    Returns:
-        Texto extraído del PDF
-    """
-    text = ""
-    pdf_bytes = io.BytesIO(file_content)
 
-    # MÉTODO 1: pdfplumber (mejor para PDFs con tablas y layouts complejos)
-    try:
-        pdf_bytes.seek(0)  # Resetear posición
+@dataclass
+class PdfExtraction:
+    """Texto extraído y el camino que lo produjo (método ganador, calidad e intentos)."""
 
-        with pdfplumber.open(pdf_bytes) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
+    text: str
+    method: str
+    probe: PdfProbe
+    quality: dict[str, float]
+    attempts: list[dict[str, Any]] = field(default_factory=list)
+    # Por qué el texto no debe ir a la caché de textos (None = se puede cachear)
+    cache_skip_reason: str | None = None
 
-                if page_text and page_text.strip():
-                    text += page_text + "\n\n"
-                else:
-                    pass
+    @property
+    def cacheable(self) -> bool:
+        return self.cache_skip_reason is None
 
-        if text.strip():
-            return text.strip()
-        else:
-            pass
-    except Exception:
-        pass
+    def metadata(self) -> dict[str, Any]:
+        return {
+            "method": self.method,
+            "pages": self.probe.pages,
+            "encrypted": self.probe.encrypted,
+            "has_text_layer": self.probe.has_text_layer,
+            "quality": self.quality,
+            "attempts": self.attempts,
+            "cacheable": self.cacheable,
+            "cache_skip_reason": self.cache_skip_reason,
+        }
 
-    # MÉTODO 2: PyPDF2 (más rápido, mejor para PDFs simples)
-    try:
-        pdf_bytes.seek(0)  # Resetear posición
 
-        pdf_reader = PdfReader(pdf_bytes)
+# Un CV con capa de texto real da cientos de caracteres por página; menos suele ser un escaneo
+PDF_MIN_CHARS_PER_PAGE = 200
+# Proporción máxima de caracteres basura (U+FFFD, controles, "(cid:N)" de fuentes sin mapeo)
+PDF_MAX_GARBAGE_RATIO = 0.2
+# Páginas que se inspeccionan buscando fuentes para decidir si hay capa de texto
+PDF_PROBE_PAGES = 3
 
-        text = ""
-        for page in pdf_reader.pages:
-            page_text = page.extract_text()
+_CID_RE = re.compile(r"\(cid:\d+\)")
 
-            if page_text and page_text.strip():
-                text += page_text + "\n\n"
-            else:
-                pass
 
-        if text.strip():
-            return text.strip()
-        else:
-            pass
-    except Exception:
-        pass
+def _pdf_resolve(obj: Any) -> Any:
+    return obj.get_object() if hasattr(obj, "get_object") else obj
 
-    # MÉTODO 3: pdfminer.six (más robusto para PDFs difíciles)
-    try:
-        pdf_bytes.seek(0)  # Resetear posición
 
-        text = pdfminer_extract_text(pdf_bytes)
+def _as_stream(file_content: CVFile) -> BinaryIO:
+    """Stream posicionado al inicio; los bytes se envuelven, el buffer de descarga se reusa tal cual."""
+    if isinstance(file_content, (bytes, bytearray)):
+        return io.BytesIO(file_content)
+    file_content.seek(0)
+    return file_content
+
+
+def _as_bytes(file_content: CVFile) -> bytes:
+    """Documento completo en memoria: solo para Textract y el pool de procesos, que lo necesitan así."""
+    if isinstance(file_content, (bytes, bytearray)):
+        return bytes(file_content)
+    file_content.seek(0)
+    return file_content.read()
 
-        if text and text.strip():
-            return text.strip()
-        else:
-            pass
-    except Exception:
-        pass
 
-    # MÉTODO 4: AWS Textract OCR (para PDFs escaneados/imágenes)
+def _probe_pdf(file_content: CVFile) -> PdfProbe:
+    """Un solo parseo: páginas, encriptación y si alguna de las primeras páginas declara fuentes."""
     try:
-        text = _extract_text_from_pdf_with_textract(file_content)
+        reader = PdfReader(_as_stream(file_content))
+    except Exception as e:
+        return PdfProbe(error=str(e))
 
-        if text and text.strip():
-            return text.strip()
-        else:
-            pass
+    probe = PdfProbe(reader=reader, encrypted=getattr(reader, "is_encrypted", None))
+    if probe.encrypted:
+        # Muchos CVs vienen con owner password y user password vacía
+        try:
+            reader.decrypt("")
+        except Exception as e:
+            probe.error = f"encriptado: {e}"
+    try:
+        pages = reader.pages
+        probe.pages = len(pages)
+        probe.has_text_layer = False
+        for page in list(pages)[:PDF_PROBE_PAGES]:
+            resources = _pdf_resolve(page.get("/Resources")) or {}
+            if "/Font" in resources:
+                probe.has_text_layer = True
+                break
+            # Texto dentro de Form XObjects: no se puede descartar sin recorrerlos
+            xobjects = _pdf_resolve(resources.get("/XObject")) or {}
+            if any(_pdf_resolve(x).get("/Subtype") == "/Form" for x in xobjects.values()):
+                probe.has_text_layer = None
+    except Exception as e:
+        probe.has_text_layer = None
+        probe.error = probe.error or str(e)
+    return probe
+
+
+def _text_quality(text: str, pages: int | None) -> dict[str, float]:
+    chars = len(text)
+    garbage = sum(len(m) for m in _CID_RE.findall(text))
+    garbage += sum(1 for c in _CID_RE.sub("", text) if c == "\ufffd" or (ord(c) < 32 and c not in "\n\r\t\f"))
+    return {
+        "chars": chars,
+        "chars_per_page": round(chars / max(pages or 1, 1), 1),
+        "garbage_ratio": round(garbage / chars, 3) if chars else 1.0,
+    }
+
+
+def _is_usable(quality: dict[str, float]) -> bool:
+    return quality["chars"] > 0 and quality["garbage_ratio"] <= PDF_MAX_GARBAGE_RATIO
+
+
+def _is_adequate(quality: dict[str, float]) -> bool:
+    return _is_usable(quality) and quality["chars_per_page"] >= PDF_MIN_CHARS_PER_PAGE
+
+
+def _join_pages(page_texts) -> str:
+    return "\n\n".join(t for t in page_texts if t and t.strip()).strip()
+
+
+def _parallel_pages_text(file_content: CVFile, probe: PdfProbe, engine: str, notes: dict[str, Any]) -> str | None:
+    """
+    Texto por páginas en paralelo (tools/pdf_pages.py); None si no corresponde o el pool falla.
+    Las páginas que vencieron o fallaron quedan en `notes` (texto incompleto).
+    """
+    if probe.encrypted or not pdf_pages.should_parallelize(probe.pages):
+        return None
+    try:
+        result = pdf_pages.extract_pages_parallel(_as_bytes(file_content), engine, probe.pages)
     except Exception as e:
-        evaluation_logger.log_error("Extracción PDF", f"⚠ Textract OCR falló: {str(e)}")
+        evaluation_logger.log_error("Extracción PDF", f"Extracción paralela ({engine}) no disponible: {e}")
+        return None
+    if result.timed_out or result.failed:
+        evaluation_logger.log_error(
+            "Extracción PDF",
+            f"{engine}: páginas sin texto por timeout {result.timed_out} / error {sorted(result.failed)}",
+        )
+        notes["timed_out_pages"] = list(result.timed_out)
+        notes["failed_pages"] = sorted(result.failed)
+    return _join_pages(result.texts)
+
+
+def _pypdf2_text(file_content: CVFile, probe: PdfProbe, notes: dict[str, Any]) -> str:
+    # Serial: PyPDF2 tarda milisegundos por página, menos que arrancar el pool de procesos
+    reader = probe.reader if probe.reader is not None else PdfReader(_as_stream(file_content))
+    return _join_pages(page.extract_text() for page in reader.pages)
+
+
+def _pdfplumber_text(file_content: CVFile, probe: PdfProbe, notes: dict[str, Any]) -> str:
+    parallel = _parallel_pages_text(file_content, probe, "pdfplumber", notes)
+    if parallel is not None:
+        return parallel
+    # Un stream externo no lo cierra pdfplumber al salir
+    with pdfplumber.open(_as_stream(file_content)) as pdf:
+        return _join_pages(page.extract_text() for page in pdf.pages)
+
+
+def _pdfminer_text(file_content: CVFile, probe: PdfProbe, notes: dict[str, Any]) -> str:
+    return (pdfminer_extract_text(_as_stream(file_content)) or "").strip()
+
+
+def _textract_text(file_content: CVFile, probe: PdfProbe, notes: dict[str, Any]) -> str:
+    text, failed_pages = _textract_pdf_pages(_as_bytes(file_content))
+    if failed_pages:
+        notes["failed_pages"] = failed_pages
+    return (text or "").strip()
+
+
+# De más barato a más caro; todos los de capa de texto antes que el OCR (pago)
+_PDF_TEXT_EXTRACTORS = (("pypdf2", _pypdf2_text), ("pdfplumber", _pdfplumber_text), ("pdfminer", _pdfminer_text))
+
+
+def extract_pdf_text(file_content: CVFile) -> PdfExtraction:
+    """
+    Extrae el texto de un PDF con el extractor más barato que dé un resultado adecuado.
 
-        # Si Textract falla, proporcionar información de diagnóstico (sin logging)
+    Sondea el PDF una vez (páginas, encriptación, capa de texto) y prueba PyPDF2 (reusa el
+    parseo del sondeo), pdfplumber y pdfminer en ese orden, puntuando cada salida por
+    caracteres por página y proporción de basura. Se detiene en la primera adecuada; si
+    ninguna lo es se queda con la mejor utilizable, y solo si no hay texto utilizable recurre a
+    Textract OCR. Si el sondeo no encuentra fuentes, tras PyPDF2 se va directo a Textract y
+    pdfplumber/pdfminer solo corren si el OCR falla o no da texto utilizable.
+
+    El resultado no es cacheable (`cache_skip_reason`) si al texto ganador le faltan páginas
+    (timeout o error en el pool de páginas) o si su calidad no llega a adecuada.
+
+    `file_content` puede ser bytes o un stream binario con seek (el buffer de descarga).
+    """
+    probe = _probe_pdf(file_content)
+    attempts: list[dict[str, Any]] = []
+    candidates: list[tuple[str, str, dict[str, float], dict[str, Any]]] = []
+
+    def _attempt(name: str, extractor) -> bool:
+        notes: dict[str, Any] = {}
         try:
-            pdf_bytes.seek(0)
-            pdf_reader = PdfReader(pdf_bytes)
-            _ = {"num_pages": len(pdf_reader.pages), "is_encrypted": pdf_reader.is_encrypted, "textract_error": str(e)}
-        except Exception:
-            pass
-
-    # Si todos los métodos fallaron
-    evaluation_logger.log_error("Extracción PDF", "Todos los métodos de extracción fallaron (incluyendo OCR)")
-
-    raise Exception(
-        "No se pudo extraer texto del PDF con ningún método disponible (incluyendo OCR). "
-        "Posibles causas:\n"
-        "1. El PDF está protegido o encriptado\n"
-        "2. El PDF está corrupto o tiene un formato no estándar\n"
-        "3. El PDF está vacío o no contiene texto ni imágenes legibles\n"
-        "4. Textract no tiene permisos (necesita textract:DetectDocumentText)\n"
-        "5. El archivo excede los 5MB para procesamiento sincrónico de Textract"
+            text = extractor(file_content, probe, notes)
+        except Exception as e:
+            attempts.append({"method": name, "error": str(e)})
+            if name == "textract":
+                evaluation_logger.log_error("Extracción PDF", f"⚠ Textract OCR falló: {str(e)}")
+            return False
+        quality = _text_quality(text, probe.pages)
+        attempts.append({"method": name, **quality, **notes})
+        if text:
+            candidates.append((name, text, quality, notes))
+        return _is_adequate(quality) and not notes
+
+    def _has_usable() -> bool:
+        return any(_is_usable(quality) for _name, _text, quality, _notes in candidates)
+
+    # Sin fuentes en las primeras páginas: solo PyPDF2 (reusa el sondeo) antes del OCR; el resto
+    # de los extractores de texto queda como respaldo si Textract falla o no da texto utilizable
+    text_extractors, deferred = _PDF_TEXT_EXTRACTORS, ()
+    if probe.has_text_layer is False:
+        attempts.append({"method": "text_layer", "deferred": "sin fuentes en las primeras páginas"})
+        text_extractors, deferred = _PDF_TEXT_EXTRACTORS[:1], _PDF_TEXT_EXTRACTORS[1:]
+    for name, extractor in text_extractors:
+        if _attempt(name, extractor):
+            break
+
+    if not _has_usable():
+        _attempt("textract", _textract_text)
+        for name, extractor in deferred:
+            if _has_usable():
+                break
+            _attempt(name, extractor)
+
+    if not candidates:
+        evaluation_logger.log_error("Extracción PDF", "Todos los métodos de extracción fallaron (incluyendo OCR)")
+        raise Exception(
+            "No se pudo extraer texto del PDF con ningún método disponible (incluyendo OCR). "
+            "Posibles causas:\n"
+            "1. El PDF está protegido o encriptado\n"
+            "2. El PDF está corrupto o tiene un formato no estándar\n"
+            "3. El PDF está vacío o no contiene texto ni imágenes legibles\n"
+            "4. Textract no tiene permisos (necesita textract:DetectDocumentText)\n"
+            "5. El archivo excede los 5MB para procesamiento sincrónico de Textract"
+        )
+
+    # Adecuado y completo > adecuado > utilizable > cualquiera; a igualdad, más caracteres útiles
+    name, text, quality, notes = max(
+        candidates,
+        key=lambda c: (
+            _is_adequate(c[2]) and not c[3],
+            _is_adequate(c[2]),
+            _is_usable(c[2]),
+            c[2]["chars"] * (1 - c[2]["garbage_ratio"]),
+        ),
+    )
+    cache_skip_reason = None
+    if notes:
+        cache_skip_reason = "páginas sin texto (timeout o error en la extracción por páginas o el OCR)"
+    elif not _is_adequate(quality):
+        cache_skip_reason = "calidad de texto no adecuada"
+    extraction = PdfExtraction(
+        text=text,
+        method=name,
+        probe=probe,
+        quality=quality,
+        attempts=attempts,
+        cache_skip_reason=cache_skip_reason,
+    )
+    evaluation_logger.log_task_progress(
+        "Extracción PDF",
+        f"{name}: {probe.pages or '?'} pág., {quality['chars_per_page']:g} chars/pág., "
+        f"basura {quality['garbage_ratio']:.0%} (intentos: {', '.join(a['method'] for a in attempts)})",
     )
+    return extraction
 
 
-def _extract_text_from_docx(file_content: bytes) -> str:
+def _extract_text_from_pdf(file_content: CVFile) -> str:
+    """
+    Extrae texto de un archivo PDF (ver `extract_pdf_text`)
+
+    Args:
+        file_content: Contenido del archivo PDF en bytes
+
+    Returns:
+        Texto extraído del PDF
+    """
+    return extract_pdf_text(file_content).text
+
+
+def _extract_text_from_docx(file_content: CVFile) -> str:
     """
     Extrae texto de un archivo DOCX
 
     Args:
-        file_content: Contenido del archivo DOCX en bytes
+        file_content: Contenido del archivo DOCX en bytes o stream binario
 
     Returns:
         Texto extraído del DOCX
     """
     try:
-        doc = Document(io.BytesIO(file_content))
+        doc = Document(_as_stream(file_content))
         text = "\n".join([paragraph.text for paragraph in doc.paragraphs])
         return text.strip()
     except Exception as e:
         raise Exception(f"Error extracting text from DOCX: {str(e)}")
 
 
-def _extract_text_from_doc(file_content: bytes) -> str:
+def _extract_text_from_doc(file_content: CVFile) -> str:
     """
     Extrae texto de un archivo DOC (formato antiguo)
     Nota: Para archivos .doc antiguos, se recomienda convertirlos a .docx primero
 
     Args:
-        file_content: Contenido del archivo DOC en bytes
+        file_content: Contenido del archivo DOC en bytes o stream binario
 
     Returns:
         Texto extraído del DOC
@@ -269,6 +592,109 @@ def _extract_text_from_doc(file_content: bytes) -> str:
         raise Exception(f"Error extracting text from DOC: {str(e)}. Consider converting to DOCX format.")
 
 
+def _cv_download_result(
+    filename: str,
+    s3_key: str,
+    bucket: str,
+    file_type: str,
+    text_content: str,
+    extraction: dict[str, Any],
+    cached: str | None = None,
+) -> str:
+    return json.dumps(
+        {
+            "success": True,
+            "filename": filename,
+            "s3_key": s3_key,
+            "bucket": bucket,
+            "file_type": file_type,
+            "text_content": text_content,
+            "content_length": len(text_content),
+            "extraction": extraction,
+            "cached": cached,
+        },
+        indent=2,
+        ensure_ascii=False,
+    )
+
+
+def _cached_download_result(
+    filename: str, s3_key: str, bucket: str, file_extension: str, cached: dict[str, Any], source: str
+) -> str:
+    evaluation_logger.log_task_progress("Descarga de CV", f"Texto de {s3_key} desde caché ({source})")
+    return _cv_download_result(
+        filename,
+        s3_key,
+        bucket,
+        cached["metadata"].get("file_type", file_extension),
+        cached["text_content"],
+        cached["metadata"].get("extraction") or {},
+        cached=source,
+    )
+
+
+def _is_not_modified(error: Exception) -> bool:
+    response = getattr(error, "response", None) or {}
+    status = response.get("ResponseMetadata", {}).get("HTTPStatusCode")
+    return status == 304 or response.get("Error", {}).get("Code") in {"304", "NotModified"}
+
+
+def _get_cv_object(s3_client, bucket: str, s3_key: str, if_none_match: str | None = None) -> dict[str, Any] | None:
+    """GetObject (condicional con `If-None-Match` si hay ETag); None si S3 responde 304 Not Modified."""
+    params = {"Bucket": bucket, "Key": s3_key}
+    if if_none_match:
+        params["IfNoneMatch"] = if_none_match
+    try:
+        return s3_client.get_object(**params)
+    except s3_client.exceptions.NoSuchKey:
+        raise FileNotFoundError(
+            f"El archivo '{s3_key}' no existe en el bucket '{bucket}'. "
+            f"Verifica que el archivo esté en la ubicación correcta."
+        )
+    except Exception as e:
+        if if_none_match and _is_not_modified(e):
+            return None
+        raise
+
+
+def _download_to_buffer(response: dict[str, Any], filename: str) -> tempfile.SpooledTemporaryFile:
+    """
+    Copia el body de S3 por bloques a un buffer que queda en memoria hasta CV_DOWNLOAD_SPOOL_BYTES
+    y después pasa a un archivo temporal. Corta si el objeto supera CV_MAX_DOWNLOAD_BYTES (según
+    ContentLength, sin leerlo, o al superarlo durante la lectura).
+    """
+    max_bytes = _env_int("CV_MAX_DOWNLOAD_BYTES", DEFAULT_CV_MAX_DOWNLOAD_BYTES)
+    too_large = (
+        f"El archivo '{filename}' supera el máximo de descarga "
+        f"({max_bytes / (1024 * 1024):.1f} MB, CV_MAX_DOWNLOAD_BYTES)"
+    )
+    body = response["Body"]
+    if (response.get("ContentLength") or 0) > max_bytes:
+        body.close()
+        raise ValueError(too_large)
+
+    # Lo cierra quien lo recibe (`with _download_to_buffer(...)`)
+    buffer = tempfile.SpooledTemporaryFile(  # noqa: SIM115
+        max_size=_env_int("CV_DOWNLOAD_SPOOL_BYTES", DEFAULT_CV_DOWNLOAD_SPOOL_BYTES)
+    )
+    size = 0
+    try:
+        while chunk := body.read(_DOWNLOAD_CHUNK_BYTES):
+            size += len(chunk)
+            if size > max_bytes:
+                raise ValueError(too_large)
+            buffer.write(chunk)
+        if size == 0:
+            raise ValueError(f"El archivo '{filename}' está vacío (0 bytes)")
+    except BaseException:
+        buffer.close()
+        raise
+    finally:
+        body.close()
+    buffer.seek(0)
+    return buffer
+
+
 @tool
 def download_cv_from_s3(filename: str) -> str:
     """
@@ -288,50 +714,51 @@ def download_cv_from_s3(filename: str) -> str:
         # Crear cliente S3
         s3_client = _get_s3_client()
 
-        # Primero verificar que el archivo existe
-        try:
-            s3_client.head_object(Bucket=bucket, Key=s3_key)
-        except s3_client.exceptions.NoSuchKey:
-            raise FileNotFoundError(
-                f"El archivo '{s3_key}' no existe en el bucket '{bucket}'. "
-                f"Verifica que el archivo esté en la ubicación correcta."
-            )
-        except Exception as e:
-            raise Exception(f"Error verificando objeto en S3: {str(e)}")
-
-        # Descargar archivo
-        response = s3_client.get_object(Bucket=bucket, Key=s3_key)
-        file_content = response["Body"].read()
-
-        if len(file_content) == 0:
-            raise ValueError(f"El archivo '{filename}' está vacío (0 bytes)")
-
-        # Detectar tipo de archivo por extensión
+        # Detectar tipo de archivo por extensión (antes de descargar nada)
         file_extension = filename.lower().split(".")[-1]
-
-        # Extraer texto según el tipo de archivo
-        if file_extension == "pdf":
-            text_content = _extract_text_from_pdf(file_content)
-        elif file_extension == "docx":
-            text_content = _extract_text_from_docx(file_content)
-        elif file_extension == "doc":
-            text_content = _extract_text_from_doc(file_content)
-        else:
+        if file_extension not in CV_FILE_TYPES:
             raise ValueError(f"Unsupported file format: {file_extension}. Supported formats: pdf, doc, docx")
 
-        return json.dumps(
-            {
-                "success": True,
-                "filename": filename,
-                "s3_key": s3_key,
-                "bucket": bucket,
-                "file_type": file_extension,
-                "text_content": text_content,
-                "content_length": len(text_content),
-            },
-            indent=2,
-            ensure_ascii=False,
-        )
+        # Una sola llamada a S3: GET condicional contra el último ETag extraído (304 = usar el caché)
+        known_etag = cv_text_cache.get_cached_etag(bucket, s3_key)
+        response = _get_cv_object(s3_client, bucket, s3_key, if_none_match=known_etag)
+        if response is None:
+            cached, cache_source = cv_text_cache.get_cached_cv_text(cv_text_cache.cache_key(bucket, s3_key, known_etag))
+            if cached:
+                return _cached_download_result(filename, s3_key, bucket, file_extension, cached, cache_source)
+            # La entrada se desalojó entre la consulta y el 304
+            response = _get_cv_object(s3_client, bucket, s3_key)
+
+        # Mismo objeto (ETag) ya extraído en otra instancia: sin leer el body ni parsear
+        text_cache_key = cv_text_cache.cache_key(bucket, s3_key, response.get("ETag"))
+        cached, cache_source = cv_text_cache.get_cached_cv_text(text_cache_key)
+        if cached:
+            response["Body"].close()
+            return _cached_download_result(filename, s3_key, bucket, file_extension, cached, cache_source)
+
+        # Extraer texto según el tipo de archivo, leyendo del buffer de descarga
+        extraction_metadata = {"method": "python-docx"}
+        with _download_to_buffer(response, filename) as file_content:
+            if file_extension == "pdf":
+                extraction = extract_pdf_text(file_content)
+                text_content = extraction.text
+                extraction_metadata = extraction.metadata()
+            elif file_extension == "docx":
+                text_content = _extract_text_from_docx(file_content)
+            else:
+                text_content = _extract_text_from_doc(file_content)
+
+        # Un texto incompleto o de baja calidad no se cachea: la próxima lectura vuelve a extraer
+        if extraction_metadata.get("cacheable", True):
+            cv_text_cache.save_cv_text(
+                text_cache_key, text_content, {"file_type": file_extension, "extraction": extraction_metadata}
+            )
+        else:
+            evaluation_logger.log_task_progress(
+                "Descarga de CV",
+                f"Texto de {s3_key} no se guarda en caché: {extraction_metadata.get('cache_skip_reason')}",
+            )
+        return _cv_download_result(filename, s3_key, bucket, file_extension, text_content, extraction_metadata)
 
     except FileNotFoundError as e:
         evaluation_logger.log_error("Descarga de CV", f"Archivo no encontrado: {str(e)}")
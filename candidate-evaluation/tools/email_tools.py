@@ -10,11 +10,11 @@ import httpx
 import requests
 from crewai.tools import tool
 from dotenv import load_dotenv
-from supabase import create_client
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from tools.elevenlabs_tools import create_elevenlabs_agent
 from utils.logger import evaluation_logger
+from utils.supabase_client import get_client
 
 load_dotenv()
 
@@ -36,7 +36,7 @@ class GraphEmailMonitor:
         # Inicializar Supabase
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        self.supabase = create_client(url, key)
+        self.supabase = get_client(url, key)
 
         # Patrón para consultas de estado: Status-<uuid>
         self.status_pattern = r"^Status-([0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$"
@@ -0,0 +1,141 @@
+"""
+Page-parallel text extraction for multi-page PDFs.
+
+Each call gets its own process pool: every worker parses the PDF once (pool initializer)
+and then extracts the pages it is handed, so layout analysis runs on several cores
+instead of page by page. `cv_tools` only uses it for pdfplumber (hundreds of ms per
+page); PyPDF2 is a few ms per page and stays serial (see scripts/benchmark_pdf_pages.py).
+
+Results are collected in page order; a page that does not finish within `page_timeout`
+seconds (or raises) yields "" and is reported, and the pool is terminated so a
+pathological page cannot hang `/read-cv`.
+
+This module only imports the PDF libraries, so pool workers start without loading crewai
+or boto3. On POSIX the pool uses the `forkserver` start method (safe from the threaded
+API process) with this module preloaded.
+
+- PDF_PARALLEL_EXTRACTION: `true` by default; `0` / `false` / `no` / `off` extracts serially.
+- PDF_PAGE_WORKERS: processes per PDF (default `min(4, cpu_count)`; < 2 disables).
+- PDF_PARALLEL_MIN_PAGES: minimum pages to go parallel (default 4).
+- PDF_PAGE_TIMEOUT_SECONDS: per-page timeout (default 15).
+"""
+
+import io
+import multiprocessing
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+import pdfplumber
+from PyPDF2 import PdfReader
+
+DEFAULT_MIN_PAGES = 4
+DEFAULT_PAGE_TIMEOUT_SECONDS = 15.0
+PAGE_ENGINES = ("pypdf2", "pdfplumber")
+
+# Estado de cada proceso del pool: el documento abierto una sola vez por el initializer
+_worker_doc: Any = None
+
+
+def is_parallel_enabled() -> bool:
+    return os.getenv("PDF_PARALLEL_EXTRACTION", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _env_number(name: str, default: float, cast) -> Any:
+    try:
+        return cast(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def page_workers() -> int:
+    return max(0, _env_number("PDF_PAGE_WORKERS", min(4, os.cpu_count() or 1), int))
+
+
+def min_parallel_pages() -> int:
+    return max(2, _env_number("PDF_PARALLEL_MIN_PAGES", DEFAULT_MIN_PAGES, int))
+
+
+def page_timeout_seconds() -> float:
+    return max(0.1, _env_number("PDF_PAGE_TIMEOUT_SECONDS", DEFAULT_PAGE_TIMEOUT_SECONDS, float))
+
+
+def should_parallelize(pages: int | None) -> bool:
+    return is_parallel_enabled() and page_workers() >= 2 and (pages or 0) >= min_parallel_pages()
+
+
+@dataclass
+class PageTexts:
+    """Text per page in document order, plus pages that timed out or failed."""
+
+    texts: list[str]
+    timed_out: list[int] = field(default_factory=list)
+    failed: dict[int, str] = field(default_factory=dict)
+
+
+def _open_document(engine: str, file_content: bytes) -> Any:
+    if engine == "pdfplumber":
+        return pdfplumber.open(io.BytesIO(file_content))
+    return PdfReader(io.BytesIO(file_content))
+
+
+def _init_worker(engine: str, file_content: bytes) -> None:
+    global _worker_doc
+    _worker_doc = _open_document(engine, file_content)
+
+
+def _extract_page(index: int) -> str:
+    return _worker_doc.pages[index].extract_text() or ""
+
+
+def extract_pages_serial(file_content: bytes, engine: str) -> PageTexts:
+    doc = _open_document(engine, file_content)
+    try:
+        return PageTexts(texts=[page.extract_text() or "" for page in doc.pages])
+    finally:
+        if hasattr(doc, "close"):
+            doc.close()
+
+
+def _mp_context():
+    methods = multiprocessing.get_all_start_methods()
+    if "forkserver" in methods:
+        ctx = multiprocessing.get_context("forkserver")
+        ctx.set_forkserver_preload([__name__])
+        return ctx
+    return multiprocessing.get_context("spawn")
+
+
+def extract_pages_parallel(
+    file_content: bytes,
+    engine: str,
+    pages: int,
+    workers: int | None = None,
+    page_timeout: float | None = None,
+) -> PageTexts:
+    """Extracts `pages` pages with `engine` on a process pool, keeping page order."""
+    if engine not in PAGE_ENGINES:
+        raise ValueError(f"engine must be one of {PAGE_ENGINES}")
+    workers = min(workers or page_workers(), pages)
+    page_timeout = page_timeout or page_timeout_seconds()
+    result = PageTexts(texts=[""] * pages)
+
+    pool = _mp_context().Pool(processes=workers, initializer=_init_worker, initargs=(engine, file_content))
+    hung = False
+    try:
+        pending = [pool.apply_async(_extract_page, (index,)) for index in range(pages)]
+        for index, async_result in enumerate(pending):
+            try:
+                result.texts[index] = async_result.get(timeout=page_timeout)
+            except multiprocessing.TimeoutError:
+                hung = True
+                result.timed_out.append(index)
+            except Exception as e:
+                result.failed[index] = str(e)
+    finally:
+        if hung:
+            pool.terminate()
+        else:
+            pool.close()
+        pool.join()
+    return result
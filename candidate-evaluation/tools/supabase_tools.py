@@ -8,11 +8,11 @@ from typing import Any
 import requests
 from crewai.tools import tool
 from dotenv import load_dotenv
-from supabase import create_client
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 from utils.helpers import clean_uuid
 from utils.logger import evaluation_logger
+from utils.supabase_client import get_client
 
 load_dotenv()
 
@@ -64,7 +64,7 @@ class SupabaseExtractorTool:
     def __init__(self):
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        self.supabase = create_client(url, key)
+        self.supabase = get_client(url, key)
 
 
 @tool
@@ -84,7 +84,7 @@ def extract_supabase_conversations(limit: int = 100) -> str:
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         response = (
             supabase.table("conversations")
@@ -398,7 +398,7 @@ def get_existing_meets_candidates() -> str:
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         result = {}
 
@@ -455,7 +455,7 @@ def get_all_jd_interviews(client_id: str = None) -> str:
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # Obtener entrevistas (filtradas por client_id si se proporciona y status = 'active')
         if client_id:
@@ -536,7 +536,7 @@ def get_jd_interviews_data(jd_interview_id: str = None) -> str:
             evaluation_logger.log_error("Obtener JD Interview Data", error_msg)
             return json.dumps({"error": error_msg}, indent=2)
 
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         print("📊 Consultando tabla jd_interviews...")
         if jd_interview_id:
@@ -616,7 +616,7 @@ def get_client_email(client_id: str) -> str:
             evaluation_logger.log_error("Obtener Email del Cliente", error_msg)
             return json.dumps({"error": error_msg}, indent=2)
 
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # Buscar cliente por ID
         response = supabase.table("clients").select("id, email, name").eq("id", client_id).limit(1).execute()
@@ -700,7 +700,7 @@ def get_conversations_by_jd_interview(jd_interview_id: str, limit: int = 100) ->
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # 1. Obtener jd_interview por ID
         jd_interview_response = supabase.table("jd_interviews").select("*").eq("id", jd_interview_id).execute()
@@ -821,32 +821,36 @@ def get_conversations_by_jd_interview(jd_interview_id: str, limit: int = 100) ->
         return json.dumps({"error": f"Error obteniendo conversaciones filtradas: {str(e)}"}, indent=2)
 
 
-@tool
-def get_meet_evaluation_data(meet_id: str) -> str:
+def load_meet_evaluation_context(meet_id: str) -> dict[str, Any]:
     """
-    Obtiene datos completos de un meet específico para evaluación individual.
-    Incluye: meet, conversación, candidato y JD interview asociado.
+    Carga en una sola pasada todo el contexto de un meet para su evaluación:
+    meet, JD interview con su cliente, y la conversación más reciente con el
+    candidato y emotion_analysis.
+
+    Lo usan el crew de evaluación individual (como input pre-cargado) y
+    evaluate_single_meet (enriquecimiento, emociones y email), así cada
+    evaluación consulta Supabase una vez.
 
     Args:
         meet_id: ID del meet a evaluar
 
     Returns:
-        JSON string con todos los datos necesarios para la evaluación
+        Dict con meet, conversation, jd_interview y client, o {"error": ...}
     """
     try:
         evaluation_logger.log_task_start("Obtener Datos de Meet", f"Obteniendo datos del meet: {meet_id}")
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
-        # 1. Obtener el meet con su jd_interviews_id
+        # 1. Meet con su JD interview y el cliente de la JD (un solo round-trip)
         meet_response = (
             supabase.table("meets")
             .select(
                 """
             *,
-            jd_interviews(id, interview_name, agent_id, job_description, client_id, created_at)
+            jd_interviews(id, interview_name, agent_id, job_description, client_id, created_at, clients(*))
             """
             )
             .eq("id", meet_id)
@@ -855,11 +859,14 @@ def get_meet_evaluation_data(meet_id: str) -> str:
 
         if not meet_response.data:
             evaluation_logger.log_error("Obtener Datos de Meet", f"No se encontró el meet con ID: {meet_id}")
-            return json.dumps({"error": f"No se encontró el meet con ID: {meet_id}"}, indent=2)
+            return {"error": f"No se encontró el meet con ID: {meet_id}"}
 
         meet = meet_response.data[0]
+        if not meet.get("jd_interviews"):
+            evaluation_logger.log_error("Obtener Datos de Meet", f"El meet {meet_id} no tiene jd_interview asociado")
+            return {"error": f"El meet {meet_id} no tiene jd_interview asociado"}
 
-        # 2. Obtener la conversación del meet (incluyendo emotion_analysis)
+        # 2. Conversación más reciente del meet (incluyendo emotion_analysis) con el candidato
         conversation_response = (
             supabase.table("conversations")
             .select(
@@ -877,15 +884,10 @@ def get_meet_evaluation_data(meet_id: str) -> str:
             .execute()
         )
 
-        client_response = (
-            supabase.table("clients").select("*").eq("id", meet.get("jd_interviews").get("client_id")).execute()
-        )
-        print("client_id: ", meet.get("jd_interviews").get("client_id"))
-        print("client: ", client_response.data)
+        jd_interview = dict(meet["jd_interviews"])
+        client_data = jd_interview.pop("clients", None)
 
-        client_data = None
-        if client_response.data and len(client_response.data) > 0:
-            client_data = client_response.data[0]
+        if client_data and client_data.get("email"):
             os.environ["REPORT_TO_EMAIL"] = client_data.get("email")
         else:
             os.environ["REPORT_TO_EMAIL"] = "flocklab.id@gmail.com"
@@ -893,26 +895,23 @@ def get_meet_evaluation_data(meet_id: str) -> str:
         conversation = None
         if conversation_response.data and len(conversation_response.data) > 0:
             row = conversation_response.data[0]
+            candidate_row = row.get("candidates") or {}
             conversation = {
                 "meet_id": row["meet_id"],
                 "candidate_id": row["candidate_id"],
                 "conversation_data": row["conversation_data"],
                 "emotion_analysis": row.get("emotion_analysis"),  # Incluir emotion_analysis
                 "candidate": {
-                    "id": row["candidates"]["id"] if row["candidates"] else None,
-                    "name": row["candidates"]["name"] if row["candidates"] else None,
-                    "email": row["candidates"]["email"] if row["candidates"] else None,
-                    "phone": row["candidates"]["phone"] if row["candidates"] else None,
-                    "cv_url": row["candidates"]["cv_url"] if row["candidates"] else None,
-                    "tech_stack": row["candidates"]["tech_stack"] if row["candidates"] else None,
+                    "id": candidate_row.get("id"),
+                    "name": candidate_row.get("name"),
+                    "email": candidate_row.get("email"),
+                    "phone": candidate_row.get("phone"),
+                    "cv_url": candidate_row.get("cv_url"),
+                    "tech_stack": candidate_row.get("tech_stack"),
                 },
                 "client": client_data,
             }
 
-        # 3. Obtener JD interview
-        jd_interview = meet.get("jd_interviews", None) if meet.get("jd_interviews") else None
-
-        # Construir respuesta completa
         result = {
             "meet": {
                 "id": meet.get("id"),
@@ -925,16 +924,29 @@ def get_meet_evaluation_data(meet_id: str) -> str:
             "client": client_data,
         }
 
-        # print("resultado de meet completa: ", result)
-
         evaluation_logger.log_task_complete(
             "Obtener Datos de Meet", f"Datos obtenidos exitosamente para meet: {meet_id}"
         )
-        return json.dumps(result, indent=2, ensure_ascii=False)
+        return result
 
     except Exception as e:
         evaluation_logger.log_error("Obtener Datos de Meet", f"Error obteniendo datos: {str(e)}")
-        return json.dumps({"error": f"Error obteniendo datos: {str(e)}"}, indent=2)
+        return {"error": f"Error obteniendo datos: {str(e)}"}
+
+
+@tool
+def get_meet_evaluation_data(meet_id: str) -> str:
+    """
+    Obtiene datos completos de un meet específico para evaluación individual.
+    Incluye: meet, conversación, candidato y JD interview asociado.
+
+    Args:
+        meet_id: ID del meet a evaluar
+
+    Returns:
+        JSON string con todos los datos necesarios para la evaluación
+    """
+    return json.dumps(load_meet_evaluation_context(meet_id), indent=2, ensure_ascii=False)
 
 
 @tool
@@ -961,7 +973,7 @@ def save_meet_evaluation(full_result: str) -> str:
             evaluation_logger.log_error("Obtener Email de Cliente", error_msg)
             return json.dumps({"error": error_msg}, indent=2)
 
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # Parsear full_result si viene como string
         if isinstance(full_result, str):
@@ -1204,7 +1216,7 @@ def save_meeting_minute(
             evaluation_logger.log_error("Guardar Minuta de Meet", error_msg)
             return json.dumps({"success": False, "error": error_msg}, indent=2, ensure_ascii=False)
 
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # Normalizar tags a lista de strings
         parsed_tags: list[str] | None = None
@@ -1387,7 +1399,7 @@ def get_candidates_by_recruiter(user_id: str, client_id: str, limit: int | None
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # 1. Obtener candidate_ids desde candidate_recruiters
         print(
@@ -1492,7 +1504,7 @@ def get_candidates_data(limit: int | dict | None = 100) -> str:
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         print(f"[MATCHING DEBUG] 📊 Consultando tabla candidates con limit={limit}")
         response = supabase.table("candidates").select("*").limit(limit).execute()
@@ -1547,7 +1559,7 @@ def log_matching_inputs_debug(
             print("[MATCHING INPUT LOG] ⚠️ SUPABASE_URL/SUPABASE_KEY no configurados, skip log")
             return
 
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
         candidates_out: list[dict[str, Any]] = []
 
         if user_id and client_id:
@@ -1696,7 +1708,7 @@ def create_candidate(
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # Normalizar tech_stack a lista
         parsed_stack = []
@@ -2055,7 +2067,7 @@ def save_interview_evaluation(
 
         url = os.getenv("SUPABASE_URL")
         key = os.getenv("SUPABASE_KEY")
-        supabase = create_client(url, key)
+        supabase = get_client(url, key)
 
         # Obtener client_id desde jd_interviews
         evaluation_logger.log_task_progress(
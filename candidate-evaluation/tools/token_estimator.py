@@ -1,4 +1,5 @@
 import json
+from functools import lru_cache
 
 import tiktoken
 
@@ -11,6 +12,29 @@ MODEL_PRICES = {
 }
 
 
+@lru_cache(maxsize=8)
+def _encoding_or_none(model: str):
+    """Codificación de tiktoken para el modelo; None si no se puede cargar (sin red, etc.)."""
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception:
+        return None
+
+
+# 🔢 Cuenta tokens de un texto; si la codificación no se puede cargar (tiktoken la descarga
+# la primera vez), usa la aproximación de ~4 caracteres por token.
+def count_tokens(text: str, model: str = "gpt-4o-mini") -> int:
+    if not text:
+        return 0
+    enc = _encoding_or_none(model)
+    if enc is None:
+        return max(1, len(text) // 4)
+    return len(enc.encode(text))
+
+
 # 🧮 Estima tokens para una lista de mensajes (Chat API) - INPUT TOKENS
 def estimate_task_tokens(messages: list[dict], model: str = "gpt-4o-mini") -> int:
     try:
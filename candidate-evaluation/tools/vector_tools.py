@@ -4,14 +4,20 @@ Herramientas para trabajar con embeddings y búsqueda vectorial usando pgvector
 
 import json
 import os
+import random
 import sys
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from dotenv import load_dotenv
-from supabase import create_client
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.embedding_cache import content_hash, get_embedding_cache
 from utils.logger import evaluation_logger
+from utils.supabase_client import get_client
+from utils.ttl_cache import TTLCache
 
 # Intentar importar OpenAI
 try:
@@ -39,7 +45,7 @@ def get_supabase_client():
     """Obtiene el cliente de Supabase"""
     if not SUPABASE_URL or not SUPABASE_KEY:
         raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar configurados")
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    return get_client(SUPABASE_URL, SUPABASE_KEY)
 
 
 def generate_embedding(text: str, model: str = "text-embedding-3-small") -> list[float]:
@@ -72,6 +78,152 @@ def generate_embedding(text: str, model: str = "text-embedding-3-small") -> list
         raise
 
 
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+# Límites de OpenAI por request de embeddings: 2048 inputs y ~300k tokens en total
+EMBEDDING_BATCH_MAX_ITEMS = _env_int("EMBEDDING_BATCH_MAX_ITEMS", 256)
+EMBEDDING_BATCH_MAX_TOKENS = _env_int("EMBEDDING_BATCH_MAX_TOKENS", 200_000)
+EMBEDDING_MAX_CONCURRENCY = _env_int("EMBEDDING_MAX_CONCURRENCY", 4)
+EMBEDDING_MAX_RETRIES = _env_int("EMBEDDING_MAX_RETRIES", 5)
+EMBEDDING_BACKOFF_SECONDS = 1.0
+EMBEDDING_BACKOFF_MAX_SECONDS = 30.0
+
+
+def _estimate_tokens(text: str) -> int:
+    # Estimación conservadora (~3 caracteres por token) para no pasarse del límite del request
+    return len(text) // 3 + 1
+
+
+def _iter_embedding_batches(texts: list[str], max_items: int, max_tokens: int) -> Iterator[list[int]]:
+    """Agrupa índices de `texts` en lotes que respetan `max_items` y `max_tokens`."""
+    batch: list[int] = []
+    batch_tokens = 0
+    for i, text in enumerate(texts):
+        tokens = _estimate_tokens(text)
+        if batch and (len(batch) >= max_items or batch_tokens + tokens > max_tokens):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(i)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def _is_retryable_openai_error(error: Exception) -> bool:
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    return type(error).__name__ in ("APIConnectionError", "APITimeoutError", "RateLimitError")
+
+
+def _create_embeddings_with_backoff(inputs: list[str], model: str, max_retries: int) -> list[list[float]]:
+    attempt = 0
+    while True:
+        try:
+            response = openai_client.embeddings.create(model=model, input=inputs)
+            # La API devuelve `index` por item; ordenar por las dudas
+            data = sorted(response.data, key=lambda d: getattr(d, "index", 0))
+            return [d.embedding for d in data]
+        except Exception as e:
+            if attempt >= max_retries or not _is_retryable_openai_error(e):
+                raise
+            delay = min(EMBEDDING_BACKOFF_MAX_SECONDS, EMBEDDING_BACKOFF_SECONDS * 2**attempt)
+            delay *= 0.5 + random.random() / 2
+            attempt += 1
+            evaluation_logger.log_task_progress(
+                "Generar Embeddings", f"Rate limit/error transitorio ({e}); reintento {attempt} en {delay:.1f}s"
+            )
+            time.sleep(delay)
+
+
+def _embed_batch(inputs: list[str], model: str, max_retries: int) -> list[list[float] | None]:
+    """
+    Embebe un lote. Si OpenAI rechaza el lote (error no transitorio, p. ej. un input
+    inválido) se parte en mitades para aislar los items fallidos, que quedan en None.
+    """
+    try:
+        embeddings = _create_embeddings_with_backoff(inputs, model, max_retries)
+        if len(embeddings) != len(inputs):
+            raise ValueError(f"OpenAI devolvió {len(embeddings)} embeddings para {len(inputs)} inputs")
+        return embeddings
+    except Exception as e:
+        if len(inputs) == 1 or _is_retryable_openai_error(e):
+            # Reintentos agotados: partir el lote sólo multiplicaría requests rechazados
+            evaluation_logger.log_error(
+                "Generar Embeddings", f"Error generando embeddings de {len(inputs)} item(s): {str(e)}"
+            )
+            return [None] * len(inputs)
+        mid = len(inputs) // 2
+        return _embed_batch(inputs[:mid], model, max_retries) + _embed_batch(inputs[mid:], model, max_retries)
+
+
+def generate_embeddings(
+    texts: list[str],
+    model: str = "text-embedding-3-small",
+    max_batch_items: int | None = None,
+    max_batch_tokens: int | None = None,
+    max_concurrency: int | None = None,
+    max_retries: int | None = None,
+) -> list[list[float] | None]:
+    """
+    Genera embeddings para muchos textos empaquetándolos en pocos requests a OpenAI
+
+    Los textos se agrupan en lotes de hasta `max_batch_items` inputs y `max_batch_tokens`
+    tokens estimados; los lotes se envían con a lo sumo `max_concurrency` requests en
+    paralelo y con backoff exponencial ante rate limits (429) o errores 5xx.
+
+    Args:
+        texts: Textos a embeber
+        model: Modelo de embedding a usar (default: text-embedding-3-small)
+        max_batch_items / max_batch_tokens / max_concurrency / max_retries:
+            por defecto EMBEDDING_BATCH_MAX_ITEMS, EMBEDDING_BATCH_MAX_TOKENS,
+            EMBEDDING_MAX_CONCURRENCY y EMBEDDING_MAX_RETRIES
+
+    Returns:
+        Lista alineada con `texts`: el embedding de cada texto, o None si ese item falló
+    """
+    if not OPENAI_AVAILABLE or not openai_client:
+        raise ValueError("OpenAI no está disponible. Verifica que OPENAI_API_KEY esté configurado.")
+    if not texts:
+        return []
+
+    max_retries = EMBEDDING_MAX_RETRIES if max_retries is None else max_retries
+    batches = list(
+        _iter_embedding_batches(
+            texts, max_batch_items or EMBEDDING_BATCH_MAX_ITEMS, max_batch_tokens or EMBEDDING_BATCH_MAX_TOKENS
+        )
+    )
+    evaluation_logger.log_task_start(
+        "Generar Embeddings", f"Generando {len(texts)} embeddings en {len(batches)} request(s)"
+    )
+
+    results: list[list[float] | None] = [None] * len(texts)
+
+    def _run(batch: list[int]) -> None:
+        embeddings = _embed_batch([texts[i] for i in batch], model, max_retries)
+        for i, embedding in zip(batch, embeddings, strict=True):
+            results[i] = embedding
+
+    workers = min(max_concurrency or EMBEDDING_MAX_CONCURRENCY, len(batches))
+    if workers <= 1:
+        for batch in batches:
+            _run(batch)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="embeddings") as pool:
+            list(pool.map(_run, batches))
+
+    failed = sum(1 for r in results if r is None)
+    evaluation_logger.log_task_complete(
+        "Generar Embeddings", f"Embeddings generados: {len(texts) - failed}/{len(texts)} (fallidos: {failed})"
+    )
+    return results
+
+
 def insert_knowledge_chunk(
     content: str,
     embedding: list[float],
@@ -213,6 +365,139 @@ def update_knowledge_chunk(
         raise
 
 
+KNOWLEDGE_CHUNKS_UPSERT_BATCH_SIZE = _env_int("KNOWLEDGE_CHUNKS_UPSERT_BATCH_SIZE", 200)
+
+
+def upsert_knowledge_chunks(chunks: list[dict[str, Any]], batch_size: int | None = None) -> int:
+    """
+    Upsert masivo de chunks en knowledge_chunks
+
+    Escribe cientos de chunks por request con un upsert de PostgREST sobre
+    (entity_type, entity_id) (requiere la constraint `knowledge_chunks_entity_key`
+    de database/setup-pgvector.sql). Los lotes se envían con a lo sumo
+    EMBEDDING_MAX_CONCURRENCY requests en paralelo. Si un lote falla (p. ej. falta
+    la constraint o una fila es inválida) sus chunks se reintentan uno a uno con
+    `update_knowledge_chunk`, así un error sólo pierde esa fila.
+
+    Args:
+        chunks: Dicts con entity_id, entity_type, content, embedding y metadata
+        batch_size: Chunks por request (default: KNOWLEDGE_CHUNKS_UPSERT_BATCH_SIZE)
+
+    Returns:
+        Número de chunks escritos
+    """
+    if not chunks:
+        return 0
+
+    batch_size = batch_size or KNOWLEDGE_CHUNKS_UPSERT_BATCH_SIZE
+    batches = [chunks[i : i + batch_size] for i in range(0, len(chunks), batch_size)]
+    evaluation_logger.log_task_start(
+        "Upsert Knowledge Chunks", f"Escribiendo {len(chunks)} chunks en {len(batches)} request(s)"
+    )
+    supabase = get_supabase_client()
+
+    def _write_one_by_one(batch: list[dict[str, Any]]) -> int:
+        written = 0
+        for chunk in batch:
+            try:
+                update_knowledge_chunk(
+                    entity_id=chunk["entity_id"],
+                    entity_type=chunk["entity_type"],
+                    content=chunk["content"],
+                    embedding=chunk["embedding"],
+                    metadata=chunk.get("metadata"),
+                )
+                written += 1
+            except Exception as e:
+                evaluation_logger.log_error(
+                    "Upsert Knowledge Chunks",
+                    f"Error escribiendo {chunk['entity_type']} {chunk['entity_id']}: {str(e)}",
+                )
+        return written
+
+    def _write(batch: list[dict[str, Any]]) -> int:
+        rows = [
+            {
+                "entity_id": chunk["entity_id"],
+                "entity_type": chunk["entity_type"],
+                "content": chunk["content"],
+                "embedding": chunk["embedding"],
+                "metadata": chunk.get("metadata"),
+            }
+            for chunk in batch
+        ]
+        try:
+            supabase.table("knowledge_chunks").upsert(
+                rows, on_conflict="entity_type,entity_id", returning="minimal"
+            ).execute()
+            return len(rows)
+        except Exception as e:
+            evaluation_logger.log_error(
+                "Upsert Knowledge Chunks", f"Falló el upsert de {len(rows)} chunks, reintento uno a uno: {str(e)}"
+            )
+            return _write_one_by_one(batch)
+
+    workers = min(EMBEDDING_MAX_CONCURRENCY, len(batches))
+    if workers <= 1:
+        written = sum(_write(batch) for batch in batches)
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunks-upsert") as pool:
+            written = sum(pool.map(_write, batches))
+
+    if written:
+        _chunks_count_cache.clear()
+    evaluation_logger.log_task_complete("Upsert Knowledge Chunks", f"Chunks escritos: {written}/{len(chunks)}")
+    return written
+
+
+QUERY_EMBEDDING_CACHE_SIZE = _env_int("QUERY_EMBEDDING_CACHE_SIZE", 512)
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = _env_int("QUERY_EMBEDDING_CACHE_TTL_SECONDS", 3600)
+KNOWLEDGE_CHUNKS_COUNT_TTL_SECONDS = _env_int("KNOWLEDGE_CHUNKS_COUNT_TTL_SECONDS", 300)
+
+_query_embedding_cache = TTLCache(maxsize=QUERY_EMBEDDING_CACHE_SIZE, ttl_seconds=QUERY_EMBEDDING_CACHE_TTL_SECONDS)
+_chunks_count_cache = TTLCache(maxsize=1, ttl_seconds=KNOWLEDGE_CHUNKS_COUNT_TTL_SECONDS)
+
+
+def get_query_embedding(query_text: str, model: str = "text-embedding-3-small") -> list[float]:
+    """
+    Embedding de una consulta con cache LRU/TTL en memoria
+
+    Consultas iguales (ignorando espacios en los extremos) reusan el embedding durante
+    QUERY_EMBEDDING_CACHE_TTL_SECONDS sin volver a llamar a OpenAI.
+    """
+    key = (model, query_text.strip())
+    embedding = _query_embedding_cache.get(key)
+    if embedding is None:
+        embedding = generate_embedding(query_text, model)
+        _query_embedding_cache.set(key, embedding)
+    return embedding
+
+
+def count_knowledge_chunks(client_factory: Callable[[], Any] | None = None, refresh: bool = False) -> int:
+    """
+    Cantidad de chunks en knowledge_chunks, cacheada KNOWLEDGE_CHUNKS_COUNT_TTL_SECONDS
+
+    El `count="exact"` recorre la tabla; como sólo se usa para saber si hay algo
+    indexado, se refresca periódicamente en lugar de en cada request. Un 0 no se
+    cachea, así una base recién indexada se detecta en el siguiente request.
+
+    Args:
+        client_factory: Función que devuelve el cliente de Supabase (default: get_supabase_client)
+        refresh: Ignorar el valor cacheado
+    """
+    if not refresh:
+        cached = _chunks_count_cache.get("total")
+        if cached is not None:
+            return cached
+
+    supabase = (client_factory or get_supabase_client)()
+    result = supabase.table("knowledge_chunks").select("id", count="exact").limit(1).execute()
+    total = getattr(result, "count", 0) or 0
+    if total > 0:
+        _chunks_count_cache.set("total", total)
+    return total
+
+
 def search_similar_chunks(
     query_text: str,
     match_threshold: float = 0.7,
@@ -236,8 +521,8 @@ def search_similar_chunks(
     try:
         evaluation_logger.log_task_start("Buscar Chunks Similares", f"Buscando: '{query_text[:50]}...'")
 
-        # Generar embedding de la consulta
-        query_embedding = generate_embedding(query_text, model)
+        # Embedding de la consulta (cacheado: el chatbot repite consultas)
+        query_embedding = get_query_embedding(query_text, model)
 
         # Buscar chunks similares
         supabase = get_supabase_client()
@@ -299,6 +584,142 @@ def delete_knowledge_chunks(entity_id: str, entity_type: str) -> int:
         raise
 
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+KNOWLEDGE_CHUNKS_IN_CHUNK_SIZE = 100
+
+
+def _with_content_hash(content: str, metadata: dict[str, Any] | None) -> dict[str, Any]:
+    """Agrega a la metadata el hash del contenido y el modelo con el que se embebe"""
+    return {**(metadata or {}), "content_hash": content_hash(content), "embedding_model": EMBEDDING_MODEL}
+
+
+def _fetch_indexed_chunks(entity_type: str, entity_ids: list[Any]) -> dict[str, dict[str, Any]]:
+    """
+    Lee id y metadata de los chunks ya indexados de `entity_ids`, en tandas de `in_`
+
+    Returns:
+        Dict entity_id -> fila. Si la lectura falla se devuelve lo leído hasta ahí
+        (esas entidades simplemente se reindexan).
+    """
+    ids = [str(entity_id) for entity_id in dict.fromkeys(entity_ids) if entity_id]
+    found: dict[str, dict[str, Any]] = {}
+    if not ids:
+        return found
+    try:
+        supabase = get_supabase_client()
+        for start in range(0, len(ids), KNOWLEDGE_CHUNKS_IN_CHUNK_SIZE):
+            response = (
+                supabase.table("knowledge_chunks")
+                .select("id, entity_id, metadata")
+                .eq("entity_type", entity_type)
+                .in_("entity_id", ids[start : start + KNOWLEDGE_CHUNKS_IN_CHUNK_SIZE])
+                .execute()
+            )
+            for row in response.data or []:
+                found[str(row.get("entity_id"))] = row
+    except Exception as e:
+        evaluation_logger.log_error("Knowledge Chunks", f"No se pudieron leer chunks indexados de {entity_type}: {e}")
+    return found
+
+
+def _is_unchanged(existing: dict[str, Any] | None, metadata: dict[str, Any]) -> bool:
+    return bool(existing) and existing.get("metadata") == metadata
+
+
+def _index_chunk(entity_id: Any, entity_type: str, content: str, metadata: dict[str, Any]) -> str:
+    """
+    Upsert de un chunk evitando trabajo repetido
+
+    Si el chunk indexado tiene la misma metadata (incluye content_hash y modelo) no se
+    llama ni a OpenAI ni al RPC. Si cambió, el embedding se toma del cache local por
+    (modelo, content_hash) o se genera y se guarda en él.
+
+    Returns:
+        ID del chunk
+    """
+    metadata = _with_content_hash(content, metadata)
+    existing = _fetch_indexed_chunks(entity_type, [entity_id]).get(str(entity_id))
+    if _is_unchanged(existing, metadata):
+        evaluation_logger.log_task_progress("Knowledge Chunks", f"{entity_type} {entity_id} sin cambios, se omite")
+        return existing.get("id")
+
+    digest = metadata["content_hash"]
+    cache = get_embedding_cache()
+    embedding = cache.get(EMBEDDING_MODEL, digest) if cache else None
+    if embedding is None:
+        embedding = generate_embedding(content, EMBEDDING_MODEL)
+        if cache:
+            cache.put(EMBEDDING_MODEL, digest, embedding)
+
+    return update_knowledge_chunk(
+        entity_id=entity_id,
+        entity_type=entity_type,
+        content=content,
+        embedding=embedding,
+        metadata=metadata,
+    )
+
+
+def _candidate_chunk(candidate: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Construye (content, metadata) del chunk de un candidato"""
+    # Construir contenido del chunk
+    content_parts = [f"Candidato {candidate.get('name', 'Unknown')} ({candidate.get('email', 'no-email')})"]
+
+    # Tech stack
+    if candidate.get("tech_stack"):
+        tech_stack_str = (
+            ", ".join(candidate["tech_stack"]) if isinstance(candidate["tech_stack"], list) else candidate["tech_stack"]
+        )
+        content_parts.append(f"con tech_stack: {tech_stack_str}")
+
+    # Observations
+    observations = candidate.get("observations")
+    if observations:
+        if isinstance(observations, str):
+            observations = json.loads(observations)
+
+        # Experiencia laboral
+        if observations.get("work_experience"):
+            exp_parts = []
+            for exp in observations["work_experience"][:3]:  # Primeras 3 experiencias
+                exp_str = f"{exp.get('position', '')} en {exp.get('company', '')}"
+                if exp.get("period"):
+                    exp_str += f" ({exp.get('period')})"
+                exp_parts.append(exp_str)
+            if exp_parts:
+                content_parts.append(f"Experiencia laboral: {', '.join(exp_parts)}")
+
+        # Rubros
+        if observations.get("industries_and_sectors"):
+            industries = [ind.get("industry", "") for ind in observations["industries_and_sectors"][:5]]
+            if industries:
+                content_parts.append(f"Rubros: {', '.join(industries)}")
+
+        # Idiomas
+        if observations.get("languages"):
+            languages = [f"{lang.get('language', '')} ({lang.get('level', '')})" for lang in observations["languages"]]
+            if languages:
+                content_parts.append(f"Idiomas: {', '.join(languages)}")
+
+        # Certificaciones
+        if observations.get("certifications_and_courses"):
+            certs = [cert.get("name", "") for cert in observations["certifications_and_courses"][:5]]
+            if certs:
+                content_parts.append(f"Certificaciones: {', '.join(certs)}")
+
+    content = ". ".join(content_parts) + "."
+
+    # Metadata
+    metadata = {
+        "candidate_id": candidate.get("id"),
+        "name": candidate.get("name"),
+        "email": candidate.get("email"),
+        "tech_stack": candidate.get("tech_stack", []),
+    }
+
+    return content, metadata
+
+
 def index_candidate(candidate: dict[str, Any]) -> str:
     """
     Indexa un candidato en la knowledge base
@@ -314,76 +735,10 @@ def index_candidate(candidate: dict[str, Any]) -> str:
             "Indexar Candidato", f"Indexando candidato: {candidate.get('name', 'Unknown')}"
         )
 
-        # Construir contenido del chunk
-        content_parts = [f"Candidato {candidate.get('name', 'Unknown')} ({candidate.get('email', 'no-email')})"]
+        content, metadata = _candidate_chunk(candidate)
 
-        # Tech stack
-        if candidate.get("tech_stack"):
-            tech_stack_str = (
-                ", ".join(candidate["tech_stack"])
-                if isinstance(candidate["tech_stack"], list)
-                else candidate["tech_stack"]
-            )
-            content_parts.append(f"con tech_stack: {tech_stack_str}")
-
-        # Observations
-        observations = candidate.get("observations")
-        if observations:
-            if isinstance(observations, str):
-                observations = json.loads(observations)
-
-            # Experiencia laboral
-            if observations.get("work_experience"):
-                exp_parts = []
-                for exp in observations["work_experience"][:3]:  # Primeras 3 experiencias
-                    exp_str = f"{exp.get('position', '')} en {exp.get('company', '')}"
-                    if exp.get("period"):
-                        exp_str += f" ({exp.get('period')})"
-                    exp_parts.append(exp_str)
-                if exp_parts:
-                    content_parts.append(f"Experiencia laboral: {', '.join(exp_parts)}")
-
-            # Rubros
-            if observations.get("industries_and_sectors"):
-                industries = [ind.get("industry", "") for ind in observations["industries_and_sectors"][:5]]
-                if industries:
-                    content_parts.append(f"Rubros: {', '.join(industries)}")
-
-            # Idiomas
-            if observations.get("languages"):
-                languages = [
-                    f"{lang.get('language', '')} ({lang.get('level', '')})" for lang in observations["languages"]
-                ]
-                if languages:
-                    content_parts.append(f"Idiomas: {', '.join(languages)}")
-
-            # Certificaciones
-            if observations.get("certifications_and_courses"):
-                certs = [cert.get("name", "") for cert in observations["certifications_and_courses"][:5]]
-                if certs:
-                    content_parts.append(f"Certificaciones: {', '.join(certs)}")
-
-        content = ". ".join(content_parts) + "."
-
-        # Generar embedding
-        embedding = generate_embedding(content)
-
-        # Metadata
-        metadata = {
-            "candidate_id": candidate.get("id"),
-            "name": candidate.get("name"),
-            "email": candidate.get("email"),
-            "tech_stack": candidate.get("tech_stack", []),
-        }
-
-        # Actualizar o insertar chunk (upsert)
-        chunk_id = update_knowledge_chunk(
-            entity_id=candidate.get("id"),
-            entity_type="candidate",
-            content=content,
-            embedding=embedding,
-            metadata=metadata,
-        )
+        # Upsert reusando el embedding cacheado; no-op si el chunk no cambió
+        chunk_id = _index_chunk(candidate.get("id"), "candidate", content, metadata)
 
         evaluation_logger.log_task_complete("Indexar Candidato", f"Candidato indexado: {chunk_id}")
         return chunk_id
@@ -393,6 +748,51 @@ def index_candidate(candidate: dict[str, Any]) -> str:
         raise
 
 
+def _jd_interview_chunk(jd_interview: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Construye (content, metadata) del chunk de un JD Interview"""
+    # Construir contenido del chunk
+    content_parts = [f"Búsqueda activa: {jd_interview.get('interview_name', 'Unknown')}"]
+
+    # Tech stack
+    tech_stack = jd_interview.get("tech_stack")
+    if tech_stack:
+        if isinstance(tech_stack, str):
+            tech_stack_str = tech_stack
+        else:
+            tech_stack_str = ", ".join(tech_stack) if isinstance(tech_stack, list) else str(tech_stack)
+        content_parts.append(f"Requiere tecnologías: {tech_stack_str}")
+
+    # Job description (resumen)
+    job_description = jd_interview.get("job_description", "")
+    if job_description:
+        # Limitar a primeros 200 caracteres
+        job_desc_summary = job_description[:200] + "..." if len(job_description) > 200 else job_description
+        content_parts.append(f"Descripción: {job_desc_summary}")
+
+    # Agent ID
+    if jd_interview.get("agent_id"):
+        content_parts.append(f"Agente asociado: {jd_interview.get('agent_id')}")
+
+    # Status
+    status = jd_interview.get("status", "active")
+    content_parts.append(f"Estado: {status}")
+
+    content = ". ".join(content_parts) + "."
+
+    # Metadata
+    metadata = {
+        "jd_interview_id": jd_interview.get("id"),
+        "interview_name": jd_interview.get("interview_name"),
+        "tech_stack": tech_stack
+        if isinstance(tech_stack, list)
+        else (tech_stack.split(", ") if isinstance(tech_stack, str) else []),
+        "status": status,
+        "agent_id": jd_interview.get("agent_id"),
+    }
+
+    return content, metadata
+
+
 def index_jd_interview(jd_interview: dict[str, Any]) -> str:
     """
     Indexa una JD Interview en la knowledge base
@@ -408,57 +808,10 @@ def index_jd_interview(jd_interview: dict[str, Any]) -> str:
             "Indexar JD Interview", f"Indexando JD: {jd_interview.get('interview_name', 'Unknown')}"
         )
 
-        # Construir contenido del chunk
-        content_parts = [f"Búsqueda activa: {jd_interview.get('interview_name', 'Unknown')}"]
-
-        # Tech stack
-        tech_stack = jd_interview.get("tech_stack")
-        if tech_stack:
-            if isinstance(tech_stack, str):
-                tech_stack_str = tech_stack
-            else:
-                tech_stack_str = ", ".join(tech_stack) if isinstance(tech_stack, list) else str(tech_stack)
-            content_parts.append(f"Requiere tecnologías: {tech_stack_str}")
-
-        # Job description (resumen)
-        job_description = jd_interview.get("job_description", "")
-        if job_description:
-            # Limitar a primeros 200 caracteres
-            job_desc_summary = job_description[:200] + "..." if len(job_description) > 200 else job_description
-            content_parts.append(f"Descripción: {job_desc_summary}")
-
-        # Agent ID
-        if jd_interview.get("agent_id"):
-            content_parts.append(f"Agente asociado: {jd_interview.get('agent_id')}")
-
-        # Status
-        status = jd_interview.get("status", "active")
-        content_parts.append(f"Estado: {status}")
-
-        content = ". ".join(content_parts) + "."
-
-        # Generar embedding
-        embedding = generate_embedding(content)
-
-        # Metadata
-        metadata = {
-            "jd_interview_id": jd_interview.get("id"),
-            "interview_name": jd_interview.get("interview_name"),
-            "tech_stack": tech_stack
-            if isinstance(tech_stack, list)
-            else (tech_stack.split(", ") if isinstance(tech_stack, str) else []),
-            "status": status,
-            "agent_id": jd_interview.get("agent_id"),
-        }
-
-        # Actualizar o insertar chunk (upsert)
-        chunk_id = update_knowledge_chunk(
-            entity_id=jd_interview.get("id"),
-            entity_type="jd_interview",
-            content=content,
-            embedding=embedding,
-            metadata=metadata,
-        )
+        content, metadata = _jd_interview_chunk(jd_interview)
+
+        # Upsert reusando el embedding cacheado; no-op si el chunk no cambió
+        chunk_id = _index_chunk(jd_interview.get("id"), "jd_interview", content, metadata)
 
         evaluation_logger.log_task_complete("Indexar JD Interview", f"JD Interview indexada: {chunk_id}")
         return chunk_id
@@ -468,12 +821,104 @@ def index_jd_interview(jd_interview: dict[str, Any]) -> str:
         raise
 
 
-def index_all_candidates(limit: int | None = None) -> int:
+def _index_rows_in_batches(
+    task_name: str,
+    entity_type: str,
+    rows: list[dict[str, Any]],
+    build_chunk: Callable[[dict[str, Any]], tuple],
+    stats: dict[str, Any] | None = None,
+) -> int:
+    """
+    Indexa filas de un mismo tipo en lote
+
+    Arma el chunk de cada fila y descarta los que ya están indexados sin cambios
+    (misma metadata, que incluye content_hash y modelo). Para el resto reusa los
+    embeddings del cache local y genera los faltantes con `generate_embeddings`
+    (pocos requests a OpenAI); después escribe los chunks en lote con
+    `upsert_knowledge_chunks`. Las filas que fallan se loguean y no cuentan.
+
+    Args:
+        stats: Si se pasa, se completa con `unchanged`, `embedding_cache_hits`,
+               `embedding_cache_misses`, `upserted` y `failed`
+
+    Returns:
+        Número de filas indexadas (incluye las que ya estaban al día)
+    """
+    if stats is None:
+        stats = {}
+    stats.update(unchanged=0, embedding_cache_hits=0, embedding_cache_misses=0, upserted=0, failed=0)
+
+    chunks = []
+    for row in rows:
+        try:
+            content, metadata = build_chunk(row)
+        except Exception as e:
+            evaluation_logger.log_error(task_name, f"Error armando chunk {entity_type} {row.get('id')}: {str(e)}")
+            stats["failed"] += 1
+            continue
+        chunks.append((row.get("id"), content, _with_content_hash(content, metadata)))
+
+    if not chunks:
+        return 0
+
+    existing = _fetch_indexed_chunks(entity_type, [entity_id for entity_id, _, _ in chunks])
+    pending = [c for c in chunks if not _is_unchanged(existing.get(str(c[0])), c[2])]
+    stats["unchanged"] = len(chunks) - len(pending)
+
+    cache = get_embedding_cache()
+    hashes = [metadata["content_hash"] for _, _, metadata in pending]
+    embeddings_by_hash = cache.get_many(EMBEDDING_MODEL, hashes) if cache and hashes else {}
+    stats["embedding_cache_hits"] = sum(1 for digest in hashes if digest in embeddings_by_hash)
+
+    # Un embedding por contenido distinto que no esté en cache
+    missing = {}
+    for _, content, metadata in pending:
+        if metadata["content_hash"] not in embeddings_by_hash:
+            missing.setdefault(metadata["content_hash"], content)
+    stats["embedding_cache_misses"] = len(pending) - stats["embedding_cache_hits"]
+    if missing:
+        generated = dict(zip(missing, generate_embeddings(list(missing.values()), model=EMBEDDING_MODEL), strict=True))
+        generated = {digest: embedding for digest, embedding in generated.items() if embedding is not None}
+        if cache:
+            cache.put_many(EMBEDDING_MODEL, generated)
+        embeddings_by_hash.update(generated)
+
+    writable = []
+    for entity_id, content, metadata in pending:
+        embedding = embeddings_by_hash.get(metadata["content_hash"])
+        if embedding is None:
+            evaluation_logger.log_error(task_name, f"Sin embedding para {entity_type} {entity_id}, se omite")
+            continue
+        writable.append(
+            {
+                "entity_id": entity_id,
+                "entity_type": entity_type,
+                "content": content,
+                "embedding": embedding,
+                "metadata": metadata,
+            }
+        )
+
+    upserted = upsert_knowledge_chunks(writable) if writable else 0
+    stats["upserted"] = upserted
+    stats["failed"] += len(pending) - upserted
+
+    evaluation_logger.log_task_progress(
+        task_name,
+        f"{entity_type}: {stats['unchanged']} sin cambios, cache de embeddings "
+        f"{stats['embedding_cache_hits']} hits / {stats['embedding_cache_misses']} misses, "
+        f"{upserted} upserts, {stats['failed']} fallidos",
+    )
+    return stats["unchanged"] + upserted
+
+
+def index_all_candidates(limit: int | None = None, stats: dict[str, Any] | None = None) -> int:
     """
     Indexa todos los candidatos de la BD
 
     Args:
         limit: Límite de candidatos a indexar (None = todos)
+        stats: Si se pasa, se completa con hits/misses del cache (ver `_index_rows_in_batches`)
 
     Returns:
         Número de candidatos indexados
@@ -505,16 +950,9 @@ def index_all_candidates(limit: int | None = None) -> int:
             )
             return 0
 
-        indexed_count = 0
-        for candidate in candidates:
-            try:
-                index_candidate(candidate)
-                indexed_count += 1
-            except Exception as e:
-                evaluation_logger.log_error(
-                    "Indexar Todos los Candidatos", f"Error indexando candidato {candidate.get('id')}: {str(e)}"
-                )
-                continue
+        indexed_count = _index_rows_in_batches(
+            "Indexar Todos los Candidatos", "candidate", candidates, _candidate_chunk, stats
+        )
 
         evaluation_logger.log_task_complete("Indexar Todos los Candidatos", f"Indexados {indexed_count} candidatos")
         return indexed_count
@@ -524,10 +962,13 @@ def index_all_candidates(limit: int | None = None) -> int:
         raise
 
 
-def index_all_jd_interviews() -> int:
+def index_all_jd_interviews(stats: dict[str, Any] | None = None) -> int:
     """
     Indexa todas las JD Interviews activas de la BD
 
+    Args:
+        stats: Si se pasa, se completa con hits/misses del cache (ver `_index_rows_in_batches`)
+
     Returns:
         Número de JD Interviews indexadas
     """
@@ -558,16 +999,9 @@ def index_all_jd_interviews() -> int:
             )
             return 0
 
-        indexed_count = 0
-        for jd_interview in jd_interviews:
-            try:
-                index_jd_interview(jd_interview)
-                indexed_count += 1
-            except Exception as e:
-                evaluation_logger.log_error(
-                    "Indexar Todas las JD Interviews", f"Error indexando JD {jd_interview.get('id')}: {str(e)}"
-                )
-                continue
+        indexed_count = _index_rows_in_batches(
+            "Indexar Todas las JD Interviews", "jd_interview", jd_interviews, _jd_interview_chunk, stats
+        )
 
         evaluation_logger.log_task_complete(
             "Indexar Todas las JD Interviews", f"Indexadas {indexed_count} JD Interviews"
@@ -579,6 +1013,64 @@ def index_all_jd_interviews() -> int:
         raise
 
 
+def _meet_chunk(meet: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Construye (content, metadata) del chunk de un meet"""
+    candidate = meet.get("candidates") or meet.get("candidate") or {}
+    jd_interview = meet.get("jd_interviews") or meet.get("jd_interview") or {}
+
+    candidate_name = candidate.get("name", "Candidato desconocido")
+    candidate_email = candidate.get("email", "sin-email")
+    candidate_tech = candidate.get("tech_stack") or []
+    if isinstance(candidate_tech, str):
+        # En caso de que venga como string separado por comas
+        candidate_tech_list = [t.strip() for t in candidate_tech.split(",") if t.strip()]
+    else:
+        candidate_tech_list = candidate_tech
+
+    jd_name = jd_interview.get("interview_name", "Búsqueda desconocida")
+    jd_tech = jd_interview.get("tech_stack") or []
+    jd_tech_list = [t.strip() for t in jd_tech.split(",") if t.strip()] if isinstance(jd_tech, str) else jd_tech
+
+    status = meet.get("status", "desconocido")
+    scheduled_at = meet.get("scheduled_at") or meet.get("created_at")
+
+    # Construir contenido descriptivo
+    content_parts = [
+        f"Entrevista (meet) para el candidato {candidate_name} ({candidate_email})",
+        f"Estado de la entrevista: {status}",
+    ]
+
+    if scheduled_at:
+        content_parts.append(f"Fecha programada: {scheduled_at}")
+
+    if jd_name:
+        content_parts.append(f"Asociada a la búsqueda: {jd_name}")
+
+    if candidate_tech_list:
+        content_parts.append(f"Tecnologías del candidato: {', '.join(candidate_tech_list)}")
+
+    if jd_tech_list:
+        content_parts.append(f"Tecnologías requeridas por la búsqueda: {', '.join(jd_tech_list)}")
+
+    content = ". ".join(content_parts) + "."
+
+    # Metadata
+    metadata: dict[str, Any] = {
+        "meet_id": meet.get("id"),
+        "candidate_id": meet.get("candidate_id") or candidate.get("id"),
+        "jd_interview_id": meet.get("jd_interviews_id") or jd_interview.get("id"),
+        "status": status,
+        "scheduled_at": str(scheduled_at) if scheduled_at else None,
+        "candidate_name": candidate_name,
+        "candidate_email": candidate_email,
+        "candidate_tech_stack": candidate_tech_list,
+        "jd_interview_name": jd_name,
+        "jd_tech_stack": jd_tech_list,
+    }
+
+    return content, metadata
+
+
 def index_meet(meet: dict[str, Any]) -> str:
     """
     Indexa un registro de meet en la knowledge base
@@ -593,70 +1085,10 @@ def index_meet(meet: dict[str, Any]) -> str:
     try:
         evaluation_logger.log_task_start("Indexar Meet", f"Indexando meet: {meet.get('id', 'Unknown')}")
 
-        candidate = meet.get("candidates") or meet.get("candidate") or {}
-        jd_interview = meet.get("jd_interviews") or meet.get("jd_interview") or {}
-
-        candidate_name = candidate.get("name", "Candidato desconocido")
-        candidate_email = candidate.get("email", "sin-email")
-        candidate_tech = candidate.get("tech_stack") or []
-        if isinstance(candidate_tech, str):
-            # En caso de que venga como string separado por comas
-            candidate_tech_list = [t.strip() for t in candidate_tech.split(",") if t.strip()]
-        else:
-            candidate_tech_list = candidate_tech
+        content, metadata = _meet_chunk(meet)
 
-        jd_name = jd_interview.get("interview_name", "Búsqueda desconocida")
-        jd_tech = jd_interview.get("tech_stack") or []
-        jd_tech_list = [t.strip() for t in jd_tech.split(",") if t.strip()] if isinstance(jd_tech, str) else jd_tech
-
-        status = meet.get("status", "desconocido")
-        scheduled_at = meet.get("scheduled_at") or meet.get("created_at")
-
-        # Construir contenido descriptivo
-        content_parts = [
-            f"Entrevista (meet) para el candidato {candidate_name} ({candidate_email})",
-            f"Estado de la entrevista: {status}",
-        ]
-
-        if scheduled_at:
-            content_parts.append(f"Fecha programada: {scheduled_at}")
-
-        if jd_name:
-            content_parts.append(f"Asociada a la búsqueda: {jd_name}")
-
-        if candidate_tech_list:
-            content_parts.append(f"Tecnologías del candidato: {', '.join(candidate_tech_list)}")
-
-        if jd_tech_list:
-            content_parts.append(f"Tecnologías requeridas por la búsqueda: {', '.join(jd_tech_list)}")
-
-        content = ". ".join(content_parts) + "."
-
-        # Generar embedding
-        embedding = generate_embedding(content)
-
-        # Metadata
-        metadata: dict[str, Any] = {
-            "meet_id": meet.get("id"),
-            "candidate_id": meet.get("candidate_id") or candidate.get("id"),
-            "jd_interview_id": meet.get("jd_interviews_id") or jd_interview.get("id"),
-            "status": status,
-            "scheduled_at": str(scheduled_at) if scheduled_at else None,
-            "candidate_name": candidate_name,
-            "candidate_email": candidate_email,
-            "candidate_tech_stack": candidate_tech_list,
-            "jd_interview_name": jd_name,
-            "jd_tech_stack": jd_tech_list,
-        }
-
-        # Actualizar o insertar chunk (upsert)
-        chunk_id = update_knowledge_chunk(
-            entity_id=meet.get("id"),
-            entity_type="meet",
-            content=content,
-            embedding=embedding,
-            metadata=metadata,
-        )
+        # Upsert reusando el embedding cacheado; no-op si el chunk no cambió
+        chunk_id = _index_chunk(meet.get("id"), "meet", content, metadata)
 
         evaluation_logger.log_task_complete("Indexar Meet", f"Meet indexado: {chunk_id}")
         return chunk_id
@@ -666,12 +1098,13 @@ def index_meet(meet: dict[str, Any]) -> str:
         raise
 
 
-def index_all_meets(limit: int | None = None) -> int:
+def index_all_meets(limit: int | None = None, stats: dict[str, Any] | None = None) -> int:
     """
     Indexa todos los meets de la BD
 
     Args:
         limit: Límite de meets a indexar (None = todos)
+        stats: Si se pasa, se completa con hits/misses del cache (ver `_index_rows_in_batches`)
 
     Returns:
         Número de meets indexados
@@ -691,17 +1124,7 @@ def index_all_meets(limit: int | None = None) -> int:
 
         meets = response.data or []
 
-        indexed_count = 0
-        for row in meets:
-            try:
-                index_meet(row)
-                indexed_count += 1
-            except Exception as e:
-                evaluation_logger.log_error(
-                    "Indexar Todos los Meets",
-                    f"Error indexando meet {row.get('id')}: {str(e)}",
-                )
-                continue
+        indexed_count = _index_rows_in_batches("Indexar Todos los Meets", "meet", meets, _meet_chunk, stats)
 
         evaluation_logger.log_task_complete(
             "Indexar Todos los Meets",
@@ -714,6 +1137,72 @@ def index_all_meets(limit: int | None = None) -> int:
         raise
 
 
+def _meet_evaluation_chunk(evaluation: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Construye (content, metadata) del chunk de un meet_evaluation"""
+    meet_id = evaluation.get("meet_id")
+    candidate_id = evaluation.get("candidate_id")
+    jd_interview_id = evaluation.get("jd_interview_id")
+
+    technical = evaluation.get("technical_assessment") or {}
+    completeness = evaluation.get("completeness_summary") or {}
+    alerts = evaluation.get("alerts") or []
+    match_eval = evaluation.get("match_evaluation") or {}
+
+    # Construir contenido descriptivo
+    content_parts = [
+        f"Evaluación de entrevista (meet) para el candidato {candidate_id} en la búsqueda {jd_interview_id}.",
+    ]
+
+    if technical:
+        nivel = technical.get("knowledge_level")
+        experiencia = technical.get("practical_experience")
+        if nivel:
+            content_parts.append(f"Nivel de conocimiento técnico: {nivel}")
+        if experiencia:
+            content_parts.append(f"Experiencia práctica: {experiencia}")
+
+        preguntas = technical.get("technical_questions") or []
+        if preguntas:
+            # No incluimos todas las preguntas completas para evitar textos muy largos
+            content_parts.append(f"Número de preguntas técnicas evaluadas: {len(preguntas)}")
+
+    if completeness:
+        resumen_completo = completeness.get("overall_completeness")
+        if resumen_completo:
+            content_parts.append(f"Resumen de completitud de la entrevista: {resumen_completo}")
+
+    if alerts:
+        alerts_texts = []
+        for a in alerts[:5]:
+            txt = (a.get("message") or a.get("description") or str(a)) if isinstance(a, dict) else str(a)
+            alerts_texts.append(txt)
+        if alerts_texts:
+            content_parts.append("Alertas relevantes detectadas: " + "; ".join(alerts_texts))
+
+    if match_eval:
+        score = match_eval.get("score")
+        summary = match_eval.get("summary")
+        if score is not None:
+            content_parts.append(f"Score global de match: {score}")
+        if summary:
+            content_parts.append(f"Resumen de evaluación de match: {summary}")
+
+    content = ". ".join(content_parts) + "."
+
+    # Metadata
+    metadata: dict[str, Any] = {
+        "meet_evaluation_id": evaluation.get("id"),
+        "meet_id": meet_id,
+        "candidate_id": candidate_id,
+        "jd_interview_id": jd_interview_id,
+        "has_alerts": bool(alerts),
+        "created_at": evaluation.get("created_at"),
+        "updated_at": evaluation.get("updated_at"),
+    }
+
+    return content, metadata
+
+
 def index_meet_evaluation(evaluation: dict[str, Any]) -> str:
     """
     Indexa una evaluación de meet (meet_evaluations) en la knowledge base
@@ -730,78 +1219,10 @@ def index_meet_evaluation(evaluation: dict[str, Any]) -> str:
             f"Indexando evaluación de meet: {evaluation.get('id', 'Unknown')}",
         )
 
-        meet_id = evaluation.get("meet_id")
-        candidate_id = evaluation.get("candidate_id")
-        jd_interview_id = evaluation.get("jd_interview_id")
-
-        technical = evaluation.get("technical_assessment") or {}
-        completeness = evaluation.get("completeness_summary") or {}
-        alerts = evaluation.get("alerts") or []
-        match_eval = evaluation.get("match_evaluation") or {}
+        content, metadata = _meet_evaluation_chunk(evaluation)
 
-        # Construir contenido descriptivo
-        content_parts = [
-            f"Evaluación de entrevista (meet) para el candidato {candidate_id} en la búsqueda {jd_interview_id}.",
-        ]
-
-        if technical:
-            nivel = technical.get("knowledge_level")
-            experiencia = technical.get("practical_experience")
-            if nivel:
-                content_parts.append(f"Nivel de conocimiento técnico: {nivel}")
-            if experiencia:
-                content_parts.append(f"Experiencia práctica: {experiencia}")
-
-            preguntas = technical.get("technical_questions") or []
-            if preguntas:
-                # No incluimos todas las preguntas completas para evitar textos muy largos
-                content_parts.append(f"Número de preguntas técnicas evaluadas: {len(preguntas)}")
-
-        if completeness:
-            resumen_completo = completeness.get("overall_completeness")
-            if resumen_completo:
-                content_parts.append(f"Resumen de completitud de la entrevista: {resumen_completo}")
-
-        if alerts:
-            alerts_texts = []
-            for a in alerts[:5]:
-                txt = (a.get("message") or a.get("description") or str(a)) if isinstance(a, dict) else str(a)
-                alerts_texts.append(txt)
-            if alerts_texts:
-                content_parts.append("Alertas relevantes detectadas: " + "; ".join(alerts_texts))
-
-        if match_eval:
-            score = match_eval.get("score")
-            summary = match_eval.get("summary")
-            if score is not None:
-                content_parts.append(f"Score global de match: {score}")
-            if summary:
-                content_parts.append(f"Resumen de evaluación de match: {summary}")
-
-        content = ". ".join(content_parts) + "."
-
-        # Generar embedding
-        embedding = generate_embedding(content)
-
-        # Metadata
-        metadata: dict[str, Any] = {
-            "meet_evaluation_id": evaluation.get("id"),
-            "meet_id": meet_id,
-            "candidate_id": candidate_id,
-            "jd_interview_id": jd_interview_id,
-            "has_alerts": bool(alerts),
-            "created_at": evaluation.get("created_at"),
-            "updated_at": evaluation.get("updated_at"),
-        }
-
-        # Actualizar o insertar chunk (upsert)
-        chunk_id = update_knowledge_chunk(
-            entity_id=evaluation.get("id"),
-            entity_type="meet_evaluation",
-            content=content,
-            embedding=embedding,
-            metadata=metadata,
-        )
+        # Upsert reusando el embedding cacheado; no-op si el chunk no cambió
+        chunk_id = _index_chunk(evaluation.get("id"), "meet_evaluation", content, metadata)
 
         evaluation_logger.log_task_complete("Indexar Meet Evaluation", f"Meet Evaluation indexada: {chunk_id}")
         return chunk_id
@@ -811,12 +1232,13 @@ def index_meet_evaluation(evaluation: dict[str, Any]) -> str:
         raise
 
 
-def index_all_meet_evaluations(limit: int | None = None) -> int:
+def index_all_meet_evaluations(limit: int | None = None, stats: dict[str, Any] | None = None) -> int:
     """
     Indexa todas las evaluaciones de meets de la BD
 
     Args:
         limit: Límite de evaluaciones a indexar (None = todas)
+        stats: Si se pasa, se completa con hits/misses del cache (ver `_index_rows_in_batches`)
 
     Returns:
         Número de evaluaciones indexadas
@@ -835,17 +1257,9 @@ def index_all_meet_evaluations(limit: int | None = None) -> int:
 
         evaluations = response.data or []
 
-        indexed_count = 0
-        for row in evaluations:
-            try:
-                index_meet_evaluation(row)
-                indexed_count += 1
-            except Exception as e:
-                evaluation_logger.log_error(
-                    "Indexar Todas las Meet Evaluations",
-                    f"Error indexando meet_evaluation {row.get('id')}: {str(e)}",
-                )
-                continue
+        indexed_count = _index_rows_in_batches(
+            "Indexar Todas las Meet Evaluations", "meet_evaluation", evaluations, _meet_evaluation_chunk, stats
+        )
 
         evaluation_logger.log_task_complete(
             "Indexar Todas las Meet Evaluations",
@@ -861,6 +1275,55 @@ def index_all_meet_evaluations(limit: int | None = None) -> int:
         raise
 
 
+def _candidate_jd_status_chunk(record: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Construye (content, metadata) del chunk de un candidate_jd_status"""
+    candidate = record.get("candidates") or record.get("candidate") or {}
+    jd_interview = record.get("jd_interviews") or record.get("jd_interview") or {}
+
+    candidate_id = record.get("candidate_id") or candidate.get("id")
+    jd_interview_id = record.get("jd_interview_id") or jd_interview.get("id")
+    status = record.get("status", "unknown")
+
+    candidate_name = candidate.get("name", "Candidato desconocido")
+    candidate_email = candidate.get("email", "sin-email")
+
+    jd_name = jd_interview.get("interview_name", "Búsqueda desconocida")
+    jd_tech = jd_interview.get("tech_stack") or []
+    jd_tech_list = [t.strip() for t in jd_tech.split(",") if t.strip()] if isinstance(jd_tech, str) else jd_tech
+
+    created_at = record.get("created_at")
+
+    # Construir contenido descriptivo
+    content_parts = [
+        f"Relación candidato-búsqueda: el candidato {candidate_name} ({candidate_email}) está asociado a la búsqueda {jd_name}.",
+        f"Estado de la relación candidate_jd_status: {status}.",
+    ]
+
+    if jd_tech_list:
+        content_parts.append(f"Tecnologías clave de la búsqueda: {', '.join(jd_tech_list)}")
+
+    if created_at:
+        content_parts.append(f"Fecha de creación de la relación: {created_at}")
+
+    content = " ".join(content_parts)
+
+    # Metadata
+    metadata: dict[str, Any] = {
+        "candidate_jd_status_id": record.get("id"),
+        "candidate_id": candidate_id,
+        "jd_interview_id": jd_interview_id,
+        "status": status,
+        "candidate_name": candidate_name,
+        "candidate_email": candidate_email,
+        "jd_interview_name": jd_name,
+        "jd_tech_stack": jd_tech_list,
+        "created_at": created_at,
+        "updated_at": record.get("updated_at"),
+    }
+
+    return content, metadata
+
+
 def index_candidate_jd_status(record: dict[str, Any]) -> str:
     """
     Indexa una relación candidate_jd_status en la knowledge base
@@ -878,61 +1341,10 @@ def index_candidate_jd_status(record: dict[str, Any]) -> str:
             f"Indexando relación: {record.get('id', 'sin-id')}",
         )
 
-        candidate = record.get("candidates") or record.get("candidate") or {}
-        jd_interview = record.get("jd_interviews") or record.get("jd_interview") or {}
+        content, metadata = _candidate_jd_status_chunk(record)
 
-        candidate_id = record.get("candidate_id") or candidate.get("id")
-        jd_interview_id = record.get("jd_interview_id") or jd_interview.get("id")
-        status = record.get("status", "unknown")
-
-        candidate_name = candidate.get("name", "Candidato desconocido")
-        candidate_email = candidate.get("email", "sin-email")
-
-        jd_name = jd_interview.get("interview_name", "Búsqueda desconocida")
-        jd_tech = jd_interview.get("tech_stack") or []
-        jd_tech_list = [t.strip() for t in jd_tech.split(",") if t.strip()] if isinstance(jd_tech, str) else jd_tech
-
-        created_at = record.get("created_at")
-
-        # Construir contenido descriptivo
-        content_parts = [
-            f"Relación candidato-búsqueda: el candidato {candidate_name} ({candidate_email}) está asociado a la búsqueda {jd_name}.",
-            f"Estado de la relación candidate_jd_status: {status}.",
-        ]
-
-        if jd_tech_list:
-            content_parts.append(f"Tecnologías clave de la búsqueda: {', '.join(jd_tech_list)}")
-
-        if created_at:
-            content_parts.append(f"Fecha de creación de la relación: {created_at}")
-
-        content = " ".join(content_parts)
-
-        # Generar embedding
-        embedding = generate_embedding(content)
-
-        # Metadata
-        metadata: dict[str, Any] = {
-            "candidate_jd_status_id": record.get("id"),
-            "candidate_id": candidate_id,
-            "jd_interview_id": jd_interview_id,
-            "status": status,
-            "candidate_name": candidate_name,
-            "candidate_email": candidate_email,
-            "jd_interview_name": jd_name,
-            "jd_tech_stack": jd_tech_list,
-            "created_at": created_at,
-            "updated_at": record.get("updated_at"),
-        }
-
-        # Actualizar o insertar chunk (upsert)
-        chunk_id = update_knowledge_chunk(
-            entity_id=record.get("id"),
-            entity_type="candidate_jd_status",
-            content=content,
-            embedding=embedding,
-            metadata=metadata,
-        )
+        # Upsert reusando el embedding cacheado; no-op si el chunk no cambió
+        chunk_id = _index_chunk(record.get("id"), "candidate_jd_status", content, metadata)
 
         evaluation_logger.log_task_complete(
             "Indexar Candidate JD Status",
@@ -948,12 +1360,13 @@ def index_candidate_jd_status(record: dict[str, Any]) -> str:
         raise
 
 
-def index_all_candidate_jd_status(limit: int | None = None) -> int:
+def index_all_candidate_jd_status(limit: int | None = None, stats: dict[str, Any] | None = None) -> int:
     """
     Indexa todas las filas de candidate_jd_status de la BD
 
     Args:
         limit: Límite de filas a indexar (None = todas)
+        stats: Si se pasa, se completa con hits/misses del cache (ver `_index_rows_in_batches`)
 
     Returns:
         Número de relaciones indexadas
@@ -976,17 +1389,9 @@ def index_all_candidate_jd_status(limit: int | None = None) -> int:
 
         records = response.data or []
 
-        indexed_count = 0
-        for row in records:
-            try:
-                index_candidate_jd_status(row)
-                indexed_count += 1
-            except Exception as e:
-                evaluation_logger.log_error(
-                    "Indexar Todos los Candidate JD Status",
-                    f"Error indexando candidate_jd_status {row.get('id')}: {str(e)}",
-                )
-                continue
+        indexed_count = _index_rows_in_batches(
+            "Indexar Todos los Candidate JD Status", "candidate_jd_status", records, _candidate_jd_status_chunk, stats
+        )
 
         evaluation_logger.log_task_complete(
             "Indexar Todos los Candidate JD Status",
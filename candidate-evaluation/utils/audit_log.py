@@ -3,9 +3,27 @@ Supabase-backed audit events for business and system movements.
 
 The audit writer is intentionally non-blocking for product flows: database
 failures are logged locally and do not raise back to API handlers.
+
+By default events go through `AuditEventWriter`: a bounded in-memory queue drained
+by a background thread that batch-inserts into `audit_events` when `batch_size`
+events are waiting or `flush_interval_seconds` have passed. If the insert fails the
+batch is appended to a local JSONL spool file and replayed on the next successful
+flush. A full queue drops the event (counted in `stats["dropped"]`).
+
+- AUDIT_LOG_ASYNC: `true` by default; `0` / `false` / `no` / `off` inserts inline, one event per call.
+- AUDIT_LOG_QUEUE_SIZE (1000), AUDIT_LOG_BATCH_SIZE (50), AUDIT_LOG_FLUSH_INTERVAL_SECONDS (2).
+- AUDIT_LOG_SPOOL_PATH: spool file (default: `<tmp>/candidate-evaluation/audit_spool.jsonl`).
+- AUDIT_LOG_SPOOL_MAX_BYTES: spool size cap (default 10 MB); beyond it events are dropped.
 """
 
+import atexit
+import json
 import os
+import queue
+import tempfile
+import threading
+import time
+from collections.abc import Callable
 from typing import Any
 
 from utils.logger import evaluation_logger
@@ -13,6 +31,12 @@ from utils.logger import evaluation_logger
 AUDIT_TABLE_NAME = "audit_events"
 SYSTEM_ACTOR_ID = "candidate-evaluation-service"
 
+DEFAULT_QUEUE_SIZE = 1000
+DEFAULT_BATCH_SIZE = 50
+DEFAULT_FLUSH_INTERVAL_SECONDS = 2.0
+DEFAULT_SPOOL_PATH = os.path.join(tempfile.gettempdir(), "candidate-evaluation", "audit_spool.jsonl")
+DEFAULT_SPOOL_MAX_BYTES = 10 * 1024 * 1024
+
 _ENABLED_VALUES = {"1", "true", "yes", "on"}
 _SENSITIVE_KEY_PARTS = (
     "api_key",
@@ -30,6 +54,229 @@ def is_audit_log_enabled() -> bool:
     return os.getenv("AUDIT_LOG_ENABLED", "").strip().lower() in _ENABLED_VALUES
 
 
+def is_audit_log_async() -> bool:
+    return os.getenv("AUDIT_LOG_ASYNC", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _env_number(name: str, default: float, cast: Callable[[str], Any]) -> Any:
+    try:
+        return cast(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _insert_audit_events(payloads: dict[str, Any] | list[dict[str, Any]]) -> None:
+    """Single round trip to `audit_events` (one event or a batch); raises on failure."""
+    from tools.vector_tools import get_supabase_client
+
+    get_supabase_client().table(AUDIT_TABLE_NAME).insert(payloads).execute()
+
+
+class AuditEventWriter:
+    """Bounded queue + background flusher that batch-inserts audit events, spooling on failure."""
+
+    def __init__(
+        self,
+        insert_batch: Callable[[list[dict[str, Any]]], Any] = _insert_audit_events,
+        max_queue: int = DEFAULT_QUEUE_SIZE,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval_seconds: float = DEFAULT_FLUSH_INTERVAL_SECONDS,
+        spool_path: str | None = DEFAULT_SPOOL_PATH,
+        spool_max_bytes: int = DEFAULT_SPOOL_MAX_BYTES,
+    ):
+        self.insert_batch = insert_batch
+        self.max_queue = max(1, max_queue)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.spool_path = spool_path
+        self.spool_max_bytes = spool_max_bytes
+        self._queue: queue.Queue = queue.Queue(maxsize=self.max_queue)
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self.stats = {"enqueued": 0, "written": 0, "dropped": 0, "spooled": 0, "replayed": 0, "flush_errors": 0}
+
+    @classmethod
+    def from_env(cls) -> "AuditEventWriter":
+        return cls(
+            max_queue=_env_number("AUDIT_LOG_QUEUE_SIZE", DEFAULT_QUEUE_SIZE, int),
+            batch_size=_env_number("AUDIT_LOG_BATCH_SIZE", DEFAULT_BATCH_SIZE, int),
+            flush_interval_seconds=_env_number(
+                "AUDIT_LOG_FLUSH_INTERVAL_SECONDS", DEFAULT_FLUSH_INTERVAL_SECONDS, float
+            ),
+            spool_path=os.getenv("AUDIT_LOG_SPOOL_PATH") or DEFAULT_SPOOL_PATH,
+            spool_max_bytes=_env_number("AUDIT_LOG_SPOOL_MAX_BYTES", DEFAULT_SPOOL_MAX_BYTES, int),
+        )
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+        return {**stats, "queue_depth": self.queue_depth, "max_queue": self.max_queue}
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] += amount
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="audit-log-writer", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, payload: dict[str, Any]) -> bool:
+        """Never blocks or raises; False if the queue was full and the event was dropped."""
+        try:
+            self._ensure_started()
+            self._queue.put_nowait(payload)
+        except queue.Full:
+            self._count("dropped")
+            evaluation_logger.log_error(
+                "Audit Log", f"Cola de auditoria llena ({self.max_queue}); evento {payload.get('action')} descartado"
+            )
+            return False
+        except Exception as e:
+            self._count("dropped")
+            evaluation_logger.log_error("Audit Log", f"No se pudo encolar evento de auditoria: {e}")
+            return False
+        self._count("enqueued")
+        return True
+
+    def _next_batch(self) -> list[dict[str, Any]]:
+        """Waits for the first event, then collects up to batch_size within flush_interval."""
+        try:
+            batch = [self._queue.get(timeout=self.flush_interval_seconds)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.flush_interval_seconds
+        while len(batch) < self.batch_size and not self._stop.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        # Al detenerse (o con un batch ya lleno) se toma lo que haya sin esperar
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            batch = self._next_batch()
+            if not batch:
+                continue
+            try:
+                self._flush(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _flush(self, batch: list[dict[str, Any]]) -> None:
+        try:
+            self.insert_batch(batch)
+        except Exception as e:
+            self._count("flush_errors")
+            evaluation_logger.log_error(
+                "Audit Log", f"No se pudieron registrar {len(batch)} eventos de auditoria, se guardan en spool: {e}"
+            )
+            self._spool(batch)
+            return
+        self._count("written", len(batch))
+        self._replay_spool()
+
+    def _spool(self, batch: list[dict[str, Any]]) -> None:
+        if not self.spool_path:
+            self._count("dropped", len(batch))
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.spool_path)), exist_ok=True)
+            size = os.path.getsize(self.spool_path) if os.path.exists(self.spool_path) else 0
+            lines = "".join(json.dumps(p, ensure_ascii=False, default=str) + "\n" for p in batch)
+            if size + len(lines.encode("utf-8")) > self.spool_max_bytes:
+                self._count("dropped", len(batch))
+                evaluation_logger.log_error("Audit Log", f"Spool de auditoria lleno; {len(batch)} eventos descartados")
+                return
+            with open(self.spool_path, "a", encoding="utf-8") as spool:
+                spool.write(lines)
+            self._count("spooled", len(batch))
+        except OSError as e:
+            self._count("dropped", len(batch))
+            evaluation_logger.log_error("Audit Log", f"No se pudo escribir el spool de auditoria: {e}")
+
+    def _replay_spool(self) -> None:
+        """Re-inserts spooled events after a successful flush; keeps whatever still fails."""
+        if not self.spool_path or not os.path.exists(self.spool_path):
+            return
+        try:
+            with open(self.spool_path, encoding="utf-8") as spool:
+                pending = [json.loads(line) for line in spool if line.strip()]
+        except (OSError, ValueError) as e:
+            evaluation_logger.log_error("Audit Log", f"No se pudo leer el spool de auditoria: {e}")
+            return
+        replayed = 0
+        try:
+            for start in range(0, len(pending), self.batch_size):
+                self.insert_batch(pending[start : start + self.batch_size])
+                replayed = start + len(pending[start : start + self.batch_size])
+        except Exception as e:
+            evaluation_logger.log_error("Audit Log", f"Reenvio del spool de auditoria interrumpido: {e}")
+        try:
+            if replayed >= len(pending):
+                os.remove(self.spool_path)
+            elif replayed:
+                with open(self.spool_path, "w", encoding="utf-8") as spool:
+                    spool.writelines(json.dumps(p, ensure_ascii=False, default=str) + "\n" for p in pending[replayed:])
+        except OSError as e:
+            evaluation_logger.log_error("Audit Log", f"No se pudo actualizar el spool de auditoria: {e}")
+        self._count("replayed", replayed)
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Waits until every queued event was written or spooled; True if the queue drained."""
+        deadline = time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self, timeout: float = 10.0) -> None:
+        """Flushes what is queued and stops the background thread."""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+_writer: AuditEventWriter | None = None
+_writer_lock = threading.Lock()
+
+
+def get_audit_writer() -> AuditEventWriter:
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = AuditEventWriter.from_env()
+                atexit.register(_writer.stop)
+    return _writer
+
+
+def audit_writer_stats() -> dict[str, Any]:
+    """Queue depth and counters of the background writer (empty if it was never used)."""
+    return _writer.snapshot() if _writer is not None else {}
+
+
 def _sanitize_value(value: Any) -> Any:
     if isinstance(value, dict):
         sanitized = {}
@@ -69,8 +316,9 @@ def record_audit_event(
     """
     Insert one append-only audit event in Supabase.
 
-    Returns True if the insert was attempted and completed, False if audit is
-    disabled or the insert failed.
+    With AUDIT_LOG_ASYNC (default) the event is queued for the background writer and
+    True means it was accepted. Inline, True means the insert completed. False if
+    audit is disabled, the queue is full or the inline insert failed.
     """
     if not action:
         raise ValueError("action is required")
@@ -99,10 +347,11 @@ def record_audit_event(
         "error_stack": error_stack,
     }
 
-    try:
-        from tools.vector_tools import get_supabase_client
+    if is_audit_log_async():
+        return get_audit_writer().enqueue(payload)
 
-        get_supabase_client().table(AUDIT_TABLE_NAME).insert(payload).execute()
+    try:
+        _insert_audit_events(payload)
         return True
     except Exception as audit_error:
         evaluation_logger.log_error("Audit Log", f"No se pudo registrar evento de auditoria: {audit_error}")
@@ -0,0 +1,134 @@
+"""
+Best-effort background runner for the side effects of POST /evaluate-meet.
+
+Once the evaluation is persisted in `meet_evaluations`, the response no longer waits for
+the match email, the audit event or the evaluation-cache write: they are submitted here
+and run on a small in-process thread pool, each with retries and exponential backoff.
+
+Delivery is best-effort, not an outbox: nothing is persisted. Effects still queued or
+retrying are lost if the process crashes or is redeployed (a clean shutdown waits for them
+via `shutdown()`), and an effect that still raises after `max_attempts` is dropped: it is
+logged as an error with its name and counted in `stats["failed"]`. Only use it for effects
+the evaluation can live without; anything that must happen belongs in a persisted job
+(see `evaluation_jobs`). `drain()` waits for everything queued (shutdown, tests).
+
+- EVALUATION_EFFECTS_ENABLED: `true` by default; `0` / `false` / `no` / `off` runs each
+  effect inline in the caller's thread (same retries).
+- EVALUATION_EFFECTS_MAX_WORKERS (2), EVALUATION_EFFECTS_MAX_ATTEMPTS (3),
+  EVALUATION_EFFECTS_RETRY_BASE_SECONDS (2): pool size and retry policy.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any
+
+from utils.logger import evaluation_logger
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_RETRY_BASE_SECONDS = 2.0
+
+
+def is_background_effects_enabled() -> bool:
+    return os.getenv("EVALUATION_EFFECTS_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def _env_number(name: str, default: float, cast: Callable[[str], float]) -> Any:
+    try:
+        return max(cast(os.getenv(name, str(default))), 0)
+    except ValueError:
+        return default
+
+
+class BackgroundEffects:
+    """In-process thread pool that runs named side effects with retries (best-effort, not persisted)."""
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        retry_base_seconds: float = DEFAULT_RETRY_BASE_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.max_attempts = max(1, max_attempts)
+        self.retry_base_seconds = retry_base_seconds
+        self._sleep = sleep
+        self._pool: ThreadPoolExecutor | None = None
+        self._pending: set[Future] = set()
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "succeeded": 0, "retried": 0, "failed": 0}
+
+    @classmethod
+    def from_env(cls) -> "BackgroundEffects":
+        return cls(
+            max_workers=_env_number("EVALUATION_EFFECTS_MAX_WORKERS", DEFAULT_MAX_WORKERS, int),
+            max_attempts=_env_number("EVALUATION_EFFECTS_MAX_ATTEMPTS", DEFAULT_MAX_ATTEMPTS, int),
+            retry_base_seconds=_env_number("EVALUATION_EFFECTS_RETRY_BASE_SECONDS", DEFAULT_RETRY_BASE_SECONDS, float),
+        )
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="evaluation-effects")
+        return self._pool
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _run(self, name: str, fn: Callable[..., Any], args: tuple, kwargs: dict) -> Any:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                result = fn(*args, **kwargs)
+                self._count("succeeded")
+                return result
+            except Exception as e:
+                if attempt >= self.max_attempts:
+                    self._count("failed")
+                    evaluation_logger.log_error(
+                        "Background Effects", f"{name} falló tras {attempt} intento(s), se descarta: {e}"
+                    )
+                    return None
+                self._count("retried")
+                delay = self.retry_base_seconds * (2 ** (attempt - 1))
+                evaluation_logger.log_task_progress(
+                    "Background Effects",
+                    f"{name} falló (intento {attempt}/{self.max_attempts}): {e}; reintento en {delay:g}s",
+                )
+                self._sleep(delay)
+        return None
+
+    def submit(self, name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """Queues `fn(*args, **kwargs)`; inline (already resolved future) if background effects are disabled."""
+        self._count("submitted")
+        if not is_background_effects_enabled():
+            future: Future = Future()
+            future.set_result(self._run(name, fn, args, kwargs))
+            return future
+        with self._lock:
+            future = self._get_pool().submit(self._run, name, fn, args, kwargs)
+            self._pending.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future) -> None:
+        with self._lock:
+            self._pending.discard(future)
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Waits for queued effects; True if none is left pending."""
+        with self._lock:
+            pending = list(self._pending)
+        if not pending:
+            return True
+        _done, not_done = wait(pending, timeout=timeout)
+        return not not_done
+
+    def shutdown(self, wait_for_pending: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait_for_pending)
@@ -0,0 +1,248 @@
+"""
+Cache of text extracted from CV files, keyed by S3 object version.
+
+Re-running POST /read-cv on the same file (retries, re-uploads of identical content,
+reprocessing after prompt changes) used to download the object again and re-run the
+PDF/DOCX cascade, Textract included. The S3 ETag changes whenever the object content
+changes, so `(bucket, key, etag, CV_TEXT_EXTRACTOR_VERSION)` identifies one extraction.
+
+Entries live in a local SQLite file bounded by size: after each write the least recently
+used rows are evicted until the total fits. Optionally the same entries are shared across
+instances through the `cv_text_cache` table (database/setup-cv-text-cache.sql); a remote
+hit is copied to the local cache. Errors are logged and treated as a miss.
+
+The local cache also remembers the last ETag extracted for each object (`get_cached_etag`),
+so `download_cv_from_s3` can send a conditional GET (`If-None-Match`) and skip the body
+entirely on `304 Not Modified`.
+
+- CV_TEXT_CACHE_ENABLED: `true` by default; `0` / `false` / `no` / `off` disables it.
+- CV_TEXT_CACHE_PATH: SQLite file (default: `<tmp>/candidate-evaluation/cv_text_cache.sqlite3`).
+- CV_TEXT_CACHE_MAX_BYTES: local size bound (default 100 MB).
+- CV_TEXT_CACHE_SUPABASE: opt-in (`1` / `true` / `yes` / `on`); requires the table.
+"""
+
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+from typing import Any
+
+from utils.logger import evaluation_logger
+
+# Subirlo cuando cambie la extracción (orden de extractores, OCR, formato) invalida lo cacheado
+CV_TEXT_EXTRACTOR_VERSION = "1"
+CV_TEXT_CACHE_TABLE = "cv_text_cache"
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "candidate-evaluation", "cv_text_cache.sqlite3")
+DEFAULT_MAX_BYTES = 100 * 1024 * 1024
+
+_cache: "CVTextCache | None" = None
+_cache_path: str | None = None
+_cache_lock = threading.Lock()
+
+
+def is_cv_text_cache_enabled() -> bool:
+    return os.getenv("CV_TEXT_CACHE_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def is_remote_cache_enabled() -> bool:
+    return os.getenv("CV_TEXT_CACHE_SUPABASE", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def object_ref(bucket: str, s3_key: str) -> str:
+    return f"v{CV_TEXT_EXTRACTOR_VERSION}:{bucket}/{s3_key}"
+
+
+def cache_key(bucket: str, s3_key: str, etag: str | None) -> str | None:
+    """None without ETag: sin versión del objeto no se puede cachear con seguridad."""
+    etag = (etag or "").strip('"')
+    if not etag:
+        return None
+    return f"{object_ref(bucket, s3_key)}@{etag}"
+
+
+def _max_bytes() -> int:
+    try:
+        return max(0, int(os.getenv("CV_TEXT_CACHE_MAX_BYTES", str(DEFAULT_MAX_BYTES))))
+    except ValueError:
+        return DEFAULT_MAX_BYTES
+
+
+class CVTextCache:
+    """SQLite map of cache_key -> extracted text + metadata, LRU-evicted by total size."""
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cv_texts ("
+                " cache_key TEXT PRIMARY KEY,"
+                " text_content TEXT NOT NULL,"
+                " metadata TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " accessed_at TEXT NOT NULL,"
+                " object_ref TEXT NOT NULL DEFAULT '')"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cv_texts_object_ref ON cv_texts (object_ref, accessed_at)")
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """`{"text_content", "metadata"}` or None; a hit refreshes its LRU position."""
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT text_content, metadata FROM cv_texts WHERE cache_key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE cv_texts SET accessed_at = ? WHERE cache_key = ?", (datetime.now().isoformat(), key)
+            )
+        return {"text_content": row[0], "metadata": json.loads(row[1])}
+
+    def latest_key(self, ref: str) -> str | None:
+        """Most recently used cache_key stored for `object_ref` (any ETag)."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cache_key FROM cv_texts WHERE object_ref = ? ORDER BY accessed_at DESC LIMIT 1", (ref,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, text_content: str, metadata: dict[str, Any]) -> None:
+        metadata_json = json.dumps(metadata, ensure_ascii=False, default=str)
+        size = len(text_content.encode("utf-8")) + len(metadata_json.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cv_texts (cache_key, text_content, metadata, size, accessed_at, object_ref)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (key, text_content, metadata_json, size, datetime.now().isoformat(), key.rpartition("@")[0]),
+            )
+            self._evict()
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cv_texts").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = []
+        for key, size in self._conn.execute("SELECT cache_key, size FROM cv_texts ORDER BY accessed_at"):
+            if total <= self.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM cv_texts WHERE cache_key = ?", evicted)
+
+    def total_bytes(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cv_texts").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_cv_text_cache() -> CVTextCache | None:
+    """Process-wide local cache, or None if disabled or the file cannot be opened."""
+    global _cache, _cache_path
+    if not is_cv_text_cache_enabled():
+        return None
+
+    path = os.getenv("CV_TEXT_CACHE_PATH") or DEFAULT_CACHE_PATH
+    with _cache_lock:
+        if _cache is None or _cache_path != path:
+            try:
+                _cache = CVTextCache(path, max_bytes=_max_bytes())
+                _cache_path = path
+            except (OSError, sqlite3.Error) as e:
+                evaluation_logger.log_error("CV Text Cache", f"No se pudo abrir el cache de textos de CV {path}: {e}")
+                return None
+        return _cache
+
+
+def _remote_client():
+    from tools.vector_tools import get_supabase_client
+
+    return get_supabase_client()
+
+
+def get_cached_etag(bucket: str, s3_key: str) -> str | None:
+    """ETag of the last local extraction of this object, for a conditional GET (local only)."""
+    local = get_cv_text_cache() if is_cv_text_cache_enabled() else None
+    if local is None:
+        return None
+    try:
+        key = local.latest_key(object_ref(bucket, s3_key))
+    except sqlite3.Error as e:
+        evaluation_logger.log_error("CV Text Cache", f"No se pudo leer el cache local: {e}")
+        return None
+    return f'"{key.rpartition("@")[2]}"' if key else None
+
+
+def get_cached_cv_text(key: str | None) -> tuple[dict[str, Any] | None, str | None]:
+    """(entry, "local" | "supabase") on hit, (None, None) on miss."""
+    if not key or not is_cv_text_cache_enabled():
+        return None, None
+    local = get_cv_text_cache()
+    try:
+        entry = local.get(key) if local else None
+    except sqlite3.Error as e:
+        evaluation_logger.log_error("CV Text Cache", f"No se pudo leer el cache local: {e}")
+        entry = None
+    if entry:
+        return entry, "local"
+    if not is_remote_cache_enabled():
+        return None, None
+    try:
+        rows = (
+            _remote_client()
+            .table(CV_TEXT_CACHE_TABLE)
+            .select("text_content, metadata")
+            .eq("cache_key", key)
+            .limit(1)
+            .execute()
+            .data
+            or []
+        )
+    except Exception as e:
+        evaluation_logger.log_error("CV Text Cache", f"No se pudo leer {CV_TEXT_CACHE_TABLE}: {e}")
+        return None, None
+    if not rows or not isinstance(rows[0].get("text_content"), str):
+        return None, None
+    entry = {"text_content": rows[0]["text_content"], "metadata": rows[0].get("metadata") or {}}
+    _put_local(key, entry["text_content"], entry["metadata"])
+    return entry, "supabase"
+
+
+def _put_local(key: str, text_content: str, metadata: dict[str, Any]) -> None:
+    local = get_cv_text_cache()
+    if local is None:
+        return
+    try:
+        local.put(key, text_content, metadata)
+    except sqlite3.Error as e:
+        evaluation_logger.log_error("CV Text Cache", f"No se pudo escribir el cache local: {e}")
+
+
+def save_cv_text(key: str | None, text_content: str, metadata: dict[str, Any]) -> None:
+    if not key or not is_cv_text_cache_enabled():
+        return
+    _put_local(key, text_content, metadata)
+    if not is_remote_cache_enabled():
+        return
+    try:
+        _remote_client().table(CV_TEXT_CACHE_TABLE).upsert(
+            {
+                "cache_key": key,
+                "text_content": text_content,
+                "metadata": metadata,
+                "updated_at": datetime.now().isoformat(),
+            },
+            on_conflict="cache_key",
+        ).execute()
+    except Exception as e:
+        evaluation_logger.log_error("CV Text Cache", f"No se pudo guardar en {CV_TEXT_CACHE_TABLE}: {e}")
@@ -0,0 +1,111 @@
+"""
+Local embedding cache keyed by (model, content hash).
+
+Indexing rebuilds the same chunk text for entities that did not change; caching the
+embedding by `content_hash(content)` lets a reindex reuse it instead of calling
+OpenAI again. Entries live in a small SQLite file so they survive process restarts.
+
+- EMBEDDING_CACHE_ENABLED: `true` by default; `0` / `false` / `no` / `off` disables it.
+- EMBEDDING_CACHE_PATH: SQLite file (default: `<tmp>/candidate-evaluation/embedding_cache.sqlite3`).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+from datetime import datetime
+
+from utils.logger import evaluation_logger
+
+DEFAULT_CACHE_PATH = os.path.join(tempfile.gettempdir(), "candidate-evaluation", "embedding_cache.sqlite3")
+
+_cache: "EmbeddingCache | None" = None
+_cache_path: str | None = None
+_cache_lock = threading.Lock()
+
+
+def content_hash(content: str) -> str:
+    """sha256 of the chunk text; stored as `metadata.content_hash` in knowledge_chunks."""
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+def is_embedding_cache_enabled() -> bool:
+    return os.getenv("EMBEDDING_CACHE_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class EmbeddingCache:
+    """SQLite-backed map of (model, content_hash) -> embedding, safe to share across threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                " model TEXT NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " embedding TEXT NOT NULL,"
+                " created_at TEXT NOT NULL,"
+                " PRIMARY KEY (model, content_hash))"
+            )
+
+    def get_many(self, model: str, hashes: list[str]) -> dict[str, list[float]]:
+        """Cached embeddings for the given hashes (missing ones are simply absent)."""
+        found: dict[str, list[float]] = {}
+        unique = list(dict.fromkeys(hashes))
+        # SQLite limita la cantidad de parámetros por query
+        for start in range(0, len(unique), 500):
+            chunk = unique[start : start + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT content_hash, embedding FROM embeddings WHERE model = ? AND content_hash IN ({placeholders})",
+                    [model, *chunk],
+                ).fetchall()
+            for digest, embedding in rows:
+                found[digest] = json.loads(embedding)
+        return found
+
+    def get(self, model: str, digest: str) -> list[float] | None:
+        return self.get_many(model, [digest]).get(digest)
+
+    def put_many(self, model: str, embeddings: dict[str, list[float]]) -> None:
+        if not embeddings:
+            return
+        now = datetime.now().isoformat()
+        rows = [(model, digest, json.dumps(embedding), now) for digest, embedding in embeddings.items()]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, content_hash, embedding, created_at) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def put(self, model: str, digest: str, embedding: list[float]) -> None:
+        self.put_many(model, {digest: embedding})
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_embedding_cache() -> EmbeddingCache | None:
+    """Process-wide cache, or None if disabled or the file cannot be opened."""
+    global _cache, _cache_path
+    if not is_embedding_cache_enabled():
+        return None
+
+    path = os.getenv("EMBEDDING_CACHE_PATH") or DEFAULT_CACHE_PATH
+    with _cache_lock:
+        if _cache is None or _cache_path != path:
+            try:
+                _cache = EmbeddingCache(path)
+                _cache_path = path
+            except (OSError, sqlite3.Error) as e:
+                evaluation_logger.log_error("Embedding Cache", f"No se pudo abrir el cache de embeddings {path}: {e}")
+                return None
+        return _cache
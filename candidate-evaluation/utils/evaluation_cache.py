@@ -0,0 +1,90 @@
+"""
+Content-addressed cache of POST /evaluate-meet results.
+
+Re-evaluating a meet whose inputs did not change (backoffice retries, duplicate job
+kicks) re-runs the whole crew for the same answer. The cache key is a sha256 over the
+evaluation inputs taken from `load_meet_evaluation_context` (transcript, emotion
+analysis, JD text, candidate tech stack) plus a version string that carries the prompt
+version, model and crew settings, so template or model changes invalidate old entries.
+
+One row per meet lives in `meet_evaluation_cache` (database/setup-meet-evaluation-cache.sql);
+a new evaluation replaces it. Read/write errors are logged and treated as a miss.
+
+- EVALUATION_CACHE_ENABLED: opt-in (`1` / `true` / `yes` / `on`); requires the table.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any
+
+from utils.logger import evaluation_logger
+
+EVALUATION_CACHE_TABLE = "meet_evaluation_cache"
+
+
+def is_evaluation_cache_enabled() -> bool:
+    return os.getenv("EVALUATION_CACHE_ENABLED", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+def evaluation_input_hash(meet_context: dict | None, version: str) -> str | None:
+    """Hash of the evaluation inputs; None when the context could not be loaded."""
+    if not isinstance(meet_context, dict) or meet_context.get("error"):
+        return None
+    conversation = meet_context.get("conversation") or {}
+    if not conversation.get("conversation_data"):
+        return None
+    jd_interview = meet_context.get("jd_interview") or {}
+    candidate = conversation.get("candidate") or {}
+    inputs = {
+        "version": version,
+        "conversation_data": conversation.get("conversation_data"),
+        "emotion_analysis": conversation.get("emotion_analysis"),
+        "job_description": jd_interview.get("job_description"),
+        "interview_name": jd_interview.get("interview_name"),
+        "candidate_id": candidate.get("id"),
+        "tech_stack": candidate.get("tech_stack"),
+    }
+    raw = json.dumps(inputs, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def get_cached_evaluation(supabase: Any, meet_id: str, input_hash: str) -> dict[str, Any] | None:
+    """Returns `{"evaluation_id", "result"}` if the stored entry matches `input_hash`."""
+    try:
+        response = (
+            supabase.table(EVALUATION_CACHE_TABLE)
+            .select("evaluation_id, result")
+            .eq("meet_id", meet_id)
+            .eq("input_hash", input_hash)
+            .limit(1)
+            .execute()
+        )
+    except Exception as e:
+        evaluation_logger.log_error("Evaluation Cache", f"No se pudo leer la caché del meet {meet_id}: {e}")
+        return None
+    rows = response.data or []
+    if not rows or not isinstance(rows[0].get("result"), dict):
+        return None
+    return {"evaluation_id": rows[0].get("evaluation_id"), "result": rows[0]["result"]}
+
+
+def save_cached_evaluation(
+    supabase: Any, meet_id: str, input_hash: str, evaluation_id: str | None, result: dict[str, Any]
+) -> bool:
+    try:
+        supabase.table(EVALUATION_CACHE_TABLE).upsert(
+            {
+                "meet_id": meet_id,
+                "input_hash": input_hash,
+                "evaluation_id": evaluation_id,
+                "result": result,
+                "updated_at": datetime.now().isoformat(),
+            },
+            on_conflict="meet_id",
+        ).execute()
+        return True
+    except Exception as e:
+        evaluation_logger.log_error("Evaluation Cache", f"No se pudo guardar la caché del meet {meet_id}: {e}")
+        return False
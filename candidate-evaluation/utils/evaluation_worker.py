@@ -0,0 +1,158 @@
+"""
+Resident loop for the evaluation_jobs worker (RAILWAY_RUN_MODE=worker).
+
+Unlike worker-cron, the process stays up: crewai/langchain are imported once and a job
+is claimed as soon as it is queued. When the queue is empty the loop sleeps with an
+exponential backoff between `min_idle_seconds` and `max_idle_seconds`; `wake()` cuts the
+sleep short (Postgres NOTIFY via `PostgresNotifyListener`, or SIGUSR1 as a local stand-in).
+`request_stop()` (SIGTERM) lets the in-flight batch finish and mark its jobs before exiting,
+so claimed jobs are never abandoned mid-run.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from utils.logger import evaluation_logger
+
+DEFAULT_MIN_IDLE_SECONDS = 2.0
+DEFAULT_MAX_IDLE_SECONDS = 60.0
+DEFAULT_NOTIFY_CHANNEL = "evaluation_jobs"
+
+
+class EvaluationJobsWorker:
+    """Claims batches through `process_batch` until stopped; expects a dict with `claimed`."""
+
+    def __init__(
+        self,
+        process_batch: Callable[[], Awaitable[dict[str, Any]]],
+        min_idle_seconds: float = DEFAULT_MIN_IDLE_SECONDS,
+        max_idle_seconds: float = DEFAULT_MAX_IDLE_SECONDS,
+        backoff_factor: float = 2.0,
+    ):
+        self.process_batch = process_batch
+        self.min_idle_seconds = min_idle_seconds
+        self.max_idle_seconds = max(max_idle_seconds, min_idle_seconds)
+        self.backoff_factor = backoff_factor
+        self._wake = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.stats = {"batches": 0, "claimed": 0, "errors": 0, "wakeups": 0}
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def wake_threadsafe(self) -> None:
+        """For callbacks running outside the event loop (e.g. the NOTIFY listener thread)."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.wake)
+
+    def request_stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+
+    async def _idle(self, seconds: float) -> bool:
+        """Sleeps up to `seconds`; True if woken early."""
+        try:
+            await asyncio.wait_for(self._wake.wait(), timeout=seconds)
+            return True
+        except TimeoutError:
+            return False
+
+    async def run(self) -> dict[str, int]:
+        self._loop = asyncio.get_running_loop()
+        idle = self.min_idle_seconds
+        while not self._stop.is_set():
+            # Un wake que llega durante el batch fuerza otra vuelta sin dormir.
+            self._wake.clear()
+            try:
+                result = await self.process_batch()
+                claimed = int((result or {}).get("claimed") or 0)
+            except Exception as e:
+                self.stats["errors"] += 1
+                evaluation_logger.log_error("Evaluation Jobs Worker", f"Error procesando batch: {e}")
+                claimed = 0
+            self.stats["batches"] += 1
+            self.stats["claimed"] += claimed
+
+            if claimed or self._stop.is_set():
+                idle = self.min_idle_seconds
+                continue
+
+            if await self._idle(idle):
+                if not self._stop.is_set():
+                    self.stats["wakeups"] += 1
+                idle = self.min_idle_seconds
+            else:
+                idle = min(idle * self.backoff_factor, self.max_idle_seconds)
+        return self.stats
+
+
+class PostgresNotifyListener:
+    """
+    Background thread that runs LISTEN on `channel` and calls `on_notify` per notification.
+
+    Needs psycopg 3 and a session-mode connection string (Supabase: direct connection or
+    pooler on port 5432; the transaction pooler does not deliver notifications).
+    Reconnects with a fixed delay on errors.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        on_notify: Callable[[], None],
+        channel: str = DEFAULT_NOTIFY_CHANNEL,
+        reconnect_delay_seconds: float = 5.0,
+    ):
+        self.dsn = dsn
+        self.on_notify = on_notify
+        self.channel = channel
+        self.reconnect_delay_seconds = reconnect_delay_seconds
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="evaluation-jobs-notify", daemon=True)
+
+    def start(self) -> "PostgresNotifyListener":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stopped.set()
+
+    def _run(self) -> None:
+        import psycopg
+        from psycopg import sql
+
+        while not self._stopped.is_set():
+            try:
+                with psycopg.connect(self.dsn, autocommit=True) as conn:
+                    conn.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                    evaluation_logger.log_task_progress(
+                        "Evaluation Jobs Worker", f"Escuchando NOTIFY en el canal {self.channel}"
+                    )
+                    while not self._stopped.is_set():
+                        for _notify in conn.notifies(timeout=1.0):
+                            self.on_notify()
+            except Exception as e:
+                evaluation_logger.log_error("Evaluation Jobs Worker", f"LISTEN {self.channel} falló: {e}")
+                self._stopped.wait(self.reconnect_delay_seconds)
+
+
+def start_notify_listener(
+    dsn: str | None, on_notify: Callable[[], None], channel: str = DEFAULT_NOTIFY_CHANNEL
+) -> PostgresNotifyListener | None:
+    """Starts the listener if a DSN is configured and psycopg is installed; otherwise polling only."""
+    if not dsn:
+        return None
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        evaluation_logger.log_error(
+            "Evaluation Jobs Worker", "psycopg no está instalado; el worker sólo hará polling (sin LISTEN/NOTIFY)"
+        )
+        return None
+    return PostgresNotifyListener(dsn, on_notify, channel=channel).start()
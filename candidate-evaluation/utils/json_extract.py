@@ -0,0 +1,69 @@
+"""
+Extraction of JSON objects embedded in LLM / crew output text.
+
+Crew results mix prose, markdown fences and one or more JSON objects. `find_json_objects`
+walks the text left to right with `str.find` and `JSONDecoder.raw_decode` (no slicing):
+after a successful decode it jumps past the object, so nested objects are not re-parsed
+and well-formed outputs are handled in a single pass. A `{` that does not start valid
+JSON is skipped and the scan resumes at the next `{`, so objects nested in malformed
+text are still found.
+"""
+
+import json
+from collections.abc import Iterator
+from dataclasses import dataclass
+from typing import Any
+
+_DECODER = json.JSONDecoder()
+# Lo que puede ir entre la apertura de un bloque ``` y el objeto: "json", "JSON" o nada
+_FENCE_LANGS = {"", "json"}
+
+
+@dataclass(frozen=True)
+class JSONMatch:
+    """A top-level JSON object found in a text: decoded value and `text[start:end]` span."""
+
+    value: dict[str, Any]
+    start: int
+    end: int
+    fenced: bool = False
+
+    @property
+    def size(self) -> int:
+        return self.end - self.start
+
+
+def _is_fenced(text: str, start: int) -> bool:
+    fence = text.rfind("```", max(0, start - 32), start)
+    return fence != -1 and text[fence + 3 : start].strip().lower() in _FENCE_LANGS
+
+
+def iter_json_objects(text: str) -> Iterator[JSONMatch]:
+    """Yields the top-level JSON objects of `text` in order of appearance."""
+    if not text:
+        return
+    pos = text.find("{")
+    while pos != -1:
+        try:
+            value, end = _DECODER.raw_decode(text, pos)
+        except ValueError:
+            pos = text.find("{", pos + 1)
+            continue
+        yield JSONMatch(value=value, start=pos, end=end, fenced=_is_fenced(text, pos))
+        pos = text.find("{", end)
+
+
+def find_json_objects(text: str) -> list[JSONMatch]:
+    return list(iter_json_objects(text))
+
+
+def extract_json_object(text: str) -> dict[str, Any] | None:
+    """
+    The main JSON object of a crew output: the largest fenced (```json) object if any,
+    otherwise the largest object in the text. None when there is no valid object.
+    """
+    matches = find_json_objects(text)
+    if not matches:
+        return None
+    fenced = [m for m in matches if m.fenced]
+    return max(fenced or matches, key=lambda m: m.size).value
@@ -0,0 +1,274 @@
+"""
+Run state and bounded execution for POST /match-candidates.
+
+Run state lives in a pluggable store (in-memory or a Supabase table) that behaves
+like a dict of ``run_id -> state``, so API handlers keep reading and writing
+``matching_runs[run_id]``. Finished runs (``done`` / ``error``) expire after a TTL;
+in the Supabase store, queued/running runs that stop updating (e.g. cut off by a
+restart) expire after a staleness window.
+Runs execute on a bounded thread pool with a queue depth limit; identical
+``(user_id, client_id, full_rebuild)`` requests that are still queued or running are coalesced
+into the existing run.
+"""
+
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator, MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from utils.logger import evaluation_logger
+
+MATCHING_RUNS_TABLE_NAME = "matching_runs"
+FINISHED_STATUSES = ("done", "error")
+
+DEFAULT_RUN_TTL_SECONDS = 3600
+DEFAULT_RUN_STALE_SECONDS = 7200
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_PENDING = 20
+
+
+class MatchingQueueFullError(RuntimeError):
+    """Raised when the matching executor already holds `max_pending` queued/running runs."""
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+class InMemoryRunStore(MutableMapping):
+    """Process-local run store with TTL eviction of finished runs."""
+
+    def __init__(self, ttl_seconds: int = DEFAULT_RUN_TTL_SECONDS, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._runs: dict[str, dict] = {}
+        self._expires_at: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _evict_expired(self) -> None:
+        now = self._clock()
+        for run_id in [rid for rid, expires_at in self._expires_at.items() if expires_at <= now]:
+            self._runs.pop(run_id, None)
+            self._expires_at.pop(run_id, None)
+
+    def __getitem__(self, run_id: str) -> dict:
+        with self._lock:
+            self._evict_expired()
+            return self._runs[run_id]
+
+    def __setitem__(self, run_id: str, state: dict) -> None:
+        with self._lock:
+            self._evict_expired()
+            self._runs[run_id] = state
+            if state.get("status") in FINISHED_STATUSES:
+                self._expires_at[run_id] = self._clock() + self.ttl_seconds
+            else:
+                self._expires_at.pop(run_id, None)
+
+    def __delitem__(self, run_id: str) -> None:
+        with self._lock:
+            del self._runs[run_id]
+            self._expires_at.pop(run_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            self._evict_expired()
+            return iter(list(self._runs))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._evict_expired()
+            return len(self._runs)
+
+
+class SupabaseRunStore(MutableMapping):
+    """
+    Run store backed by the `matching_runs` table (see database/setup-matching-runs.sql).
+
+    State survives restarts and is visible to every uvicorn worker. Finished runs expire
+    `ttl_seconds` after finishing; active runs expire `stale_seconds` after their last
+    update, so a run whose process died mid-run does not stay `running` forever. Expired
+    rows are hidden on read and deleted whenever a run is queued or finishes.
+    """
+
+    def __init__(
+        self,
+        supabase: Any = None,
+        ttl_seconds: int = DEFAULT_RUN_TTL_SECONDS,
+        stale_seconds: int = DEFAULT_RUN_STALE_SECONDS,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.stale_seconds = stale_seconds
+        self._supabase = supabase
+
+    @property
+    def supabase(self) -> Any:
+        if self._supabase is None:
+            from tools.vector_tools import get_supabase_client
+
+            self._supabase = get_supabase_client()
+        return self._supabase
+
+    @staticmethod
+    def _utc_iso(dt: datetime) -> str:
+        # Sin "+00:00": el "+" no sobrevive sin escapar en los filtros de PostgREST
+        return dt.astimezone(UTC).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+    def _not_expired(self, query: Any) -> Any:
+        # expires_at NULL: filas anteriores al vencimiento de runs activos
+        now = self._utc_iso(datetime.now(UTC))
+        return query.or_(f"expires_at.is.null,expires_at.gt.{now}")
+
+    def __getitem__(self, run_id: str) -> dict:
+        query = self.supabase.table(MATCHING_RUNS_TABLE_NAME).select("state").eq("run_id", run_id)
+        response = self._not_expired(query).limit(1).execute()
+        rows = response.data or []
+        if not rows:
+            raise KeyError(run_id)
+        return rows[0].get("state") or {}
+
+    def __setitem__(self, run_id: str, state: dict) -> None:
+        now = datetime.now(UTC)
+        finished = state.get("status") in FINISHED_STATUSES
+        # Cada actualización de un run activo renueva su vencimiento por inactividad
+        lifetime = self.ttl_seconds if finished else self.stale_seconds
+        row = {
+            "run_id": run_id,
+            "status": state.get("status"),
+            "state": state,
+            "updated_at": self._utc_iso(now),
+            "expires_at": self._utc_iso(now + timedelta(seconds=lifetime)),
+        }
+        self.supabase.table(MATCHING_RUNS_TABLE_NAME).upsert(row, on_conflict="run_id").execute()
+        if finished or state.get("status") == "queued":
+            self.evict_expired()
+
+    def __delitem__(self, run_id: str) -> None:
+        response = self.supabase.table(MATCHING_RUNS_TABLE_NAME).delete().eq("run_id", run_id).execute()
+        if not response.data:
+            raise KeyError(run_id)
+
+    def __iter__(self) -> Iterator[str]:
+        response = self._not_expired(self.supabase.table(MATCHING_RUNS_TABLE_NAME).select("run_id")).execute()
+        return iter([row.get("run_id") for row in response.data or []])
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def evict_expired(self) -> None:
+        now = self._utc_iso(datetime.now(UTC))
+        try:
+            self.supabase.table(MATCHING_RUNS_TABLE_NAME).delete().lt("expires_at", now).execute()
+        except Exception as e:
+            evaluation_logger.log_error("Matching Runs", f"No se pudieron purgar runs vencidos: {e}")
+
+
+def create_matching_run_store() -> MutableMapping:
+    """Build the run store selected by `MATCHING_RUN_STORE` (`memory` by default, or `supabase`)."""
+    backend = os.getenv("MATCHING_RUN_STORE", "memory").strip().lower()
+    ttl_seconds = _env_int("MATCHING_RUN_TTL_SECONDS", DEFAULT_RUN_TTL_SECONDS)
+    if backend == "supabase":
+        return SupabaseRunStore(
+            ttl_seconds=ttl_seconds,
+            stale_seconds=_env_int("MATCHING_RUN_STALE_SECONDS", DEFAULT_RUN_STALE_SECONDS),
+        )
+    if backend != "memory":
+        evaluation_logger.log_error("Matching Runs", f"MATCHING_RUN_STORE={backend!r} desconocido, usando memory")
+    return InMemoryRunStore(ttl_seconds=ttl_seconds)
+
+
+class MatchingRunExecutor:
+    """
+    Bounded pool for matching runs.
+
+    At most `max_workers` runs execute at once and at most `max_pending` are queued or
+    running; beyond that `submit` raises `MatchingQueueFullError`. A submit whose
+    coalescing key matches a run that is still queued/running returns that run instead.
+    """
+
+    def __init__(
+        self,
+        store: MutableMapping,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ):
+        self.store = store
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool: ThreadPoolExecutor | None = None
+        self._active: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, store: MutableMapping) -> "MatchingRunExecutor":
+        return cls(
+            store,
+            max_workers=_env_int("MATCHING_MAX_WORKERS", DEFAULT_MAX_WORKERS),
+            max_pending=_env_int("MATCHING_MAX_PENDING", DEFAULT_MAX_PENDING),
+        )
+
+    @property
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._active)
+
+    def _get_pool(self) -> ThreadPoolExecutor:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="matching-run")
+        return self._pool
+
+    def submit(self, key: tuple, run_id: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> tuple[str, bool]:
+        """
+        Queue `fn(*args, **kwargs)` as run `run_id`.
+
+        Returns `(run_id, coalesced)`: if a run with the same `key` is still active, its
+        run_id is returned with `coalesced=True` and nothing new is queued.
+        """
+        with self._lock:
+            active_run_id = self._active.get(key)
+            if active_run_id is not None:
+                return active_run_id, True
+            if len(self._active) >= self.max_pending:
+                raise MatchingQueueFullError(
+                    f"Cola de matching llena ({len(self._active)}/{self.max_pending} runs en curso)"
+                )
+            self._active[key] = run_id
+            pool = self._get_pool()
+
+        try:
+            self.store[run_id] = {
+                "status": "queued",
+                "progress": 0.0,
+                "message": "Proceso en cola...",
+                "runId": run_id,
+            }
+            future = pool.submit(fn, *args, **kwargs)
+        except Exception:
+            self._release(key, run_id)
+            raise
+
+        future.add_done_callback(lambda f: self._on_done(f, key, run_id))
+        return run_id, False
+
+    def _release(self, key: tuple, run_id: str) -> None:
+        with self._lock:
+            if self._active.get(key) == run_id:
+                del self._active[key]
+
+    def _on_done(self, future: Any, key: tuple, run_id: str) -> None:
+        self._release(key, run_id)
+        error = future.exception()
+        if error is not None:
+            evaluation_logger.log_error("Matching Runs", f"Run {run_id} terminó con excepción no controlada: {error}")
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=wait)
@@ -0,0 +1,101 @@
+"""
+Process-wide Supabase client registry.
+
+`supabase.create_client` builds a new client, and with it new HTTP sessions, on
+every call. `get_client(url, key)` instead returns one shared client per
+(url, key), backed by a keep-alive `httpx.Client` pool, so the Supabase calls
+of a request (and of concurrent requests) reuse connections instead of paying a
+TLS handshake each time.
+
+Pool size and timeouts come from env:
+
+- SUPABASE_HTTP_MAX_CONNECTIONS (default 20)
+- SUPABASE_HTTP_MAX_KEEPALIVE (default 10)
+- SUPABASE_HTTP_KEEPALIVE_EXPIRY seconds (default 30)
+- SUPABASE_HTTP_TIMEOUT seconds (default 120, same as postgrest)
+
+Tests can inject a fake for every caller with `override_client(fake)`.
+"""
+
+import os
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager, suppress
+from typing import Any
+
+import httpx
+from supabase import create_client
+from supabase.lib.client_options import SyncClientOptions
+
+_clients: dict[tuple[str, str], Any] = {}
+_http_clients: list[httpx.Client] = []
+_override: Any = None
+_lock = threading.Lock()
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _build_http_client() -> httpx.Client:
+    limits = httpx.Limits(
+        max_connections=int(_env_float("SUPABASE_HTTP_MAX_CONNECTIONS", 20)),
+        max_keepalive_connections=int(_env_float("SUPABASE_HTTP_MAX_KEEPALIVE", 10)),
+        keepalive_expiry=_env_float("SUPABASE_HTTP_KEEPALIVE_EXPIRY", 30),
+    )
+    return httpx.Client(limits=limits, timeout=httpx.Timeout(_env_float("SUPABASE_HTTP_TIMEOUT", 120)))
+
+
+def _build_client(url: str, key: str) -> Any:
+    # El httpx.Client compartido lo usan PostgREST (table/rpc) y auth. storage/functions
+    # re-apuntan su base_url, pero este servicio no los usa.
+    http_client = _build_http_client()
+    _http_clients.append(http_client)
+    return create_client(url, key, options=SyncClientOptions(httpx_client=http_client))
+
+
+def get_client(url: str | None = None, key: str | None = None) -> Any:
+    """
+    Shared Supabase client for (url, key), created on first use.
+
+    `url`/`key` default to SUPABASE_URL / SUPABASE_KEY. Raises ValueError if missing.
+    """
+    if _override is not None:
+        return _override
+
+    url = url or os.getenv("SUPABASE_URL")
+    key = key or os.getenv("SUPABASE_KEY")
+    if not url or not key:
+        raise ValueError("SUPABASE_URL y SUPABASE_KEY deben estar configurados")
+
+    with _lock:
+        client = _clients.get((url, key))
+        if client is None:
+            client = _build_client(url, key)
+            _clients[(url, key)] = client
+        return client
+
+
+@contextmanager
+def override_client(client: Any) -> Iterator[Any]:
+    """Make every `get_client` call return `client` inside the block (tests / scripts)."""
+    global _override
+    previous, _override = _override, client
+    try:
+        yield client
+    finally:
+        _override = previous
+
+
+def reset_clients() -> None:
+    """Drop cached clients and close their HTTP pools."""
+    with _lock:
+        _clients.clear()
+        http_clients = list(_http_clients)
+        _http_clients.clear()
+    for http_client in http_clients:
+        with suppress(Exception):
+            http_client.close()